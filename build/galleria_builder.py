@@ -2,13 +2,23 @@
 
 from pathlib import Path
 
+from galleria.config import (
+    duplicates_enabled,
+    processor_options,
+    transform_options,
+)
+from galleria.manager.hooks import PluginHookManager
+from galleria.manager.pages import PageWriter
 from galleria.manager.pipeline import PipelineManager
 from galleria.plugins.base import PluginContext
 from galleria.plugins.css import BasicCSSPlugin
+from galleria.plugins.duplicates import DuplicateDetectionPlugin
 from galleria.plugins.pagination import BasicPaginationPlugin
 from galleria.plugins.processors.thumbnail import ThumbnailProcessorPlugin
 from galleria.plugins.providers.normpic import NormPicProviderPlugin
 from galleria.plugins.template import BasicTemplatePlugin
+from galleria.processor.pool import WorkerPool
+from galleria.processor.upgrade import PreviewUpgrader
 
 from .context import BuildContext
 from .exceptions import GalleriaError
@@ -17,9 +27,23 @@ from .exceptions import GalleriaError
 class GalleriaBuilder:
     """Handles galleria pipeline setup and execution."""
 
-    def __init__(self):
-        """Initialize GalleriaBuilder."""
-        pass
+    def __init__(
+        self,
+        worker_pool: WorkerPool | None = None,
+        hooks: PluginHookManager | None = None,
+        upgrader: PreviewUpgrader | None = None,
+    ):
+        """Initialize GalleriaBuilder.
+
+        Args:
+            worker_pool: Long-lived pool reused by every build (owned by caller)
+            hooks: Pipeline hooks shared by every build (e.g. progress display)
+            upgrader: Background upgrader for the quick thumbnails of
+                development builds (owned by caller)
+        """
+        self.worker_pool = worker_pool
+        self.hooks = hooks
+        self.upgrader = upgrader
 
     def _get_theme_path(self, theme_name: str) -> str:
         """Get the filesystem path to a Galleria theme.
@@ -65,10 +89,29 @@ class GalleriaBuilder:
             # Create output directory
             output_dir.mkdir(parents=True, exist_ok=True)
 
+            processor_config = processor_options(galleria_config)
+            for key in ("web_dir", "queue_dir"):
+                if key in processor_config:
+                    processor_config[key] = str(base_dir / processor_config[key])
+
+            # Streaming writes each page as the template renders it; without
+            # it, page scheduling writes pages once their photos are done,
+            # unless duplicate detection changes the photos before pagination
+            streaming = galleria_config.get("streaming", False)
+            hooks = self.hooks
+            page_writes = processor_config.get("schedule") == "page" and not streaming
+            if page_writes and not duplicates_enabled(galleria_config):
+                hooks = hooks.copy() if hooks is not None else PluginHookManager()
+                PageWriter().attach(hooks)
+
             # Initialize pipeline and register plugins
-            pipeline = PipelineManager()
+            pipeline = PipelineManager(hooks=hooks)
             pipeline.registry.register(NormPicProviderPlugin(), "provider")
-            pipeline.registry.register(ThumbnailProcessorPlugin(), "processor")
+            pipeline.registry.register(
+                ThumbnailProcessorPlugin(self.worker_pool, self.upgrader),
+                "processor",
+            )
+            pipeline.registry.register(DuplicateDetectionPlugin(), "transform")
             pipeline.registry.register(BasicPaginationPlugin(), "transform")
             pipeline.registry.register(BasicTemplatePlugin(), "template")
             pipeline.registry.register(BasicCSSPlugin(), "css")
@@ -81,11 +124,15 @@ class GalleriaBuilder:
                 ("template", "basic-template"),
                 ("css", "basic-css")
             ]
+            if duplicates_enabled(galleria_config):
+                stages.insert(2, ("transform", "duplicate-detection"))
 
-            # Create metadata with BuildContext if provided
+            # Create metadata with BuildContext if provided; a development
+            # context also switches the thumbnails to quick previews
             metadata = {}
-            if build_context is not None and site_url is not None:
+            if build_context is not None:
                 metadata["build_context"] = build_context
+            if build_context is not None and site_url is not None:
                 metadata["site_url"] = site_url
 
             # Create initial context
@@ -96,11 +143,11 @@ class GalleriaBuilder:
                     "processor": {
                         "thumbnail_size": galleria_config.get("thumbnail_size", 400),
                         "quality": galleria_config.get("quality", 85),
-                        **({"parallel": galleria_config["parallel"]} if "parallel" in galleria_config else {}),
-                        **({"max_workers": galleria_config["max_workers"]} if "max_workers" in galleria_config else {}),
+                        **processor_config,
                     },
                     "transform": {
-                        "page_size": galleria_config.get("photos_per_page", 60)
+                        "page_size": galleria_config.get("photos_per_page", 60),
+                        **transform_options(galleria_config),
                     },
                     "template": {
                         "theme": galleria_config.get("theme", "minimal"),
@@ -117,7 +164,10 @@ class GalleriaBuilder:
             )
 
             # Execute pipeline
-            final_result = pipeline.execute_stages(stages, initial_context)
+            if streaming:
+                final_result = pipeline.execute_streaming(stages, initial_context)
+            else:
+                final_result = pipeline.execute_stages(stages, initial_context)
 
             if not final_result.success:
                 error_msg = "Pipeline execution failed: " + ", ".join(final_result.errors)
@@ -2,6 +2,10 @@
 
 from pathlib import Path
 
+from galleria.manager.hooks import PluginHookManager
+from galleria.processor.pool import WorkerPool
+from galleria.processor.upgrade import PreviewUpgrader
+
 from .config_manager import ConfigManager
 from .galleria_builder import GalleriaBuilder
 from .pelican_builder import PelicanBuilder
@@ -12,12 +16,27 @@ from .exceptions import BuildError
 class BuildOrchestrator:
     """Orchestrates the complete site build process."""
 
-    def __init__(self):
-        """Initialize BuildOrchestrator."""
+    def __init__(self, hooks: PluginHookManager | None = None):
+        """Initialize BuildOrchestrator.
+
+        Args:
+            hooks: Pipeline hooks for every gallery build (e.g. progress display)
+        """
         self.config_manager = ConfigManager()
-        self.galleria_builder = GalleriaBuilder()
+        # Worker pool outlives single builds so repeated execute() calls reuse it
+        self.worker_pool = WorkerPool()
+        # Upgrades the quick thumbnails of development builds in the background
+        self.upgrader = PreviewUpgrader()
+        self.galleria_builder = GalleriaBuilder(
+            worker_pool=self.worker_pool, hooks=hooks, upgrader=self.upgrader
+        )
         self.pelican_builder = PelicanBuilder()
 
+    def shutdown(self) -> None:
+        """Stop the preview upgrade and worker processes kept between builds."""
+        self.upgrader.shutdown()
+        self.worker_pool.shutdown()
+
     def execute(self, config_dir: Path = None, base_dir: Path = None, override_site_url: str | None = None) -> bool:
         """Execute the complete build process.
         
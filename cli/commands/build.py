@@ -7,6 +7,8 @@ import click
 from build.benchmark import TimingContext
 from build.exceptions import BuildError
 from build.orchestrator import BuildOrchestrator
+from galleria.manager.hooks import PluginHookManager
+from galleria.manager.progress import ProgressReporter
 
 from .organize import organize
 
@@ -32,8 +34,11 @@ def build(benchmark: bool):
 
     # Execute complete build using orchestrator
     click.echo("Generating galleries and site pages...")
+    # Live photos/sec, ETA and cache-hit ratio for each gallery's thumbnails
+    hooks = PluginHookManager()
+    ProgressReporter().attach(hooks)
+    orchestrator = BuildOrchestrator(hooks=hooks)
     try:
-        orchestrator = BuildOrchestrator()
         orchestrator.execute()
         click.echo("✓ Build completed successfully!")
 
@@ -44,6 +49,8 @@ def build(benchmark: bool):
     except BuildError as e:
         click.echo(f"✗ Build failed: {e}")
         ctx.exit(1)
+    finally:
+        orchestrator.shutdown()
 
 
 def _is_already_built(output_dir="output"):
@@ -25,9 +25,10 @@ class ManifestComparator:
         try:
             for file_path in directory.rglob("*"):
                 if file_path.is_file() and file_path.name != "manifest.json":
-                    # Use relative path from the directory as key
-                    relative_path = file_path.relative_to(directory)
-                    manifest[str(relative_path)] = self.calculate_file_hash(file_path)
+                    # Use relative path from the directory as key; forward
+                    # slashes match remote keys for nested trees (full/, web/)
+                    relative_path = file_path.relative_to(directory).as_posix()
+                    manifest[relative_path] = self.calculate_file_hash(file_path)
 
             return manifest
 
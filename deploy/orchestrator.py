@@ -6,8 +6,9 @@ from pathlib import Path
 class DeployOrchestrator:
     """Orchestrate deployment to bunny.net with dual zone strategy.
 
-    Manages photo zone routing (/output/pics/* → photo zone) and
-    site content zone deployment (everything except pics/).
+    Manages photo zone routing (/output/pics/* → photo zone: pics/full
+    originals and pics/web derivatives) and site content zone deployment
+    (everything except pics/).
     """
 
     def __init__(self, photo_client, site_client, manifest_comparator):
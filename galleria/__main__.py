@@ -1,18 +1,24 @@
 """Galleria CLI entry point."""
 
+import threading
 from pathlib import Path
 
 import click
 
-from .config import GalleriaConfig
+from .config import GalleriaConfig, duplicates_enabled
+from .manager.hooks import PluginHookManager
+from .manager.pages import PageWriter
 from .manager.pipeline import PipelineManager
+from .manager.progress import ProgressReporter
 from .orchestrator.serve import ServeOrchestrator
 from .plugins.base import PluginContext
 from .plugins.css import BasicCSSPlugin
+from .plugins.duplicates import DuplicateDetectionPlugin
 from .plugins.pagination import BasicPaginationPlugin
 from .plugins.processors.thumbnail import ThumbnailProcessorPlugin
 from .plugins.providers.normpic import NormPicProviderPlugin
 from .plugins.template import BasicTemplatePlugin
+from .processor.queue import DEFAULT_LEASE_SECONDS, DEFAULT_MAX_ATTEMPTS, QueueWorker
 
 
 @click.group()
@@ -36,8 +42,13 @@ def cli():
     type=click.Path(path_type=Path),
     help="Output directory for generated gallery (overrides config)",
 )
+@click.option(
+    "--stream",
+    is_flag=True,
+    help="Stream photos through the pipeline, writing pages as they are ready",
+)
 @click.option("--verbose", "-v", is_flag=True, help="Enable verbose output")
-def generate(config: Path, output: Path | None, verbose: bool):
+def generate(config: Path, output: Path | None, stream: bool, verbose: bool):
     """Generate static gallery from configuration file.
 
     This command processes a photo collection through the galleria plugin
@@ -69,9 +80,22 @@ def generate(config: Path, output: Path | None, verbose: bool):
     if verbose:
         click.echo("Initializing plugin pipeline...")
 
-    pipeline = PipelineManager()
+    # Live photos/sec, ETA and cache-hit ratio while thumbnails are built
+    hooks = PluginHookManager()
+    ProgressReporter().attach(hooks)
+    # Page scheduling: write each page as soon as its thumbnails are done
+    # (streaming writes pages as they are rendered anyway)
+    processor_config = galleria_config.pipeline.processor.config
+    if (
+        not stream
+        and processor_config.get("schedule") == "page"
+        and not duplicates_enabled(galleria_config.pipeline.transform.config)
+    ):
+        PageWriter().attach(hooks)
+    pipeline = PipelineManager(hooks=hooks)
     pipeline.registry.register(NormPicProviderPlugin(), "provider")
     pipeline.registry.register(ThumbnailProcessorPlugin(), "processor")
+    pipeline.registry.register(DuplicateDetectionPlugin(), "transform")
     pipeline.registry.register(BasicPaginationPlugin(), "transform")
     pipeline.registry.register(BasicTemplatePlugin(), "template")
     pipeline.registry.register(BasicCSSPlugin(), "css")
@@ -84,6 +108,8 @@ def generate(config: Path, output: Path | None, verbose: bool):
         ("template", "basic-template"),
         ("css", "basic-css"),
     ]
+    if duplicates_enabled(galleria_config.pipeline.transform.config):
+        stages.insert(2, ("transform", "duplicate-detection"))
 
     # Create initial context
     initial_context = PluginContext(
@@ -102,7 +128,10 @@ def generate(config: Path, output: Path | None, verbose: bool):
                 click.echo(f"  [{i}/{len(stages)}] Running {stage} ({plugin_name})...")
 
         # Execute complete pipeline
-        final_result = pipeline.execute_stages(stages, initial_context)
+        if stream:
+            final_result = pipeline.execute_streaming(stages, initial_context)
+        else:
+            final_result = pipeline.execute_stages(stages, initial_context)
 
         if not final_result.success:
             error_msg = "Pipeline execution failed:\n" + "\n".join(final_result.errors)
@@ -168,7 +197,9 @@ def generate(config: Path, output: Path | None, verbose: bool):
                         f"Failed to write HTML file {i}: {e}"
                     ) from e
 
-            page_count = len(final_output["html_files"])
+            page_count = len(final_output["html_files"]) + len(
+                final_output.get("written_files", ())
+            )
             click.echo(f"Generated {page_count} HTML pages for '{collection_name}'")
 
         # Write CSS files
@@ -258,9 +289,20 @@ def generate(config: Path, output: Path | None, verbose: bool):
 )
 @click.option("--no-generate", is_flag=True, help="Skip gallery generation phase")
 @click.option("--no-watch", is_flag=True, help="Disable file watching and hot reload")
+@click.option(
+    "--lazy",
+    is_flag=True,
+    help="Generate missing thumbnails when first requested instead of up front",
+)
 @click.option("--verbose", "-v", is_flag=True, help="Enable verbose output")
 def serve(
-    config: Path, host: str, port: int, no_generate: bool, no_watch: bool, verbose: bool
+    config: Path,
+    host: str,
+    port: int,
+    no_generate: bool,
+    no_watch: bool,
+    lazy: bool,
+    verbose: bool,
 ):
     """Start development server for gallery with hot reload.
 
@@ -275,6 +317,8 @@ def serve(
             click.echo("Skipping gallery generation")
         if no_watch:
             click.echo("File watching disabled")
+        if lazy:
+            click.echo("Thumbnails generated on first request")
 
     try:
         # Initialize and execute serve orchestrator
@@ -285,6 +329,7 @@ def serve(
             port=port,
             no_generate=no_generate,
             no_watch=no_watch,
+            lazy=lazy,
             verbose=verbose,
         )
     except KeyboardInterrupt:
@@ -295,6 +340,84 @@ def serve(
         raise click.ClickException(f"Server error: {e}") from e
 
 
+@cli.command()
+@click.option(
+    "--queue-dir",
+    "-q",
+    type=click.Path(path_type=Path),
+    required=True,
+    help="Shared queue directory (the queue_dir of the building config)",
+)
+@click.option(
+    "--threads",
+    "-t",
+    type=click.IntRange(min=1),
+    default=1,
+    help="Tasks to run concurrently on this node (default: 1)",
+)
+@click.option(
+    "--lease-seconds",
+    type=click.FloatRange(min=0, min_open=True),
+    default=DEFAULT_LEASE_SECONDS,
+    help=f"Heartbeat age after which a claimed task is taken over "
+    f"(default: {DEFAULT_LEASE_SECONDS:g})",
+)
+@click.option(
+    "--max-attempts",
+    type=click.IntRange(min=1),
+    default=DEFAULT_MAX_ATTEMPTS,
+    help=f"Claims per task before it is abandoned (default: {DEFAULT_MAX_ATTEMPTS})",
+)
+@click.option(
+    "--idle-exit",
+    type=float,
+    default=None,
+    help="Exit after this many seconds without work (default: run until Ctrl-C)",
+)
+@click.option("--verbose", "-v", is_flag=True, help="Enable verbose output")
+def worker(
+    queue_dir: Path,
+    threads: int,
+    lease_seconds: float,
+    max_attempts: int,
+    idle_exit: float | None,
+    verbose: bool,
+):
+    """Render thumbnails for builds using the distributed executor.
+
+    Start this on every machine that mounts the shared queue directory.
+    Sources and outputs must be visible at the same paths as on the
+    machine running the build.
+    """
+    if verbose:
+        click.echo(f"Serving queue {queue_dir} with {threads} thread(s)")
+
+    workers = [
+        QueueWorker(queue_dir, lease_seconds=lease_seconds, max_attempts=max_attempts)
+        for _ in range(threads)
+    ]
+    stop_event = threading.Event()
+    runners = [
+        threading.Thread(target=w.run, args=(stop_event, idle_exit), daemon=True)
+        for w in workers
+    ]
+    for runner in runners:
+        runner.start()
+
+    try:
+        for runner in runners:
+            while runner.is_alive():
+                runner.join(0.5)
+    except KeyboardInterrupt:
+        if verbose:
+            click.echo("\nFinishing running tasks...")
+        stop_event.set()
+        for runner in runners:
+            runner.join()
+
+    click.echo(f"Worker stopped after {sum(w.completed for w in workers)} tasks")
+
+
 def main():
     """Entry point for the galleria CLI."""
     cli()
@@ -6,6 +6,9 @@ Follows patterns from build/benchmark.py but is galleria-specific.
 
 from dataclasses import dataclass, field
 
+# How a photo's thumbnails were obtained, counted separately in the metrics
+PHOTO_OUTCOMES = ("fresh", "cached", "resumed")
+
 
 @dataclass
 class ThumbnailBenchmark:
@@ -26,34 +29,65 @@ class ThumbnailBenchmark:
     per_photo_times: list[float] = field(default_factory=list)
     output_sizes: list[int] = field(default_factory=list)
     total_duration_s: float = 0.0
+    placeholder_times: list[float] = field(default_factory=list)
+    outcomes: dict[str, int] = field(
+        default_factory=lambda: dict.fromkeys(PHOTO_OUTCOMES, 0)
+    )
 
-    def record_photo(self, duration_s: float, output_bytes: int) -> None:
+    def record_photo(
+        self,
+        duration_s: float,
+        output_bytes: int,
+        placeholder_s: float | None = None,
+        outcome: str = "fresh",
+    ) -> None:
         """Record timing and size for a processed photo.
 
         Args:
             duration_s: Time taken to process this photo in seconds
             output_bytes: Size of the output thumbnail in bytes
+            placeholder_s: Part of duration_s spent on the LQIP and dominant
+                colour, if they were computed
+            outcome: "fresh" (rendered now), "cached" (from the cache index)
+                or "resumed" (finished by an interrupted earlier run). Only
+                fresh photos count towards the timing metrics: the others
+                were not rendered in this run
         """
-        self.per_photo_times.append(duration_s)
+        self.outcomes[outcome] += 1
         self.output_sizes.append(output_bytes)
+        if outcome != "fresh":
+            return
+        self.per_photo_times.append(duration_s)
         self.total_duration_s += duration_s
+        if placeholder_s is not None:
+            self.placeholder_times.append(placeholder_s)
 
     def get_metrics(self) -> dict:
         """Get all collected metrics as a dictionary.
 
         Returns:
             Dict containing:
-                - per_photo_times: List of per-photo processing times
-                - total_duration_s: Sum of all processing times
-                - photos_per_second: Throughput (photos / total_duration)
-                - output_sizes: List of output file sizes in bytes
+                - per_photo_times: List of per-photo processing times of the
+                  photos rendered in this run
+                - total_duration_s: Sum of those processing times
+                - photos_per_second: Rendering throughput (rendered photos /
+                  total_duration)
+                - output_sizes: List of output file sizes in bytes, of every
+                  photo
                 - total_output_bytes: Sum of all output sizes
                 - average_output_bytes: Mean output size
+                - placeholder_total_s: Time spent on placeholders (if any)
+                - placeholder_share: Fraction of total_duration_s spent on
+                  placeholders (if any)
+                - fresh_photos, cached_photos, resumed_photos: Photos rendered
+                  in this run, served from the cache index, and finished by an
+                  interrupted run whose journal was replayed
         """
         count = len(self.per_photo_times)
         total_bytes = sum(self.output_sizes)
+        sized = len(self.output_sizes)
 
-        return {
+        metrics = {
             "per_photo_times": self.per_photo_times,
             "total_duration_s": self.total_duration_s,
             "photos_per_second": (
@@ -61,5 +95,16 @@ class ThumbnailBenchmark:
             ),
             "output_sizes": self.output_sizes,
             "total_output_bytes": total_bytes,
-            "average_output_bytes": total_bytes // count if count > 0 else 0,
+            "average_output_bytes": total_bytes // sized if sized > 0 else 0,
         }
+        for outcome, photo_count in self.outcomes.items():
+            metrics[f"{outcome}_photos"] = photo_count
+        if self.placeholder_times:
+            placeholder_total = sum(self.placeholder_times)
+            metrics["placeholder_total_s"] = placeholder_total
+            metrics["placeholder_share"] = (
+                placeholder_total / self.total_duration_s
+                if self.total_duration_s > 0
+                else 0.0
+            )
+        return metrics
@@ -7,6 +7,69 @@ from typing import Any
 
 import click
 
+# Flat config keys passed to the processor stage only when present
+PROCESSOR_OPTIONAL_KEYS = (
+    "parallel",
+    "executor",
+    "max_workers",
+    "dispatch",
+    "batch_size",
+    "max_in_flight",
+    "worker_memory_limit_mb",
+    "schedule",
+    "schedule_weight",
+    "queue_dir",
+    "queue_lease_seconds",
+    "queue_max_attempts",
+    "queue_local_workers",
+    "photo_timeout_s",
+    "max_retries",
+    "max_image_pixels",
+    "dev_previews",
+    "lazy_thumbnails",
+    "thumbnail_sizes",
+    "web_size",
+    "output_format",
+    "alternate_formats",
+    "smallest_wins",
+    "format_quality",
+    "adaptive_quality",
+    "target_ssim",
+    "min_quality",
+    "max_quality",
+    "placeholders",
+    "crop",
+    "perceptual_hash",
+    "web_photos",
+    "web_dir",
+    "web_quality",
+)
+
+# Flat config keys passed to the transform stage only when present
+TRANSFORM_OPTIONAL_KEYS = ("duplicates", "duplicate_threshold")
+
+
+def duplicates_enabled(data: dict[str, Any]) -> bool:
+    """Whether a flat config turns on the duplicate-detection stage."""
+    return data.get("duplicates", "off") != "off"
+
+
+def processor_options(data: dict[str, Any]) -> dict[str, Any]:
+    """Optional processor settings present in a flat config.
+
+    Duplicate detection needs a perceptual hash per photo, so enabling it
+    also turns on hashing (dhash unless ``perceptual_hash`` says otherwise).
+    """
+    options = {k: data[k] for k in PROCESSOR_OPTIONAL_KEYS if k in data}
+    if duplicates_enabled(data):
+        options.setdefault("perceptual_hash", "dhash")
+    return options
+
+
+def transform_options(data: dict[str, Any]) -> dict[str, Any]:
+    """Optional transform settings present in a flat config."""
+    return {k: data[k] for k in TRANSFORM_OPTIONAL_KEYS if k in data}
+
 
 @dataclass
 class PipelineStageConfig:
@@ -74,14 +137,16 @@ class GalleriaConfig:
                 config={
                     "thumbnail_size": data.get("thumbnail_size", 400),
                     "quality": data.get("quality", 90),
-                    # Only include parallel options if specified in config
-                    **({"parallel": data["parallel"]} if "parallel" in data else {}),
-                    **({"max_workers": data["max_workers"]} if "max_workers" in data else {}),
+                    # Only include optional processor settings if specified in config
+                    **processor_options(data),
                 },
             ),
             "transform": PipelineStageConfig(
                 plugin="basic-pagination",
-                config={"page_size": data.get("page_size", 20)},
+                config={
+                    "page_size": data.get("page_size", 20),
+                    **transform_options(data),
+                },
             ),
             "template": PipelineStageConfig(
                 plugin="basic-template",
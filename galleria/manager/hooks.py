@@ -9,7 +9,10 @@ class PluginHookManager:
     """Manages plugin hooks for extensibility points in the pipeline.
 
     Provides registration and execution of hooks at specific stages
-    of the plugin pipeline workflow.
+    of the plugin pipeline workflow. PipelineManager runs
+    ``before_<stage>`` and ``after_<stage>`` around every stage, and plugins
+    that work through a collection run ``<stage>_item`` once per item
+    (e.g. ``processor_item`` for each finished thumbnail).
     """
 
     def __init__(self):
@@ -49,6 +52,33 @@ class PluginHookManager:
 
         return results
 
+    def has_hook(self, name: str) -> bool:
+        """Check whether any callback is registered for a hook.
+
+        Lets per-item call sites skip building a context nobody receives.
+
+        Args:
+            name: Hook name to check
+
+        Returns:
+            True if at least one callback is registered
+        """
+        return bool(self._hooks.get(name))
+
+    def copy(self) -> "PluginHookManager":
+        """Return a manager with the same callbacks registered.
+
+        Lets one run add its own hooks without adding them to a manager
+        shared by every run.
+
+        Returns:
+            New PluginHookManager
+        """
+        hooks = PluginHookManager()
+        for name, callbacks in self._hooks.items():
+            hooks._hooks[name] = list(callbacks)
+        return hooks
+
     def list_hooks(self) -> list[str]:
         """List all registered hook names.
 
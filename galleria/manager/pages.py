@@ -0,0 +1,138 @@
+"""Early page writes driven by pipeline hooks."""
+
+import math
+from pathlib import Path
+
+from galleria.plugins import PluginContext, PluginResult
+from galleria.plugins.css import BasicCSSPlugin
+from galleria.plugins.processors.thumbnail import DEFAULT_PAGE_SIZE, RELEASE_HOOK
+from galleria.plugins.streaming import photo_count
+from galleria.plugins.template import BasicTemplatePlugin
+from galleria.processor.cache import atomic_output
+
+from .hooks import PluginHookManager
+
+
+class PageWriter:
+    """Write each gallery page as soon as its photos' thumbnails are done.
+
+    The processor releases photos in manifest order, which is pagination
+    order. Once a page's worth has been released, that page is rendered
+    with the template plugin and written, so page 1 of a large gallery
+    exists after about ``page_size`` photos. The first page also brings
+    index.html and the stylesheets. The template and css stages still run
+    at the end and rewrite every file with the same content.
+
+    Pages match the final ones only when the processor's photos are paged
+    unchanged, so callers leave it out when a transform (e.g. duplicate
+    detection) runs before pagination.
+    """
+
+    def __init__(
+        self,
+        template: BasicTemplatePlugin | None = None,
+        css: BasicCSSPlugin | None = None,
+    ):
+        """Initialize page writer.
+
+        Args:
+            template: Template plugin rendering the pages
+            css: CSS plugin rendering the stylesheets
+        """
+        self.template = template or BasicTemplatePlugin()
+        self.css = css or BasicCSSPlugin()
+        self._reset("", 0, DEFAULT_PAGE_SIZE)
+
+    def attach(self, hooks: PluginHookManager) -> "PageWriter":
+        """Register the writer's callbacks on a hook manager.
+
+        Args:
+            hooks: Hook manager passed to PipelineManager
+
+        Returns:
+            This writer, for chaining
+        """
+        hooks.register_hook("before_processor", self.on_start)
+        hooks.register_hook(RELEASE_HOOK, self.on_release)
+        return self
+
+    def _reset(self, collection_name: str, total: int, page_size: int) -> None:
+        """Start paging a new collection."""
+        self.collection_name = collection_name
+        self.total = total
+        self.page_size = page_size
+        self.total_pages = max(1, math.ceil(total / page_size))
+        self.page: list[dict] = []
+        self.page_num = 0
+        self.written: list[str] = []
+
+    def on_start(self, context: PluginContext) -> PluginResult:
+        """Learn the page layout of the collection entering the processor."""
+        input_data = context.input_data if isinstance(context.input_data, dict) else {}
+        config = context.config or {}
+        page_size = config.get("transform", config).get("page_size", DEFAULT_PAGE_SIZE)
+        self._reset(
+            input_data.get("collection_name", ""),
+            photo_count(input_data),
+            max(1, page_size),
+        )
+        return PluginResult(success=True, output_data=None)
+
+    def on_release(self, context: PluginContext) -> PluginResult:
+        """Collect a released photo and write its page once complete."""
+        self.page.append(context.input_data["photo"])
+        released = context.input_data["released"]
+        if len(self.page) < self.page_size and released < context.input_data["total"]:
+            return PluginResult(success=True, output_data=None)
+
+        self.page_num += 1
+        photos, self.page = self.page, []
+        try:
+            self._write_page(photos, context)
+        except Exception as e:
+            # The template stage writes every page anyway
+            return PluginResult(
+                success=False,
+                output_data=None,
+                errors=[f"PAGE_WRITE_ERROR: page {self.page_num}: {e}"],
+            )
+        return PluginResult(success=True, output_data=None)
+
+    def _write_page(self, photos: list[dict], context: PluginContext) -> None:
+        """Render and write one page (and, with the first, index and CSS)."""
+        page_context = PluginContext(
+            input_data={"collection_name": self.collection_name},
+            config=context.config,
+            output_dir=context.output_dir,
+            metadata=context.metadata,
+        )
+        files = [
+            self.template.render_page(
+                photos,
+                self.collection_name,
+                self.page_num,
+                self.total_pages,
+                page_context,
+            )
+        ]
+        if self.page_num == 1:
+            files.append(self.template.render_index(self.collection_name))
+            css_result = self.css.generate_css(
+                PluginContext(
+                    input_data={
+                        "collection_name": self.collection_name,
+                        "html_files": [],
+                    },
+                    config=context.config,
+                    output_dir=context.output_dir,
+                    metadata=context.metadata,
+                )
+            )
+            if css_result.success:
+                files.extend(css_result.output_data["css_files"])
+
+        for file in files:
+            # Atomic: the dev server may be serving the previous build's page
+            with atomic_output(Path(context.output_dir) / file["filename"]) as tmp:
+                tmp.write_text(file["content"], encoding="utf-8")
+            self.written.append(file["filename"])
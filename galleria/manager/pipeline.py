@@ -1,19 +1,26 @@
 """Pipeline manager for orchestrating plugin execution."""
 
-from ..plugins.base import PluginResult
+from collections.abc import Iterable, Iterator
+from dataclasses import replace
+
+from ..plugins.base import PluginContext, PluginResult
 from ..plugins.registry import PluginRegistry
+from ..plugins.streaming import StreamingPlugin, run_materialized, streamed_key
+from .hooks import PluginHookManager
 
 
 class PipelineManager:
     """Manager for orchestrating plugin pipeline execution."""
 
-    def __init__(self, registry=None):
+    def __init__(self, registry=None, hooks=None):
         """Initialize pipeline manager.
 
         Args:
             registry: PluginRegistry instance, creates new one if None
+            hooks: PluginHookManager run around stages, creates new one if None
         """
         self.registry = registry or PluginRegistry()
+        self.hooks = hooks or PluginHookManager()
 
     def execute_single_stage(self, stage, plugin_name, context):
         """Execute a single plugin stage.
@@ -48,6 +55,10 @@ class PipelineManager:
     def execute_stages(self, stages, initial_context):
         """Execute multiple stages in sequence.
 
+        Runs the ``before_<stage>`` hooks with each stage's input context and
+        the ``after_<stage>`` hooks with its output (also when it fails).
+        Contexts carry the hook manager so plugins can run per-item hooks.
+
         Args:
             stages: List of stage configs. Supports both formats:
                 - Dict format: [{"stage": "provider", "plugin": "name"}, ...]
@@ -58,34 +69,119 @@ class PipelineManager:
             Final PluginResult from last stage
         """
         current_context = initial_context
+        if current_context.hooks is None:
+            current_context = replace(current_context, hooks=self.hooks)
 
         for stage_config in stages:
-            # Handle both tuple and dict formats
-            if isinstance(stage_config, tuple):
-                stage, plugin_name = stage_config
-            else:
-                stage = stage_config["stage"]
-                plugin_name = stage_config["plugin"]
+            stage, plugin_name = self._stage_names(stage_config)
 
             # Execute this stage
+            self.hooks.execute_hook(f"before_{stage}", current_context)
             result = self.execute_single_stage(stage, plugin_name, current_context)
 
-            # If stage failed, return failure
-            if not result.success:
-                return result
-
             # Prepare context for next stage with this stage's output
-            from ..plugins.base import PluginContext
-
-            current_context = PluginContext(
+            next_context = PluginContext(
                 input_data=result.output_data,
                 config=current_context.config,
                 output_dir=current_context.output_dir,
                 metadata={**current_context.metadata, **result.metadata},
+                hooks=current_context.hooks,
+            )
+            self.hooks.execute_hook(f"after_{stage}", next_context)
+
+            # If stage failed, return failure
+            if not result.success:
+                return result
+
+            current_context = next_context
+
+        return result
+
+    def execute_streaming(self, stages, initial_context):
+        """Execute multiple stages with photos streamed between them.
+
+        Plugins implementing StreamingPlugin get the previous stage's
+        iterators and return their own, so photos are pulled through the
+        pipeline by the template stage, which writes each page as it is
+        rendered. Only about a page of photos is held at a time. Other
+        plugins run through run_materialized(), which collects their input
+        into lists first, so existing dict-based plugins keep working.
+
+        Hooks run as in execute_stages(), except that ``after_<stage>`` of a
+        stage returning an iterator runs once that iterator is exhausted.
+        Hooks must not consume the iterators they see. Errors raised while
+        a later stage pulls photos fail the pipeline like a failed stage.
+
+        Args:
+            stages: List of stage configs, as for execute_stages()
+            initial_context: Initial PluginContext
+
+        Returns:
+            Final PluginResult from last stage
+        """
+        current_context = initial_context
+        if current_context.hooks is None:
+            current_context = replace(current_context, hooks=self.hooks)
+
+        try:
+            for stage_config in stages:
+                stage, plugin_name = self._stage_names(stage_config)
+                plugin = self.registry.get_plugin(plugin_name, stage)
+                if plugin is None:
+                    return PluginResult(
+                        success=False,
+                        output_data={},
+                        errors=[f"Plugin '{plugin_name}' not found in stage '{stage}'"],
+                    )
+
+                self.hooks.execute_hook(f"before_{stage}", current_context)
+                if isinstance(plugin, StreamingPlugin):
+                    result = plugin.stream(current_context)
+                else:
+                    result = run_materialized(plugin, current_context)
+
+                next_context = PluginContext(
+                    input_data=result.output_data,
+                    config=current_context.config,
+                    output_dir=current_context.output_dir,
+                    metadata={**current_context.metadata, **result.metadata},
+                    hooks=current_context.hooks,
+                )
+                key = streamed_key(result.output_data) if result.success else None
+                if key is None:
+                    self.hooks.execute_hook(f"after_{stage}", next_context)
+                else:
+                    result.output_data[key] = self._after_exhausted(
+                        result.output_data[key], f"after_{stage}", next_context
+                    )
+
+                if not result.success:
+                    return result
+
+                current_context = next_context
+        except Exception as e:
+            return PluginResult(
+                success=False,
+                output_data={},
+                errors=[f"Plugin execution failed: {str(e)}"],
             )
 
         return result
 
+    def _after_exhausted(
+        self, items: Iterable, hook: str, context: PluginContext
+    ) -> Iterator:
+        """Yield a stage's streamed items, then run its after hook."""
+        yield from items
+        self.hooks.execute_hook(hook, context)
+
+    @staticmethod
+    def _stage_names(stage_config) -> tuple[str, str]:
+        """Return (stage, plugin_name) from a tuple or dict stage config."""
+        if isinstance(stage_config, tuple):
+            return stage_config
+        return stage_config["stage"], stage_config["plugin"]
+
     def execute_workflow(self, workflow_name, **kwargs):
         """Execute a predefined workflow.
 
@@ -114,8 +210,6 @@ class PipelineManager:
             )
 
         # Create initial context from workflow parameters
-        from ..plugins.base import PluginContext
-
         initial_context = PluginContext(
             input_data={"manifest_path": kwargs.get("manifest_path")},
             config={},
@@ -0,0 +1,162 @@
+"""Live thumbnail progress display driven by pipeline hooks."""
+
+import sys
+import time
+from collections import deque
+from collections.abc import Callable
+from typing import TextIO
+
+from galleria.plugins import PluginContext, PluginResult
+from galleria.plugins.streaming import photo_count
+
+from .hooks import PluginHookManager
+
+# Completions older than this no longer count towards the current rate, so
+# the ETA follows slowdowns instead of averaging over the whole run
+RATE_WINDOW_S = 5.0
+
+# Seconds between redraws on a terminal, and between lines in a log
+TTY_INTERVAL_S = 0.2
+LOG_INTERVAL_S = 10.0
+
+
+def format_duration(seconds: float) -> str:
+    """Format a duration compactly, e.g. "42s", "3m05s" or "1h02m"."""
+    seconds = int(round(seconds))
+    if seconds < 60:
+        return f"{seconds}s"
+    minutes, seconds = divmod(seconds, 60)
+    if minutes < 60:
+        return f"{minutes}m{seconds:02d}s"
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h{minutes:02d}m"
+
+
+class ProgressReporter:
+    """Print photos/sec, ETA and cache-hit ratio while thumbnails are built.
+
+    Registers on the processor stage hooks of a PluginHookManager. On a
+    terminal the status line is redrawn in place; otherwise (CI logs, pipes)
+    a line is printed every LOG_INTERVAL_S. A summary line is printed when
+    the stage ends.
+    """
+
+    def __init__(
+        self,
+        stream: TextIO | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        interval_s: float | None = None,
+    ):
+        """Initialize progress reporter.
+
+        Args:
+            stream: Output stream (default: stderr)
+            clock: Monotonic time source in seconds
+            interval_s: Minimum seconds between updates (default: by stream)
+        """
+        self.stream = stream or sys.stderr
+        self.clock = clock
+        self.interactive = hasattr(self.stream, "isatty") and self.stream.isatty()
+        if interval_s is None:
+            interval_s = TTY_INTERVAL_S if self.interactive else LOG_INTERVAL_S
+        self.interval_s = interval_s
+        self._reset("gallery")
+
+    def attach(self, hooks: PluginHookManager) -> "ProgressReporter":
+        """Register the reporter's callbacks on a hook manager.
+
+        Args:
+            hooks: Hook manager passed to PipelineManager
+
+        Returns:
+            This reporter, for chaining
+        """
+        hooks.register_hook("before_processor", self.on_start)
+        hooks.register_hook("processor_item", self.on_item)
+        hooks.register_hook("after_processor", self.on_finish)
+        return self
+
+    def _reset(self, label: str) -> None:
+        """Start counting a new collection."""
+        self.label = label
+        self.total = 0
+        self.completed = 0
+        self.cache_hits = 0
+        self.start_s = self.clock()
+        self.last_update_s = self.start_s
+        self.line_width = 0
+        self.samples: deque[tuple[float, int]] = deque([(self.start_s, 0)])
+
+    def on_start(self, context: PluginContext) -> PluginResult:
+        """Reset counters for the collection entering the processor stage."""
+        input_data = context.input_data if isinstance(context.input_data, dict) else {}
+        self._reset(input_data.get("collection_name") or "gallery")
+        self.total = photo_count(input_data)
+        return PluginResult(success=True, output_data=None)
+
+    def on_item(self, context: PluginContext) -> PluginResult:
+        """Count a completed photo and redraw when the interval has passed."""
+        self.completed = context.input_data["completed"]
+        self.total = context.input_data["total"]
+        if context.input_data["photo"].get("cached"):
+            self.cache_hits += 1
+
+        now = self.clock()
+        self.samples.append((now, self.completed))
+        while len(self.samples) > 2 and now - self.samples[1][0] >= RATE_WINDOW_S:
+            self.samples.popleft()
+
+        if now - self.last_update_s >= self.interval_s:
+            self.last_update_s = now
+            self._write(self.status_line(now), final=not self.interactive)
+        return PluginResult(success=True, output_data=None)
+
+    def on_finish(self, context: PluginContext) -> PluginResult:
+        """Print the summary line for the collection."""
+        if self.total:
+            self._write(self.summary_line(self.clock()), final=True)
+        return PluginResult(success=True, output_data=None)
+
+    def rate(self, now: float) -> float:
+        """Photos per second over the last RATE_WINDOW_S."""
+        start_s, start_count = self.samples[0]
+        elapsed = now - start_s
+        return (self.completed - start_count) / elapsed if elapsed > 0 else 0.0
+
+    def cache_ratio(self) -> float:
+        """Fraction of completed photos served from the thumbnail cache."""
+        return self.cache_hits / self.completed if self.completed else 0.0
+
+    def status_line(self, now: float) -> str:
+        """Format the live line: progress, rate, ETA and cache hits."""
+        rate = self.rate(now)
+        remaining = self.total - self.completed
+        eta = format_duration(remaining / rate) if rate > 0 else "--"
+        percent = 100 * self.completed / self.total if self.total else 100
+        return (
+            f"  {self.label}: {self.completed}/{self.total} photos ({percent:.0f}%)"
+            f" | {rate:.1f} photos/s | ETA {eta}"
+            f" | cache hits {100 * self.cache_ratio():.0f}%"
+        )
+
+    def summary_line(self, now: float) -> str:
+        """Format the final line: count, duration, mean rate and cache hits."""
+        elapsed = now - self.start_s
+        rate = self.completed / elapsed if elapsed > 0 else 0.0
+        return (
+            f"  {self.label}: {self.completed} photos in {format_duration(elapsed)}"
+            f" | {rate:.1f} photos/s"
+            f" | cache hits {100 * self.cache_ratio():.0f}%"
+        )
+
+    def _write(self, line: str, final: bool) -> None:
+        """Write a line, overwriting the previous one on a terminal."""
+        if self.interactive:
+            padding = " " * max(0, self.line_width - len(line))
+            self.stream.write(f"\r{line}{padding}")
+            self.line_width = 0 if final else len(line)
+            if final:
+                self.stream.write("\n")
+        else:
+            self.stream.write(f"{line}\n")
+        self.stream.flush()
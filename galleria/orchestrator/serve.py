@@ -3,7 +3,10 @@
 from pathlib import Path
 
 from build.config_manager import ConfigManager
+from build.context import BuildContext
 from build.galleria_builder import GalleriaBuilder
+from galleria.processor.pool import WorkerPool
+from galleria.processor.upgrade import PreviewUpgrader
 from galleria.server import GalleriaHTTPServer
 from galleria.util.watcher import FileWatcher
 
@@ -14,7 +17,15 @@ class ServeOrchestrator:
     def __init__(self):
         """Initialize ServeOrchestrator."""
         self.config_manager = ConfigManager()
-        self.galleria_builder = GalleriaBuilder()
+        # Warm worker pool shared by the initial build and every hot reload
+        self.worker_pool = WorkerPool()
+        # Development builds write quick thumbnails so the server starts in
+        # seconds; the upgrader re-renders them at full quality meanwhile
+        self.build_context = BuildContext(production=False)
+        self.upgrader = PreviewUpgrader()
+        self.galleria_builder = GalleriaBuilder(
+            worker_pool=self.worker_pool, upgrader=self.upgrader
+        )
         self._file_watcher = None
         self._http_server = None
 
@@ -26,6 +37,7 @@ class ServeOrchestrator:
         no_generate: bool = False,
         no_watch: bool = False,
         verbose: bool = False,
+        lazy: bool = False,
     ) -> bool:
         """Execute the complete serve process.
 
@@ -36,6 +48,9 @@ class ServeOrchestrator:
             no_generate: Skip gallery generation phase
             no_watch: Disable file watching and hot reload
             verbose: Enable verbose output
+            lazy: Leave missing or stale thumbnails to the server, which
+                renders them on first request (also ``lazy_thumbnails`` in
+                the config)
 
         Returns:
             True if successful (never returns False, raises on error)
@@ -53,6 +68,7 @@ class ServeOrchestrator:
             base_dir = config_path.parent.parent
             output_dir = base_dir / raw_config["output_dir"]
             manifest_path = base_dir / raw_config["manifest_path"]
+            lazy = lazy or raw_config.get("lazy_thumbnails", False)
 
             # 2. Generate gallery (unless no_generate)
             if not no_generate:
@@ -66,16 +82,22 @@ class ServeOrchestrator:
                         if k not in ["manifest_path", "output_dir"]
                     },
                 }
-                self.galleria_builder.build(builder_config, base_dir)
+                if lazy:
+                    builder_config["lazy_thumbnails"] = True
+                self.galleria_builder.build(
+                    builder_config, base_dir, build_context=self.build_context
+                )
 
             # output_dir and manifest_path already extracted from config above
 
             # 3. Setup file watcher (unless no_watch)
             if not no_watch:
-                self._setup_file_watcher(config_path, manifest_path, raw_config)
+                self._setup_file_watcher(
+                    config_path, manifest_path, raw_config, lazy=lazy
+                )
 
             # 4. Start HTTP server
-            self._http_server = GalleriaHTTPServer(output_dir, host, port)
+            self._http_server = GalleriaHTTPServer(output_dir, host, port, lazy=lazy)
             self._http_server.start(verbose=verbose)
 
             return True
@@ -89,7 +111,11 @@ class ServeOrchestrator:
             raise
 
     def _setup_file_watcher(
-        self, config_path: Path, manifest_path: Path, raw_config: dict
+        self,
+        config_path: Path,
+        manifest_path: Path,
+        raw_config: dict,
+        lazy: bool = False,
     ) -> None:
         """Setup file watcher for hot reload functionality.
 
@@ -97,6 +123,7 @@ class ServeOrchestrator:
             config_path: Path to galleria configuration file
             manifest_path: Path to photo manifest file
             raw_config: Raw configuration dict
+            lazy: Whether rebuilds leave thumbnails to the server
         """
         # Determine paths to watch
         watched_paths = {config_path, manifest_path}
@@ -123,9 +150,15 @@ class ServeOrchestrator:
                         if k not in ["manifest_path", "output_dir"]
                     },
                 }
+                if lazy:
+                    updated_builder_config["lazy_thumbnails"] = True
                 # Use project root (config's parent's parent) as base_dir
                 base_dir = config_path.parent.parent
-                self.galleria_builder.build(updated_builder_config, base_dir)
+                self.galleria_builder.build(
+                    updated_builder_config,
+                    base_dir,
+                    build_context=self.build_context,
+                )
             except Exception:
                 # Gracefully handle rebuild errors to keep server running
                 pass
@@ -135,9 +168,12 @@ class ServeOrchestrator:
         self._file_watcher.start()
 
     def _cleanup(self) -> None:
-        """Clean up file watcher and HTTP server."""
+        """Clean up file watcher, HTTP server, preview upgrade and worker pool."""
         if self._file_watcher:
             self._file_watcher.stop()
 
         if self._http_server:
             self._http_server.stop()
+
+        self.upgrader.shutdown()
+        self.worker_pool.shutdown()
@@ -3,7 +3,10 @@
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from ..manager.hooks import PluginHookManager
 
 
 class BasePlugin(ABC):
@@ -52,6 +55,9 @@ class PluginContext:
     metadata: dict[str, Any] = field(default_factory=dict)
     """Shared metadata that can be passed between plugins."""
 
+    hooks: "PluginHookManager | None" = None
+    """Hook manager of the running pipeline, for per-item hooks."""
+
 
 @dataclass
 class PluginResult:
@@ -0,0 +1,111 @@
+"""Near-duplicate detection plugin for burst shots and repeated exports."""
+
+import time
+
+from ..processor.duplicates import DEFAULT_THRESHOLD, find_duplicate_groups
+from .base import PluginContext, PluginResult
+from .interfaces import TransformPlugin
+from .records import PhotoRecord
+
+# How duplicates are surfaced: "mark" keeps every photo and annotates the
+# groups, "collapse" keeps only the first photo of each group
+DUPLICATE_MODES = ("mark", "collapse")
+
+
+class DuplicateDetectionPlugin(TransformPlugin):
+    """Cluster photos by perceptual hash and mark or collapse near-duplicates.
+
+    Needs the ``perceptual_hash`` field set by the thumbnail processor
+    (processor config ``perceptual_hash``); photos without one are never
+    grouped. The first photo of a group in collection order is kept as its
+    representative.
+    """
+
+    @property
+    def name(self) -> str:
+        return "duplicate-detection"
+
+    @property
+    def version(self) -> str:
+        return "1.0.0"
+
+    def transform_data(self, context: PluginContext) -> PluginResult:
+        """Group near-duplicate photos and mark or drop the repeats."""
+        try:
+            # Get configuration - support both nested and direct config patterns
+            config = context.config or {}
+            if "transform" in config:
+                transform_config = config["transform"]
+            else:
+                transform_config = config
+
+            mode = transform_config.get("duplicates", "mark")
+            threshold = transform_config.get("duplicate_threshold", DEFAULT_THRESHOLD)
+
+            if mode not in DUPLICATE_MODES:
+                return PluginResult(
+                    success=False,
+                    output_data={},
+                    errors=[
+                        f"INVALID_DUPLICATES_MODE: duplicates must be one of "
+                        f"{', '.join(DUPLICATE_MODES)}, got {mode!r}"
+                    ],
+                )
+
+            photos = context.input_data.get("photos", [])
+
+            start_time = time.perf_counter()
+            groups = find_duplicate_groups(
+                [photo.get("perceptual_hash") for photo in photos], threshold
+            )
+            cluster_s = time.perf_counter() - start_time
+
+            # Photos outside any group are handed on as they are; grouped
+            # ones get an overlay carrying their marks
+            output_photos = list(photos)
+            dropped = set()
+            for group_id, members in enumerate(groups):
+                for i in members:
+                    output_photos[i] = PhotoRecord(photos[i])
+                representative = output_photos[members[0]]
+                repeats = [output_photos[i] for i in members[1:]]
+                representative["duplicate_group"] = group_id
+                representative["duplicates"] = [p["dest_path"] for p in repeats]
+                for photo in repeats:
+                    photo["duplicate_group"] = group_id
+                    photo["duplicate_of"] = representative["dest_path"]
+                if mode == "collapse":
+                    dropped.update(members[1:])
+
+            if dropped:
+                output_photos = [
+                    photo for i, photo in enumerate(output_photos) if i not in dropped
+                ]
+
+            duplicate_metadata = {
+                "mode": mode,
+                "threshold": threshold,
+                "groups": len(groups),
+                "duplicates": sum(len(members) - 1 for members in groups),
+                "collapsed": len(dropped),
+                "hashed_photos": sum(
+                    1 for photo in photos if photo.get("perceptual_hash")
+                ),
+                "cluster_s": cluster_s,
+            }
+
+            return PluginResult(
+                success=True,
+                output_data={
+                    **context.input_data,
+                    "photos": output_photos,
+                    "duplicate_metadata": duplicate_metadata,
+                },
+            )
+
+        except Exception as e:
+            return PluginResult(
+                success=False,
+                output_data={},
+                errors=[f"DUPLICATE_DETECTION_ERROR: {str(e)}"],
+            )
@@ -1,10 +1,13 @@
 """Pagination plugin implementation for splitting photos into pages."""
 
+from collections.abc import Iterable, Iterator
+
 from .base import PluginContext, PluginResult
 from .interfaces import TransformPlugin
+from .streaming import StreamingPlugin, photo_count
 
 
-class BasicPaginationPlugin(TransformPlugin):
+class BasicPaginationPlugin(TransformPlugin, StreamingPlugin):
     """Basic pagination plugin for splitting photo collections into pages."""
 
     @property
@@ -18,92 +21,138 @@ class BasicPaginationPlugin(TransformPlugin):
     def transform_data(self, context: PluginContext) -> PluginResult:
         """Transform photo data by splitting into paginated pages."""
         try:
-            # Get configuration - support both nested and direct config patterns
-            config = context.config or {}
+            page_size = self._page_size(context)
+            if isinstance(page_size, PluginResult):
+                return page_size
 
-            # Try nested config first (for multi-stage pipelines), fall back to direct access
-            if "transform" in config:
-                transform_config = config["transform"]
-            else:
-                transform_config = config
+            # Split photos into pages
+            photos = context.input_data.get("photos", [])
+            return self._result(
+                context, page_size, len(photos), list(self._pages(photos, page_size))
+            )
 
-            page_size = transform_config.get("page_size", 20)
+        except Exception as e:
+            return PluginResult(
+                success=False, output_data={}, errors=[f"PAGINATION_ERROR: {str(e)}"]
+            )
 
-            # Validate page_size configuration
-            if page_size <= 0:
-                return PluginResult(
-                    success=False,
-                    output_data={},
-                    errors=["INVALID_PAGE_SIZE: page_size must be positive"],
-                )
+    def stream(self, context: PluginContext) -> PluginResult:
+        """Split streamed photos into pages as they arrive.
 
-            if page_size > 500:
-                return PluginResult(
-                    success=False,
-                    output_data={},
-                    errors=["INVALID_PAGE_SIZE: page_size must be <= 500"],
-                )
+        Page layout comes from "photo_count", so page metadata is complete
+        before any photo has been processed. Only the page being filled is
+        held here.
+        """
+        try:
+            page_size = self._page_size(context)
+            if isinstance(page_size, PluginResult):
+                return page_size
 
-            # Get input data
             photos = context.input_data.get("photos", [])
-            collection_name = context.input_data.get("collection_name", "")
+            return self._result(
+                context,
+                page_size,
+                photo_count(context.input_data),
+                self._pages(photos, page_size),
+            )
 
-            # Calculate number of pages needed
-            total_photos = len(photos)
-            total_pages = (
-                (total_photos + page_size - 1) // page_size if total_photos > 0 else 1
+        except Exception as e:
+            return PluginResult(
+                success=False, output_data={}, errors=[f"PAGINATION_ERROR: {str(e)}"]
             )
 
-            # Split photos into pages
-            pages = []
-            if total_photos == 0:
-                # Create one empty page for empty collections
-                pages.append([])
-            else:
-                for i in range(0, len(photos), page_size):
-                    page_photos = photos[i : i + page_size]
-                    pages.append(page_photos)
+    def _page_size(self, context: PluginContext) -> int | PluginResult:
+        """Read and validate page_size, or return the failed result."""
+        # Get configuration - support both nested and direct config patterns
+        config = context.config or {}
 
-            transform_metadata = {
-                "page_size": page_size,
-                "total_pages": total_pages,
-                "total_photos": total_photos,
-            }
+        # Try nested config first (for multi-stage pipelines), fall back to direct access
+        if "transform" in config:
+            transform_config = config["transform"]
+        else:
+            transform_config = config
 
-            # Add page numbers to metadata if there are multiple pages
-            if total_pages > 1:
-                transform_metadata["pagination_enabled"] = True
-                transform_metadata["page_info"] = [
-                    {
-                        "page_number": i + 1,
-                        "photo_count": len(pages[i]),
-                        "start_index": i * page_size,
-                        "end_index": min((i + 1) * page_size - 1, total_photos - 1),
-                    }
-                    for i in range(total_pages)
-                ]
-            else:
-                transform_metadata["pagination_enabled"] = False
+        page_size = transform_config.get("page_size", 20)
 
+        # Validate page_size configuration
+        if page_size <= 0:
             return PluginResult(
-                success=True,
-                output_data={
-                    "pages": pages,
-                    "collection_name": collection_name,
-                    "transform_metadata": transform_metadata,
-                    # Pass through other processor data
-                    **{
-                        k: v
-                        for k, v in context.input_data.items()
-                        if k not in ["photos", "collection_name"]
-                    },
-                },
+                success=False,
+                output_data={},
+                errors=["INVALID_PAGE_SIZE: page_size must be positive"],
             )
 
-        except Exception as e:
+        if page_size > 500:
             return PluginResult(
-                success=False, output_data={}, errors=[f"PAGINATION_ERROR: {str(e)}"]
+                success=False,
+                output_data={},
+                errors=["INVALID_PAGE_SIZE: page_size must be <= 500"],
             )
+        return page_size
+
+    def _pages(self, photos: Iterable[dict], page_size: int) -> Iterator[list[dict]]:
+        """Yield pages of page_size photos; one empty page for no photos."""
+        page = []
+        yielded = False
+        for photo in photos:
+            page.append(photo)
+            if len(page) == page_size:
+                yield page
+                yielded = True
+                page = []
+        if page or not yielded:
+            yield page
+
+    def _result(
+        self,
+        context: PluginContext,
+        page_size: int,
+        total_photos: int,
+        pages: list[list[dict]] | Iterator[list[dict]],
+    ) -> PluginResult:
+        """Build the pagination output around pages (a list or a stream)."""
+        collection_name = context.input_data.get("collection_name", "")
+
+        # Calculate number of pages needed
+        total_pages = (
+            (total_photos + page_size - 1) // page_size if total_photos > 0 else 1
+        )
+
+        transform_metadata = {
+            "page_size": page_size,
+            "total_pages": total_pages,
+            "total_photos": total_photos,
+        }
+
+        # Add page numbers to metadata if there are multiple pages
+        if total_pages > 1:
+            transform_metadata["pagination_enabled"] = True
+            transform_metadata["page_info"] = [
+                {
+                    "page_number": i + 1,
+                    "photo_count": min(page_size, total_photos - i * page_size),
+                    "start_index": i * page_size,
+                    "end_index": min((i + 1) * page_size - 1, total_photos - 1),
+                }
+                for i in range(total_pages)
+            ]
+        else:
+            transform_metadata["pagination_enabled"] = False
+
+        return PluginResult(
+            success=True,
+            output_data={
+                "pages": pages,
+                "collection_name": collection_name,
+                "transform_metadata": transform_metadata,
+                # Pass through other processor data
+                **{
+                    k: v
+                    for k, v in context.input_data.items()
+                    if k not in ["photos", "collection_name"]
+                },
+            },
+        )
 
 
 class SmartPaginationPlugin(TransformPlugin):
@@ -1,125 +1,521 @@
-"""Thumbnail processor plugin for generating optimized WebP thumbnails from photo collections."""
+"""Thumbnail processor plugin for generating optimized thumbnails from photo collections."""
 
-import copy
-import time
-from concurrent.futures import ProcessPoolExecutor, as_completed
+import itertools
+import json
+import math
+import os
+import queue
+import threading
+from concurrent.futures import Executor, Future
+from dataclasses import replace
 from pathlib import Path
 
 from galleria.benchmark import ThumbnailBenchmark
 from galleria.plugins.base import PluginContext, PluginResult
+from galleria.plugins.exceptions import PluginExecutionError
 from galleria.plugins.interfaces import ProcessorPlugin
-from galleria.processor.image import ImageProcessingError, ImageProcessor
+from galleria.plugins.records import PhotoRecord
+from galleria.plugins.streaming import StreamClosed, StreamingPlugin, photo_count
+from galleria.processor.cache import (
+    LAZY_MANIFEST_NAME,
+    CacheStatus,
+    ThumbnailCache,
+    atomic_output,
+    encoding_fingerprint,
+)
+from galleria.processor.crop import CROP_MODES
+from galleria.processor.dimensions import DimensionProbeError, probe_dimensions
+from galleria.processor.dispatch import TaskDispatcher
+from galleria.processor.duplicates import HASH_ALGORITHMS
+from galleria.processor.encoders import get_encoder
+from galleria.processor.image import (
+    DEFAULT_MAX_IMAGE_PIXELS,
+)
+from galleria.processor.pool import WorkerPool
+from galleria.processor.quality import (
+    DEFAULT_MAX_QUALITY,
+    DEFAULT_MIN_QUALITY,
+    DEFAULT_TARGET_SSIM,
+)
+from galleria.processor.upgrade import PreviewUpgrader, UpgradeCancelled
+from galleria.processor.worker import (
+    BatchParams,
+    WorkResult,
+    derivative_names,
+    process_batch,
+)
+from galleria.util.reorder import ReorderBuffer
 
+# Executor modes: worker processes, threads (Pillow releases the GIL while
+# decoding, resizing and encoding), a shared-directory queue served by
+# `galleria worker` on other machines, or in-process sequential
+EXECUTOR_MODES = ("process", "thread", "distributed", "serial")
 
-def _process_single_photo(
+# Parallel dispatch modes: compact chunked work items or one future per photo
+DISPATCH_MODES = ("batched", "photo")
+
+# Decoded-size threshold above which a worker serialises the decode with the
+# other workers (large panoramas); None or 0 disables the guard
+DEFAULT_WORKER_MEMORY_LIMIT_MB = 256
+
+# Per-photo budget of a parallel task before its pool is killed and
+# respawned, and how often a photo is retried after a timeout or crash
+DEFAULT_PHOTO_TIMEOUT_S = 120
+DEFAULT_MAX_RETRIES = 1
+
+# Submission order for parallel work: manifest order, largest first by file
+# size ("bytes", from the manifest) or header-probed pixel count, or page by
+# page in pagination order with the largest photos of each page first
+SCHEDULE_MODES = ("manifest", "largest-first", "page")
+SCHEDULE_WEIGHTS = ("bytes", "pixels")
+
+# Misses the largest-first schedule sorts at a time (at least the parallel
+# window's photos); results wait in the reorder buffer for at most about
+# this many photos, however large the collection
+LARGEST_FIRST_WINDOW = 256
+
+# Upper bound on photos per batch so progress and load balancing stay smooth
+MAX_BATCH_SIZE = 64
+
+# Web photos (pics/web): long edge, quality and encoder. Progressive JPEG
+# renders a full-frame preview early on slow connections
+DEFAULT_WEB_PHOTO_SIZE = 2048
+DEFAULT_WEB_PHOTO_QUALITY = 85
+WEB_PHOTO_FORMAT = "jpeg"
+
+# Hook run for every completed photo (cache hits included), for live progress
+ITEM_HOOK = "processor_item"
+
+# Hook run as each photo is released in manifest order, for early page writes
+RELEASE_HOOK = "processor_release"
+
+# Pagination's own default, for page scheduling without a transform config
+DEFAULT_PAGE_SIZE = 20
+
+# Seconds between checks of a streamed run whose consumer is behind
+STREAM_POLL_S = 0.1
+
+
+def _page_size(config: dict) -> int:
+    """Return the pagination stage's page size from a pipeline config."""
+    transform_config = config.get("transform") or config.get("processor") or config
+    return transform_config.get("page_size", DEFAULT_PAGE_SIZE)
+
+
+def _default_web_dir(output_dir: Path) -> Path:
+    """Place web photos in ``pics/web`` under the site's ``output`` root.
+
+    Uses the same ``output`` path component that URL routing strips, so
+    files land where their links point; falls back to the gallery's own
+    output directory when no such component exists.
+    """
+    parts = Path(output_dir).parts
+    if "output" in parts:
+        return Path(*parts[: parts.index("output") + 1]) / "pics" / "web"
+    return Path(output_dir) / "pics" / "web"
+
+
+def _auto_batch_size(item_count: int, max_workers: int | None) -> int:
+    """Pick a chunk size giving each worker about four batches.
+
+    Args:
+        item_count: Number of photos to dispatch
+        max_workers: Configured worker count (None means os.cpu_count())
+
+    Returns:
+        Photos per batch, between 1 and MAX_BATCH_SIZE
+    """
+    workers = max_workers or os.cpu_count() or 1
+    return max(1, min(MAX_BATCH_SIZE, math.ceil(item_count / (workers * 4))))
+
+
+def _merge_work_result(
     photo: dict,
+    work_result: WorkResult,
     thumbnails_dir: Path,
     thumbnail_size: int,
-    quality: int,
     output_format: str,
-    use_cache: bool,
-    collect_timing: bool = False,
+    collect_timing: bool,
+) -> PhotoRecord:
+    """Merge a compact worker result back into an overlay of its photo.
+
+    Every executor and dispatch mode builds its photo records here.
+    """
+    processed_photo = PhotoRecord(photo)
+
+    if work_result.error is not None:
+        processed_photo["error"] = work_result.error
+    else:
+        thumbnail_name = Path(photo["dest_path"]).stem + f".{output_format}"
+        processed_photo["thumbnail_path"] = str(thumbnails_dir / thumbnail_name)
+        processed_photo["thumbnail_size"] = work_result.thumbnail_dims or (
+            thumbnail_size,
+            thumbnail_size,
+        )
+        processed_photo["cached"] = work_result.cached
+        if work_result.thumbnails is not None:
+            processed_photo["thumbnails"] = [
+                {"size": size, "path": str(thumbnails_dir / name)}
+                for size, name in work_result.thumbnails
+            ]
+        if work_result.web is not None:
+            web_name, web_width, web_height = work_result.web
+            processed_photo["web_path"] = os.path.normpath(thumbnails_dir / web_name)
+            processed_photo["web_size"] = (web_width, web_height)
+        if work_result.sources is not None:
+            processed_photo["sources"] = [
+                _photo_source(
+                    image_format,
+                    mime_type,
+                    {size: thumbnails_dir / name for size, name in names},
+                    thumbnail_size,
+                )
+                for image_format, mime_type, names in work_result.sources
+            ]
+        if work_result.quality is not None:
+            processed_photo["thumbnail_quality"] = work_result.quality
+        if work_result.crop_box is not None:
+            processed_photo["crop_box"] = list(work_result.crop_box)
+        if work_result.perceptual_hash is not None:
+            processed_photo["perceptual_hash"] = work_result.perceptual_hash
+        if work_result.placeholder is not None:
+            lqip, color, placeholder_s = work_result.placeholder
+            processed_photo["lqip"] = lqip
+            processed_photo["dominant_color"] = color
+            if collect_timing:
+                processed_photo["_placeholder_s"] = placeholder_s
+
+    if collect_timing:
+        processed_photo["_timing_s"] = work_result.timing_s
+        if work_result.error is None:
+            processed_photo["_output_bytes"] = work_result.output_bytes
+    return processed_photo
+
+
+def _photo_source(
+    image_format: str, mime_type: str, paths: dict[int, Path], thumbnail_size: int
 ) -> dict:
+    """Build a photo's ``sources`` entry for one alternate format.
+
+    Args:
+        image_format: Alternate format extension (e.g. "avif")
+        mime_type: MIME type for ``<source type=...>``
+        paths: Square size in pixels to written file path
+        thumbnail_size: Primary thumbnail size
+
+    Returns:
+        Dict with format, type, path (primary size) and ascending thumbnails
+    """
+    return {
+        "format": image_format,
+        "type": mime_type,
+        "path": str(paths[thumbnail_size]),
+        "thumbnails": [
+            {"size": size, "path": str(path)} for size, path in sorted(paths.items())
+        ],
+    }
+
+
+def _cache_fields(processed_photo: dict) -> tuple[list[str] | None, dict | None]:
+    """Extract derivative files and restorable fields for the cache index.
+
+    Paths are stored as names relative to the thumbnails directory.
+
+    Returns:
+        Tuple of (file names required for a hit, fields to restore), both None
+        when the photo only has the primary thumbnail
+    """
+    if not any(
+        k in processed_photo
+        for k in (
+            "thumbnails",
+            "web_path",
+            "sources",
+            "thumbnail_quality",
+            "lqip",
+            "crop_box",
+            "perceptual_hash",
+        )
+    ):
+        return None, None
+
+    fields = {}
+    files = [Path(processed_photo["thumbnail_path"]).name]
+    if "thumbnails" in processed_photo:
+        fields["thumbnails"] = [
+            {"size": t["size"], "name": Path(t["path"]).name}
+            for t in processed_photo["thumbnails"]
+        ]
+        files = [t["name"] for t in fields["thumbnails"]]
+    if "web_path" in processed_photo:
+        # Relative to the thumbnails directory: web photos live in pics/web
+        fields["web_name"] = Path(
+            os.path.relpath(
+                processed_photo["web_path"],
+                Path(processed_photo["thumbnail_path"]).parent,
+            )
+        ).as_posix()
+        fields["web_size"] = list(processed_photo["web_size"])
+        files.append(fields["web_name"])
+    if "sources" in processed_photo:
+        fields["sources"] = [
+            {
+                "format": source["format"],
+                "type": source["type"],
+                "thumbnails": [
+                    {"size": t["size"], "name": Path(t["path"]).name}
+                    for t in source["thumbnails"]
+                ],
+            }
+            for source in processed_photo["sources"]
+        ]
+        files.extend(
+            t["name"] for source in fields["sources"] for t in source["thumbnails"]
+        )
+    if "thumbnail_quality" in processed_photo:
+        fields["thumbnail_quality"] = processed_photo["thumbnail_quality"]
+    if "crop_box" in processed_photo:
+        fields["crop_box"] = processed_photo["crop_box"]
+    if "perceptual_hash" in processed_photo:
+        fields["perceptual_hash"] = processed_photo["perceptual_hash"]
+    if "lqip" in processed_photo:
+        fields["lqip"] = processed_photo["lqip"]
+        fields["dominant_color"] = processed_photo["dominant_color"]
+    return files, fields
+
+
+def _restore_cache_fields(
+    photo: dict, fields: dict, thumbnails_dir: Path, thumbnail_size: int
+) -> None:
+    """Restore derivative fields recorded by _cache_fields onto a photo dict."""
+    if "thumbnails" in fields:
+        photo["thumbnails"] = [
+            {"size": t["size"], "path": str(thumbnails_dir / t["name"])}
+            for t in fields["thumbnails"]
+        ]
+    if "web_name" in fields:
+        photo["web_path"] = os.path.normpath(thumbnails_dir / fields["web_name"])
+        photo["web_size"] = tuple(fields["web_size"])
+    if "sources" in fields:
+        photo["sources"] = [
+            _photo_source(
+                source["format"],
+                source["type"],
+                {t["size"]: thumbnails_dir / t["name"] for t in source["thumbnails"]},
+                thumbnail_size,
+            )
+            for source in fields["sources"]
+        ]
+    if "thumbnail_quality" in fields:
+        photo["thumbnail_quality"] = fields["thumbnail_quality"]
+    if "crop_box" in fields:
+        photo["crop_box"] = fields["crop_box"]
+    if "perceptual_hash" in fields:
+        photo["perceptual_hash"] = fields["perceptual_hash"]
+    if "lqip" in fields:
+        photo["lqip"] = fields["lqip"]
+        photo["dominant_color"] = fields["dominant_color"]
+
+
+def _attach_dimensions(photo: dict, cache: ThumbnailCache | None) -> None:
+    """Set the original's width, height and aspect_ratio on a photo dict.
+
+    Dimensions come from the cache index by content hash when known,
+    otherwise from a header-only probe of the source, so later stages (e.g.
+    layout) get aspect ratios without any image being decoded.
+    """
+    content_hash = photo.get("metadata", {}).get("hash")
+    dims = cache.get_dimensions(content_hash) if cache is not None else None
+    if dims is None:
+        try:
+            dims = probe_dimensions(photo["source_path"])
+        except DimensionProbeError:
+            return
+        if cache is not None:
+            cache.record_dimensions(content_hash, dims)
+
+    width, height = dims
+    photo["width"] = width
+    photo["height"] = height
+    photo["aspect_ratio"] = round(width / height, 4)
+
+
+def _failed_photo(photo: dict, reason: str) -> PhotoRecord:
+    """Return an overlay of a photo carrying a processing error."""
+    failed = PhotoRecord(photo)
+    failed["error"] = f"Failed to process {photo['source_path']}: {reason}"
+    return failed
+
+
+def _lazy_photo(
+    photo: dict,
+    thumbnails_dir: Path,
+    thumbnail_size: int,
+    thumbnail_sizes: tuple[int, ...],
+    output_format: str,
+) -> PhotoRecord:
+    """Describe a photo's thumbnails without rendering them (lazy dev builds).
+
+    Only the square thumbnails are listed; the dev server renders them, and
+    the photo's other derivatives, when one is first requested. Fields that
+    need the pixels (placeholders, hashes, alternates, web photos) are left
+    out until a full build.
+    """
+    lazy_photo = PhotoRecord(photo)
+    names = derivative_names(
+        Path(photo["dest_path"]).stem, thumbnail_size, thumbnail_sizes, output_format
+    )
+    lazy_photo["thumbnail_path"] = str(thumbnails_dir / names[thumbnail_size])
+    lazy_photo["thumbnail_size"] = (thumbnail_size, thumbnail_size)
+    lazy_photo["cached"] = False
+    if thumbnail_sizes:
+        lazy_photo["thumbnails"] = [
+            {"size": size, "path": str(thumbnails_dir / name)}
+            for size, name in sorted(names.items())
+        ]
+    lazy_photo["_lazy"] = True
+    return lazy_photo
+
+
+def _write_lazy_manifest(
+    thumbnails_dir: Path, config: dict, collection_name: str, photos: list[dict]
+) -> None:
+    """Record the photos a lazy build did not render, for the dev server.
+
+    Maps every square thumbnail name to its photo, so a request for any size
+    renders the whole photo once with ``config``. Paths are made absolute
+    because the server runs from the output directory. Without lazy photos
+    the manifest is removed.
+    """
+    manifest_path = thumbnails_dir / LAZY_MANIFEST_NAME
+    if not photos:
+        manifest_path.unlink(missing_ok=True)
+        return
+
+    files = {}
+    for lazy_photo in photos:
+        for path in [lazy_photo["thumbnail_path"]] + [
+            item["path"] for item in lazy_photo.get("thumbnails", ())
+        ]:
+            files[Path(path).name] = Path(lazy_photo["dest_path"]).stem
+    if config.get("web_dir"):
+        config = {**config, "web_dir": os.path.abspath(config["web_dir"])}
+    manifest = {
+        "collection_name": collection_name,
+        "config": config,
+        "files": files,
+        "photos": {
+            Path(lazy_photo["dest_path"]).stem: {
+                "source_path": os.path.abspath(lazy_photo["source_path"]),
+                "dest_path": lazy_photo["dest_path"],
+                "metadata": lazy_photo.get("metadata", {}),
+            }
+            for lazy_photo in photos
+        },
+    }
+    with atomic_output(manifest_path) as tmp_path:
+        tmp_path.write_text(
+            json.dumps(manifest, sort_keys=True, default=str), encoding="utf-8"
+        )
+
+
+def _process_single_photo(
+    photo: dict,
+    params: BatchParams,
+    use_cache: bool,
+    known_quality: int | None = None,
+    known_crop: tuple[float, ...] | None = None,
+) -> PhotoRecord:
     """Process a single photo to generate a thumbnail.
 
     This is a standalone function (not a method) to enable pickling
-    for ProcessPoolExecutor parallel processing.
+    for ProcessPoolExecutor parallel processing. It renders through the
+    worker's batch code as a batch of one, so every executor writes the
+    same files and fields.
 
     Args:
         photo: Photo dict with source_path, dest_path, metadata
-        thumbnails_dir: Directory to write thumbnails to
-        thumbnail_size: Target thumbnail size in pixels
-        quality: WebP quality (0-100)
-        output_format: Output format (e.g., "webp")
-        use_cache: Whether to use cached thumbnails
-        collect_timing: Whether to collect timing/size metrics
+        params: Encoding settings, as for a batch
+        use_cache: Whether to reuse an existing thumbnail newer than the
+            source (the legacy mtime check)
+        known_quality: Quality an earlier search chose for this photo; used
+            instead of searching again
+        known_crop: Crop box an earlier run chose for this photo; used
+            instead of scoring the image again
 
     Returns:
-        Dict with processed photo data including:
+        PhotoRecord with processed photo data including:
             - All original photo fields
             - thumbnail_path: Path to generated thumbnail
             - thumbnail_size: Tuple of (width, height)
             - cached: Whether thumbnail was from cache
+            - thumbnails: [{"size", "path"}] ascending (if a ladder is configured)
+            - web_path / web_size: Web derivative (if web_size is set)
+            - sources: [{"format", "type", "path", "thumbnails"}] alternates
+            - thumbnail_quality: Quality chosen by the search (if target_ssim)
+            - lqip / dominant_color: Inline placeholder (if placeholder)
+            - crop_box: Normalised smart crop box (if crop is not "center")
+            - perceptual_hash: Hex hash (if perceptual_hash is set)
             - error: Error message if processing failed (optional)
-            - _timing_s: Processing time in seconds (if collect_timing=True)
-            - _output_bytes: Output file size in bytes (if collect_timing=True)
+            - _timing_s: Processing time in seconds (if params.collect_timing)
+            - _output_bytes: Output file size in bytes (if params.collect_timing)
+            - _placeholder_s: Placeholder time in seconds (if both are enabled)
     """
-    # Create image processor instance
-    processor = ImageProcessor()
-    start_time = time.perf_counter() if collect_timing else 0.0
-
     try:
-        # Copy original photo data to preserve it
-        processed_photo = copy.deepcopy(photo)
-
-        # Extract paths
-        source_path = Path(photo["source_path"])
-        dest_path_obj = Path(photo["dest_path"])
-        thumbnail_name = dest_path_obj.stem + f".{output_format}"
-        thumbnail_path = thumbnails_dir / thumbnail_name
-
-        # Check caching if enabled
-        if use_cache and thumbnail_path.exists():
-            if not processor.should_process(source_path, thumbnail_path):
-                # Use cached thumbnail
-                processed_photo["thumbnail_path"] = str(thumbnail_path)
-                processed_photo["thumbnail_size"] = (thumbnail_size, thumbnail_size)
-                processed_photo["cached"] = True
-                # Add timing data for cached files
-                if collect_timing:
-                    processed_photo["_timing_s"] = time.perf_counter() - start_time
-                    processed_photo["_output_bytes"] = thumbnail_path.stat().st_size
-                return processed_photo
-
-        # Process thumbnail
-        try:
-            result_path = processor.process_image(
-                source_path=source_path,
-                output_dir=thumbnails_dir,
-                size=thumbnail_size,
-                quality=quality,
-                output_name=thumbnail_name,
-            )
-
-            # Add processor data to photo
-            processed_photo["thumbnail_path"] = str(result_path)
-            processed_photo["thumbnail_size"] = (thumbnail_size, thumbnail_size)
-            processed_photo["cached"] = False
-
-            # Add timing data
-            if collect_timing:
-                processed_photo["_timing_s"] = time.perf_counter() - start_time
-                processed_photo["_output_bytes"] = result_path.stat().st_size
-
-        except ImageProcessingError as e:
-            # Individual photo processing failed
-            processed_photo["error"] = f"Failed to process {source_path}: {e}"
-            if collect_timing:
-                processed_photo["_timing_s"] = time.perf_counter() - start_time
-
-        except Exception as e:
-            # Unexpected error
-            processed_photo["error"] = f"Unexpected error processing {source_path}: {e}"
-            if collect_timing:
-                processed_photo["_timing_s"] = time.perf_counter() - start_time
-
-        return processed_photo
-
+        item = (
+            0,
+            str(photo["source_path"]),
+            Path(photo["dest_path"]).stem,
+            use_cache,
+            known_quality,
+            known_crop,
+        )
     except Exception as e:
         # Error processing individual photo metadata
-        error_photo = copy.deepcopy(photo)
+        error_photo = PhotoRecord(photo)
         error_photo["error"] = f"Error processing photo metadata: {e}"
         return error_photo
 
+    (work_result,) = process_batch(params, [item])
+    return _merge_work_result(
+        photo,
+        work_result,
+        Path(params.thumbnails_dir),
+        params.thumbnail_size,
+        params.output_format,
+        params.collect_timing,
+    )
 
-class ThumbnailProcessorPlugin(ProcessorPlugin):
+
+class ThumbnailProcessorPlugin(ProcessorPlugin, StreamingPlugin):
     """Processor plugin for generating thumbnails from photo collections.
 
     Converts existing galleria.processor.image functionality to ProcessorPlugin
     contract format. Takes ProviderPlugin output and generates WebP thumbnails
     with proper caching and error handling.
+
+    Parallel runs use a temporary process pool unless a long-lived WorkerPool
+    is supplied, in which case its warm workers are reused across calls.
+
+    With a PreviewUpgrader, dev builds (a ``build_context`` in the metadata
+    whose ``production`` is False) write quick previews and leave the
+    full-quality pass to the upgrader's background thread.
     """
 
+    def __init__(
+        self,
+        worker_pool: WorkerPool | None = None,
+        upgrader: PreviewUpgrader | None = None,
+    ):
+        """Initialize ThumbnailProcessorPlugin.
+
+        Args:
+            worker_pool: Shared pool owned by the caller (never shut down here)
+            upgrader: Background upgrader for dev-mode previews (owned by caller)
+        """
+        self.worker_pool = worker_pool
+        self.upgrader = upgrader
+
     @property
     def name(self) -> str:
         """Plugin name identifier."""
@@ -130,6 +526,175 @@ class ThumbnailProcessorPlugin(ProcessorPlugin):
         """Plugin version."""
         return "1.0.0"
 
+    def _resolve_cache(
+        self,
+        photo: dict,
+        cache: ThumbnailCache | None,
+        thumbnails_dir: Path,
+        thumbnail_size: int,
+        output_format: str,
+        fingerprint: str,
+        collect_timing: bool,
+        has_derivatives: bool = False,
+        preview_fingerprint: str | None = None,
+    ) -> tuple[PhotoRecord | None, bool]:
+        """Resolve a photo against the content-hash cache index.
+
+        Args:
+            photo: Photo dict from the provider
+            cache: Loaded ThumbnailCache, or None when caching is disabled
+            thumbnails_dir: Directory thumbnails are written to
+            thumbnail_size: Target thumbnail size in pixels
+            output_format: Output format extension
+            fingerprint: Encoding fingerprint for the current settings
+            collect_timing: Whether to attach benchmark fields to cache hits
+            has_derivatives: Whether photos get more than the primary
+                thumbnail (BatchParams.has_derivatives)
+            preview_fingerprint: Also accept dev-mode previews rendered with
+                this fingerprint (they are marked ``_preview``)
+
+        Returns:
+            Tuple of (cached photo record or None, whether the worker should fall
+            back to the legacy mtime check). The mtime fallback only applies to
+            photos without an index entry, e.g. thumbnails from older builds,
+            which never carried a derivative ladder.
+        """
+        if cache is None:
+            return None, False
+
+        thumbnail_name = Path(photo["dest_path"]).stem + f".{output_format}"
+        content_hash = photo.get("metadata", {}).get("hash")
+        status = cache.lookup(thumbnail_name, content_hash, fingerprint)
+        is_preview = (
+            status is CacheStatus.STALE
+            and preview_fingerprint is not None
+            and cache.lookup(thumbnail_name, content_hash, preview_fingerprint)
+            is CacheStatus.HIT
+        )
+        if is_preview:
+            status = CacheStatus.HIT
+
+        if status is CacheStatus.UNKNOWN:
+            return None, not has_derivatives
+        if status is CacheStatus.STALE:
+            return None, False
+
+        cached_photo = PhotoRecord(photo)
+        cached_photo["thumbnail_path"] = str(thumbnails_dir / thumbnail_name)
+        cached_photo["thumbnail_size"] = (thumbnail_size, thumbnail_size)
+        cached_photo["cached"] = True
+        if is_preview:
+            cached_photo["_preview"] = True
+        _restore_cache_fields(
+            cached_photo,
+            cache.get(thumbnail_name).get("fields", {}),
+            thumbnails_dir,
+            thumbnail_size,
+        )
+        if collect_timing:
+            cached_photo["_timing_s"] = 0.0
+            cached_photo["_output_bytes"] = cache.get(thumbnail_name).get("bytes", 0)
+            cached_photo["_resumed"] = thumbnail_name in cache.resumed
+        return cached_photo, False
+
+    def _schedule_upgrade(self, context: PluginContext) -> None:
+        """Hand the full-quality pass over this collection to the upgrader.
+
+        The pass is a production run of a separate plugin instance (without
+        the upgrader, so it cannot cancel itself). Preview cache entries
+        carry their own fingerprint, so it re-renders exactly the previews;
+        every file is replaced atomically while the server keeps serving.
+        It stops between photos when a newer build cancels it, and the
+        cache journal keeps what it finished.
+
+        Args:
+            context: Context of the dev build that wrote the previews
+        """
+        plugin = ThumbnailProcessorPlugin(self.worker_pool)
+        upgrade_context = PluginContext(
+            # Photos are never modified in place (later stages overlay
+            # them), so the pass needs its own list but not its own photos
+            input_data={
+                **context.input_data,
+                "photos": list(context.input_data.get("photos", [])),
+            },
+            config=context.config,
+            output_dir=context.output_dir,
+        )
+
+        def upgrade(check_cancelled) -> None:
+            upgrade_context.metadata["progress_callback"] = (
+                lambda *_: check_cancelled()
+            )
+            plugin.process_thumbnails(upgrade_context)
+
+        self.upgrader.submit(upgrade)
+
+    def stream(self, context: PluginContext) -> PluginResult:
+        """Yield processed photos in manifest order as input photos arrive.
+
+        process_thumbnails runs in a background thread and hands each
+        released photo to a queue holding one page. The thread waits while
+        the next stage is behind, so memory stays at about a page plus the
+        parallel window. Nothing runs until the first photo is requested,
+        and closing the iterator early stops the thread. Per-photo errors
+        stay on the photos; a fatal error is raised from the iterator. Dev
+        previews are off, since their upgrade pass needs the photo list.
+
+        Args:
+            context: Plugin execution context as for process_thumbnails(),
+                with "photos" as any iterable and a "photo_count"
+
+        Returns:
+            PluginResult whose "photos" is an iterator
+        """
+        released: queue.Queue = queue.Queue(
+            maxsize=max(1, _page_size(context.config or {}))
+        )
+        closed = threading.Event()
+
+        def put(item: dict | PluginResult) -> None:
+            """Queue an item, giving up once the consumer has gone."""
+            while not closed.is_set():
+                try:
+                    released.put(item, timeout=STREAM_POLL_S)
+                    return
+                except queue.Full:
+                    continue
+            raise StreamClosed()
+
+        def run() -> None:
+            metadata = {**(context.metadata or {}), "photo_sink": put}
+            try:
+                put(self.process_thumbnails(replace(context, metadata=metadata)))
+            except StreamClosed:
+                # The consumer has gone; nothing is waiting for the rest
+                pass
+
+        def photos():
+            thread = threading.Thread(
+                target=run, name="galleria-stream-processor", daemon=True
+            )
+            thread.start()
+            try:
+                while True:
+                    item = released.get()
+                    if isinstance(item, PluginResult):
+                        if not item.success:
+                            raise PluginExecutionError(
+                                "; ".join(item.errors), self.name
+                            )
+                        return
+                    yield item
+            finally:
+                closed.set()
+                thread.join()
+
+        output_data = {k: v for k, v in context.input_data.items() if k != "photos"}
+        output_data["photos"] = photos()
+        output_data["photo_count"] = photo_count(context.input_data)
+        return PluginResult(success=True, output_data=output_data)
+
     def process_thumbnails(self, context: PluginContext) -> PluginResult:
         """Generate thumbnails for photo collection from provider data.
 
@@ -138,9 +703,26 @@ class ThumbnailProcessorPlugin(ProcessorPlugin):
                 - input_data: ProviderPlugin output with photos array
                 - config: Processor configuration (thumbnail_size, quality, etc.)
                 - output_dir: Target output directory
+                - metadata: Optional "progress_callback"(completed, total,
+                  source_path), called as each photo completes, and
+                  "build_context"; a non-production context switches to
+                  quick previews when the plugin has an upgrader, or with
+                  "lazy_thumbnails" leaves misses to the dev server. A
+                  "photo_sink"(photo) takes released photos instead of the
+                  output list (see stream())
+                - hooks: Optional PluginHookManager; its "processor_item"
+                  hooks get {"photo", "completed", "total"} per completed photo
+                  and its "processor_release" hooks {"photo", "released",
+                  "total"} per photo released in manifest order
 
         Returns:
-            PluginResult with success/failure and processed photo data
+            PluginResult with success/failure and processed photo data. Photos
+            keep input order in both sequential and parallel mode.
+
+        Raises:
+            UpgradeCancelled: From the progress_callback of a cancelled
+                preview upgrade; tasks not yet started are cancelled
+            StreamClosed: From the photo_sink once the stream is closed
 
         Expected input format (ProviderPlugin output):
         {
@@ -167,7 +749,19 @@ class ThumbnailProcessorPlugin(ProcessorPlugin):
                     # New processor data
                     "thumbnail_path": str,
                     "thumbnail_size": tuple,
-                    "cached": bool  # Optional, indicates if thumbnail was cached
+                    "cached": bool,  # Optional, indicates if thumbnail was cached
+                    "thumbnails": [{"size": int, "path": str}],  # If thumbnail_sizes
+                    "web_path": str,  # If web_size is configured
+                    "web_size": tuple,  # (width, height) of web derivative
+                    "sources": [...],  # If alternate_formats is configured
+                    "thumbnail_quality": int,  # If adaptive_quality is enabled
+                    "lqip": str,  # If placeholders is enabled
+                    "dominant_color": str,  # If placeholders is enabled
+                    "width": int,  # Original display width (header probe)
+                    "height": int,  # Original display height (header probe)
+                    "aspect_ratio": float,  # width / height
+                    "crop_box": list,  # Normalised smart crop box (if crop set)
+                    "perceptual_hash": str,  # If perceptual_hash is set
                 },
                 ...
             ],
@@ -211,11 +805,130 @@ class ThumbnailProcessorPlugin(ProcessorPlugin):
             thumbnail_size = processor_config.get("thumbnail_size", 400)
             quality = processor_config.get("quality", 85)
             use_cache = processor_config.get("use_cache", True)
-            output_format = processor_config.get("output_format", "webp")
+            # Resolve format names (e.g. "jpeg") to file extensions up front so
+            # an unsupported format fails the stage before any work starts
+            output_format = get_encoder(
+                processor_config.get("output_format", "webp")
+            ).extension
+            alternate_formats = tuple(
+                dict.fromkeys(
+                    get_encoder(name).extension
+                    for name in processor_config.get("alternate_formats", ())
+                    if get_encoder(name).extension != output_format
+                )
+            )
+            smallest_wins = processor_config.get("smallest_wins", False)
+            format_quality = processor_config.get("format_quality") or None
+            reduced_decode = processor_config.get("reduced_decode", True)
+
+            # Adaptive quality: search the lowest quality meeting an SSIM target
+            # per photo instead of using one global quality
+            target_ssim = (
+                processor_config.get("target_ssim", DEFAULT_TARGET_SSIM)
+                if processor_config.get("adaptive_quality", False)
+                else None
+            )
+            quality_range = (
+                processor_config.get("min_quality", DEFAULT_MIN_QUALITY),
+                processor_config.get("max_quality", DEFAULT_MAX_QUALITY),
+            )
+
+            # Inline placeholders (LQIP + dominant colour) for the templates
+            placeholders = processor_config.get("placeholders", False)
+
+            # Square crop: fixed centre or content-aware window
+            crop = processor_config.get("crop", "center")
+            if crop not in CROP_MODES:
+                raise ValueError(f"Unknown crop mode: {crop!r}")
 
+            # Perceptual hash for near-duplicate detection downstream
+            perceptual_hash = processor_config.get("perceptual_hash")
+            if perceptual_hash is not None and perceptual_hash not in HASH_ALGORITHMS:
+                raise ValueError(
+                    f"Unknown perceptual hash algorithm: {perceptual_hash!r}"
+                )
+
+            # Responsive derivative options
+            thumbnail_sizes = tuple(sorted(processor_config.get("thumbnail_sizes", ())))
+            web_size = processor_config.get("web_size")
+
+            # Web photos: a full-view derivative in its own tree (pics/web)
+            # for gallery links, instead of the camera original
+            web_dir = None
+            web_format = None
+            web_quality = None
+            if processor_config.get("web_photos", False):
+                web_size = web_size or DEFAULT_WEB_PHOTO_SIZE
+                web_dir = Path(
+                    processor_config.get("web_dir")
+                    or _default_web_dir(context.output_dir)
+                )
+                web_format = WEB_PHOTO_FORMAT
+                web_quality = processor_config.get(
+                    "web_quality", DEFAULT_WEB_PHOTO_QUALITY
+                )
             # Parallel processing options
             parallel = processor_config.get("parallel", False)
+            executor_mode = processor_config.get(
+                "executor", "process" if parallel else "serial"
+            )
             max_workers = processor_config.get("max_workers", None)
+            dispatch = processor_config.get("dispatch", "batched")
+            batch_size = processor_config.get("batch_size", None)
+            max_in_flight = processor_config.get("max_in_flight", None)
+            worker_memory_limit_mb = processor_config.get(
+                "worker_memory_limit_mb", DEFAULT_WORKER_MEMORY_LIMIT_MB
+            )
+            photo_timeout_s = processor_config.get(
+                "photo_timeout_s", DEFAULT_PHOTO_TIMEOUT_S
+            )
+            max_retries = processor_config.get("max_retries", DEFAULT_MAX_RETRIES)
+            max_image_pixels = processor_config.get(
+                "max_image_pixels", DEFAULT_MAX_IMAGE_PIXELS
+            )
+            schedule = processor_config.get("schedule", "manifest")
+            schedule_weight = processor_config.get("schedule_weight", "bytes")
+            if executor_mode not in EXECUTOR_MODES:
+                raise ValueError(f"Unknown executor mode: {executor_mode!r}")
+            if executor_mode == "distributed" and not processor_config.get(
+                "queue_dir"
+            ):
+                raise ValueError("The distributed executor requires queue_dir")
+            if max_retries < 1:
+                raise ValueError("max_retries must be at least 1")
+            if executor_mode == "thread" and processor_config.get("photo_timeout_s"):
+                # A hung thread cannot be killed, only abandoned still running
+                raise ValueError(
+                    "photo_timeout_s needs the process executor; "
+                    "thread tasks cannot be killed"
+                )
+            if schedule not in SCHEDULE_MODES:
+                raise ValueError(f"Unknown schedule: {schedule!r}")
+            if schedule_weight not in SCHEDULE_WEIGHTS:
+                raise ValueError(f"Unknown schedule weight: {schedule_weight!r}")
+            if dispatch not in DISPATCH_MODES:
+                raise ValueError(f"Unknown dispatch mode: {dispatch!r}")
+            # Page scheduling follows the pagination stage's pages
+            page_size = _page_size(config)
+            if schedule == "page" and page_size <= 0:
+                raise ValueError("page_size must be positive")
+
+            # Dev server: render nothing and let the server render thumbnails
+            # when first requested, or quick previews now and full quality in
+            # the background. A streamed run keeps no photo list to upgrade
+            build_context = (context.metadata or {}).get("build_context")
+            photo_sink = (context.metadata or {}).get("photo_sink")
+            dev_build = build_context is not None and not build_context.production
+            lazy = dev_build and processor_config.get("lazy_thumbnails", False)
+            preview = (
+                dev_build
+                and not lazy
+                and photo_sink is None
+                and self.upgrader is not None
+                and processor_config.get("dev_previews", True)
+            )
+            if lazy:
+                executor_mode = "serial"
 
             # Benchmark collection option
             collect_benchmark = processor_config.get("benchmark", False)
@@ -225,87 +938,527 @@ class ThumbnailProcessorPlugin(ProcessorPlugin):
             thumbnails_dir = context.output_dir / "thumbnails"
             thumbnails_dir.mkdir(parents=True, exist_ok=True)
 
+            # Resolve cache validity for the whole collection up front:
+            # one index load and one directory scan instead of per-file stats
+            fingerprint_params = {
+                "size": thumbnail_size,
+                "quality": quality,
+                "format": output_format,
+                "reduced_decode": reduced_decode,
+                "thumbnail_sizes": thumbnail_sizes,
+                "web_size": web_size,
+            }
+            if alternate_formats or format_quality:
+                # Only added when set so existing caches stay valid
+                fingerprint_params.update(
+                    alternate_formats=alternate_formats,
+                    smallest_wins=smallest_wins,
+                    format_quality=format_quality,
+                )
+            if placeholders:
+                fingerprint_params["placeholders"] = True
+            if crop != "center":
+                fingerprint_params["crop"] = crop
+            if perceptual_hash:
+                fingerprint_params["perceptual_hash"] = perceptual_hash
+            if web_dir is not None:
+                fingerprint_params.update(
+                    web_dir=Path(os.path.relpath(web_dir, thumbnails_dir)).as_posix(),
+                    web_format=web_format,
+                    web_quality=web_quality,
+                )
+            quality_key = None
+            if target_ssim is not None:
+                fingerprint_params.update(
+                    target_ssim=target_ssim, quality_range=quality_range
+                )
+                # Searched qualities are reused for any build that encodes the
+                # same largest size and format against the same target
+                quality_key = encoding_fingerprint(
+                    size=max((thumbnail_size, *thumbnail_sizes)),
+                    format=output_format,
+                    reduced_decode=reduced_decode,
+                    target_ssim=target_ssim,
+                    quality_range=quality_range,
+                )
+            fingerprint = encoding_fingerprint(**fingerprint_params)
+            preview_fingerprint = None
+            if preview:
+                # Previews land at the final paths with the final sizes, so
+                # pages rendered now stay valid after the upgrade. The costly
+                # extras are skipped: no alternates (smallest_wins could drop
+                # them later), no quality search, centre crop
+                preview_fingerprint = encoding_fingerprint(preview=fingerprint)
+                alternate_formats = ()
+                target_ssim = None
+                quality_key = None
+                crop = "center"
+                reduced_decode = True
+            if self.upgrader is not None:
+                # A running upgrade writes the same cache index; stop it first
+                self.upgrader.cancel()
+            cache = None
+            if use_cache:
+                # Journaled, so a killed run resumes from its last finished photo
+                cache = ThumbnailCache(
+                    thumbnails_dir,
+                    extra_directories=(web_dir,) if web_dir is not None else (),
+                    journal=True,
+                )
+                cache.load()
+
             # Process photos
             processed_photos = []
             thumbnail_count = 0
+            preview_count = 0
+            lazy_photos = []
             processing_errors = []
+            released_count = 0
             photos = context.input_data["photos"]
+            total = photo_count(context.input_data)
 
-            if parallel:
-                # Parallel processing using ProcessPoolExecutor
-                with ProcessPoolExecutor(max_workers=max_workers) as executor:
-                    # Submit all photos to the pool
-                    future_to_photo = {
-                        executor.submit(
+            def known_quality(photo: dict) -> int | None:
+                """Return the adaptive quality chosen for this photo before."""
+                if cache is None or quality_key is None:
+                    return None
+                return cache.get_quality(
+                    photo.get("metadata", {}).get("hash"), quality_key
+                )
+
+            def known_crop(photo: dict) -> tuple[float, ...] | None:
+                """Return the smart crop box chosen for this photo before."""
+                if cache is None or crop == "center":
+                    return None
+                return cache.get_crop(photo.get("metadata", {}).get("hash"), crop)
+
+            def work_weight(photo: dict) -> int:
+                """Estimate a photo's rendering cost for largest-first order."""
+                metadata = photo.get("metadata", {})
+                if schedule_weight == "pixels":
+                    # Header probe, recorded so _attach_dimensions reuses it
+                    content_hash = metadata.get("hash")
+                    dims = (
+                        cache.get_dimensions(content_hash)
+                        if cache is not None
+                        else None
+                    )
+                    if dims is None:
+                        try:
+                            dims = probe_dimensions(photo["source_path"])
+                        except DimensionProbeError:
+                            return 0
+                        if cache is not None:
+                            cache.record_dimensions(content_hash, dims)
+                    return dims[0] * dims[1]
+                if metadata.get("size_bytes"):
+                    return metadata["size_bytes"]
+                try:
+                    return os.path.getsize(photo["source_path"])
+                except OSError:
+                    return 0
+
+            def record_photo(processed_photo: dict) -> None:
+                """Record a completed photo in the cache (and so its journal)."""
+                if "error" in processed_photo:
+                    return
+                _attach_dimensions(processed_photo, cache)
+                if cache is not None and not processed_photo.get("_lazy"):
+                    files, fields = _cache_fields(processed_photo)
+                    cache.record(
+                        Path(processed_photo["thumbnail_path"]).name,
+                        processed_photo.get("metadata", {}).get("hash"),
+                        preview_fingerprint
+                        if processed_photo.get("_preview")
+                        else fingerprint,
+                        processed_photo.get("_output_bytes", 0),
+                        files=files,
+                        fields=fields,
+                    )
+                    if "crop_box" in processed_photo:
+                        cache.record_crop(
+                            processed_photo.get("metadata", {}).get("hash"),
+                            crop,
+                            processed_photo["crop_box"],
+                        )
+                    if "thumbnail_quality" in processed_photo:
+                        cache.record_quality(
+                            processed_photo.get("metadata", {}).get("hash"),
+                            quality_key,
+                            processed_photo["thumbnail_quality"],
+                        )
+
+            def finish_photo(processed_photo: dict) -> None:
+                """Track a processed photo's result and benchmark data."""
+                nonlocal thumbnail_count, preview_count, released_count
+
+                # Track results
+                if "error" in processed_photo:
+                    processing_errors.append(processed_photo["error"])
+                else:
+                    thumbnail_count += 1
+
+                # Collect benchmark data if enabled
+                if benchmark and "_timing_s" in processed_photo:
+                    output_bytes = processed_photo.get("_output_bytes", 0)
+                    if processed_photo.get("_resumed"):
+                        outcome = "resumed"
+                    elif processed_photo.get("cached"):
+                        outcome = "cached"
+                    else:
+                        outcome = "fresh"
+                    benchmark.record_photo(
+                        processed_photo["_timing_s"],
+                        output_bytes,
+                        placeholder_s=processed_photo.get("_placeholder_s"),
+                        outcome=outcome,
+                    )
+
+                # Remove internal fields from output
+                processed_photo.pop("_timing_s", None)
+                processed_photo.pop("_output_bytes", None)
+                processed_photo.pop("_placeholder_s", None)
+                processed_photo.pop("_resumed", None)
+                if processed_photo.pop("_preview", False):
+                    preview_count += 1
+                if processed_photo.pop("_lazy", False):
+                    lazy_photos.append(processed_photo)
+
+                released_count += 1
+                if photo_sink is not None:
+                    photo_sink(processed_photo)
+                else:
+                    processed_photos.append(processed_photo)
+                if release_hooks is not None:
+                    release_hooks.execute_hook(
+                        RELEASE_HOOK,
+                        PluginContext(
+                            input_data={
+                                "photo": processed_photo,
+                                "released": released_count,
+                                "total": total,
+                            },
+                            config=context.config,
+                            output_dir=context.output_dir,
+                            metadata=context.metadata,
+                        ),
+                    )
+
+            # Results may complete out of order; the reorder buffer releases them
+            # in manifest order as soon as each prefix is complete, so page
+            # contents are stable across builds without waiting for the slowest
+            # photo. Progress is reported on completion, before reordering.
+            reorder = ReorderBuffer()
+            progress_callback = (context.metadata or {}).get("progress_callback")
+            hooks = context.hooks
+            release_hooks = context.hooks
+            if hooks is not None and not hooks.has_hook(ITEM_HOOK):
+                hooks = None
+            if release_hooks is not None and not release_hooks.has_hook(RELEASE_HOOK):
+                release_hooks = None
+            completed_count = 0
+
+            def complete_photo(index: int, processed_photo: dict) -> None:
+                """Record, report progress and release photos now in order."""
+                nonlocal completed_count
+                completed_count += 1
+                if preview and not processed_photo.get("cached"):
+                    processed_photo["_preview"] = "error" not in processed_photo
+                # Journaled on completion, not release: a photo waiting in the
+                # reorder buffer when the run is killed is not rendered again
+                record_photo(processed_photo)
+                if progress_callback:
+                    progress_callback(
+                        completed_count, total, processed_photo.get("source_path")
+                    )
+                if hooks is not None:
+                    hooks.execute_hook(
+                        ITEM_HOOK,
+                        PluginContext(
+                            input_data={
+                                "photo": processed_photo,
+                                "completed": completed_count,
+                                "total": total,
+                            },
+                            config=context.config,
+                            output_dir=context.output_dir,
+                            metadata=context.metadata,
+                        ),
+                    )
+                for ready_photo in reorder.push(index, processed_photo):
+                    finish_photo(ready_photo)
+
+            # Distributed tasks run on other nodes, from other working
+            # directories, so every path they carry is made absolute
+            shared = executor_mode == "distributed"
+
+            def task_path(path: Path | str) -> str:
+                """Path as written into a task."""
+                return str(Path(path).resolve()) if shared else str(path)
+
+            # Encoding settings shared by batches, single-photo tasks and
+            # sequential processing
+            params = BatchParams(
+                thumbnails_dir=task_path(thumbnails_dir),
+                thumbnail_size=thumbnail_size,
+                quality=quality,
+                output_format=output_format,
+                reduced_decode=reduced_decode,
+                thumbnail_sizes=thumbnail_sizes,
+                web_size=web_size,
+                collect_timing=collect_benchmark,
+                memory_limit_bytes=worker_memory_limit_mb * 1024 * 1024
+                if worker_memory_limit_mb
+                else None,
+                alternate_formats=alternate_formats,
+                smallest_wins=smallest_wins,
+                format_quality=format_quality,
+                target_ssim=target_ssim,
+                quality_range=quality_range,
+                placeholder=placeholders,
+                crop=crop,
+                perceptual_hash=perceptual_hash,
+                web_dir=task_path(web_dir) if web_dir is not None else None,
+                web_format=web_format,
+                web_quality=web_quality,
+                max_image_pixels=max_image_pixels,
+                preview=preview,
+            )
+
+            if executor_mode != "serial":
+                chunk_size = (
+                    1
+                    if dispatch == "photo"
+                    else batch_size or _auto_batch_size(total, max_workers)
+                )
+                # Other nodes get single-item batches rather than photo
+                # dicts, whose paths are the provider's
+                whole_photos = dispatch == "photo" and not shared
+
+                def submit_task(executor: Executor, batch: list) -> Future:
+                    """Submit one task for (index, photo, check_mtime) items."""
+                    if whole_photos:
+                        # One task per photo, whole photo dict pickled each way
+                        _, photo, check_mtime = batch[0]
+                        return executor.submit(
                             _process_single_photo,
                             photo,
-                            thumbnails_dir,
-                            thumbnail_size,
-                            quality,
-                            output_format,
-                            use_cache,
-                            collect_benchmark,  # Pass timing collection flag
-                        ): photo
-                        for photo in photos
-                    }
-
-                    # Collect results as they complete
-                    for future in as_completed(future_to_photo):
-                        processed_photo = future.result()
-
-                        # Track results
-                        if "error" in processed_photo:
-                            processing_errors.append(processed_photo["error"])
-                        else:
-                            thumbnail_count += 1
-
-                        # Collect benchmark data if enabled
-                        if benchmark and "_timing_s" in processed_photo:
-                            output_bytes = processed_photo.get("_output_bytes", 0)
-                            benchmark.record_photo(
-                                processed_photo["_timing_s"], output_bytes
+                            params,
+                            check_mtime,
+                            known_quality(photo),
+                            known_crop(photo),
+                        )
+                    # Batched: compact work items, small tuples back
+                    items = [
+                        (
+                            position,
+                            task_path(photo["source_path"]),
+                            Path(photo["dest_path"]).stem,
+                            check_mtime,
+                            known_quality(photo),
+                            known_crop(photo),
+                        )
+                        for position, (_, photo, check_mtime) in enumerate(batch)
+                    ]
+                    return executor.submit(process_batch, params, items)
+
+                def complete_task(future: Future, batch: list) -> None:
+                    """Complete the photos of a finished task."""
+                    try:
+                        results = future.result()
+                    except Exception as e:
+                        # Task-level failure (e.g. an abandoned distributed
+                        # task): its photos fail, the stage goes on
+                        for index, photo, _ in batch:
+                            complete_photo(index, _failed_photo(photo, str(e)))
+                        return
+                    if whole_photos:
+                        complete_photo(batch[0][0], results)
+                        return
+                    for work_result in results:
+                        index, photo, _ = batch[work_result[0]]
+                        complete_photo(
+                            index,
+                            _merge_work_result(
+                                photo,
+                                work_result,
+                                thumbnails_dir,
+                                thumbnail_size,
+                                output_format,
+                                collect_benchmark,
+                            ),
+                        )
+
+                def fail_item(item: tuple, reason: str) -> None:
+                    """Report a photo that hung or crashed on every attempt."""
+                    index, photo, _ = item
+                    complete_photo(index, _failed_photo(photo, reason))
+
+                with TaskDispatcher(
+                    executor_mode,
+                    submit_task,
+                    complete_task,
+                    fail_item,
+                    chunk_size=chunk_size,
+                    max_workers=max_workers,
+                    max_in_flight=max_in_flight,
+                    photo_timeout_s=photo_timeout_s,
+                    max_retries=max_retries,
+                    worker_pool=self.worker_pool,
+                    queue_config=processor_config,
+                ) as dispatcher:
+                    # Results parked in the reorder buffer are capped at the
+                    # window's photos, so memory stays flat for any size
+                    buffer_limit = dispatcher.window * chunk_size
+                    # Largest-first misses waiting to be sorted and submitted
+                    unsorted: list = []
+
+                    def submit_largest_first() -> None:
+                        """Submit the waiting misses, largest first."""
+                        # Longest job first: big panoramas start while every
+                        # worker is busy instead of forming the tail. Ties keep
+                        # manifest order; results are still released in order.
+                        # Batches close at a weight budget too, so the largest
+                        # photos are never queued behind each other in a batch
+                        weighted = sorted(
+                            ((work_weight(item[1]), item) for item in unsorted),
+                            key=lambda pair: pair[0],
+                            reverse=True,
+                        )
+                        unsorted.clear()
+                        budget = sum(weight for weight, _ in weighted) / (
+                            4 * dispatcher.workers
+                        )
+                        chunk_weight = 0
+                        for weight, item in weighted:
+                            chunk_weight += weight
+                            if dispatcher.add(item) or chunk_weight >= budget:
+                                dispatcher.flush()
+                                chunk_weight = 0
+                        dispatcher.flush()
+
+                    def cache_misses():
+                        """Complete cache hits; yield photos workers must render."""
+                        for index, photo in enumerate(photos):
+                            # Don't let results pile up behind one slow photo
+                            if reorder.pending_count >= buffer_limit:
+                                if unsorted:
+                                    submit_largest_first()
+                                dispatcher.flush()
+                                while (
+                                    dispatcher.in_flight
+                                    and reorder.pending_count >= buffer_limit
+                                ):
+                                    dispatcher.collect()
+
+                            # Cache hits are resolved here; only misses go to workers
+                            cached_photo, check_mtime = self._resolve_cache(
+                                photo,
+                                cache,
+                                thumbnails_dir,
+                                thumbnail_size,
+                                output_format,
+                                fingerprint,
+                                collect_benchmark,
+                                params.has_derivatives,
+                                preview_fingerprint,
                             )
-                            # Remove internal fields from output
-                            del processed_photo["_timing_s"]
-                            if "_output_bytes" in processed_photo:
-                                del processed_photo["_output_bytes"]
+                            if cached_photo is not None:
+                                complete_photo(index, cached_photo)
+                                continue
+                            yield index, photo, check_mtime
+
+                    if schedule == "largest-first":
+                        # Sorted a window at a time, so neither the misses nor
+                        # the parked results grow with the collection
+                        sort_window = max(buffer_limit, LARGEST_FIRST_WINDOW)
+                        for item in cache_misses():
+                            unsorted.append(item)
+                            if len(unsorted) >= sort_window:
+                                submit_largest_first()
+                        submit_largest_first()
+                    elif schedule == "page":
+                        # Page by page in pagination order, so each page is
+                        # complete after its own photos; within a page the
+                        # largest start first. Batches never span two pages
+                        for _, page in itertools.groupby(
+                            cache_misses(), key=lambda item: item[0] // page_size
+                        ):
+                            for item in sorted(
+                                page,
+                                key=lambda item: work_weight(item[1]),
+                                reverse=True,
+                            ):
+                                dispatcher.add(item)
+                            dispatcher.flush()
+                    else:
+                        for item in cache_misses():
+                            dispatcher.add(item)
 
-                        processed_photos.append(processed_photo)
+                    dispatcher.finish()
             else:
                 # Sequential processing (default)
-                for photo in photos:
+                for index, photo in enumerate(photos):
+                    cached_photo, check_mtime = self._resolve_cache(
+                        photo,
+                        cache,
+                        thumbnails_dir,
+                        thumbnail_size,
+                        output_format,
+                        fingerprint,
+                        collect_benchmark,
+                        params.has_derivatives,
+                        preview_fingerprint,
+                    )
+                    if cached_photo is not None:
+                        complete_photo(index, cached_photo)
+                        continue
+                    if lazy:
+                        # Rendered by the dev server when first requested
+                        complete_photo(
+                            index,
+                            _lazy_photo(
+                                photo,
+                                thumbnails_dir,
+                                thumbnail_size,
+                                thumbnail_sizes,
+                                output_format,
+                            ),
+                        )
+                        continue
+
                     # Process single photo using extracted function
                     processed_photo = _process_single_photo(
-                        photo=photo,
-                        thumbnails_dir=thumbnails_dir,
-                        thumbnail_size=thumbnail_size,
-                        quality=quality,
-                        output_format=output_format,
-                        use_cache=use_cache,
-                        collect_timing=collect_benchmark,  # Pass timing collection flag
+                        photo,
+                        params,
+                        use_cache=check_mtime,
+                        known_quality=known_quality(photo),
+                        known_crop=known_crop(photo),
                     )
+                    complete_photo(index, processed_photo)
 
-                    # Track results
-                    if "error" in processed_photo:
-                        processing_errors.append(processed_photo["error"])
-                    else:
-                        thumbnail_count += 1
-
-                    # Collect benchmark data if enabled
-                    if benchmark and "_timing_s" in processed_photo:
-                        output_bytes = processed_photo.get("_output_bytes", 0)
-                        benchmark.record_photo(
-                            processed_photo["_timing_s"], output_bytes
-                        )
-                        # Remove internal fields from output
-                        del processed_photo["_timing_s"]
-                        if "_output_bytes" in processed_photo:
-                            del processed_photo["_output_bytes"]
-
-                    processed_photos.append(processed_photo)
+            if cache is not None:
+                cache.save()
+            if lazy:
+                # The server renders one photo at a time with these settings,
+                # through this plugin, so results land in the same cache
+                _write_lazy_manifest(
+                    thumbnails_dir,
+                    {
+                        **processor_config,
+                        "lazy_thumbnails": False,
+                        "executor": "serial",
+                        "benchmark": False,
+                    },
+                    context.input_data["collection_name"],
+                    lazy_photos,
+                )
+            if preview_count:
+                self._schedule_upgrade(context)
 
             # Build output data - preserve all input data and add processor results
-            output_data = copy.deepcopy(context.input_data)
+            output_data = {
+                k: v for k, v in context.input_data.items() if k != "photos"
+            }
             output_data["photos"] = processed_photos
             output_data["thumbnail_count"] = thumbnail_count
 
@@ -320,6 +1473,9 @@ class ThumbnailProcessorPlugin(ProcessorPlugin):
                 errors=processing_errors,  # Non-fatal errors for individual photos
             )
 
+        except (UpgradeCancelled, StreamClosed):
+            # The run was abandoned, not failed: nobody wants its result
+            raise
         except Exception as e:
             # Fatal error that prevents any processing
             return PluginResult(
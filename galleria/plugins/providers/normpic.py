@@ -4,10 +4,28 @@ import json
 from pathlib import Path
 
 from galleria.plugins.base import PluginContext, PluginResult
+from galleria.plugins.exceptions import PluginExecutionError
 from galleria.plugins.interfaces import ProviderPlugin
+from galleria.plugins.streaming import StreamingPlugin
 
 
-class NormPicProviderPlugin(ProviderPlugin):
+def _to_photo(pic_data: dict) -> dict:
+    """Convert one NormPic pic entry to the ProviderPlugin photo format."""
+    # Create metadata dict with all NormPic fields except source/dest paths
+    metadata = {}
+    for key, value in pic_data.items():
+        if key not in ["source_path", "dest_path"]:
+            metadata[key] = value
+
+    # Build photo object following ProviderPlugin contract
+    return {
+        "source_path": pic_data["source_path"],
+        "dest_path": pic_data["dest_path"],
+        "metadata": metadata,
+    }
+
+
+class NormPicProviderPlugin(ProviderPlugin, StreamingPlugin):
     """Provider plugin for loading NormPic manifest files.
 
     Converts NormPic manifest.json format to ProviderPlugin contract format.
@@ -60,65 +78,15 @@ class NormPicProviderPlugin(ProviderPlugin):
         }
         """
         try:
-            # Extract manifest path from input data
-            if "manifest_path" not in context.input_data:
-                return PluginResult(
-                    success=False,
-                    output_data=None,
-                    errors=["Missing required input: manifest_path"],
-                )
-
-            manifest_path = Path(context.input_data["manifest_path"])
-
-            # Load and parse manifest JSON
-            try:
-                with open(manifest_path) as f:
-                    data = json.load(f)
-            except FileNotFoundError:
-                return PluginResult(
-                    success=False,
-                    output_data=None,
-                    errors=[f"Manifest file not found: {manifest_path}"],
-                )
-            except json.JSONDecodeError as e:
-                return PluginResult(
-                    success=False,
-                    output_data=None,
-                    errors=[f"Invalid JSON in manifest: {e}"],
-                )
-
-            # Validate required fields
-            if "collection_name" not in data:
-                return PluginResult(
-                    success=False,
-                    output_data=None,
-                    errors=["Missing required field: collection_name"],
-                )
+            data = self._read_manifest(context)
+            if isinstance(data, PluginResult):
+                return data
 
             # Convert NormPic pics to ProviderPlugin photo format
             photos = []
-            pics_data = data.get("pics", [])
-
-            for pic_data in pics_data:
+            for pic_data in data.get("pics", []):
                 try:
-                    # Extract required NormPic fields
-                    source_path = pic_data["source_path"]
-                    dest_path = pic_data["dest_path"]
-
-                    # Create metadata dict with all NormPic fields except source/dest paths
-                    metadata = {}
-                    for key, value in pic_data.items():
-                        if key not in ["source_path", "dest_path"]:
-                            metadata[key] = value
-
-                    # Build photo object following ProviderPlugin contract
-                    photo = {
-                        "source_path": source_path,
-                        "dest_path": dest_path,
-                        "metadata": metadata,
-                    }
-                    photos.append(photo)
-
+                    photos.append(_to_photo(pic_data))
                 except KeyError as e:
                     return PluginResult(
                         success=False,
@@ -126,21 +94,104 @@ class NormPicProviderPlugin(ProviderPlugin):
                         errors=[f"Missing required pic field: {e}"],
                     )
 
-            # Build output data following ProviderPlugin contract
-            output_data = {"photos": photos, "collection_name": data["collection_name"]}
+            return PluginResult(
+                success=True, output_data=self._output_data(data, photos)
+            )
 
-            # Add optional fields if present
-            if "collection_description" in data:
-                output_data["collection_description"] = data["collection_description"]
-            if "manifest_version" in data:
-                output_data["manifest_version"] = data["manifest_version"]
+        except Exception as e:
+            # Catch any unexpected errors
+            return PluginResult(
+                success=False,
+                output_data=None,
+                errors=[f"Unexpected error loading NormPic manifest: {e}"],
+            )
 
-            return PluginResult(success=True, output_data=output_data)
+    def stream(self, context: PluginContext) -> PluginResult:
+        """Load a NormPic manifest and yield its photos one at a time.
+
+        The manifest is parsed up front, so errors in the file itself fail
+        the stage. Each pic entry is converted when the next stage asks for
+        it and dropped from the parsed manifest, so converted photos are
+        only held by the stages still working on them.
+
+        Args:
+            context: Plugin execution context as for load_collection()
 
+        Returns:
+            PluginResult whose "photos" is an iterator, with "photo_count"
+        """
+        try:
+            data = self._read_manifest(context)
         except Exception as e:
-            # Catch any unexpected errors
             return PluginResult(
                 success=False,
                 output_data=None,
                 errors=[f"Unexpected error loading NormPic manifest: {e}"],
             )
+        if isinstance(data, PluginResult):
+            return data
+
+        pics = data.pop("pics", [])
+        pics.reverse()
+
+        def photos():
+            while pics:
+                try:
+                    yield _to_photo(pics.pop())
+                except KeyError as e:
+                    raise PluginExecutionError(
+                        f"Missing required pic field: {e}", self.name
+                    ) from e
+
+        output_data = self._output_data(data, photos())
+        output_data["photo_count"] = len(pics)
+        return PluginResult(success=True, output_data=output_data)
+
+    def _read_manifest(self, context: PluginContext) -> dict | PluginResult:
+        """Parse and validate the manifest, or return the failed result."""
+        # Extract manifest path from input data
+        if "manifest_path" not in context.input_data:
+            return PluginResult(
+                success=False,
+                output_data=None,
+                errors=["Missing required input: manifest_path"],
+            )
+
+        manifest_path = Path(context.input_data["manifest_path"])
+
+        # Load and parse manifest JSON
+        try:
+            with open(manifest_path) as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return PluginResult(
+                success=False,
+                output_data=None,
+                errors=[f"Manifest file not found: {manifest_path}"],
+            )
+        except json.JSONDecodeError as e:
+            return PluginResult(
+                success=False,
+                output_data=None,
+                errors=[f"Invalid JSON in manifest: {e}"],
+            )
+
+        # Validate required fields
+        if "collection_name" not in data:
+            return PluginResult(
+                success=False,
+                output_data=None,
+                errors=["Missing required field: collection_name"],
+            )
+        return data
+
+    def _output_data(self, data: dict, photos) -> dict:
+        """Build output data following the ProviderPlugin contract."""
+        output_data = {"photos": photos, "collection_name": data["collection_name"]}
+
+        # Add optional fields if present
+        if "collection_description" in data:
+            output_data["collection_description"] = data["collection_description"]
+        if "manifest_version" in data:
+            output_data["manifest_version"] = data["manifest_version"]
+        return output_data
@@ -0,0 +1,105 @@
+"""Copy-on-write photo records for handing photos between plugin stages."""
+
+from collections.abc import Iterator, Mapping, MutableMapping
+
+
+class PhotoRecord(MutableMapping):
+    """Photo dict overlay that adds fields without copying the photo.
+
+    A stage that adds fields to a photo (thumbnail paths, duplicate marks)
+    wraps its input photo instead of deep-copying it: the record reads
+    through to the input dict, which it never modifies, and keeps its own
+    writes and deletions in a small overlay. The input photo stays exactly
+    as the previous stage produced it, at the cost of one overlay per photo
+    rather than a copy of every nested metadata value.
+
+    Wrapping a record shares its base and copies only the overlay, so a
+    photo passed through many stages is never more than one lookup deep.
+    Nested values (e.g. "metadata") are shared with the input: stages
+    replace them rather than mutating them in place.
+
+    Records behave like dicts for reading, ``in``, iteration, equality,
+    ``dict(record)`` and pickling; ``json`` needs ``dict(record)``.
+
+    Usage:
+        processed = PhotoRecord(photo)
+        processed["thumbnail_path"] = "thumbnails/IMG_0001.webp"
+        assert "thumbnail_path" not in photo
+    """
+
+    __slots__ = ("_base", "_own", "_hidden")
+
+    def __init__(self, photo: Mapping = (), **fields) -> None:
+        """Initialize PhotoRecord over a photo.
+
+        Args:
+            photo: Photo dict (or record) to read through to; never modified
+            **fields: Fields to set on the record straight away
+        """
+        if isinstance(photo, PhotoRecord):
+            self._base = photo._base
+            self._own = dict(photo._own)
+            self._hidden = photo._hidden
+        else:
+            self._base = photo if isinstance(photo, dict) else dict(photo)
+            self._own = {}
+            self._hidden = frozenset()
+        for key, value in fields.items():
+            self[key] = value
+
+    def __getitem__(self, key: str) -> object:
+        """Return a field from the overlay, else from the base photo."""
+        try:
+            return self._own[key]
+        except KeyError:
+            if key in self._hidden:
+                raise
+            return self._base[key]
+
+    def __setitem__(self, key: str, value: object) -> None:
+        """Set a field in the overlay; the base photo is left untouched."""
+        self._own[key] = value
+        if key in self._hidden:
+            self._hidden = self._hidden - {key}
+
+    def __delitem__(self, key: str) -> None:
+        """Remove a field, hiding it if the base photo has it."""
+        found = self._own.pop(key, self) is not self
+        if key in self._base and key not in self._hidden:
+            self._hidden = self._hidden | {key}
+            found = True
+        if not found:
+            raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate in dict order: visible base fields, then added fields."""
+        for key in self._base:
+            if key in self._own or key not in self._hidden:
+                yield key
+        for key in self._own:
+            if key not in self._base:
+                yield key
+
+    def __len__(self) -> int:
+        """Return the number of visible fields."""
+        return sum(1 for _ in self)
+
+    def __contains__(self, key: object) -> bool:
+        """Return whether the record has a field (without raising)."""
+        return key in self._own or (key not in self._hidden and key in self._base)
+
+    def get(self, key: str, default: object = None) -> object:
+        """Return a field, or ``default`` when the record does not have it."""
+        if key in self._own:
+            return self._own[key]
+        if key in self._hidden:
+            return default
+        return self._base.get(key, default)
+
+    def copy(self) -> "PhotoRecord":
+        """Return a new record over the same base, with its own overlay."""
+        return PhotoRecord(self)
+
+    def __repr__(self) -> str:
+        """Return the record's visible fields in dict form."""
+        return f"PhotoRecord({dict(self)!r})"
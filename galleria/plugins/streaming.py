@@ -0,0 +1,92 @@
+"""Streaming stage protocol: photos flow between stages as iterators."""
+
+from abc import ABC, abstractmethod
+from collections.abc import Iterator
+from dataclasses import replace
+
+from .base import BasePlugin, PluginContext, PluginResult
+
+# Output keys that carry a stage's photos, or pagination's pages, as a stream
+STREAM_KEYS = ("photos", "pages")
+
+
+class StreamClosed(Exception):
+    """Raised in a stage's producer once the consumer of its stream is gone."""
+
+    pass
+
+
+class StreamingPlugin(ABC):
+    """Mixin for plugins that can run as a streaming pipeline stage.
+
+    ``stream()`` gets the previous stage's output with "photos" (or "pages")
+    as any iterable and returns output_data in which that key is an iterator
+    doing the stage's work lazily, as the next stage pulls from it. Provider
+    output also carries "photo_count", so later stages know the collection
+    size without materialising it. The last streaming stage (the template)
+    is the sink: it consumes its input inside ``stream()``.
+
+    PipelineManager.execute_streaming() calls ``stream()`` on plugins that
+    implement it and runs other plugins through run_materialized().
+    """
+
+    @abstractmethod
+    def stream(self, context: PluginContext) -> PluginResult:
+        """Run the stage on streamed input.
+
+        Args:
+            context: Plugin context whose input_data may hold iterators
+
+        Returns:
+            PluginResult whose output_data holds this stage's iterator
+        """
+
+
+def photo_count(input_data: dict) -> int:
+    """Return the number of photos in stage input, streamed or not.
+
+    Args:
+        input_data: Stage input with a "photos" list or a "photo_count"
+
+    Returns:
+        Number of photos in the collection
+    """
+    if "photo_count" in input_data:
+        return input_data["photo_count"]
+    return len(input_data.get("photos", ()))
+
+
+def streamed_key(output_data: object) -> str | None:
+    """Return the key of the iterator in a stage's output, if it has one."""
+    if not isinstance(output_data, dict):
+        return None
+    for key in STREAM_KEYS:
+        if isinstance(output_data.get(key), Iterator):
+            return key
+    return None
+
+
+def run_materialized(plugin: BasePlugin, context: PluginContext) -> PluginResult:
+    """Run a dict-based plugin on streamed input.
+
+    Collects the streamed input into lists, runs the plugin normally and
+    updates "photo_count" when the plugin changed the photos (e.g. dropped
+    duplicates). The stage then holds the whole collection in memory.
+
+    Args:
+        plugin: Plugin without a ``stream()`` method
+        context: Plugin context whose input_data may hold iterators
+
+    Returns:
+        The plugin's PluginResult
+    """
+    input_data = context.input_data
+    key = streamed_key(input_data)
+    if key is not None:
+        input_data = {**input_data, key: list(input_data[key])}
+    result = plugin.execute(replace(context, input_data=input_data))
+
+    output_data = result.output_data
+    if isinstance(output_data, dict) and isinstance(output_data.get("photos"), list):
+        output_data["photo_count"] = len(output_data["photos"])
+    return result
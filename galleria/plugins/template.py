@@ -1,12 +1,21 @@
 """Template plugin implementations for HTML generation."""
 
+from pathlib import Path
 from typing import Any
 
+from ..processor.cache import atomic_output
 from .base import PluginContext, PluginResult
 from .interfaces import TemplatePlugin
+from .streaming import StreamingPlugin
 
+# Rendered thumbnail width per grid breakpoint (see BasicCSSPlugin grid layout)
+DEFAULT_THUMBNAIL_SIZES = (
+    "(min-width: 1024px) 220px, (min-width: 768px) 25vw, "
+    "(min-width: 560px) 33vw, 50vw"
+)
 
-class BasicTemplatePlugin(TemplatePlugin):
+
+class BasicTemplatePlugin(TemplatePlugin, StreamingPlugin):
     """Basic template plugin for generating simple HTML gallery pages."""
 
     @property
@@ -37,27 +46,15 @@ class BasicTemplatePlugin(TemplatePlugin):
                 # Pagination transform input
                 pages = context.input_data["pages"]
                 for page_num, photos in enumerate(pages, 1):
-                    html_content = self._generate_page_html(
-                        photos, collection_name, page_num, len(pages), context
-                    )
                     html_files.append(
-                        {
-                            "filename": f"page_{page_num}.html",
-                            "content": html_content,
-                            "page_number": page_num,
-                        }
+                        self.render_page(
+                            photos, collection_name, page_num, len(pages), context
+                        )
                     )
 
                 # Generate index.html that redirects to first page for direct directory access
                 if pages:
-                    index_content = self._generate_gallery_index_html(collection_name)
-                    html_files.append(
-                        {
-                            "filename": "index.html",
-                            "content": index_content,
-                            "page_number": 0,  # Special marker for index page
-                        }
-                    )
+                    html_files.append(self.render_index(collection_name))
             elif "photos" in context.input_data:
                 # Direct photos input (no pagination)
                 photos = context.input_data["photos"]
@@ -95,6 +92,94 @@ class BasicTemplatePlugin(TemplatePlugin):
                 success=False, output_data={}, errors=[f"TEMPLATE_ERROR: {str(e)}"]
             )
 
+    def stream(self, context: PluginContext) -> PluginResult:
+        """Render each page as pagination yields it and write it to disk.
+
+        The sink of a streaming pipeline: every page is written atomically
+        to output_dir when it arrives, so no page's HTML is kept, and
+        output_data lists the files in "written_files" with "html_files"
+        empty. Errors from earlier stages surface here and are raised.
+        Input without pages is rendered by generate_html().
+        """
+        if "collection_name" not in context.input_data:
+            return PluginResult(
+                success=False,
+                output_data={},
+                errors=["MISSING_COLLECTION_NAME: collection_name required"],
+            )
+        if "pages" not in context.input_data:
+            return self.generate_html(context)
+
+        collection_name = context.input_data["collection_name"]
+        pages = context.input_data["pages"]
+        total_pages = context.input_data.get("transform_metadata", {}).get(
+            "total_pages"
+        )
+        if total_pages is None:
+            pages = list(pages)
+            total_pages = len(pages)
+
+        output_dir = Path(context.output_dir)
+        written = []
+        for page_num, photos in enumerate(pages, 1):
+            written.append(
+                self._write_file(
+                    output_dir,
+                    self.render_page(
+                        photos, collection_name, page_num, total_pages, context
+                    ),
+                )
+            )
+        if written:
+            written.append(
+                self._write_file(output_dir, self.render_index(collection_name))
+            )
+
+        return PluginResult(
+            success=True,
+            output_data={
+                "html_files": [],
+                "written_files": written,
+                "collection_name": collection_name,
+                "file_count": len(written),
+            },
+        )
+
+    def _write_file(self, output_dir: Path, html_file: dict[str, Any]) -> str:
+        """Write an html_files entry atomically and return its filename."""
+        with atomic_output(output_dir / html_file["filename"]) as tmp_path:
+            tmp_path.write_text(html_file["content"], encoding="utf-8")
+        return html_file["filename"]
+
+    def render_page(
+        self,
+        photos: list[dict[str, Any]],
+        collection_name: str,
+        page_num: int,
+        total_pages: int,
+        context: PluginContext,
+    ) -> dict[str, Any]:
+        """Render one page of a paginated gallery as an html_files entry.
+
+        Used by generate_html and by PageWriter, which writes pages while
+        the processor is still running.
+        """
+        return {
+            "filename": f"page_{page_num}.html",
+            "content": self._generate_page_html(
+                photos, collection_name, page_num, total_pages, context
+            ),
+            "page_number": page_num,
+        }
+
+    def render_index(self, collection_name: str) -> dict[str, Any]:
+        """Render the index.html entry that redirects to the first page."""
+        return {
+            "filename": "index.html",
+            "content": self._generate_gallery_index_html(collection_name),
+            "page_number": 0,  # Special marker for index page
+        }
+
     def _generate_page_html(
         self,
         photos: list[dict[str, Any]],
@@ -201,6 +286,98 @@ class BasicTemplatePlugin(TemplatePlugin):
             # Fallback to original relative path method
             return self._make_relative_path(path)
 
+    def _make_srcset(self, photo: dict[str, Any], context: PluginContext) -> str:
+        """Build an ``srcset`` value from the photo's thumbnail derivative ladder.
+
+        Args:
+            photo: Processed photo dict, optionally with a ``thumbnails`` list
+            context: Plugin context used for URL generation
+
+        Returns:
+            Comma-separated ``url widthw`` candidates, or empty string when the
+            photo only has a single thumbnail
+        """
+        thumbnails = photo.get("thumbnails") or []
+        if len(thumbnails) < 2:
+            return ""
+
+        return ", ".join(
+            f"{self._make_url(t['path'], context)} {t['size']}w" for t in thumbnails
+        )
+
+    def _make_sources(
+        self, photo: dict[str, Any], context: PluginContext
+    ) -> list[dict[str, str]]:
+        """Build ``<source>`` attributes for the photo's alternate thumbnail formats.
+
+        Args:
+            photo: Processed photo dict, optionally with a ``sources`` list
+            context: Plugin context used for URL generation
+
+        Returns:
+            List of ``{"type", "srcset"}`` dicts in preference order; empty when
+            the photo only has its primary format
+        """
+        sources = []
+        for source in photo.get("sources") or []:
+            srcset = self._make_srcset(source, context) or self._make_url(
+                source["path"], context
+            )
+            sources.append({"type": source["type"], "srcset": srcset})
+        return sources
+
+    def _make_placeholder_style(self, photo: dict[str, Any]) -> str:
+        """Build an inline style showing the photo's placeholder until it loads.
+
+        Args:
+            photo: Processed photo dict, optionally with ``lqip`` and
+                ``dominant_color`` from the thumbnail processor
+
+        Returns:
+            CSS declarations for the ``<img>`` ``style`` attribute, or empty
+            string when the photo has no placeholder
+        """
+        color = photo.get("dominant_color")
+        lqip = photo.get("lqip")
+        if not color and not lqip:
+            return ""
+
+        layers = [color] if color else []
+        if lqip:
+            layers.append(f"url({lqip}) center/cover no-repeat")
+        return f"background: {' '.join(layers)}"
+
+    def _get_dimensions(self, photo: dict[str, Any]) -> dict[str, int | None]:
+        """Get intrinsic sizes of the thumbnail and the linked photo.
+
+        Uses dimensions the thumbnail processor already recorded, so no image
+        is opened while rendering.
+
+        Args:
+            photo: Processed photo dict
+
+        Returns:
+            Dict with thumb_width/thumb_height and photo_width/photo_height,
+            each None when unknown
+        """
+        thumb_width, thumb_height = photo.get("thumbnail_size") or (None, None)
+        if photo.get("web_path") and photo.get("web_size"):
+            photo_width, photo_height = photo["web_size"]
+        else:
+            photo_width, photo_height = photo.get("width"), photo.get("height")
+        return {
+            "thumb_width": thumb_width,
+            "thumb_height": thumb_height,
+            "photo_width": photo_width,
+            "photo_height": photo_height,
+        }
+
+    def _get_sizes_attribute(self, context: PluginContext) -> str:
+        """Get the ``sizes`` attribute from template config or the grid default."""
+        config = context.config or {}
+        template_config = config.get("template", config)
+        return template_config.get("sizes", DEFAULT_THUMBNAIL_SIZES)
+
     def _make_relative_path(self, path: str) -> str:
         """Convert absolute filesystem path to relative web path for Edge Rules routing.
 
@@ -243,13 +420,19 @@ class BasicTemplatePlugin(TemplatePlugin):
 
         # Prepare photo data for template
         template_photos = []
+        sizes = self._get_sizes_attribute(context)
         for photo in photos:
             thumb_path = photo.get("thumbnail_path", photo.get("dest_path", ""))
-            photo_path = photo.get("dest_path", "")
+            photo_path = photo.get("web_path") or photo.get("dest_path", "")
 
             template_photos.append({
                 "thumb_url": self._make_url(thumb_path, context),
                 "photo_url": self._make_url(photo_path, context),
+                "srcset": self._make_srcset(photo, context),
+                "sizes": sizes,
+                "sources": self._make_sources(photo, context),
+                "placeholder_style": self._make_placeholder_style(photo),
+                **self._get_dimensions(photo),
                 "collection_name": collection_name,
             })
 
@@ -292,18 +475,53 @@ class BasicTemplatePlugin(TemplatePlugin):
 
         # Build photo gallery HTML
         photo_html = ""
+        sizes = self._get_sizes_attribute(context)
         for photo in photos:
             thumb_path = photo.get("thumbnail_path", photo.get("dest_path", ""))
-            photo_path = photo.get("dest_path", "")
+            photo_path = photo.get("web_path") or photo.get("dest_path", "")
 
             # Convert paths to URLs using context-aware filter
             thumb_url = self._make_url(thumb_path, context)
             photo_url = self._make_url(photo_path, context)
+            srcset = self._make_srcset(photo, context)
+            srcset_attrs = f' srcset="{srcset}" sizes="{sizes}"' if srcset else ""
+            sizes_attr = f' sizes="{sizes}"' if srcset else ""
+            placeholder_style = self._make_placeholder_style(photo)
+            style_attr = f' style="{placeholder_style}"' if placeholder_style else ""
+
+            # Intrinsic sizes let the browser reserve space before loading
+            dims = self._get_dimensions(photo)
+            size_attrs = ""
+            if dims["thumb_width"] and dims["thumb_height"]:
+                size_attrs = (
+                    f' width="{dims["thumb_width"]}" height="{dims["thumb_height"]}"'
+                )
+            link_attrs = ""
+            if dims["photo_width"] and dims["photo_height"]:
+                link_attrs = (
+                    f' data-width="{dims["photo_width"]}"'
+                    f' data-height="{dims["photo_height"]}"'
+                )
+            img_html = (
+                f'<img src="{thumb_url}"{srcset_attrs}{size_attrs} '
+                f'alt="Photo from {collection_name}" loading="lazy"{style_attr}>'
+            )
+
+            # Alternate formats go in a <picture>; browsers pick the first
+            # <source> type they support and fall back to the <img>
+            sources = self._make_sources(photo, context)
+            if sources:
+                source_html = "".join(
+                    f'<source type="{source["type"]}" srcset="{source["srcset"]}"'
+                    f"{sizes_attr}>"
+                    for source in sources
+                )
+                img_html = f"<picture>{source_html}{img_html}</picture>"
 
             photo_html += f"""
             <div class="photo-item">
-                <a href="{photo_url}">
-                    <img src="{thumb_url}" alt="Photo from {collection_name}" loading="lazy">
+                <a href="{photo_url}"{link_attrs}>
+                    {img_html}
                 </a>
             </div>"""
 
@@ -0,0 +1,499 @@
+"""Content-hash thumbnail cache backed by a single sidecar index file."""
+
+import fcntl
+import hashlib
+import json
+import os
+import time
+import uuid
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from enum import Enum
+from pathlib import Path
+from typing import TextIO
+
+CACHE_INDEX_NAME = ".galleria-cache.json"
+
+# Bumped when cached outputs change meaning; version 2 derives crops and
+# thumbnails from EXIF-oriented pixels
+CACHE_INDEX_VERSION = 2
+
+# Append-only log of index changes since the last save, replayed by load()
+CACHE_JOURNAL_NAME = ".galleria-journal.jsonl"
+
+# Locked while a process reads or rewrites the index and journal
+CACHE_LOCK_NAME = ".galleria-cache.lock"
+
+# Photos a lazy dev build left for the dev server to render on first request
+LAZY_MANIFEST_NAME = ".galleria-lazy.json"
+
+# Prefix of files being written; they only take their final name when complete
+TEMP_PREFIX = ".galleria-tmp-"
+
+# Temporary files older than this were left by a killed run and are removed;
+# younger ones may belong to a build still writing into the same directory
+STALE_TEMP_S = 3600.0
+
+
+@contextmanager
+def atomic_output(path: Path | str) -> Iterator[Path]:
+    """Yield a temporary path that replaces ``path`` once fully written.
+
+    Readers, and runs after a crash, see either no file or a complete one,
+    never a partially written thumbnail. The temporary file is removed if
+    writing fails.
+
+    Usage:
+        with atomic_output(output_path) as tmp_path:
+            img.save(tmp_path, "WEBP", quality=85)
+    """
+    path = Path(path)
+    tmp_path = path.with_name(f"{TEMP_PREFIX}{uuid.uuid4().hex[:12]}-{path.name}")
+    try:
+        yield tmp_path
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def encoding_fingerprint(**params) -> str:
+    """Build a stable fingerprint of the parameters that shape a thumbnail.
+
+    Args:
+        **params: Encoding parameters (size, quality, format, ...)
+
+    Returns:
+        Short hex digest that changes whenever any parameter changes
+    """
+    payload = json.dumps(params, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+class CacheStatus(Enum):
+    """Result of looking up a thumbnail in the cache index."""
+
+    HIT = "hit"
+    """Index entry matches content hash and fingerprint, file is present."""
+
+    STALE = "stale"
+    """Index entry exists but the content or encoding parameters changed."""
+
+    UNKNOWN = "unknown"
+    """No index entry (or no content hash) - caller decides how to validate."""
+
+
+@dataclass
+class ThumbnailCache:
+    """Sidecar index mapping thumbnail names to content hash and fingerprint.
+
+    Validity for a whole collection is resolved with one index read and one
+    directory scan instead of an ``exists()`` plus two ``stat()`` calls per
+    photo. Entries are keyed by thumbnail file name so the index stays valid
+    when the thumbnails directory is moved.
+
+    Usage:
+        cache = ThumbnailCache(thumbnails_dir)
+        cache.load()
+        if cache.lookup(name, photo_hash, fingerprint) is CacheStatus.HIT:
+            ...
+        cache.record(name, photo_hash, fingerprint, output_bytes)
+        cache.save()
+
+    Derivatives outside the directory (web photos in ``pics/web``) are
+    tracked through ``extra_directories``; their file names are recorded
+    relative to ``directory``, e.g. ``../../../pics/web/IMG_0001.jpg``.
+
+    Adaptive quality decisions, smart crop boxes and original image
+    dimensions are kept separately, keyed by content hash, so they survive
+    thumbnail invalidation and are reused without searching, scoring or
+    opening the file.
+
+    With ``journal=True`` every change is also appended to a journal file
+    as it happens, so a run that is killed before ``save()`` loses nothing:
+    the next ``load()`` replays the journal and the thumbnails finished so
+    far are hits again (listed in ``resumed``). ``save()`` folds the journal
+    into the index and removes it.
+
+    Several processes may use one directory at once (a dev server rendering
+    lazy thumbnails while a rebuild runs). ``load()`` and ``save()`` hold an
+    exclusive lock on a lock file next to the index, and ``save()`` applies
+    this instance's changes on top of the index as it is on disk then, so
+    entries another process saved in the meantime are kept.
+    """
+
+    directory: Path
+    extra_directories: tuple[Path, ...] = ()
+    entries: dict[str, dict] = field(default_factory=dict)
+    qualities: dict[str, dict[str, int]] = field(default_factory=dict)
+    dimensions: dict[str, list[int]] = field(default_factory=dict)
+    crops: dict[str, dict[str, list[float]]] = field(default_factory=dict)
+    journal: bool = False
+    resumed: set[str] = field(default_factory=set, init=False)
+    _present: set[str] = field(default_factory=set, init=False, repr=False)
+    _dirty: bool = field(default=False, init=False, repr=False)
+    _journal_file: TextIO | None = field(default=None, init=False, repr=False)
+    _replaying: bool = field(default=False, init=False, repr=False)
+    _changes: list[tuple] = field(default_factory=list, init=False, repr=False)
+
+    @property
+    def index_path(self) -> Path:
+        """Path to the sidecar index file."""
+        return Path(self.directory) / CACHE_INDEX_NAME
+
+    @property
+    def journal_path(self) -> Path:
+        """Path to the journal of changes since the last save."""
+        return Path(self.directory) / CACHE_JOURNAL_NAME
+
+    def load(self) -> None:
+        """Load the index and scan the directory for existing files.
+
+        A missing, unreadable or incompatible index is treated as empty.
+        A journal left by an interrupted run is replayed on top of it, and
+        temporary files that run was writing are removed.
+        """
+        self.entries = {}
+        self.qualities = {}
+        self.dimensions = {}
+        self.crops = {}
+        self.resumed = set()
+        self._present = set()
+        self._dirty = False
+        self._changes = []
+
+        try:
+            with os.scandir(self.directory) as it:
+                self._present = {
+                    entry.name
+                    for entry in it
+                    if entry.is_file() and not self._sweep_temp(entry)
+                }
+        except FileNotFoundError:
+            return
+
+        for extra in self.extra_directories:
+            prefix = Path(os.path.relpath(extra, self.directory)).as_posix()
+            try:
+                with os.scandir(extra) as it:
+                    self._present.update(
+                        f"{prefix}/{entry.name}"
+                        for entry in it
+                        if entry.is_file() and not self._sweep_temp(entry)
+                    )
+            except FileNotFoundError:
+                continue
+
+        with self._locked():
+            self._read_index()
+            self._replay_journal()
+
+    def _read_index(self) -> None:
+        """Replace the in-memory index with the index file's contents."""
+        self.entries = {}
+        self.qualities = {}
+        self.dimensions = {}
+        self.crops = {}
+        try:
+            data = json.loads(self.index_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+
+        if data.get("version") == CACHE_INDEX_VERSION:
+            self.entries = data.get("entries", {})
+            self.qualities = data.get("qualities", {})
+            self.dimensions = data.get("dimensions", {})
+            self.crops = data.get("crops", {})
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """Hold the directory's cache lock, excluding other processes."""
+        try:
+            lock_file = open(Path(self.directory) / CACHE_LOCK_NAME, "a")
+        except FileNotFoundError:
+            yield  # No directory yet, so nothing to read or overwrite
+            return
+        with lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    @staticmethod
+    def _sweep_temp(entry: os.DirEntry) -> bool:
+        """Remove a stale temporary file; True for any temporary file."""
+        if not entry.name.startswith(TEMP_PREFIX):
+            return False
+        try:
+            if time.time() - entry.stat().st_mtime > STALE_TEMP_S:
+                os.unlink(entry.path)
+        except OSError:
+            pass
+        return True
+
+    def _replay_journal(self) -> None:
+        """Apply the changes an interrupted run journaled after its last save."""
+        try:
+            lines = self.journal_path.read_text(encoding="utf-8").splitlines()
+        except OSError:
+            return
+
+        # Only files actually on disk count: replayed records must not mark
+        # a thumbnail present that was deleted after the run was killed
+        present = set(self._present)
+        self._replaying = True
+        try:
+            for line in lines:
+                try:
+                    op, *args = json.loads(line)
+                    self._apply(op, args)
+                except (ValueError, TypeError, KeyError):
+                    continue  # Torn last line of a killed run, or foreign data
+                if op == "record":
+                    self.resumed.add(args[0])
+        finally:
+            self._replaying = False
+            self._present = present
+
+    def _apply(self, op: str, args: list) -> None:
+        """Apply one journaled change."""
+        replay = {
+            "record": self.record,
+            "quality": self.record_quality,
+            "dimensions": self.record_dimensions,
+            "crop": self.record_crop,
+        }
+        replay[op](*args)
+
+    def _append(self, *change) -> None:
+        """Keep one change for save() and append it to the journal."""
+        if self._replaying:
+            return
+        self._changes.append(change)
+        if not self.journal:
+            return
+        if self._journal_file is None:
+            self._journal_file = open(self.journal_path, "a", encoding="utf-8")
+        self._journal_file.write(json.dumps(change) + "\n")
+        self._journal_file.flush()
+
+    def close(self) -> None:
+        """Close the journal, keeping it for the next load() to replay."""
+        if self._journal_file is not None:
+            self._journal_file.close()
+            self._journal_file = None
+
+    def lookup(
+        self, name: str, content_hash: str | None, fingerprint: str
+    ) -> CacheStatus:
+        """Check whether a thumbnail is valid for the given content and params.
+
+        Args:
+            name: Thumbnail file name within the cache directory
+            content_hash: Content hash of the source photo (NormPic hash)
+            fingerprint: Encoding fingerprint from encoding_fingerprint()
+
+        Returns:
+            CacheStatus describing the lookup result
+        """
+        entry = self.entries.get(name)
+        if not content_hash or entry is None:
+            return CacheStatus.UNKNOWN
+
+        if (
+            entry.get("hash") == content_hash
+            and entry.get("fingerprint") == fingerprint
+            and all(f in self._present for f in entry.get("files", [name]))
+        ):
+            return CacheStatus.HIT
+
+        return CacheStatus.STALE
+
+    def get(self, name: str) -> dict | None:
+        """Return the raw index entry for a thumbnail, if any."""
+        return self.entries.get(name)
+
+    def record(
+        self,
+        name: str,
+        content_hash: str | None,
+        fingerprint: str,
+        output_bytes: int = 0,
+        files: list[str] | None = None,
+        fields: dict | None = None,
+    ) -> None:
+        """Record a freshly written (or adopted) thumbnail in the index.
+
+        Args:
+            name: Thumbnail file name within the cache directory
+            content_hash: Content hash of the source photo
+            fingerprint: Encoding fingerprint used to produce the file
+            output_bytes: Size of the written file in bytes
+            files: All file names that must exist for a hit (defaults to name)
+            fields: JSON-serialisable photo fields restored on a cache hit
+        """
+        if not content_hash:
+            return
+
+        # Re-recording an unchanged entry must not force an index rewrite
+        entry = self.entries.get(name)
+        if (
+            entry is not None
+            and entry.get("hash") == content_hash
+            and entry.get("fingerprint") == fingerprint
+            and (not output_bytes or entry.get("bytes") == output_bytes)
+            and (files is None or entry.get("files") == files)
+            and (fields is None or entry.get("fields") == fields)
+        ):
+            return
+
+        self.entries[name] = {
+            "hash": content_hash,
+            "fingerprint": fingerprint,
+            "bytes": output_bytes,
+        }
+        if files is not None:
+            self.entries[name]["files"] = files
+            self._present.update(files)
+        if fields is not None:
+            self.entries[name]["fields"] = fields
+        self._present.add(name)
+        self._dirty = True
+        self._append(
+            "record", name, content_hash, fingerprint, output_bytes, files, fields
+        )
+
+    def get_quality(self, content_hash: str | None, search_key: str) -> int | None:
+        """Return a previously chosen adaptive quality for a photo, if any.
+
+        Args:
+            content_hash: Content hash of the source photo
+            search_key: Fingerprint of the adaptive search parameters
+
+        Returns:
+            Recorded quality, or None when the photo was never searched
+        """
+        if not content_hash:
+            return None
+        return self.qualities.get(content_hash, {}).get(search_key)
+
+    def record_quality(
+        self, content_hash: str | None, search_key: str, quality: int
+    ) -> None:
+        """Remember the adaptive quality chosen for a photo.
+
+        Args:
+            content_hash: Content hash of the source photo
+            search_key: Fingerprint of the adaptive search parameters
+            quality: Quality the search settled on
+        """
+        if not content_hash or self.get_quality(content_hash, search_key) == quality:
+            return
+        self.qualities.setdefault(content_hash, {})[search_key] = quality
+        self._dirty = True
+        self._append("quality", content_hash, search_key, quality)
+
+    def get_dimensions(self, content_hash: str | None) -> tuple[int, int] | None:
+        """Return the recorded (width, height) of a source photo, if any.
+
+        Args:
+            content_hash: Content hash of the source photo
+
+        Returns:
+            Display dimensions, or None when never probed
+        """
+        dims = self.dimensions.get(content_hash) if content_hash else None
+        return tuple(dims) if dims else None
+
+    def record_dimensions(
+        self, content_hash: str | None, dimensions: tuple[int, int]
+    ) -> None:
+        """Remember the display dimensions of a source photo.
+
+        Args:
+            content_hash: Content hash of the source photo
+            dimensions: (width, height) from probe_dimensions()
+        """
+        if not content_hash or self.get_dimensions(content_hash) == tuple(dimensions):
+            return
+        self.dimensions[content_hash] = list(dimensions)
+        self._dirty = True
+        self._append("dimensions", content_hash, list(dimensions))
+
+    def get_crop(
+        self, content_hash: str | None, crop_mode: str
+    ) -> tuple[float, ...] | None:
+        """Return the crop box chosen for a photo in a crop mode, if any.
+
+        Args:
+            content_hash: Content hash of the source photo
+            crop_mode: Smart crop mode the box was chosen with
+
+        Returns:
+            Normalised (left, top, right, bottom) box, or None
+        """
+        if not content_hash:
+            return None
+        box = self.crops.get(content_hash, {}).get(crop_mode)
+        return tuple(box) if box else None
+
+    def record_crop(
+        self, content_hash: str | None, crop_mode: str, box: tuple[float, ...]
+    ) -> None:
+        """Remember the crop box chosen for a photo.
+
+        Args:
+            content_hash: Content hash of the source photo
+            crop_mode: Smart crop mode the box was chosen with
+            box: Normalised (left, top, right, bottom) box
+        """
+        if not content_hash or self.get_crop(content_hash, crop_mode) == tuple(box):
+            return
+        self.crops.setdefault(content_hash, {})[crop_mode] = list(box)
+        self._dirty = True
+        self._append("crop", content_hash, crop_mode, list(box))
+
+    def save(self) -> None:
+        """Write the index atomically if it changed since load().
+
+        The index and journal are re-read first and this instance's changes
+        applied on top, so a concurrent process's saved or journaled entries
+        survive. The journal is removed afterwards: everything in it is now
+        in the index. A crash in between only replays the same changes again.
+        """
+        with self._locked():
+            # Another process's journal is folded in before it is removed
+            if self._dirty or self.journal_path.exists():
+                self._merge_saved()
+                self._write_index()
+            self.close()
+            self.journal_path.unlink(missing_ok=True)
+        self._changes = []
+
+    def _merge_saved(self) -> None:
+        """Reload the saved index and journal and re-apply this run's changes."""
+        changes, resumed = self._changes, self.resumed
+        self._read_index()
+        self._replay_journal()
+        self.resumed = resumed
+        self._replaying = True
+        try:
+            for op, *args in changes:
+                self._apply(op, args)
+        finally:
+            self._replaying = False
+
+    def _write_index(self) -> None:
+        """Replace the index file with the current entries."""
+        payload = {"version": CACHE_INDEX_VERSION, "entries": self.entries}
+        if self.qualities:
+            payload["qualities"] = self.qualities
+        if self.dimensions:
+            payload["dimensions"] = self.dimensions
+        if self.crops:
+            payload["crops"] = self.crops
+        with atomic_output(self.index_path) as tmp_path:
+            tmp_path.write_text(json.dumps(payload, sort_keys=True), encoding="utf-8")
+        self._dirty = False
@@ -0,0 +1,43 @@
+"""Header-only image dimension probing."""
+
+from pathlib import Path
+
+from PIL import Image
+
+# EXIF orientation tag and the values that rotate the image by 90 degrees
+_ORIENTATION_TAG = 0x0112
+_TRANSPOSED_ORIENTATIONS = {5, 6, 7, 8}
+
+
+class DimensionProbeError(Exception):
+    """Exception raised when an image header cannot be read."""
+
+    pass
+
+
+def probe_dimensions(path: Path | str) -> tuple[int, int]:
+    """Read an image's display size from its header without decoding pixels.
+
+    ``Image.open`` only parses the header; pixel data is never loaded. EXIF
+    orientations that rotate by 90 degrees swap width and height, so the
+    result matches what a browser displays.
+
+    Args:
+        path: Path to the image file
+
+    Returns:
+        Tuple of (width, height) in pixels
+
+    Raises:
+        DimensionProbeError: If the file is missing or not a readable image
+    """
+    try:
+        with Image.open(path) as img:
+            width, height = img.size
+            orientation = img.getexif().get(_ORIENTATION_TAG)
+    except Exception as e:
+        raise DimensionProbeError(f"Failed to read {path}: {e}") from e
+
+    if orientation in _TRANSPOSED_ORIENTATIONS:
+        return height, width
+    return width, height
@@ -0,0 +1,297 @@
+"""Bounded, supervised dispatch of thumbnail work to a parallel executor.
+
+The thumbnail plugin decides what a task is (a batch of compact work items
+or one whole photo) and what to do with its results; the TaskDispatcher
+decides when tasks are submitted and what happens when an executor stalls
+or breaks. Work is submitted in chunks, with at most ``window`` tasks
+outstanding, so memory stays flat for any collection size.
+"""
+
+import os
+import time
+from collections.abc import Callable
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    BrokenExecutor,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+
+from .pool import WorkerPool, kill_executor
+from .queue import DEFAULT_LEASE_SECONDS, DEFAULT_MAX_ATTEMPTS, SharedDirectoryExecutor
+from .worker import process_pool_options
+
+# A dispatched item is (index, photo, check_mtime); a task runs a list of them
+Item = tuple[int, dict, bool]
+
+
+class TaskDispatcher:
+    """Runs chunks of items on an executor it can kill and respawn.
+
+    Executor modes are "process" (the warm WorkerPool's workers when one is
+    given, otherwise a pool for this run only), "thread" and "distributed"
+    (a SharedDirectoryExecutor on ``queue_config["queue_dir"]``).
+
+    A photo that hangs or kills its worker costs a bounded amount of time.
+    When no task completes within ``photo_timeout_s`` times the largest
+    running batch, every running task is over its budget, so the executor is
+    killed and respawned, as it is after a worker crash. Work that was only
+    queued is resubmitted; suspect batches (those running at a stall, or
+    failed by a crashed executor) are split into single items, and suspect
+    single items are retried alone, one at a time after the main pass, up to
+    ``max_retries`` times before ``fail_item`` reports them. Only process mode is supervised: threads cannot be killed,
+    and distributed runs rely on their leases.
+
+    Usage:
+        with TaskDispatcher("process", submit_task, complete_task, fail_item,
+                            chunk_size=8) as dispatcher:
+            for item in items:
+                dispatcher.add(item)
+            dispatcher.finish()
+    """
+
+    def __init__(
+        self,
+        mode: str,
+        submit_task: Callable[[Executor, list[Item]], Future],
+        complete_task: Callable[[Future, list[Item]], None],
+        fail_item: Callable[[Item, str], None],
+        *,
+        chunk_size: int,
+        max_workers: int | None = None,
+        max_in_flight: int | None = None,
+        photo_timeout_s: float | None = None,
+        max_retries: int = 1,
+        worker_pool: WorkerPool | None = None,
+        queue_config: dict | None = None,
+    ) -> None:
+        """Initialize TaskDispatcher without starting the executor.
+
+        Args:
+            mode: Executor mode, "process", "thread" or "distributed"
+            submit_task: Called as ``submit_task(executor, items)`` to submit
+                one task and return its future
+            complete_task: Called with a finished future (result or
+                exception) and its items
+            fail_item: Called with an item and the reason once it has hung
+                or crashed more than ``max_retries`` times
+            chunk_size: Items per task
+            max_workers: Worker count, None for os.cpu_count()
+            max_in_flight: Outstanding tasks at most, None for twice the
+                worker count
+            photo_timeout_s: Per-item budget of a running task in process
+                mode; None or 0 disables supervision. Threads cannot be
+                killed, so thread mode is never supervised
+            max_retries: Times a suspect item is retried alone
+            worker_pool: Warm pool to reuse in process mode
+            queue_config: Processor config with "queue_dir" and the optional
+                queue settings, for distributed mode
+        """
+        self.mode = mode
+        self.chunk_size = chunk_size
+        self.max_workers = max_workers
+        self.workers = max_workers or os.cpu_count() or 1
+        self.window = max_in_flight or 2 * self.workers
+        self.photo_timeout_s = photo_timeout_s
+        self.max_retries = max_retries
+        self.supervised = bool(photo_timeout_s) and mode == "process"
+        # The warm pool outlives this run; only process mode uses it
+        self.worker_pool = worker_pool if mode == "process" else None
+        self.queue_config = queue_config or {}
+        self._submit_task = submit_task
+        self._complete_task = complete_task
+        self._fail_item = fail_item
+        self._executor: Executor | None = None
+        self._pending: dict[Future, list[Item]] = {}
+        self._chunk: list[Item] = []
+        self._isolated: list[Item] = []
+        self._last_progress = time.monotonic()
+
+    @property
+    def in_flight(self) -> int:
+        """Number of submitted tasks that have not been completed yet."""
+        return len(self._pending)
+
+    def __enter__(self) -> "TaskDispatcher":
+        """Start the executor (or fetch the warm pool's)."""
+        self._executor = self._open_executor()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        """Shut the executor down; the warm pool is left running.
+
+        When the run is abandoned by an exception (a cancelled upgrade, a
+        closed stream), tasks that have not started are cancelled instead
+        of being run for nobody; running tasks finish.
+        """
+        abandoned = exc_type is not None
+        if abandoned:
+            for future in self._pending:
+                future.cancel()
+            self._pending.clear()
+        self._close_executor(cancel=abandoned)
+
+    def add(self, item: Item) -> bool:
+        """Add an item to the current chunk, submitting the chunk when full.
+
+        Returns:
+            True if the chunk was submitted
+        """
+        self._chunk.append(item)
+        if len(self._chunk) < self.chunk_size:
+            return False
+        self.flush()
+        return True
+
+    def flush(self) -> None:
+        """Submit the current chunk, however small, once the window has room."""
+        if not self._chunk:
+            return
+        while len(self._pending) >= self.window:
+            self.collect()
+        self._submit(self._chunk)
+        self._chunk = []
+
+    def collect(self) -> None:
+        """Wait for at least one task and complete it (or recover the pool)."""
+        done, _ = wait(
+            self._pending, timeout=self._stall_timeout(), return_when=FIRST_COMPLETED
+        )
+        if not done:
+            if self._stall_timeout() == 0:
+                # Everything running is over its budget
+                self._recover({f for f in self._pending if f.running()})
+            return
+        self._last_progress = time.monotonic()
+        for future in done:
+            if isinstance(future.exception(), BrokenExecutor):
+                # A worker died (segfault, OOM kill); the suspects are the
+                # tasks the broken executor failed, not a guess by position
+                self._recover(
+                    {
+                        f
+                        for f in self._pending
+                        if f.done() and isinstance(f.exception(), BrokenExecutor)
+                    }
+                )
+                return
+            self._complete_task(future, self._pending.pop(future))
+
+    def finish(self) -> None:
+        """Submit what is left, wait for every task and retry suspects."""
+        self.flush()
+        while self._pending:
+            self.collect()
+        for item in self._isolated:
+            self._run_isolated(item)
+        self._isolated = []
+
+    def _open_executor(self) -> Executor:
+        """Start the executor for the mode (or fetch the warm pool's)."""
+        if self.mode == "thread":
+            return ThreadPoolExecutor(max_workers=self.max_workers)
+        if self.mode == "distributed":
+            return SharedDirectoryExecutor(
+                self.queue_config["queue_dir"],
+                lease_seconds=self.queue_config.get(
+                    "queue_lease_seconds", DEFAULT_LEASE_SECONDS
+                ),
+                max_attempts=self.queue_config.get(
+                    "queue_max_attempts", DEFAULT_MAX_ATTEMPTS
+                ),
+                local_workers=self.queue_config.get("queue_local_workers", 1),
+            )
+        if self.worker_pool is not None:
+            return self.worker_pool.get_executor(self.max_workers)
+        return ProcessPoolExecutor(
+            max_workers=self.max_workers, **process_pool_options()
+        )
+
+    def _close_executor(self, kill: bool = False, cancel: bool = False) -> None:
+        """Shut the executor down, or kill it when it is stuck.
+
+        Args:
+            kill: Kill the workers instead of waiting for them
+            cancel: Drop outstanding work instead of waiting for it
+        """
+        if self.worker_pool is not None:
+            # The warm pool outlives this run unless it is stuck
+            if kill:
+                self.worker_pool.kill()
+        elif kill:
+            kill_executor(self._executor)
+        else:
+            self._executor.shutdown(wait=True, cancel_futures=cancel)
+
+    def _stall_timeout(self) -> float | None:
+        """Seconds left before the running tasks count as stuck."""
+        if not self.supervised:
+            return None
+        running = [len(c) for f, c in self._pending.items() if f.running()]
+        budget = self.photo_timeout_s * max(running, default=self.chunk_size)
+        return max(0.0, self._last_progress + budget - time.monotonic())
+
+    def _submit(self, batch: list[Item]) -> None:
+        """Submit one task for a list of items."""
+        if not self._pending:
+            self._last_progress = time.monotonic()
+        self._pending[self._submit_task(self._executor, batch)] = batch
+
+    def _respawn(self) -> None:
+        """Kill the stuck or broken executor and start a fresh one."""
+        self._close_executor(kill=True)
+        self._executor = self._open_executor()
+        self._last_progress = time.monotonic()
+
+    def _recover(self, suspects: set[Future]) -> None:
+        """Respawn the executor and requeue its outstanding work.
+
+        Suspect batches are split so a bad item cannot take its batch mates
+        down again; suspect single items are set aside and retried alone
+        after the main pass.
+        """
+        self._respawn()
+        requeue = []
+        for future, batch in list(self._pending.items()):
+            del self._pending[future]
+            if (
+                future.done()
+                and not future.cancelled()
+                and not isinstance(future.exception(), BrokenExecutor)
+            ):
+                # Finished before the executor went down
+                self._complete_task(future, batch)
+            elif future not in suspects:
+                requeue.append(batch)
+            elif len(batch) > 1:
+                requeue.extend([item] for item in batch)
+            else:
+                self._isolated.append(batch[0])
+        for batch in requeue:
+            self._submit(batch)
+
+    def _run_isolated(self, item: Item) -> None:
+        """Retry a suspect item alone, so any crash is its own."""
+        for _ in range(self.max_retries):
+            self._submit([item])
+            (future,) = self._pending
+            done, _ = wait(
+                self._pending,
+                timeout=self.photo_timeout_s if self.supervised else None,
+            )
+            if done and not isinstance(future.exception(), BrokenExecutor):
+                self._complete_task(future, self._pending.pop(future))
+                return
+            reason = (
+                "worker process crashed"
+                if done
+                else f"timed out after {self.photo_timeout_s:g}s"
+            )
+            self._pending.clear()
+            self._respawn()
+        self._fail_item(
+            item, f"{reason}; gave up after {self.max_retries + 1} attempts"
+        )
@@ -0,0 +1,246 @@
+"""Perceptual hashes and near-duplicate clustering for photo collections."""
+
+import itertools
+import math
+
+import numpy as np
+from PIL import Image
+
+# Supported perceptual hash algorithms
+HASH_ALGORITHMS = ("dhash", "phash")
+
+# Bits per hash; both algorithms produce 64-bit hashes
+HASH_BITS = 64
+
+# Default maximum Hamming distance between near-duplicates
+DEFAULT_THRESHOLD = 4
+
+# Side of the greyscale proxy the DCT hash is computed from
+_PHASH_SIZE = 32
+
+# Low-frequency DCT block kept by the DCT hash
+_PHASH_BLOCK = 8
+
+# SWAR popcount masks, for numpy releases without bitwise_count (< 2.0)
+_M1 = np.uint64(0x5555555555555555)
+_M2 = np.uint64(0x3333333333333333)
+_M4 = np.uint64(0x0F0F0F0F0F0F0F0F)
+_H01 = np.uint64(0x0101010101010101)
+
+
+def _dct_matrix(size: int) -> np.ndarray:
+    """Orthonormal DCT-II basis, so ``D @ X @ D.T`` is the 2-D DCT of X."""
+    k = np.arange(size)[:, None]
+    n = np.arange(size)[None, :]
+    basis = np.cos(np.pi * (2 * n + 1) * k / (2 * size)) * np.sqrt(2 / size)
+    basis[0] /= np.sqrt(2)
+    return basis
+
+
+_DCT = _dct_matrix(_PHASH_SIZE)
+
+
+def _proxy(img: Image.Image, size: tuple[int, int]) -> np.ndarray:
+    """Shrink an image to a tiny greyscale array (aspect ratio ignored)."""
+    small = img.resize(size, Image.Resampling.BOX, reducing_gap=2.0)
+    return np.asarray(small.convert("L"), dtype=np.float64)
+
+
+def _pack(bits: np.ndarray) -> int:
+    """Pack a boolean array into an integer, first element most significant."""
+    return int.from_bytes(np.packbits(bits.ravel()).tobytes(), "big")
+
+
+def dhash(img: Image.Image) -> int:
+    """Difference hash: whether each pixel is brighter than its right neighbour.
+
+    Args:
+        img: Image to hash (any size; only a 9x8 proxy is analysed)
+
+    Returns:
+        64-bit hash
+    """
+    pixels = _proxy(img, (9, 8))
+    return _pack(pixels[:, 1:] > pixels[:, :-1])
+
+
+def phash(img: Image.Image) -> int:
+    """DCT hash: low-frequency coefficients compared with their median.
+
+    More robust to brightness and contrast edits than dhash, at the cost of
+    a 32x32 proxy and two small matrix products.
+
+    Args:
+        img: Image to hash (any size; only a 32x32 proxy is analysed)
+
+    Returns:
+        64-bit hash
+    """
+    pixels = _proxy(img, (_PHASH_SIZE, _PHASH_SIZE))
+    coefficients = (_DCT @ pixels @ _DCT.T)[:_PHASH_BLOCK, :_PHASH_BLOCK]
+    # The DC term only encodes mean brightness; leave it out of the median
+    median = np.median(coefficients.ravel()[1:])
+    return _pack(coefficients > median)
+
+
+def perceptual_hash(img: Image.Image, algorithm: str = "dhash") -> str:
+    """Hash an image and format the result as 16 hex digits.
+
+    Args:
+        img: Image to hash
+        algorithm: "dhash" or "phash"
+
+    Returns:
+        Zero-padded lower-case hex string
+
+    Raises:
+        ValueError: If the algorithm is unknown
+    """
+    if algorithm == "dhash":
+        value = dhash(img)
+    elif algorithm == "phash":
+        value = phash(img)
+    else:
+        raise ValueError(f"Unknown perceptual hash algorithm: {algorithm!r}")
+    return f"{value:016x}"
+
+
+def _popcount(x: np.ndarray) -> np.ndarray:
+    """Set bits in each element of a uint64 array."""
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(x)
+    x = x - ((x >> np.uint64(1)) & _M1)
+    x = (x & _M2) + ((x >> np.uint64(2)) & _M2)
+    x = (x + (x >> np.uint64(4))) & _M4
+    return (x * _H01) >> np.uint64(56)
+
+
+def hamming_distances(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Element-wise Hamming distance between two uint64 arrays."""
+    return _popcount(np.bitwise_xor(a, b))
+
+
+def _chunk_bounds(chunks: int) -> list[tuple[int, int]]:
+    """Split the hash into near-equal bit ranges, as (shift, width) pairs."""
+    bounds = []
+    start = 0
+    for i in range(chunks):
+        width = HASH_BITS // chunks + (1 if i < HASH_BITS % chunks else 0)
+        bounds.append((HASH_BITS - start - width, width))
+        start += width
+    return bounds
+
+
+def _chunks_per_key(count: int, threshold: int) -> int:
+    """Pick how many chunks each lookup key combines, minimising expected work.
+
+    With ``threshold + k`` chunks, two hashes within the threshold agree
+    exactly on at least ``k`` of them. Keying on every combination of ``k``
+    chunks costs one sort per combination but makes buckets exponentially
+    sparser, so larger thresholds and collections favour larger ``k``.
+    """
+
+    def cost(k: int) -> float:
+        chunks = threshold + k
+        key_bits = HASH_BITS * k / chunks
+        per_key = count * (math.log2(count) + count / 2**key_bits)
+        return math.comb(chunks, k) * per_key
+
+    return min(range(1, 5), key=cost)
+
+
+def _candidate_pairs(keys: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """All index pairs (i < j) whose keys are equal, found by sorting."""
+    order = np.argsort(keys, kind="stable")
+    sorted_keys = keys[order]
+    # Position one past the end of each element's run of equal keys
+    starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+    run_ends = np.repeat(
+        np.r_[starts[1:], len(keys)], np.diff(np.r_[starts, len(keys)])
+    )
+
+    firsts, seconds = [], []
+    positions = np.arange(len(keys))
+    offset = 1
+    active = positions[run_ends - positions > offset]
+    while active.size:
+        firsts.append(order[active])
+        seconds.append(order[active + offset])
+        offset += 1
+        active = active[run_ends[active] - active > offset]
+    if not firsts:
+        empty = np.empty(0, dtype=np.intp)
+        return empty, empty
+    return np.concatenate(firsts), np.concatenate(seconds)
+
+
+def find_duplicate_groups(
+    hashes: list[str], threshold: int = DEFAULT_THRESHOLD
+) -> list[list[int]]:
+    """Cluster hashes that lie within a Hamming distance of each other.
+
+    Uses multi-index hashing instead of comparing every pair: the 64 bits
+    are split into ``threshold + k`` chunks, and by the pigeonhole principle
+    two hashes at distance <= threshold agree exactly on at least ``k`` of
+    them. Each combination of ``k`` chunks is bucketed with one sort, only
+    hashes sharing a bucket are compared, and matches are merged
+    transitively with union-find.
+
+    Args:
+        hashes: Hex hashes from perceptual_hash(); ``None`` entries are skipped
+        threshold: Maximum Hamming distance between near-duplicates
+
+    Returns:
+        Groups of two or more indices into ``hashes``, each sorted, ordered
+        by their first index
+
+    Raises:
+        ValueError: If threshold is negative or not below HASH_BITS
+    """
+    if not 0 <= threshold < HASH_BITS:
+        raise ValueError(f"threshold must be in [0, {HASH_BITS}), got {threshold}")
+
+    present = [i for i, value in enumerate(hashes) if value is not None]
+    if len(present) < 2:
+        return []
+    values = np.array([int(hashes[i], 16) for i in present], dtype=np.uint64)
+
+    k = _chunks_per_key(len(values), threshold)
+    chunks = [
+        (values >> np.uint64(shift)) & np.uint64((1 << width) - 1)
+        for shift, width in _chunk_bounds(threshold + k)
+    ]
+    widths = [width for _, width in _chunk_bounds(threshold + k)]
+
+    pair_codes = []
+    for combination in itertools.combinations(range(len(chunks)), k):
+        keys = np.zeros_like(values)
+        for i in combination:
+            keys = (keys << np.uint64(widths[i])) | chunks[i]
+        first, second = _candidate_pairs(keys)
+        close = hamming_distances(values[first], values[second]) <= threshold
+        low = np.minimum(first[close], second[close])
+        high = np.maximum(first[close], second[close])
+        pair_codes.append(low.astype(np.int64) * len(values) + high)
+    codes = np.unique(np.concatenate(pair_codes))
+
+    parent = list(range(len(values)))
+
+    def root(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for low, high in zip(*np.divmod(codes, len(values)), strict=True):
+        a, b = root(int(low)), root(int(high))
+        if a != b:
+            parent[max(a, b)] = min(a, b)
+
+    groups: dict[int, list[int]] = {}
+    for i in range(len(values)):
+        groups.setdefault(root(i), []).append(present[i])
+    return sorted(
+        (members for members in groups.values() if len(members) > 1),
+        key=lambda members: members[0],
+    )
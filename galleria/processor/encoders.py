@@ -0,0 +1,157 @@
+"""Pluggable thumbnail encoders (WebP, AVIF, JPEG)."""
+
+import io
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from PIL import Image, features
+
+from .cache import atomic_output
+
+
+class UnsupportedFormatError(ValueError):
+    """Exception raised for an unknown or unavailable output format."""
+
+    pass
+
+
+@dataclass(frozen=True)
+class Encoder:
+    """Describes how to write an image in one output format.
+
+    Usage:
+        encoder = get_encoder("avif")
+        encoder.save(img, output_dir / f"photo.{encoder.extension}", quality=60)
+    """
+
+    name: str
+    """Format name used in config (e.g. "webp")."""
+
+    extension: str
+    """File extension without the dot."""
+
+    mime_type: str
+    """MIME type emitted in ``<source type=...>``."""
+
+    pil_format: str
+    """Format name passed to ``Image.save``."""
+
+    feature: str | None = None
+    """PIL feature that must be compiled in, if any."""
+
+    save_options: dict = field(default_factory=dict)
+    """Extra keyword arguments for ``Image.save``."""
+
+    fast_options: dict = field(default_factory=dict)
+    """Keyword arguments overriding ``save_options`` for quick previews."""
+
+    @property
+    def available(self) -> bool:
+        """Whether the installed Pillow can write this format."""
+        return self.feature is None or bool(features.check(self.feature))
+
+    def save(
+        self, img: Image.Image, path: Path, quality: int, fast: bool = False
+    ) -> int:
+        """Encode an image to ``path``, replacing it atomically.
+
+        Args:
+            img: RGB image to encode
+            path: Output file path
+            quality: Encoder quality (0-100)
+            fast: Use the lowest encoder effort (dev-server previews)
+
+        Returns:
+            Size of the written file in bytes
+        """
+        options = (
+            {**self.save_options, **self.fast_options} if fast else self.save_options
+        )
+        with atomic_output(path) as tmp_path:
+            img.save(tmp_path, self.pil_format, quality=quality, **options)
+        return Path(path).stat().st_size
+
+    def encode(self, img: Image.Image, quality: int) -> bytes:
+        """Encode an image in memory, e.g. to measure it before writing.
+
+        Args:
+            img: RGB image to encode
+            quality: Encoder quality (0-100)
+
+        Returns:
+            Encoded file contents
+        """
+        buffer = io.BytesIO()
+        img.save(buffer, self.pil_format, quality=quality, **self.save_options)
+        return buffer.getvalue()
+
+
+_ENCODERS: dict[str, Encoder] = {}
+
+
+def register_encoder(encoder: Encoder, aliases: tuple[str, ...] = ()) -> None:
+    """Register an encoder under its name, file extension and any aliases.
+
+    Args:
+        encoder: Encoder to register (replaces one with the same name)
+        aliases: Additional config names resolving to this encoder
+    """
+    for name in (encoder.name, encoder.extension, *aliases):
+        _ENCODERS[name.lower()] = encoder
+
+
+def get_encoder(name: str) -> Encoder:
+    """Look up an available encoder by config name.
+
+    Args:
+        name: Format name or alias (case-insensitive)
+
+    Returns:
+        Registered Encoder
+
+    Raises:
+        UnsupportedFormatError: If the format is unknown or Pillow lacks support
+    """
+    encoder = _ENCODERS.get(str(name).lower())
+    if encoder is None:
+        raise UnsupportedFormatError(
+            f"Unsupported output format: {name!r} "
+            f"(known: {', '.join(sorted(_ENCODERS))})"
+        )
+    if not encoder.available:
+        raise UnsupportedFormatError(
+            f"Output format {name!r} is not supported by the installed Pillow"
+        )
+    return encoder
+
+
+register_encoder(
+    Encoder(
+        "webp",
+        "webp",
+        "image/webp",
+        "WEBP",
+        feature="webp",
+        fast_options={"method": 0},
+    ),
+)
+register_encoder(
+    Encoder(
+        "avif",
+        "avif",
+        "image/avif",
+        "AVIF",
+        feature="avif",
+        fast_options={"speed": 10},
+    ),
+)
+register_encoder(
+    Encoder(
+        "jpeg",
+        "jpg",
+        "image/jpeg",
+        "JPEG",
+        save_options={"optimize": True, "progressive": True},
+        fast_options={"optimize": False, "progressive": False},
+    ),
+)
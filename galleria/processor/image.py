@@ -1,8 +1,16 @@
 """Image processor for generating optimized thumbnails."""
 
+import math
 from pathlib import Path
 
-from PIL import Image
+from PIL import Image, ImageOps
+
+from .cache import atomic_output
+from .crop import crop_to_box, smart_crop_box
+from .duplicates import perceptual_hash as compute_perceptual_hash
+from .encoders import Encoder, UnsupportedFormatError, get_encoder
+from .placeholder import make_placeholder
+from .quality import DEFAULT_MAX_QUALITY, DEFAULT_MIN_QUALITY, search_quality
 
 
 class ImageProcessingError(Exception):
@@ -11,20 +19,76 @@ class ImageProcessingError(Exception):
     pass
 
 
+# Decoded bytes per pixel for common modes; anything else is assumed 4
+_BYTES_PER_PIXEL = {"1": 1, "L": 1, "P": 1, "LA": 2, "I;16": 2, "RGB": 3, "YCbCr": 3}
+
+
+# Largest source accepted, in pixels, checked from the header before any
+# decoding. The default is where Pillow itself refuses a file as a
+# decompression bomb (twice Image.MAX_IMAGE_PIXELS)
+DEFAULT_MAX_IMAGE_PIXELS = 178_956_970
+
+
+def _upright(img: Image.Image) -> Image.Image:
+    """Apply the EXIF orientation to the pixels, as viewers display them."""
+    ImageOps.exif_transpose(img, in_place=True)
+    return img
+
+
+def _resampling(preview: bool) -> Image.Resampling:
+    """Resize filter: LANCZOS for final output, BILINEAR for quick previews."""
+    return Image.Resampling.BILINEAR if preview else Image.Resampling.LANCZOS
+
+
+def _resolve_encoder(output_format: str) -> Encoder:
+    """Look up an encoder, reporting unknown formats as processing errors."""
+    try:
+        return get_encoder(output_format)
+    except UnsupportedFormatError as e:
+        raise ImageProcessingError(str(e)) from e
+
+
 class ImageProcessor:
-    """Processor for generating optimized WebP thumbnails from images."""
+    """Processor for generating optimized thumbnails (WebP by default) from images."""
+
+    def __init__(self, max_image_pixels: int | None = DEFAULT_MAX_IMAGE_PIXELS):
+        """Initialize image processor.
+
+        Args:
+            max_image_pixels: Refuse sources with more pixels than this before
+                decoding them; None or 0 disables the check
+        """
+        self.max_image_pixels = max_image_pixels
 
     def process_image(
-        self, source_path, output_dir, size=400, quality=85, output_name=None
+        self,
+        source_path,
+        output_dir,
+        size=400,
+        quality=85,
+        output_name=None,
+        reduced_decode=True,
+        output_format="webp",
+        crop="center",
+        crop_box=None,
+        preview=False,
     ):
-        """Process a single image to generate a WebP thumbnail.
+        """Process a single image to generate a square thumbnail.
 
         Args:
             source_path: Path to source image file
             output_dir: Directory to save thumbnail
             size: Thumbnail size (creates square thumbnail)
-            quality: WebP quality setting (0-100)
-            output_name: Optional custom output name (defaults to source stem)
+            quality: Encoder quality setting (0-100)
+            output_name: Optional custom output name (defaults to source stem);
+                the format's extension is appended unless already present
+            reduced_decode: Decode at the smallest scale still covering size
+                (JPEG DCT scaling or integer reduce) instead of full resolution
+            output_format: Registered encoder name ("webp", "avif", "jpeg")
+            crop: Crop mode, "center", "entropy" or "edges"
+            crop_box: Normalised crop box from an earlier run; skips scoring
+            preview: Quick preview: bilinear resampling and the encoder's
+                lowest effort, for the dev server
 
         Returns:
             Path to generated thumbnail
@@ -39,30 +103,32 @@ class ImageProcessor:
         if not source_path.exists():
             raise ImageProcessingError(f"Source file does not exist: {source_path}")
 
+        encoder = _resolve_encoder(output_format)
+
         try:
-            # Load image
-            img = Image.open(source_path)
+            # Load image upright, optionally at a reduced scale
+            img = self._open_image(source_path, size, reduced_decode)
 
             # Convert to RGB if needed (for RGBA, grayscale, etc.)
             if img.mode != "RGB":
                 img = img.convert("RGB")
 
-            # Apply center crop to square
-            img_cropped = self._center_crop_to_square(img)
+            # Crop to square (centre or content-aware)
+            img_cropped, _ = self._crop_to_square(img, crop, crop_box)
 
             # Resize to target size
-            img_resized = img_cropped.resize((size, size), Image.Resampling.LANCZOS)
+            img_resized = img_cropped.resize((size, size), _resampling(preview))
 
             # Determine output filename
+            extension = "." + encoder.extension
             if output_name is None:
-                output_name = source_path.stem + ".webp"
-            elif not output_name.endswith(".webp"):
-                output_name = output_name + ".webp"
+                output_name = source_path.stem + extension
+            elif not output_name.lower().endswith(extension):
+                output_name = output_name + extension
 
             output_path = output_dir / output_name
 
-            # Save as WebP
-            img_resized.save(output_path, "WEBP", quality=quality)
+            encoder.save(img_resized, output_path, quality, fast=preview)
 
             return output_path
 
@@ -71,6 +137,347 @@ class ImageProcessor:
                 f"Failed to process image {source_path}: {e}"
             ) from e
 
+    def process_derivatives(
+        self,
+        source_path,
+        output_dir,
+        outputs,
+        quality=85,
+        web_name=None,
+        web_size=None,
+        reduced_decode=True,
+        output_format="webp",
+        alternate_formats=(),
+        smallest_wins=False,
+        format_quality=None,
+        target_ssim=None,
+        quality_range=(DEFAULT_MIN_QUALITY, DEFAULT_MAX_QUALITY),
+        placeholder=False,
+        crop="center",
+        crop_box=None,
+        perceptual_hash=None,
+        web_dir=None,
+        web_format=None,
+        web_quality=None,
+        preview=False,
+    ):
+        """Generate a ladder of square thumbnails and a web size from one decode.
+
+        The source is decoded once at the smallest scale covering the largest
+        requested output, cropped to a square once (centre or ``crop`` mode),
+        and every square size is resized from that crop. The optional web
+        derivative keeps the aspect ratio and limits the long edge to
+        ``web_size`` (never upscaled).
+
+        Each square size is also encoded in every alternate format, next to
+        the primary file with the alternate's extension. With
+        ``smallest_wins`` an alternate is kept only if its files are smaller
+        in total than the primary format's; otherwise they are deleted.
+
+        With ``target_ssim`` the primary format's quality is chosen per image:
+        the lowest quality in ``quality_range`` whose largest square output
+        reaches the SSIM target is searched for and used for every primary
+        output. Alternates without a ``format_quality`` entry use it too.
+
+        With ``placeholder`` a tiny LQIP and the dominant colour are computed
+        from the smallest square output while it is still in memory.
+
+        The EXIF orientation is applied to the decode, so the crop, the hash
+        and every derivative see the photo upright; outputs carry no
+        metadata. ``web_dir``, ``web_format`` and ``web_quality`` send the
+        web derivative to a separate tree (e.g. ``pics/web``) with its own
+        encoder instead of next to the thumbnails.
+
+        With ``perceptual_hash`` the uncropped decode is also hashed ("dhash"
+        or "phash") for near-duplicate detection; it costs under a millisecond.
+
+        With ``preview`` every output is resized bilinearly and encoded at the
+        encoder's lowest effort: the dev server shows these within seconds
+        and replaces them with full-quality files in the background.
+
+        Args:
+            source_path: Path to source image file
+            output_dir: Directory to save derivatives
+            outputs: Mapping of square size in pixels to output file name
+            quality: Encoder quality setting (0-100)
+            web_name: Output file name for the web derivative
+            web_size: Long-edge limit of the web derivative, None to skip it
+            reduced_decode: Decode at the smallest scale still covering outputs
+            output_format: Primary encoder name, used for the fallback ``<img>``
+            alternate_formats: Extra encoder names for ``<source>`` elements
+            smallest_wins: Drop alternates that are not smaller than primary
+            format_quality: Optional per-format quality overriding ``quality``
+            target_ssim: Mean SSIM target for adaptive quality, None to disable
+            quality_range: (min, max) quality searched when adaptive
+            placeholder: Whether to compute an LQIP and dominant colour
+            crop: Crop mode, "center", "entropy" or "edges"
+            crop_box: Normalised crop box from an earlier run; skips scoring
+            perceptual_hash: Perceptual hash algorithm, None to skip hashing
+            web_dir: Directory for the web derivative, None for ``output_dir``
+            web_format: Encoder name for the web derivative, None for primary
+            web_quality: Quality for the web derivative, None for primary
+            preview: Quick preview resampling and encoder effort
+
+        Returns:
+            Dict with:
+                - thumbnails: {size: Path} for each square derivative
+                - web: (Path, (width, height)) or None
+                - sources: [{"format", "mime_type", "thumbnails": {size: Path}}]
+                  for each kept alternate format, in the configured order
+                - quality: Quality used for the primary format
+                - placeholder: {"lqip", "dominant_color", "elapsed_s"} or None
+                - crop_box: Normalised box used, None for the centre crop
+                - perceptual_hash: 16 hex digit hash, or None
+
+        Raises:
+            ImageProcessingError: If processing fails
+        """
+        source_path = Path(source_path)
+        output_dir = Path(output_dir)
+
+        if not source_path.exists():
+            raise ImageProcessingError(f"Source file does not exist: {source_path}")
+
+        encoder = _resolve_encoder(output_format)
+        alternates = [
+            alternate
+            for alternate in map(_resolve_encoder, alternate_formats)
+            if alternate != encoder
+        ]
+        format_quality = format_quality or {}
+
+        def quality_for(enc: Encoder) -> int:
+            return format_quality.get(
+                enc.name, format_quality.get(enc.extension, quality)
+            )
+
+        try:
+            square_size = max(outputs) if outputs else 0
+            img = self._open_image(
+                source_path, square_size, reduced_decode, long_edge=web_size
+            )
+            if img.mode != "RGB":
+                img = img.convert("RGB")
+
+            thumbnails = {}
+            primary_bytes = 0
+            sources = [
+                {"encoder": alternate, "thumbnails": {}, "bytes": 0}
+                for alternate in alternates
+            ]
+            primary_quality = quality_for(encoder)
+            hash_value = (
+                compute_perceptual_hash(img, perceptual_hash)
+                if perceptual_hash
+                else None
+            )
+            # The web size is resized first: when it still covers the largest
+            # square, the squares are cut from it instead of the (up to 2x
+            # larger) decode, which keeps LANCZOS off the full-size pixels
+            square_source = img
+            if web_size:
+                width, height = img.size
+                scale = min(1.0, web_size / max(width, height))
+                web_dims = (max(1, round(width * scale)), max(1, round(height * scale)))
+                img_web = img.resize(web_dims, _resampling(preview))
+                if min(web_dims) >= square_size:
+                    square_source = img_web
+            img_cropped, used_box = self._crop_to_square(
+                square_source, crop, crop_box
+            )
+            for size in sorted(outputs, reverse=True):
+                output_path = output_dir / outputs[size]
+                img_resized = img_cropped.resize((size, size), _resampling(preview))
+                if target_ssim is not None and not thumbnails:
+                    # Tune on the largest output; smaller ones reuse the choice
+                    primary_quality, data = search_quality(
+                        img_resized, encoder, target_ssim, *quality_range
+                    )
+                    with atomic_output(output_path) as tmp_path:
+                        tmp_path.write_bytes(data)
+                    primary_bytes += len(data)
+                    quality = primary_quality
+                else:
+                    primary_bytes += encoder.save(
+                        img_resized, output_path, primary_quality, fast=preview
+                    )
+                thumbnails[size] = output_path
+                for source in sources:
+                    alternate = source["encoder"]
+                    alternate_path = output_path.with_suffix("." + alternate.extension)
+                    source["bytes"] += alternate.save(
+                        img_resized,
+                        alternate_path,
+                        quality_for(alternate),
+                        fast=preview,
+                    )
+                    source["thumbnails"][size] = alternate_path
+
+            # Sizes run largest first, so img_resized is now the smallest
+            placeholder_data = make_placeholder(img_resized) if placeholder else None
+
+            kept_sources = []
+            for source in sources:
+                if smallest_wins and source["bytes"] >= primary_bytes:
+                    for path in source["thumbnails"].values():
+                        path.unlink(missing_ok=True)
+                    continue
+                kept_sources.append(
+                    {
+                        "format": source["encoder"].extension,
+                        "mime_type": source["encoder"].mime_type,
+                        "thumbnails": dict(sorted(source["thumbnails"].items())),
+                    }
+                )
+
+            web = None
+            if web_size:
+                web_encoder = _resolve_encoder(web_format) if web_format else encoder
+                web_path = Path(web_dir or output_dir) / (
+                    web_name or f"{source_path.stem}-web.{web_encoder.extension}"
+                )
+                web_path.parent.mkdir(parents=True, exist_ok=True)
+                web_encoder.save(
+                    img_web, web_path, web_quality or primary_quality, fast=preview
+                )
+                web = (web_path, img_web.size)
+
+            return {
+                "thumbnails": thumbnails,
+                "web": web,
+                "sources": kept_sources,
+                "quality": primary_quality,
+                "placeholder": placeholder_data,
+                "crop_box": used_box,
+                "perceptual_hash": hash_value,
+            }
+
+        except OSError as e:
+            raise ImageProcessingError(
+                f"Failed to process image {source_path}: {e}"
+            ) from e
+
+    def estimate_decode_bytes(
+        self, source_path, size, reduced_decode=True, long_edge=None
+    ):
+        """Estimate the memory needed to decode an image, from its header only.
+
+        Mirrors the scale choice of _open_image(): JPEG files are assumed to
+        decode at the largest DCT scale (1/2, 1/4, 1/8) that still covers the
+        request, other formats at full size.
+
+        Args:
+            source_path: Path to source image file
+            size: Target square thumbnail size in pixels
+            reduced_decode: Whether reduced-scale decoding is enabled
+            long_edge: Optional long-edge size that must also be covered
+
+        Returns:
+            Estimated decoded pixel buffer size in bytes
+
+        Raises:
+            ImageProcessingError: If the image header cannot be read
+        """
+        try:
+            with Image.open(source_path) as img:
+                width, height = img.size
+                mode, image_format = img.mode, img.format
+        except Exception as e:
+            raise ImageProcessingError(f"Failed to read {source_path}: {e}") from e
+
+        scale = 1
+        if reduced_decode and image_format == "JPEG":
+            request = max(size, 1)
+            for factor in (8, 4, 2):
+                fits_size = min(width, height) // factor >= request
+                fits_edge = not long_edge or max(width, height) // factor >= long_edge
+                if fits_size and fits_edge:
+                    scale = factor
+                    break
+            mode = "RGB"
+
+        bytes_per_pixel = _BYTES_PER_PIXEL.get(mode, 4)
+        return math.ceil(width / scale) * math.ceil(height / scale) * bytes_per_pixel
+
+    def _open_image(self, source_path, size, reduced_decode=True, long_edge=None):
+        """Open and decode an image, reducing scale where the decoder allows.
+
+        JPEG files are decoded through DCT scaling (``Image.draft``), which
+        skips most of the decode work for 1/2, 1/4 and 1/8 scales. Other
+        formats are fully decoded and then box-reduced by an integer factor.
+        Both paths keep the short side at or above ``size`` (and the long
+        edge at or above ``long_edge``) so the final LANCZOS resize never
+        upsamples. The EXIF orientation is then applied to the pixels, so
+        callers crop and resize the photo as it is displayed.
+
+        Args:
+            source_path: Path to source image file
+            size: Target square thumbnail size in pixels
+            reduced_decode: Whether to decode at a reduced scale
+            long_edge: Optional long-edge size that must also be covered
+
+        Returns:
+            Loaded, upright PIL Image object
+
+        Raises:
+            ImageProcessingError: If the image has more than max_image_pixels
+        """
+        try:
+            img = Image.open(source_path)
+        except Image.DecompressionBombError as e:
+            raise ImageProcessingError(str(e)) from e
+
+        width, height = img.size
+        if self.max_image_pixels and width * height > self.max_image_pixels:
+            img.close()
+            raise ImageProcessingError(
+                f"{width}x{height} image exceeds max_image_pixels "
+                f"({self.max_image_pixels})"
+            )
+
+        if not reduced_decode:
+            return _upright(img)
+
+        request = (max(size, 1), max(size, 1))
+        if long_edge:
+            scale = long_edge / max(width, height)
+            request = (
+                max(request[0], math.ceil(width * scale)),
+                max(request[1], math.ceil(height * scale)),
+            )
+
+        if img.format == "JPEG":
+            # draft() picks the largest DCT scale with both sides >= request
+            img.draft("RGB", request)
+            img.load()
+            return _upright(img)
+
+        factor = min(width // request[0], height // request[1])
+        if factor > 1:
+            # reduce() is not implemented for palette and 16-bit modes
+            if img.mode != "RGB":
+                img = img.convert("RGB")
+            img = img.reduce(factor)
+
+        return _upright(img)
+
+    def _crop_to_square(self, img, crop="center", crop_box=None):
+        """Crop an image to a square using a crop mode or a known box.
+
+        Args:
+            img: PIL Image object (possibly a reduced-scale decode)
+            crop: Crop mode, "center", "entropy" or "edges"
+            crop_box: Normalised box to reuse instead of scoring the image
+
+        Returns:
+            Tuple of (square image, normalised box used or None for centre)
+        """
+        if crop_box is None:
+            if crop == "center":
+                return self._center_crop_to_square(img), None
+            crop_box = smart_crop_box(img, crop)
+        return crop_to_box(img, crop_box), tuple(crop_box)
+
     def _center_crop_to_square(self, img):
         """Crop image to square using center crop strategy.
 
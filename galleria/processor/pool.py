@@ -0,0 +1,114 @@
+"""Long-lived worker pool shared by thumbnail processing across builds."""
+
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor
+
+from .worker import process_pool_options
+
+
+def kill_executor(executor: Executor) -> None:
+    """Stop an executor without waiting for its running tasks.
+
+    Worker processes are killed, so a task stuck in native code (a
+    decompression bomb, a decoder loop) cannot keep its worker busy. Threads
+    cannot be killed: a stuck thread is abandoned and exits when its task
+    does. Outstanding futures fail or are cancelled.
+
+    Args:
+        executor: Executor to stop
+    """
+    # Snapshot first: shutdown() forgets the processes
+    processes = list((getattr(executor, "_processes", None) or {}).values())
+    executor.shutdown(wait=False, cancel_futures=True)
+    for process in processes:
+        if process.is_alive():
+            process.kill()
+
+
+class WorkerPool:
+    """Lazily created ProcessPoolExecutor that survives between builds.
+
+    Owners (the serve and build orchestrators) create one WorkerPool and hand
+    it to every GalleriaBuilder.build() call. The underlying executor is only
+    started on the first parallel build, is reused by later builds with the
+    same worker count and is replaced when ``max_workers`` changes.
+
+    Usage:
+        pool = WorkerPool()
+        executor = pool.get_executor(max_workers=4)
+        ...
+        pool.shutdown()
+    """
+
+    def __init__(self) -> None:
+        """Initialize WorkerPool without starting any worker processes."""
+        self._executor: ProcessPoolExecutor | None = None
+        self._max_workers: int | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_running(self) -> bool:
+        """Whether worker processes have been started and not shut down."""
+        return self._executor is not None
+
+    @property
+    def max_workers(self) -> int | None:
+        """Worker count of the running executor, or None if not running."""
+        return self._max_workers
+
+    def get_executor(self, max_workers: int | None = None) -> ProcessPoolExecutor:
+        """Return the shared executor, starting or resizing it as needed.
+
+        Args:
+            max_workers: Desired worker count (None means os.cpu_count())
+
+        Returns:
+            Running ProcessPoolExecutor with the requested worker count
+        """
+        workers = max_workers or os.cpu_count() or 1
+
+        with self._lock:
+            if self._executor is not None and self._max_workers != workers:
+                # Worker count changed in config - drain and replace the pool
+                self._executor.shutdown(wait=True)
+                self._executor = None
+
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=workers, **process_pool_options()
+                )
+                self._max_workers = workers
+
+            return self._executor
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop all worker processes. Safe to call more than once.
+
+        Args:
+            wait: Whether to block until pending work has finished
+        """
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=wait, cancel_futures=not wait)
+            self._executor = None
+            self._max_workers = None
+
+    def kill(self) -> None:
+        """Kill the worker processes without waiting, e.g. when one is stuck.
+
+        The next get_executor() call starts fresh workers.
+        """
+        with self._lock:
+            if self._executor is not None:
+                kill_executor(self._executor)
+            self._executor = None
+            self._max_workers = None
+
+    def __enter__(self) -> "WorkerPool":
+        """Use the pool as a context manager that shuts down on exit."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        """Shut the pool down when leaving the context."""
+        self.shutdown()
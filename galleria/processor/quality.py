@@ -0,0 +1,119 @@
+"""Perceptual quality metric and per-image encoder quality search."""
+
+import io
+
+import numpy as np
+from PIL import Image
+
+from .encoders import Encoder
+
+# Lowest and highest quality tried by the adaptive search
+DEFAULT_MIN_QUALITY = 30
+DEFAULT_MAX_QUALITY = 95
+
+# Mean SSIM a thumbnail must reach; ~0.95 is visually lossless at grid size
+DEFAULT_TARGET_SSIM = 0.95
+
+# SSIM stabilising constants for 8-bit data (Wang et al. 2004)
+_C1 = (0.01 * 255) ** 2
+_C2 = (0.03 * 255) ** 2
+
+
+def _luma(img: Image.Image) -> np.ndarray:
+    """Return an image's luma channel as a float64 array."""
+    return np.asarray(img.convert("L"), dtype=np.float64)
+
+
+def _box_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """Mean over every ``window`` x ``window`` block using a summed-area table."""
+    table = np.pad(values, ((1, 0), (1, 0))).cumsum(axis=0).cumsum(axis=1)
+    sums = (
+        table[window:, window:]
+        - table[:-window, window:]
+        - table[window:, :-window]
+        + table[:-window, :-window]
+    )
+    return sums / (window * window)
+
+
+def ssim(reference: Image.Image, candidate: Image.Image, window: int = 8) -> float:
+    """Mean structural similarity of two equally sized images.
+
+    Computed on luma over sliding square windows, fully vectorised: local
+    means, variances and covariance all come from summed-area tables, so one
+    call costs a handful of array passes regardless of window size.
+
+    Args:
+        reference: Image the candidate should match
+        candidate: Decoded encoder output
+        window: Side of the sliding window in pixels
+
+    Returns:
+        Mean SSIM in [-1, 1]; 1.0 means identical
+
+    Raises:
+        ValueError: If the images differ in size
+    """
+    if reference.size != candidate.size:
+        raise ValueError(
+            f"SSIM needs equal sizes, got {reference.size} and {candidate.size}"
+        )
+
+    x = _luma(reference)
+    y = _luma(candidate)
+    window = max(1, min(window, *x.shape))
+
+    mu_x = _box_mean(x, window)
+    mu_y = _box_mean(y, window)
+    var_x = _box_mean(x * x, window) - mu_x * mu_x
+    var_y = _box_mean(y * y, window) - mu_y * mu_y
+    cov_xy = _box_mean(x * y, window) - mu_x * mu_y
+
+    ssim_map = ((2 * mu_x * mu_y + _C1) * (2 * cov_xy + _C2)) / (
+        (mu_x * mu_x + mu_y * mu_y + _C1) * (var_x + var_y + _C2)
+    )
+    return float(ssim_map.mean())
+
+
+def search_quality(
+    img: Image.Image,
+    encoder: Encoder,
+    target_ssim: float = DEFAULT_TARGET_SSIM,
+    min_quality: int = DEFAULT_MIN_QUALITY,
+    max_quality: int = DEFAULT_MAX_QUALITY,
+) -> tuple[int, bytes]:
+    """Binary-search the lowest quality whose output meets an SSIM target.
+
+    SSIM rises with quality for all supported encoders, so about
+    log2(max_quality - min_quality) encodes are needed. If even
+    ``max_quality`` misses the target, ``max_quality`` is returned.
+
+    Args:
+        img: Resized RGB image to encode
+        encoder: Encoder to tune
+        target_ssim: Minimum mean SSIM against ``img``
+        min_quality: Lowest quality to consider
+        max_quality: Highest quality to consider
+
+    Returns:
+        Tuple of (chosen quality, encoded bytes at that quality) so the
+        caller can write the result without encoding it again
+    """
+    encoded: dict[int, bytes] = {}
+
+    def passes(quality: int) -> bool:
+        encoded[quality] = encoder.encode(img, quality)
+        with Image.open(io.BytesIO(encoded[quality])) as decoded:
+            return ssim(img, decoded) >= target_ssim
+
+    low, high = min_quality, max_quality
+    while low < high:
+        mid = (low + high) // 2
+        if passes(mid):
+            high = mid
+        else:
+            low = mid + 1
+
+    if low not in encoded:
+        encoded[low] = encoder.encode(img, low)
+    return low, encoded[low]
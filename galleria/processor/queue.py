@@ -0,0 +1,384 @@
+"""Shared-directory work queue for rendering thumbnails on several machines.
+
+Every node mounts the same storage. The coordinator (the build) submits
+tasks as files, and workers on any machine claim them with lease files:
+
+    <queue_dir>/jobs/<job_id>/
+        tasks/<task_id>.task               pickled (fn, args, kwargs)
+        leases/<task_id>.<attempt>.lease   one per claim, heartbeat via mtime
+        results/<task_id>.result           pickled (ok, value), written atomically
+        done                               job finished, workers skip it
+
+A claim creates the next attempt's lease with O_EXCL, so exactly one node
+wins it. There is no rename or lock step, so it works on NFS and SMB as well
+as on local disks. Workers refresh the mtime of their lease while they run.
+A lease whose mtime is older than ``lease_seconds`` belongs to a crashed or
+stalled node. The next claim takes the following attempt. After
+``max_attempts`` expired leases the task fails with TaskAbandonedError
+instead of crashing node after node. Ages are measured against the shared
+directory's clock (the mtime of a freshly touched file), so clock skew
+between machines does not expire leases early.
+
+No network service is involved: several local processes pointed at a
+temporary directory behave exactly like several machines.
+"""
+
+import json
+import os
+import pickle
+import shutil
+import socket
+import threading
+import time
+import uuid
+from collections.abc import Callable
+from concurrent.futures import Executor, Future
+from pathlib import Path
+
+# Seconds without a heartbeat after which a lease is considered dead
+DEFAULT_LEASE_SECONDS = 60.0
+
+# Claims per task before it is failed instead of handed to another node
+DEFAULT_MAX_ATTEMPTS = 3
+
+# Seconds between scans of the queue for new tasks and results
+DEFAULT_POLL_SECONDS = 0.2
+
+JOBS_DIR = "jobs"
+DONE_MARKER = "done"
+
+
+class TaskAbandonedError(Exception):
+    """Exception raised for a task whose leases expired max_attempts times."""
+
+    pass
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    """Write a file so readers see either nothing or the complete contents."""
+    tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+
+
+def _shared_now(job_dir: Path) -> float:
+    """Current time according to the filesystem holding the queue."""
+    clock = job_dir / ".clock"
+    clock.touch()
+    return clock.stat().st_mtime
+
+
+def _dump_outcome(ok: bool, value) -> bytes:
+    """Pickle a task outcome, degrading unpicklable errors to RuntimeError."""
+    try:
+        return pickle.dumps((ok, value))
+    except Exception:
+        return pickle.dumps((False, RuntimeError(repr(value))))
+
+
+class QueueWorker:
+    """Claims and runs tasks from a shared queue directory.
+
+    Usage:
+        worker = QueueWorker("/mnt/shared/queue")
+        worker.run(idle_exit_s=300)  # or run(stop_event=...) from a thread
+    """
+
+    def __init__(
+        self,
+        queue_dir: Path | str,
+        node_id: str | None = None,
+        lease_seconds: float = DEFAULT_LEASE_SECONDS,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        poll_seconds: float = DEFAULT_POLL_SECONDS,
+        job_dir: Path | None = None,
+    ):
+        """Initialize queue worker.
+
+        Args:
+            queue_dir: Shared queue directory
+            node_id: Name recorded in leases (default: host name and pid)
+            lease_seconds: Heartbeat age after which a lease is dead
+            max_attempts: Claims per task before it is abandoned
+            poll_seconds: Sleep between scans when no task is available
+            job_dir: Only serve this job (a coordinator's in-process worker)
+        """
+        self.queue_dir = Path(queue_dir)
+        self.node_id = node_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.poll_seconds = poll_seconds
+        self.job_dir = job_dir
+        self.completed = 0
+
+    def _jobs(self) -> list[Path]:
+        """Unfinished jobs, oldest first."""
+        if self.job_dir is not None:
+            jobs = [self.job_dir]
+        else:
+            try:
+                jobs = sorted((self.queue_dir / JOBS_DIR).iterdir())
+            except FileNotFoundError:
+                return []
+        return [job for job in jobs if not (job / DONE_MARKER).exists()]
+
+    def run_once(self) -> bool:
+        """Claim and run at most one task.
+
+        Returns:
+            True if a task was run (or abandoned), False if none was available
+        """
+        for job_dir in self._jobs():
+            try:
+                task_paths = sorted((job_dir / "tasks").glob("*.task"))
+            except FileNotFoundError:
+                continue
+            for task_path in task_paths:
+                task_id = task_path.stem
+                if (job_dir / "results" / f"{task_id}.result").exists():
+                    continue
+                attempt = self._claim(job_dir, task_id)
+                if attempt is not None:
+                    self._run_task(job_dir, task_path, attempt)
+                    return True
+        return False
+
+    def run(
+        self,
+        stop_event: threading.Event | None = None,
+        idle_exit_s: float | None = None,
+    ) -> int:
+        """Serve tasks until stopped or idle for too long.
+
+        Args:
+            stop_event: Event that ends the loop when set
+            idle_exit_s: Return after this many seconds without work
+
+        Returns:
+            Number of tasks this worker ran
+        """
+        stop_event = stop_event or threading.Event()
+        idle_since = time.monotonic()
+        while not stop_event.is_set():
+            if self.run_once():
+                idle_since = time.monotonic()
+                continue
+            if idle_exit_s is not None and time.monotonic() - idle_since >= idle_exit_s:
+                break
+            stop_event.wait(self.poll_seconds)
+        return self.completed
+
+    def _claim(self, job_dir: Path, task_id: str) -> int | None:
+        """Take the next lease of a task, or None if it is held or gone."""
+        leases_dir = job_dir / "leases"
+        try:
+            attempts = [
+                int(path.name.split(".")[1])
+                for path in leases_dir.glob(f"{task_id}.*.lease")
+            ]
+        except FileNotFoundError:
+            return None
+
+        current = max(attempts, default=0)
+        if current:
+            try:
+                heartbeat = (leases_dir / f"{task_id}.{current}.lease").stat().st_mtime
+            except FileNotFoundError:
+                return None
+            if _shared_now(job_dir) - heartbeat < self.lease_seconds:
+                return None
+
+        attempt = current + 1
+        lease_path = leases_dir / f"{task_id}.{attempt}.lease"
+        try:
+            fd = os.open(lease_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except (FileExistsError, FileNotFoundError):
+            return None
+        with os.fdopen(fd, "w") as f:
+            json.dump({"node": self.node_id, "attempt": attempt}, f)
+
+        if attempt > self.max_attempts:
+            # Every earlier holder died or stalled: fail the task, not the node
+            self._write_result(
+                job_dir,
+                task_id,
+                _dump_outcome(
+                    False,
+                    TaskAbandonedError(
+                        f"Task {task_id} abandoned after {current} expired leases"
+                    ),
+                ),
+            )
+            return None
+        return attempt
+
+    def _run_task(self, job_dir: Path, task_path: Path, attempt: int) -> None:
+        """Run a claimed task while heartbeating its lease, then store the result."""
+        task_id = task_path.stem
+        lease_path = job_dir / "leases" / f"{task_id}.{attempt}.lease"
+        if (job_dir / "results" / f"{task_id}.result").exists():
+            return  # Finished by a node whose lease looked dead
+        try:
+            fn, args, kwargs = pickle.loads(task_path.read_bytes())
+        except FileNotFoundError:
+            return  # Consumed by the coordinator after another node finished it
+
+        finished = threading.Event()
+
+        def heartbeat() -> None:
+            while not finished.wait(self.lease_seconds / 4):
+                try:
+                    os.utime(lease_path)
+                except FileNotFoundError:
+                    return
+
+        beat = threading.Thread(target=heartbeat, daemon=True)
+        beat.start()
+        try:
+            outcome = _dump_outcome(True, fn(*args, **kwargs))
+        except Exception as e:
+            outcome = _dump_outcome(False, e)
+        finally:
+            finished.set()
+            beat.join()
+
+        self._write_result(job_dir, task_id, outcome)
+        self.completed += 1
+
+    def _write_result(self, job_dir: Path, task_id: str, data: bytes) -> None:
+        """Publish a task result; a finished job's directory may be gone."""
+        try:
+            _write_atomic(job_dir / "results" / f"{task_id}.result", data)
+        except FileNotFoundError:
+            pass
+
+
+class SharedDirectoryExecutor(Executor):
+    """concurrent.futures executor backed by a shared-directory queue.
+
+    ``submit`` writes a task file and returns a Future that resolves when
+    any worker publishes the result. A monitor thread collects results and
+    removes consumed task files. ``local_workers`` QueueWorker threads in
+    this process serve the job too, so a build always makes progress even
+    if no other node is running ``galleria worker``.
+
+    Submitted callables and arguments must be picklable and importable on
+    every node, and all nodes must see sources and outputs at the same paths.
+    Workers run in their own working directories, so paths in task
+    arguments must be absolute.
+    """
+
+    def __init__(
+        self,
+        queue_dir: Path | str,
+        lease_seconds: float = DEFAULT_LEASE_SECONDS,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        local_workers: int = 1,
+        poll_seconds: float = DEFAULT_POLL_SECONDS,
+    ):
+        """Initialize executor and create this job's queue directory.
+
+        Args:
+            queue_dir: Shared queue directory
+            lease_seconds: Heartbeat age after which a lease is dead
+            max_attempts: Claims per task before it is abandoned
+            local_workers: Worker threads in this process (0 to only coordinate)
+            poll_seconds: Interval between scans for results
+        """
+        job_id = f"{time.strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        self.job_dir = Path(queue_dir).resolve() / JOBS_DIR / job_id
+        for name in ("tasks", "leases", "results"):
+            (self.job_dir / name).mkdir(parents=True, exist_ok=True)
+        self.poll_seconds = poll_seconds
+
+        self._futures: dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._next_id = 0
+        self._shutdown = False
+        self._stop = threading.Event()
+
+        self._threads = [threading.Thread(target=self._collect, daemon=True)]
+        for i in range(local_workers):
+            worker = QueueWorker(
+                queue_dir,
+                node_id=f"{socket.gethostname()}-{os.getpid()}-local{i}",
+                lease_seconds=lease_seconds,
+                max_attempts=max_attempts,
+                poll_seconds=poll_seconds,
+                job_dir=self.job_dir,
+            )
+            self._threads.append(
+                threading.Thread(target=worker.run, args=(self._stop,), daemon=True)
+            )
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, fn: Callable, /, *args, **kwargs) -> Future:
+        """Queue a call for any node and return its Future."""
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError("cannot schedule new futures after shutdown")
+            task_id = f"{self._next_id:08d}"
+            self._next_id += 1
+            future = Future()
+            future.set_running_or_notify_cancel()
+            self._futures[task_id] = future
+
+        _write_atomic(
+            self.job_dir / "tasks" / f"{task_id}.task",
+            pickle.dumps((fn, args, kwargs)),
+        )
+        return future
+
+    def _collect(self) -> None:
+        """Resolve futures from published results until shut down."""
+        results_dir = self.job_dir / "results"
+        while True:
+            for result_path in sorted(results_dir.glob("*.result")):
+                self._resolve(result_path)
+            with self._lock:
+                if self._stop.is_set() and not self._futures:
+                    return
+            self._stop.wait(self.poll_seconds)
+
+    def _resolve(self, result_path: Path) -> None:
+        """Hand one result to its Future and remove the task's files."""
+        task_id = result_path.stem
+        with self._lock:
+            future = self._futures.pop(task_id, None)
+        if future is None:
+            result_path.unlink(missing_ok=True)  # Duplicate from a stolen lease
+            return
+
+        (self.job_dir / "tasks" / f"{task_id}.task").unlink(missing_ok=True)
+        ok, value = pickle.loads(result_path.read_bytes())
+        result_path.unlink(missing_ok=True)
+        if ok:
+            future.set_result(value)
+        else:
+            future.set_exception(value)
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        """Stop accepting work, optionally wait for it, and remove the job.
+
+        Args:
+            wait: Block until every submitted task has a result; otherwise
+                outstanding futures fail, since the job directory is removed
+            cancel_futures: Fail outstanding futures instead of waiting
+        """
+        with self._lock:
+            self._shutdown = True
+            if cancel_futures or not wait:
+                for future in self._futures.values():
+                    future.set_exception(RuntimeError("executor was shut down"))
+                self._futures.clear()
+            pending = list(self._futures.values())
+
+        for future in pending:
+            future.exception()
+
+        self._stop.set()
+        for thread in self._threads:
+            thread.join()
+        (self.job_dir / DONE_MARKER).touch()
+        shutil.rmtree(self.job_dir, ignore_errors=True)
@@ -0,0 +1,98 @@
+"""Background upgrade of dev-server preview thumbnails to full quality."""
+
+import threading
+from collections.abc import Callable
+
+
+class UpgradeCancelled(Exception):
+    """Raised inside an upgrade task once a newer build has cancelled it."""
+
+    pass
+
+
+class PreviewUpgrader:
+    """Runs one background full-quality thumbnail pass at a time.
+
+    Dev builds write quick preview thumbnails so the server starts in
+    seconds, then hand the production-quality pass to the upgrader. Owners
+    (the serve and build orchestrators) keep one PreviewUpgrader next to
+    their WorkerPool and pass it to every GalleriaBuilder.build() call.
+
+    A task receives a ``check_cancelled`` callable and should call it
+    between photos. Submitting a new task, or calling ``cancel()``, makes
+    it raise UpgradeCancelled in the running task and waits for the task
+    to stop, so two passes never write the same cache index at once.
+
+    Usage:
+        upgrader = PreviewUpgrader()
+        upgrader.submit(lambda check_cancelled: ...)
+        ...
+        upgrader.shutdown()
+    """
+
+    def __init__(self) -> None:
+        """Initialize PreviewUpgrader without starting a thread."""
+        self._thread: threading.Thread | None = None
+        self._cancelled = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def is_running(self) -> bool:
+        """Whether an upgrade task is still running."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def submit(self, task: Callable[[Callable[[], None]], object]) -> None:
+        """Cancel any running task and start ``task`` in a background thread.
+
+        Args:
+            task: Called as ``task(check_cancelled)`` in the upgrade thread
+        """
+        with self._lock:
+            self._stop()
+            cancelled = threading.Event()
+
+            def check_cancelled() -> None:
+                if cancelled.is_set():
+                    raise UpgradeCancelled()
+
+            def run() -> None:
+                try:
+                    task(check_cancelled)
+                except UpgradeCancelled:
+                    pass
+
+            self._cancelled = cancelled
+            self._thread = threading.Thread(
+                target=run, name="galleria-preview-upgrade", daemon=True
+            )
+            self._thread.start()
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Block until the running task finishes.
+
+        Args:
+            timeout: Seconds to wait at most, None to wait indefinitely
+
+        Returns:
+            True if no task is running any more
+        """
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        return not self.is_running
+
+    def cancel(self) -> None:
+        """Stop the running task at its next check and wait for it."""
+        with self._lock:
+            self._stop()
+
+    def shutdown(self) -> None:
+        """Cancel the running task. Safe to call more than once."""
+        self.cancel()
+
+    def _stop(self) -> None:
+        """Signal the running task and join it (caller holds the lock)."""
+        self._cancelled.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        self._thread = None
@@ -0,0 +1,397 @@
+"""Worker-side thumbnail rendering for batched parallel dispatch.
+
+The parent process sends compact work items in chunks and receives small
+result tuples back, instead of pickling whole photo dicts per future.
+"""
+
+import multiprocessing
+import os
+import threading
+import time
+from contextlib import nullcontext
+from pathlib import Path
+from typing import NamedTuple
+
+from .dimensions import DimensionProbeError, probe_dimensions
+from .encoders import get_encoder
+from .image import DEFAULT_MAX_IMAGE_PIXELS, ImageProcessingError, ImageProcessor
+from .quality import DEFAULT_MAX_QUALITY, DEFAULT_MIN_QUALITY
+
+# Per-process processor created once by init_worker()
+_processor: ImageProcessor | None = None
+
+# Held while decoding an image over the memory limit, so at most one such
+# decode runs at a time. Shared across processes when set by init_worker().
+_large_image_lock = threading.Lock()
+
+
+class BatchParams(NamedTuple):
+    """Encoding parameters shared by every item in a batch.
+
+    Single-photo tasks (photo dispatch and the serial executor) take the
+    same parameters and render through the same code.
+    """
+
+    thumbnails_dir: str
+    thumbnail_size: int
+    quality: int
+    output_format: str
+    reduced_decode: bool = True
+    thumbnail_sizes: tuple[int, ...] = ()
+    web_size: int | None = None
+    collect_timing: bool = False
+    memory_limit_bytes: int | None = None
+    alternate_formats: tuple[str, ...] = ()
+    smallest_wins: bool = False
+    format_quality: dict | None = None
+    target_ssim: float | None = None
+    quality_range: tuple[int, int] = (DEFAULT_MIN_QUALITY, DEFAULT_MAX_QUALITY)
+    placeholder: bool = False
+    crop: str = "center"
+    perceptual_hash: str | None = None
+    web_dir: str | None = None
+    web_format: str | None = None
+    web_quality: int | None = None
+    max_image_pixels: int | None = DEFAULT_MAX_IMAGE_PIXELS
+    preview: bool = False
+
+    @property
+    def has_derivatives(self) -> bool:
+        """Whether photos need more than the primary thumbnail.
+
+        True when any option produces extra files or fields (a ladder, a web
+        derivative, alternate formats, adaptive quality, placeholders, a
+        smart crop or a perceptual hash), so rendering goes through
+        process_derivatives() and cache entries must record the extras.
+        """
+        return bool(
+            self.thumbnail_sizes
+            or self.web_size
+            or self.alternate_formats
+            or self.target_ssim is not None
+            or self.placeholder
+            or self.crop != "center"
+            or self.perceptual_hash
+        )
+
+
+# Work item: (index, source_path, output_stem, check_mtime, quality, crop_box)
+# where quality is a known adaptive quality (skips the search) and crop_box a
+# known smart crop box (skips scoring), each None when not known yet
+WorkItem = tuple[int, str, str, bool, int | None, tuple[float, ...] | None]
+
+
+class WorkResult(NamedTuple):
+    """Compact per-item result returned from a worker.
+
+    File paths are plain names relative to the thumbnails directory so the
+    result stays small to pickle.
+    """
+
+    index: int
+    cached: bool
+    thumbnails: tuple[tuple[int, str], ...] | None = None
+    """((size, name), ...) ascending, or None without a ladder."""
+
+    web: tuple[str, int, int] | None = None
+    """(name, width, height) of the web derivative, or None.
+
+    The name is relative to the thumbnails directory, so a web derivative
+    in a separate tree reads e.g. ``../../../pics/web/IMG_0001.jpg``.
+    """
+
+    sources: tuple[tuple[str, str, tuple[tuple[int, str], ...]], ...] | None = None
+    """((format, mime_type, ((size, name), ...)), ...) for kept alternates."""
+
+    quality: int | None = None
+    """Quality chosen by the adaptive search, or None."""
+
+    placeholder: tuple[str, str, float] | None = None
+    """(lqip data URI, dominant colour, seconds spent), or None."""
+
+    thumbnail_dims: tuple[int, int] | None = None
+    """Probed (width, height) of a reused thumbnail, or None when rendered."""
+
+    crop_box: tuple[float, ...] | None = None
+    """Normalised smart crop box used, or None for the centre crop."""
+
+    perceptual_hash: str | None = None
+    """Hex perceptual hash of the photo, or None when not requested."""
+
+    error: str | None = None
+    timing_s: float = 0.0
+    output_bytes: int = 0
+
+
+def derivative_names(
+    stem: str,
+    thumbnail_size: int,
+    thumbnail_sizes: tuple[int, ...],
+    output_format: str,
+) -> dict[int, str]:
+    """Map each square derivative size to its output file name.
+
+    The primary ``thumbnail_size`` keeps the plain ``<stem>.<format>`` name so
+    existing links and caches stay valid; extra ladder sizes get a size suffix.
+    """
+    names = {
+        size: f"{stem}-{size}.{output_format}"
+        for size in thumbnail_sizes
+        if size != thumbnail_size
+    }
+    names[thumbnail_size] = f"{stem}.{output_format}"
+    return names
+
+
+def web_derivative_name(
+    stem: str, output_format: str, web_format: str | None = None
+) -> str:
+    """Return the web derivative's file name.
+
+    Next to the thumbnails it is ``<stem>-web.<format>``; in its own tree
+    (``web_format`` set) it keeps the photo's plain stem, like the original.
+    """
+    if web_format:
+        return f"{stem}.{get_encoder(web_format).extension}"
+    return f"{stem}-web.{output_format}"
+
+
+def init_worker(large_image_lock=None) -> None:
+    """Pool initializer: import PIL codecs and create the worker's processor.
+
+    Runs once when a worker process starts so individual photos do not pay
+    the PIL plugin registration or processor construction cost.
+
+    Args:
+        large_image_lock: Lock shared by all workers of a process pool that
+            serialises decodes over the memory limit
+    """
+    global _processor, _large_image_lock
+
+    from PIL import Image
+
+    Image.init()
+    _processor = ImageProcessor()
+    if large_image_lock is not None:
+        _large_image_lock = large_image_lock
+
+
+def process_pool_options() -> dict:
+    """Initializer keyword arguments for a ProcessPoolExecutor of workers.
+
+    Returns:
+        Dict with ``initializer`` and ``initargs`` carrying a fresh lock
+        shared by the pool's workers
+    """
+    return {"initializer": init_worker, "initargs": (multiprocessing.Lock(),)}
+
+
+def process_batch(params: BatchParams, items: list[WorkItem]) -> list[WorkResult]:
+    """Render every item in a batch and return compact result tuples.
+
+    Args:
+        params: Encoding parameters shared by the batch
+        items: Work items as (index, source_path, output_stem, check_mtime,
+            quality, crop_box)
+
+    Returns:
+        One WorkResult per item, in item order
+    """
+    if _processor is None:
+        init_worker()
+    _processor.max_image_pixels = params.max_image_pixels
+    return [_render_item(params, item) for item in items]
+
+
+def _render_item(params: BatchParams, item: WorkItem) -> WorkResult:
+    """Render one work item; failures are reported in the ``error`` field."""
+    index, source, stem, check_mtime, known_quality, known_crop = item
+    start_time = time.perf_counter() if params.collect_timing else 0.0
+    thumbnails_dir = Path(params.thumbnails_dir)
+    source_path = Path(source)
+    thumbnail_name = f"{stem}.{params.output_format}"
+    thumbnail_path = thumbnails_dir / thumbnail_name
+
+    def elapsed() -> float:
+        return time.perf_counter() - start_time if params.collect_timing else 0.0
+
+    def size_of(path: Path) -> int:
+        return path.stat().st_size if params.collect_timing else 0
+
+    try:
+        # Legacy mtime check for thumbnails without a cache index entry
+        if (
+            check_mtime
+            and thumbnail_path.exists()
+            and not _processor.should_process(source_path, thumbnail_path)
+        ):
+            return WorkResult(
+                index,
+                True,
+                thumbnail_dims=_probe_or_none(thumbnail_path),
+                timing_s=elapsed(),
+                output_bytes=size_of(thumbnail_path),
+            )
+
+        with _memory_guard(params, source_path):
+            return _render_derivatives(
+                params,
+                index,
+                source_path,
+                stem,
+                known_quality,
+                known_crop,
+                thumbnails_dir,
+                elapsed,
+                size_of,
+            )
+
+    except ImageProcessingError as e:
+        error = f"Failed to process {source_path}: {e}"
+    except Exception as e:
+        error = f"Unexpected error processing {source_path}: {e}"
+    return WorkResult(index, False, error=error, timing_s=elapsed())
+
+
+def _probe_or_none(path: Path) -> tuple[int, int] | None:
+    """Header-probe an existing file's dimensions, None if unreadable."""
+    try:
+        return probe_dimensions(path)
+    except DimensionProbeError:
+        return None
+
+
+def _memory_guard(params: BatchParams, source_path: Path):
+    """Return the large-image lock if decoding would exceed the memory limit.
+
+    Photos that fit the limit get a no-op context and run fully in parallel;
+    oversized ones (e.g. panoramas) are decoded one at a time across workers.
+    """
+    if not params.memory_limit_bytes:
+        return nullcontext()
+
+    try:
+        estimate = _processor.estimate_decode_bytes(
+            source_path,
+            max((params.thumbnail_size, *params.thumbnail_sizes)),
+            params.reduced_decode,
+            params.web_size,
+        )
+    except ImageProcessingError:
+        # Let the render report the real error
+        return nullcontext()
+
+    if estimate > params.memory_limit_bytes:
+        return _large_image_lock
+    return nullcontext()
+
+
+def _render_derivatives(
+    params: BatchParams,
+    index: int,
+    source_path: Path,
+    stem: str,
+    known_quality: int | None,
+    known_crop: tuple[float, ...] | None,
+    thumbnails_dir: Path,
+    elapsed,
+    size_of,
+) -> WorkResult:
+    """Decode once and write the thumbnail (and any ladder/web derivatives)."""
+    adaptive = params.target_ssim is not None
+    thumbnail_name = f"{stem}.{params.output_format}"
+
+    thumbnails = None
+    web = None
+    sources = None
+    quality = None
+    placeholder = None
+    crop_box = None
+    hash_value = None
+    if params.has_derivatives:
+        derivatives = _processor.process_derivatives(
+            source_path=source_path,
+            output_dir=thumbnails_dir,
+            outputs=derivative_names(
+                stem,
+                params.thumbnail_size,
+                params.thumbnail_sizes,
+                params.output_format,
+            ),
+            quality=known_quality or params.quality,
+            web_name=web_derivative_name(
+                stem, params.output_format, params.web_format
+            ),
+            web_size=params.web_size,
+            reduced_decode=params.reduced_decode,
+            output_format=params.output_format,
+            alternate_formats=params.alternate_formats,
+            smallest_wins=params.smallest_wins,
+            format_quality=params.format_quality,
+            target_ssim=params.target_ssim if known_quality is None else None,
+            quality_range=params.quality_range,
+            placeholder=params.placeholder,
+            crop=params.crop,
+            crop_box=known_crop,
+            perceptual_hash=params.perceptual_hash,
+            web_dir=params.web_dir,
+            web_format=params.web_format,
+            web_quality=params.web_quality,
+            preview=params.preview,
+        )
+        crop_box = derivatives["crop_box"]
+        hash_value = derivatives["perceptual_hash"]
+        if adaptive:
+            quality = derivatives["quality"]
+        if derivatives["placeholder"] is not None:
+            placeholder = (
+                derivatives["placeholder"]["lqip"],
+                derivatives["placeholder"]["dominant_color"],
+                derivatives["placeholder"]["elapsed_s"],
+            )
+        result_path = derivatives["thumbnails"][params.thumbnail_size]
+        thumbnails = tuple(
+            (size, path.name)
+            for size, path in sorted(derivatives["thumbnails"].items())
+        )
+        if derivatives["web"] is not None:
+            web_path, (web_width, web_height) = derivatives["web"]
+            web_name = os.path.relpath(web_path, thumbnails_dir)
+            web = (Path(web_name).as_posix(), web_width, web_height)
+        if params.alternate_formats:
+            sources = tuple(
+                (
+                    source["format"],
+                    source["mime_type"],
+                    tuple(
+                        (size, path.name)
+                        for size, path in sorted(source["thumbnails"].items())
+                    ),
+                )
+                for source in derivatives["sources"]
+            )
+    else:
+        result_path = _processor.process_image(
+            source_path=source_path,
+            output_dir=thumbnails_dir,
+            size=params.thumbnail_size,
+            quality=params.quality,
+            output_name=thumbnail_name,
+            reduced_decode=params.reduced_decode,
+            output_format=params.output_format,
+            preview=params.preview,
+        )
+
+    return WorkResult(
+        index,
+        False,
+        thumbnails=thumbnails,
+        web=web,
+        sources=sources,
+        quality=quality,
+        placeholder=placeholder,
+        crop_box=crop_box,
+        perceptual_hash=hash_value,
+        timing_s=elapsed(),
+        output_bytes=size_of(result_path),
+    )
@@ -1,14 +1,23 @@
 """Static file server for galleria development."""
 
 import os
-from http.server import HTTPServer, SimpleHTTPRequestHandler
+from http.server import HTTPServer, SimpleHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 from typing import Any
+from urllib.parse import unquote, urlsplit
+
+from .lazy import LazyThumbnails
+
+# URL prefix of thumbnails the lazy mode renders on request
+THUMBNAILS_PREFIX = "/thumbnails/"
 
 
 class GalleriaRequestHandler(SimpleHTTPRequestHandler):
     """Custom request handler with CORS headers and root redirect."""
 
+    lazy: LazyThumbnails | None = None
+    """Renders missing or stale thumbnails on request (lazy mode only)."""
+
     def end_headers(self) -> None:
         """Add CORS headers before ending headers."""
         self.send_header("Access-Control-Allow-Origin", "*")
@@ -24,6 +33,13 @@ class GalleriaRequestHandler(SimpleHTTPRequestHandler):
             self.end_headers()
             return
 
+        if self.lazy is not None and self.path.startswith(THUMBNAILS_PREFIX):
+            name = unquote(urlsplit(self.path).path)[len(THUMBNAILS_PREFIX) :]
+            error = self.lazy.ensure(name)
+            if error:
+                self.send_error(500, "Thumbnail generation failed", error)
+                return
+
         super().do_GET()
 
     def log_request(self, code: int = "-", size: int | str = "-") -> None:
@@ -35,7 +51,11 @@ class GalleriaHTTPServer:
     """HTTP server for serving static gallery files during development."""
 
     def __init__(
-        self, output_directory: Path, host: str = "127.0.0.1", port: int = 8000
+        self,
+        output_directory: Path,
+        host: str = "127.0.0.1",
+        port: int = 8000,
+        lazy: bool = False,
     ):
         """Initialize the HTTP server.
 
@@ -43,6 +63,8 @@ class GalleriaHTTPServer:
             output_directory: Directory containing generated gallery files
             host: Host address to bind server
             port: Port number for server
+            lazy: Render thumbnails a lazy build left out when first requested
+                (requests are then served from concurrent threads)
 
         Raises:
             ValueError: If output_directory doesn't exist or isn't a directory
@@ -55,6 +77,7 @@ class GalleriaHTTPServer:
         self.output_directory = output_directory
         self.host = host
         self.port = port
+        self.lazy = LazyThumbnails(output_directory) if lazy else None
         self._server: HTTPServer | None = None
 
     def start(self, verbose: bool = False) -> None:
@@ -69,8 +92,17 @@ class GalleriaHTTPServer:
         # Change to output directory so SimpleHTTPRequestHandler serves from there
         os.chdir(str(self.output_directory))
 
-        # Create and start the HTTP server
-        self._server = HTTPServer((self.host, self.port), GalleriaRequestHandler)
+        # Create and start the HTTP server; lazy renders must not block
+        # requests for files that already exist
+        if self.lazy is not None:
+            handler = type(
+                "LazyGalleriaRequestHandler",
+                (GalleriaRequestHandler,),
+                {"lazy": self.lazy},
+            )
+            self._server = ThreadingHTTPServer((self.host, self.port), handler)
+        else:
+            self._server = HTTPServer((self.host, self.port), GalleriaRequestHandler)
         self._server.serve_forever()
 
     def stop(self) -> None:
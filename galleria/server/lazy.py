@@ -0,0 +1,124 @@
+"""On-demand thumbnail rendering for the galleria development server."""
+
+import json
+import os
+import threading
+from concurrent.futures import Future
+from pathlib import Path
+
+from galleria.plugins.base import PluginContext
+from galleria.plugins.processors.thumbnail import ThumbnailProcessorPlugin
+from galleria.processor.cache import LAZY_MANIFEST_NAME
+
+
+class LazyThumbnails:
+    """Renders the thumbnails a lazy dev build left out, when first requested.
+
+    A build with ``lazy_thumbnails`` writes ``thumbnails/.galleria-lazy.json``
+    mapping each planned thumbnail name to its photo. The first request for
+    any of a photo's thumbnails runs the thumbnail plugin on that photo
+    alone, so the files and the cache index entry are exactly those of a
+    normal build. Concurrent requests for the same photo (e.g. every size
+    in a srcset) wait for that one render instead of starting their own.
+
+    Renders run one at a time. A rebuild writing the same cache index at
+    the same time is safe: ThumbnailCache merges under a file lock. The
+    manifest is re-read whenever a rebuild replaces it.
+
+    Usage:
+        lazy = LazyThumbnails(output_dir)
+        error = lazy.ensure("IMG_0001.webp")  # None once the file is ready
+    """
+
+    def __init__(self, output_directory: Path) -> None:
+        """Initialize LazyThumbnails for a gallery output directory.
+
+        Args:
+            output_directory: Gallery output directory (holding thumbnails/)
+        """
+        # Absolute: the server changes into the output directory
+        self.output_directory = Path(output_directory).resolve()
+        self.manifest_path = self.output_directory / "thumbnails" / LAZY_MANIFEST_NAME
+        self.rendered = 0
+        self._manifest_mtime: int | None = None
+        self._manifest: dict = {}
+        self._files: dict[str, str] = {}
+        self._in_flight: dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._render_lock = threading.Lock()
+
+    def ensure(self, name: str) -> str | None:
+        """Render the photo owning a thumbnail if it is still pending.
+
+        Args:
+            name: Thumbnail file name within the thumbnails directory
+
+        Returns:
+            None when the file can be served from disk, otherwise the
+            error that prevented rendering it
+        """
+        with self._lock:
+            self._refresh()
+            key = self._files.get(name)
+            if key is None:
+                return None
+            future = self._in_flight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._in_flight[key] = future
+
+        if owner:
+            try:
+                future.set_result(self._render(key))
+            except Exception as e:
+                future.set_result(f"Failed to render {name}: {e}")
+            finally:
+                with self._lock:
+                    # Later requests are served from disk (or fail there)
+                    self._in_flight.pop(key, None)
+                    self._files = {
+                        file: owner_key
+                        for file, owner_key in self._files.items()
+                        if owner_key != key
+                    }
+        return future.result()
+
+    def _refresh(self) -> None:
+        """Reload the manifest if a build wrote a new one (caller holds lock)."""
+        try:
+            mtime = os.stat(self.manifest_path).st_mtime_ns
+        except OSError:
+            mtime = None
+        if mtime == self._manifest_mtime:
+            return
+
+        self._manifest_mtime = mtime
+        self._manifest = {}
+        if mtime is not None:
+            try:
+                self._manifest = json.loads(
+                    self.manifest_path.read_text(encoding="utf-8")
+                )
+            except (OSError, ValueError):
+                self._manifest = {}
+        self._files = dict(self._manifest.get("files", {}))
+
+    def _render(self, key: str) -> str | None:
+        """Run the thumbnail plugin on one planned photo."""
+        with self._lock:
+            manifest = self._manifest
+        context = PluginContext(
+            input_data={
+                "photos": [manifest["photos"][key]],
+                "collection_name": manifest.get("collection_name", ""),
+            },
+            config=manifest.get("config", {}),
+            output_dir=self.output_directory,
+        )
+        with self._render_lock:
+            result = ThumbnailProcessorPlugin().process_thumbnails(context)
+            self.rendered += 1
+        if not result.success:
+            return "; ".join(result.errors)
+        return result.output_data["photos"][0].get("error")
@@ -4,6 +4,10 @@ import os
 
 from build.context import BuildContext
 
+# Subdirectories of pics/ served from the photo zone: camera originals and
+# web-optimized derivatives
+PHOTO_TREES = ('full', 'web')
+
 
 def full_url(path: str, context: BuildContext, site_url: str) -> str:
     """Generate relative URL from path for use with Edge Rules routing.
@@ -66,6 +70,12 @@ def _make_relative_path(path: str) -> str:
         # 'output' not found in path, fall through to file type detection
         pass
 
+    # Photo trees (pics/full originals, pics/web derivatives) are served from
+    # the photo zone root wherever the build wrote them
+    for index, part in enumerate(path_parts[:-2]):
+        if part == 'pics' and path_parts[index + 1] in PHOTO_TREES:
+            return '/'.join(path_parts[index:])
+
     # For paths without 'output', check if it needs file type detection
     # Only apply file type detection if it's a bare filename (no directory separators)
     if os.sep not in path and '/' not in path:
@@ -75,8 +85,8 @@ def _make_relative_path(path: str) -> str:
         # For photos (jpg, jpeg), they should be in pics/full/
         if filename.lower().endswith(('.jpg', '.jpeg')):
             return f'pics/full/{filename}'
-        # For thumbnails (webp), they should be in galleries/{collection}/thumbnails/
-        elif filename.lower().endswith('.webp'):
+        # For thumbnails (webp, avif), they should be in galleries/{collection}/thumbnails/
+        elif filename.lower().endswith(('.webp', '.avif')):
             # Without collection context, fallback to thumbnails/
             return f'thumbnails/{filename}'
         else:
@@ -0,0 +1,61 @@
+"""Streaming reorder buffer for restoring input order to out-of-order results."""
+
+from typing import Any
+
+
+class ReorderBuffer:
+    """Release results in sequence order while they arrive in any order.
+
+    Results are held only until every earlier index has arrived, so the
+    consumer can start on the first results long before the slowest item
+    finishes. Memory use is bounded by how far completion runs ahead of the
+    oldest outstanding item.
+
+    Usage:
+        buffer = ReorderBuffer()
+        for index, result in completed_results:
+            for ready in buffer.push(index, result):
+                consume(ready)
+    """
+
+    def __init__(self, start: int = 0) -> None:
+        """Initialize ReorderBuffer.
+
+        Args:
+            start: Index of the first result to release
+        """
+        self._next_index = start
+        self._pending: dict[int, Any] = {}
+
+    @property
+    def next_index(self) -> int:
+        """Index of the next result that will be released."""
+        return self._next_index
+
+    @property
+    def pending_count(self) -> int:
+        """Number of results held back waiting for an earlier index."""
+        return len(self._pending)
+
+    def push(self, index: int, item: Any) -> list[Any]:
+        """Add a result and return every result that is now in order.
+
+        Args:
+            index: Sequence index of the result
+            item: The result itself
+
+        Returns:
+            Results ready for release, in index order (possibly empty)
+
+        Raises:
+            ValueError: If the index was already pushed or released
+        """
+        if index < self._next_index or index in self._pending:
+            raise ValueError(f"Duplicate result for index {index}")
+
+        self._pending[index] = item
+        ready = []
+        while self._next_index in self._pending:
+            ready.append(self._pending.pop(self._next_index))
+            self._next_index += 1
+        return ready
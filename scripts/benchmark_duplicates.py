@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""Benchmark near-duplicate clustering on a synthetic collection of hashes.
+
+Usage:
+    uv run python scripts/benchmark_duplicates.py [photo_count] [threshold ...]
+
+One in ten photos is a near-duplicate (0-3 flipped bits) of an earlier one,
+like burst shots and repeated exports. Hashes are random otherwise, so the
+timings cover clustering only, not hashing.
+
+Example:
+    uv run python scripts/benchmark_duplicates.py 50000 4 6 8
+"""
+
+import random
+import sys
+import time
+
+from galleria.processor.duplicates import DEFAULT_THRESHOLD, find_duplicate_groups
+
+
+def synthetic_hashes(count: int, seed: int = 1) -> list[str]:
+    """Random 64-bit hashes where every tenth is a near copy of an earlier one."""
+    rng = random.Random(seed)
+    values = []
+    for i in range(count):
+        if i and i % 10 == 0:
+            value = rng.choice(values)
+            for _ in range(rng.randint(0, 3)):
+                value ^= 1 << rng.randrange(64)
+        else:
+            value = rng.getrandbits(64)
+        values.append(value)
+    return [f"{value:016x}" for value in values]
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    thresholds = [int(t) for t in sys.argv[2:]] or [DEFAULT_THRESHOLD]
+    hashes = synthetic_hashes(count)
+
+    print(f"{count} photos")
+    for threshold in thresholds:
+        start_time = time.perf_counter()
+        groups = find_duplicate_groups(hashes, threshold)
+        elapsed = time.perf_counter() - start_time
+        duplicates = sum(len(members) - 1 for members in groups)
+        print(
+            f"  threshold {threshold:2d}: {len(groups)} groups, "
+            f"{duplicates} duplicates in {elapsed * 1000:.0f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,137 @@
 #!/usr/bin/env python3
 """Benchmark parallel scaling (sequential, 1, 2, 4, 8, 16 workers).
 
+Runs the scaling curve for both the process and thread executors and records
+peak resident memory (RSS) of the whole process tree for every run. Also
+compares full-resolution decoding against reduced-scale decoding
+(JPEG DCT scaling) on the sequential path, per-photo task dispatch
+against batched dispatch, and manifest-order against largest-first
+scheduling (tail latency) at the largest worker count.
+
 Usage:
-    uv run python scripts/benchmark_parallel.py
+    uv run python scripts/benchmark_parallel.py [manifest_path]
 """
 
 import json
+import os
+import resource
 import shutil
+import sys
+import threading
 import time
 from pathlib import Path
 
-from galleria.plugins.base import PluginContext
+from galleria.manager.hooks import PluginHookManager
+from galleria.plugins.base import PluginContext, PluginResult
 from galleria.plugins.processors.thumbnail import ThumbnailProcessorPlugin
 
 
+def _process_tree_rss() -> int:
+    """Return the summed RSS in bytes of this process and all descendants.
+
+    Reads /proc (Linux); elsewhere falls back to this process's peak RSS.
+    """
+    proc = Path("/proc")
+    if not proc.exists():
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+    parents = {}
+    for stat_file in proc.glob("[0-9]*/stat"):
+        try:
+            fields = stat_file.read_text().rsplit(")", 1)[1].split()
+            parents[int(stat_file.parent.name)] = int(fields[1])
+        except (OSError, IndexError, ValueError):
+            continue
+
+    tree = {os.getpid()}
+    added = True
+    while added:
+        children = {pid for pid, ppid in parents.items() if ppid in tree} - tree
+        tree |= children
+        added = bool(children)
+
+    total = 0
+    for pid in tree:
+        try:
+            for line in (proc / str(pid) / "status").read_text().splitlines():
+                if line.startswith("VmRSS:"):
+                    total += int(line.split()[1]) * 1024
+                    break
+        except OSError:
+            continue
+    return total
+
+
+class PeakRSSSampler:
+    """Sample process-tree RSS in a background thread and keep the peak."""
+
+    def __init__(self, interval_s: float = 0.05):
+        self.interval_s = interval_s
+        self.peak_bytes = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.peak_bytes = max(self.peak_bytes, _process_tree_rss())
+            self._stop.wait(self.interval_s)
+
+    def __enter__(self) -> "PeakRSSSampler":
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.peak_bytes = max(self.peak_bytes, _process_tree_rss())
+
+    @property
+    def peak_mb(self) -> float:
+        return self.peak_bytes / (1024 * 1024)
+
+
+class CompletionRecorder:
+    """Record when each photo completes, through the processor_item hook."""
+
+    def __init__(self):
+        self.times: dict[str, float] = {}
+        self.hooks = PluginHookManager()
+        self.hooks.register_hook("processor_item", self._record)
+
+    def _record(self, context: PluginContext) -> PluginResult:
+        self.times[context.input_data["photo"]["source_path"]] = time.perf_counter()
+        return PluginResult(success=True, output_data=None)
+
+    def durations(self, start: float) -> dict[str, float]:
+        """Per-photo durations of a sequential run that began at start."""
+        durations = {}
+        previous = start
+        for source, finished in sorted(self.times.items(), key=lambda kv: kv[1]):
+            durations[source] = finished - previous
+            previous = finished
+        return durations
+
+    def tail_s(self, end: float, workers: int) -> float:
+        """Seconds from when fewer photos than workers remained to the end.
+
+        From that point on at least one worker sits idle, so this is the
+        stretch a better submission order can shorten.
+        """
+        times = sorted(self.times.values())
+        if len(times) <= workers:
+            return 0.0
+        return end - times[len(times) - workers - 1]
+
+
+def simulate_makespan(durations: list[float], workers: int) -> float:
+    """Greedy list-scheduling makespan of jobs started in the given order."""
+    finish = [0.0] * workers
+    for duration in durations:
+        slot = finish.index(min(finish))
+        finish[slot] += duration
+    return max(finish)
+
+
 def load_manifest(manifest_path: Path) -> dict:
     """Load photos from normpic manifest."""
     with open(manifest_path) as f:
@@ -38,7 +156,10 @@ def load_manifest(manifest_path: Path) -> dict:
 
 
 def main():
-    manifest_path = Path("output/pics/full/manifest.json")
+    if len(sys.argv) > 1:
+        manifest_path = Path(sys.argv[1])
+    else:
+        manifest_path = Path("output/pics/full/manifest.json")
     if not manifest_path.exists():
         print(f"Error: Manifest not found at {manifest_path}")
         return
@@ -57,6 +178,35 @@ def main():
 
     results = []
     baseline_time = None
+    plugin = ThumbnailProcessorPlugin()
+
+    # Sequential full-resolution decode (pre reduced-decode behaviour)
+    print("\nRunning sequential full-decode baseline...")
+    output_dir = output_base / "sequential_full_decode"
+    if output_dir.exists():
+        shutil.rmtree(output_dir)
+    output_dir.mkdir(parents=True)
+
+    context = PluginContext(
+        input_data=provider_data,
+        config={
+            "thumbnail_size": 400,
+            "quality": 85,
+            "parallel": False,
+            "benchmark": True,
+            "use_cache": False,
+            "reduced_decode": False,
+        },
+        output_dir=output_dir,
+    )
+
+    start = time.perf_counter()
+    result = plugin.process_thumbnails(context)
+    full_decode_time = time.perf_counter() - start
+
+    if result.success:
+        bm = result.output_data["benchmark"]
+        print(f"  Full decode: {full_decode_time:.1f}s ({bm['photos_per_second']:.1f} photos/s)")
 
     # Sequential baseline
     print("\nRunning sequential baseline...")
@@ -77,27 +227,79 @@ def main():
         output_dir=output_dir,
     )
 
-    plugin = ThumbnailProcessorPlugin()
-    start = time.perf_counter()
-    result = plugin.process_thumbnails(context)
-    baseline_time = time.perf_counter() - start
+    sequential = CompletionRecorder()
+    context.hooks = sequential.hooks
+    with PeakRSSSampler() as rss:
+        start = sequential_start = time.perf_counter()
+        result = plugin.process_thumbnails(context)
+        baseline_time = time.perf_counter() - start
 
     if result.success:
         bm = result.output_data["benchmark"]
         results.append({
+            "executor": "serial",
             "workers": "seq",
             "time_s": round(baseline_time, 2),
             "speedup": 1.0,
             "efficiency": 100.0,
             "photos_per_second": round(bm["photos_per_second"], 2),
+            "peak_rss_mb": round(rss.peak_mb, 1),
         })
-        print(f"  Sequential: {baseline_time:.1f}s ({bm['photos_per_second']:.1f} photos/s)")
+        print(f"  Sequential: {baseline_time:.1f}s ({bm['photos_per_second']:.1f} photos/s, "
+              f"peak RSS {rss.peak_mb:.0f} MB)")
+        print(f"  Reduced decode speedup: {full_decode_time / baseline_time:.2f}x")
 
-    # Parallel with different worker counts
+    # Parallel scaling curves for the process and thread executors
     worker_counts = [1, 2, 4, 8, 16]
 
-    for workers in worker_counts:
-        output_dir = output_base / f"workers_{workers}"
+    for executor in ("process", "thread"):
+        for workers in worker_counts:
+            output_dir = output_base / f"{executor}_{workers}"
+            if output_dir.exists():
+                shutil.rmtree(output_dir)
+            output_dir.mkdir(parents=True)
+
+            context = PluginContext(
+                input_data=provider_data,
+                config={
+                    "thumbnail_size": 400,
+                    "quality": 85,
+                    "executor": executor,
+                    "max_workers": workers,
+                    "benchmark": True,
+                    "use_cache": False,
+                },
+                output_dir=output_dir,
+            )
+
+            print(f"\nRunning {executor} executor with {workers} worker(s)...")
+            with PeakRSSSampler() as rss:
+                start = time.perf_counter()
+                result = plugin.process_thumbnails(context)
+                total_time = time.perf_counter() - start
+
+            if result.success and "benchmark" in result.output_data:
+                bm = result.output_data["benchmark"]
+                speedup = baseline_time / total_time if total_time > 0 else 0
+                efficiency = (speedup / workers) * 100
+
+                results.append({
+                    "executor": executor,
+                    "workers": workers,
+                    "time_s": round(total_time, 2),
+                    "speedup": round(speedup, 2),
+                    "efficiency": round(efficiency, 1),
+                    "photos_per_second": round(bm["photos_per_second"], 2),
+                    "peak_rss_mb": round(rss.peak_mb, 1),
+                })
+
+                print(f"  {executor} x{workers}: {total_time:.1f}s, {speedup:.2f}x speedup, "
+                      f"{efficiency:.0f}% efficiency, peak RSS {rss.peak_mb:.0f} MB")
+
+    # Dispatch overhead: one future per photo vs compact batched work items
+    dispatch_results = {}
+    for dispatch in ("photo", "batched"):
+        output_dir = output_base / f"dispatch_{dispatch}"
         if output_dir.exists():
             shutil.rmtree(output_dir)
         output_dir.mkdir(parents=True)
@@ -108,48 +310,97 @@ def main():
                 "thumbnail_size": 400,
                 "quality": 85,
                 "parallel": True,
-                "max_workers": workers,
-                "benchmark": True,
+                "max_workers": worker_counts[-1],
+                "dispatch": dispatch,
                 "use_cache": False,
             },
             output_dir=output_dir,
         )
 
-        print(f"\nRunning with {workers} worker(s)...")
+        print(f"\nRunning {dispatch} dispatch with {worker_counts[-1]} workers...")
         start = time.perf_counter()
-        result = plugin.process_thumbnails(context)
-        total_time = time.perf_counter() - start
+        plugin.process_thumbnails(context)
+        dispatch_results[dispatch] = round(time.perf_counter() - start, 2)
+        print(f"  {dispatch}: {dispatch_results[dispatch]:.1f}s")
 
-        if result.success and "benchmark" in result.output_data:
-            bm = result.output_data["benchmark"]
-            speedup = baseline_time / total_time if total_time > 0 else 0
-            efficiency = (speedup / workers) * 100
+    if dispatch_results["batched"] > 0:
+        print(f"  Batched dispatch speedup: "
+              f"{dispatch_results['photo'] / dispatch_results['batched']:.2f}x")
 
-            results.append({
-                "workers": workers,
-                "time_s": round(total_time, 2),
-                "speedup": round(speedup, 2),
-                "efficiency": round(efficiency, 1),
-                "photos_per_second": round(bm["photos_per_second"], 2),
-            })
+    # Scheduling: a few huge photos late in the manifest form a tail where
+    # most workers are idle; largest-first starts them while all are busy
+    schedule_results = {}
+    workers = worker_counts[-1]
+    for schedule in ("manifest", "largest-first"):
+        output_dir = output_base / f"schedule_{schedule}"
+        if output_dir.exists():
+            shutil.rmtree(output_dir)
+        output_dir.mkdir(parents=True)
 
-            print(f"  {workers} worker(s): {total_time:.1f}s, {speedup:.2f}x speedup, {efficiency:.0f}% efficiency")
+        recorder = CompletionRecorder()
+        context = PluginContext(
+            input_data=provider_data,
+            config={
+                "thumbnail_size": 400,
+                "quality": 85,
+                "parallel": True,
+                "max_workers": workers,
+                "schedule": schedule,
+                "use_cache": False,
+            },
+            output_dir=output_dir,
+            hooks=recorder.hooks,
+        )
+
+        print(f"\nRunning {schedule} schedule with {workers} workers...")
+        start = time.perf_counter()
+        plugin.process_thumbnails(context)
+        end = time.perf_counter()
+        schedule_results[schedule] = {
+            "time_s": round(end - start, 2),
+            "tail_s": round(recorder.tail_s(end, workers), 2),
+        }
+        print(f"  {schedule}: {end - start:.1f}s, "
+              f"tail {schedule_results[schedule]['tail_s']:.1f}s")
+
+    # The same comparison simulated from the sequential per-photo times:
+    # free of machine noise, and meaningful on hosts with fewer cores than
+    # workers. Largest-first orders by size_bytes, as the scheduler does
+    durations = sequential.durations(sequential_start)
+    photos = provider_data["photos"]
+    by_size = sorted(
+        photos, key=lambda p: p["metadata"].get("size_bytes", 0), reverse=True
+    )
+    for schedule, ordered in (("manifest", photos), ("largest-first", by_size)):
+        jobs = [durations.get(p["source_path"], 0.0) for p in ordered]
+        simulated = simulate_makespan(jobs, workers)
+        schedule_results[schedule]["simulated_s"] = round(simulated, 2)
+        print(f"  {schedule} (simulated from sequential times): {simulated:.1f}s")
 
     print("\n" + "=" * 60)
     print("RESULTS")
     print("=" * 60)
-    print(f"\n{'Workers':<10} {'Time':<10} {'Speedup':<10} {'Efficiency':<12} {'Rate':<12}")
-    print("-" * 54)
+    print(f"\n{'Executor':<10} {'Workers':<10} {'Time':<10} {'Speedup':<10} "
+          f"{'Efficiency':<12} {'Rate':<12} {'Peak RSS':<10}")
+    print("-" * 76)
     for r in results:
-        print(f"{r['workers']:<10} {r['time_s']:.1f}s{'':<5} "
+        print(f"{r['executor']:<10} {r['workers']:<10} {r['time_s']:.1f}s{'':<5} "
               f"{r['speedup']:.2f}x{'':<5} "
               f"{r['efficiency']:.0f}%{'':<7} "
-              f"{r['photos_per_second']:.1f}/s")
+              f"{r['photos_per_second']:.1f}/s{'':<6} "
+              f"{r['peak_rss_mb']:.0f} MB")
 
     # Save results
     results_file = output_base / "results.json"
     with open(results_file, "w") as f:
-        json.dump({"parallel_benchmark": results, "num_photos": num_photos, "baseline_time_s": baseline_time}, f, indent=2)
+        json.dump({
+            "parallel_benchmark": results,
+            "num_photos": num_photos,
+            "baseline_time_s": baseline_time,
+            "full_decode_time_s": full_decode_time,
+            "dispatch_time_s": dispatch_results,
+            "schedule": schedule_results,
+        }, f, indent=2)
     print(f"\nResults saved to {results_file}")
 
 
@@ -1,11 +1,15 @@
 #!/usr/bin/env python3
-"""Benchmark WebP quality at a specific level.
+"""Benchmark WebP quality at a specific level or an adaptive SSIM target.
 
 Usage:
     uv run python scripts/benchmark_quality.py <manifest_path> <output_dir> <quality>
 
+<quality> is either a fixed quality (e.g. 60) or ``ssim:<target>`` to pick the
+lowest quality per photo that reaches the SSIM target (e.g. ssim:0.95).
+
 Example:
     uv run python scripts/benchmark_quality.py output/pics/full/manifest.json .benchmarks/q60 60
+    uv run python scripts/benchmark_quality.py output/pics/full/manifest.json .benchmarks/ssim95 ssim:0.95
 """
 
 import json
@@ -52,7 +56,14 @@ def main():
 
     manifest_path = Path(sys.argv[1])
     output_dir = Path(sys.argv[2])
-    quality = int(sys.argv[3])
+    quality_arg = sys.argv[3]
+    if quality_arg.startswith("ssim:"):
+        target_ssim = float(quality_arg.split(":", 1)[1])
+        quality = f"ssim>={target_ssim}"
+        quality_config = {"adaptive_quality": True, "target_ssim": target_ssim}
+    else:
+        quality = int(quality_arg)
+        quality_config = {"quality": quality}
 
     if not manifest_path.exists():
         print(f"Error: Manifest not found at {manifest_path}")
@@ -75,7 +86,7 @@ def main():
         input_data=provider_data,
         config={
             "thumbnail_size": 400,
-            "quality": quality,
+            **quality_config,
             "parallel": True,
             "max_workers": OPTIMAL_WORKERS,
             "benchmark": True,
@@ -121,6 +132,20 @@ def main():
             "p75_size_kb": round(sorted_sizes[p75_idx] / 1024, 1),
         }
 
+        # Distribution of per-photo qualities chosen by the adaptive search
+        chosen = sorted(
+            p["thumbnail_quality"]
+            for p in result.output_data["photos"]
+            if "thumbnail_quality" in p
+        )
+        if chosen:
+            results["chosen_quality"] = {
+                "min": chosen[0],
+                "p50": chosen[len(chosen) // 2],
+                "max": chosen[-1],
+                "mean": round(sum(chosen) / len(chosen), 1),
+            }
+
         print(f"\n{'=' * 60}")
         print("RESULTS")
         print("=" * 60)
@@ -133,6 +158,10 @@ def main():
         print(f"Percentiles:    P25={sorted_sizes[p25_idx]/1024:.1f} KB, "
               f"P50={sorted_sizes[p50_idx]/1024:.1f} KB, "
               f"P75={sorted_sizes[p75_idx]/1024:.1f} KB")
+        if chosen:
+            cq = results["chosen_quality"]
+            print(f"Chosen quality: {cq['min']} - {cq['max']} "
+                  f"(P50={cq['p50']}, mean={cq['mean']})")
 
         # Save results
         results_file = output_dir / "results.json"
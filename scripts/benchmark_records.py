@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""Measure what plugin stages allocate handing photo records to the next stage.
+
+Usage:
+    uv run python scripts/benchmark_records.py [photo_count]
+
+Writes a synthetic NormPic manifest (pic entries with exif and GPS
+metadata, one in ten a repeat shot), loads it with the provider, then runs
+the stages that add fields to photos: the thumbnail processor as a lazy dev
+build (so no image is decoded and only the handoff is measured) and
+duplicate marking. Each stage runs under TimingContext(track_memory=True);
+the memory column is what the stage's output keeps alive beyond its input.
+
+Example:
+    uv run python scripts/benchmark_records.py 20000
+"""
+
+import json
+import random
+import sys
+import tempfile
+from pathlib import Path
+
+from build.benchmark import TimingContext
+from build.context import BuildContext
+from galleria.plugins.base import PluginContext
+from galleria.plugins.duplicates import DuplicateDetectionPlugin
+from galleria.plugins.processors.thumbnail import ThumbnailProcessorPlugin
+from galleria.plugins.providers.normpic import NormPicProviderPlugin
+
+
+def synthetic_manifest(count: int, seed: int = 1) -> dict:
+    """NormPic manifest with `count` pics carrying typical camera metadata."""
+    rng = random.Random(seed)
+    pics = []
+    for i in range(count):
+        # Every tenth photo is a repeat of an earlier one (burst shots)
+        perceptual_hash = (
+            rng.choice(pics)["perceptual_hash"]
+            if i and i % 10 == 0
+            else f"{rng.getrandbits(64):016x}"
+        )
+        pics.append(
+            {
+                "source_path": f"/photos/IMG_{i:05d}.jpg",
+                "dest_path": f"/organized/event-{i:05d}.jpg",
+                "hash": f"{rng.getrandbits(256):064x}",
+                "size_bytes": rng.randint(2_000_000, 12_000_000),
+                "mtime": 1699123456.0 + i,
+                "timestamp": f"2024-10-05T14:{i // 60 % 60:02d}:{i % 60:02d}",
+                "timestamp_source": "exif",
+                "camera": "Canon EOS R5",
+                "gps": {"lat": rng.uniform(-90, 90), "lon": rng.uniform(-180, 180)},
+                "exif": {
+                    "lens": "RF24-70mm F2.8 L IS USM",
+                    "focal_length": rng.choice([24, 35, 50, 70]),
+                    "aperture": rng.choice([2.8, 4.0, 5.6]),
+                    "iso": rng.choice([100, 400, 1600]),
+                    "exposure": "1/250",
+                },
+                "perceptual_hash": perceptual_hash,
+                "errors": [],
+            }
+        )
+    return {"version": "0.1.0", "collection_name": "event", "pics": pics}
+
+
+def run_stage(label: str, run) -> dict:
+    """Run one stage under a memory-tracking timer and print its cost."""
+    with TimingContext(track_memory=True) as timer:
+        result = run()
+    if not result.success:
+        raise SystemExit(f"{label} failed: {result.errors}")
+    print(
+        f"  {label:<22} {timer.duration_s * 1000:7.0f} ms"
+        f" {timer.memory_bytes / 1024 / 1024:8.1f} MB"
+    )
+    return result.output_data
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        output_dir = Path(tmp)
+        manifest_path = output_dir / "manifest.json"
+        manifest_path.write_text(json.dumps(synthetic_manifest(count)))
+
+        collection = (
+            NormPicProviderPlugin()
+            .load_collection(
+                PluginContext(
+                    input_data={"manifest_path": str(manifest_path)},
+                    config={},
+                    output_dir=output_dir,
+                )
+            )
+            .output_data
+        )
+        # Hashes normally come from the thumbnail pass; here from the manifest
+        for photo in collection["photos"]:
+            photo["perceptual_hash"] = photo["metadata"]["perceptual_hash"]
+
+        print(f"{count} photos")
+        processed = run_stage(
+            "thumbnail (lazy)",
+            lambda: ThumbnailProcessorPlugin().process_thumbnails(
+                PluginContext(
+                    input_data=collection,
+                    config={"lazy_thumbnails": True},
+                    output_dir=output_dir,
+                    metadata={"build_context": BuildContext(production=False)},
+                )
+            ),
+        )
+        run_stage(
+            "duplicates (mark)",
+            lambda: DuplicateDetectionPlugin().transform_data(
+                PluginContext(
+                    input_data=processed,
+                    config={"duplicates": "mark"},
+                    output_dir=output_dir,
+                )
+            ),
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -72,6 +72,9 @@ class ServeOrchestrator:
             except Exception as exc:  # pragma: no cover
                 print(f"Error during server shutdown: {exc!r}")
 
+        # Stop thumbnail workers kept warm by the build orchestrator
+        self.build_orchestrator.shutdown()
+
     def start(
         self,
         host: str,
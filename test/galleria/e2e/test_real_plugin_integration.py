@@ -264,3 +264,71 @@ class TestRealPluginIntegration:
         # 400 photos / 384 per page = 2 pages (page 1: 384, page 2: 16)
         html_files = final_result.output_data["html_files"]
         assert len(html_files) == 3  # 2 pages + 1 index.html redirect
+
+    def test_parallel_builds_produce_byte_identical_html(self, tmp_path):
+        """E2E: Repeated parallel builds write the same page HTML byte for byte."""
+        from PIL import Image
+
+        # Arrange: photos of very different sizes so workers finish out of order
+        photos_dir = tmp_path / "photos"
+        photos_dir.mkdir()
+        pics = []
+        for i in range(9):
+            photo_path = photos_dir / f"photo_{i}.jpg"
+            side = 2400 if i % 4 == 0 else 80
+            Image.new("RGB", (side, side), color=(i * 25, 60, 200)).save(photo_path, "JPEG")
+            pics.append(
+                {
+                    "source_path": str(photo_path),
+                    "dest_path": f"photo_{i}.jpg",
+                    "hash": f"hash{i}",
+                    "size_bytes": photo_path.stat().st_size,
+                    "mtime": 1234567890 + i,
+                }
+            )
+        manifest_path = tmp_path / "manifest.json"
+        manifest_path.write_text(
+            json.dumps({"version": "0.1.0", "collection_name": "ordered", "pics": pics})
+        )
+        output_dir = tmp_path / "output"
+
+        def build() -> dict[str, str]:
+            pipeline = PipelineManager()
+            pipeline.registry.register(NormPicProviderPlugin(), "provider")
+            pipeline.registry.register(ThumbnailProcessorPlugin(), "processor")
+            pipeline.registry.register(BasicPaginationPlugin(), "transform")
+            pipeline.registry.register(BasicTemplatePlugin(), "template")
+            stages = [
+                ("provider", "normpic-provider"),
+                ("processor", "thumbnail-processor"),
+                ("transform", "basic-pagination"),
+                ("template", "basic-template"),
+            ]
+            context = PluginContext(
+                input_data={"manifest_path": str(manifest_path)},
+                config={
+                    "provider": {},
+                    "processor": {
+                        "thumbnail_size": 80,
+                        "parallel": True,
+                        "max_workers": 3,
+                        "batch_size": 1,
+                        "use_cache": False,
+                    },
+                    "transform": {"page_size": 2},
+                    "template": {"theme": "minimal", "layout": "grid"},
+                },
+                output_dir=output_dir,
+            )
+            result = pipeline.execute_stages(stages, context)
+            assert result.success, result.errors
+            return {f["filename"]: f["content"] for f in result.output_data["html_files"]}
+
+        # Act
+        builds = [build() for _ in range(3)]
+
+        # Assert: identical bytes every time, photos paginated in manifest order
+        encoded = [{k: v.encode("utf-8") for k, v in b.items()} for b in builds]
+        assert encoded[0] == encoded[1] == encoded[2]
+        first_page = builds[0]["page_1.html"]
+        assert first_page.index("photo_0") < first_page.index("photo_1")
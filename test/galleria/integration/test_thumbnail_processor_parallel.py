@@ -1,11 +1,93 @@
 """Integration tests for parallel thumbnail processing."""
 
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from unittest.mock import patch
 
 from PIL import Image
 
 from galleria.plugins import PluginContext
 from galleria.plugins.processors.thumbnail import ThumbnailProcessorPlugin
+from galleria.processor.pool import WorkerPool
+from galleria.processor.queue import QueueWorker
+from galleria.processor.worker import process_batch
+
+# Released at the end of the hang test so the abandoned thread can exit
+_release_hang = threading.Event()
+
+
+def _crashing_batch(params, items):
+    """process_batch that kills its worker process on a photo named bad."""
+    if any("bad" in item[1] for item in items):
+        os._exit(1)
+    return process_batch(params, items)
+
+
+def _hanging_batch(params, items):
+    """process_batch that never returns for a photo named bad."""
+    if any("bad" in item[1] for item in items):
+        _release_hang.wait()
+    return process_batch(params, items)
+
+
+def _failing_batch(params, items):
+    """process_batch whose whole task fails for a photo named bad."""
+    if any("bad" in item[1] for item in items):
+        raise RuntimeError("task lost")
+    return process_batch(params, items)
+
+
+def _serve_from(cwd: str, queue_dir: str) -> None:
+    """Run a worker node from its own working directory until idle."""
+    os.chdir(cwd)
+    QueueWorker(queue_dir, poll_seconds=0.02).run(idle_exit_s=2.0)
+
+
+def _build_from(cwd: str, count: int, results) -> None:
+    """Run a distributed build with relative paths from ``cwd``."""
+    os.chdir(cwd)
+    context = PluginContext(
+        input_data={
+            "photos": [
+                {
+                    "source_path": f"source/IMG_{i}.jpg",
+                    "dest_path": f"test/IMG_{i}.jpg",
+                    "metadata": {},
+                }
+                for i in range(count)
+            ],
+            "collection_name": "relative",
+        },
+        config={
+            "thumbnail_size": 100,
+            "executor": "distributed",
+            "queue_dir": "queue",
+            "queue_local_workers": 0,
+        },
+        output_dir=Path("output"),
+    )
+    result = ThumbnailProcessorPlugin().process_thumbnails(context)
+    photos = result.output_data["photos"] if result.success else []
+    results.put(
+        (result.success, result.errors, [p.get("thumbnail_path") for p in photos])
+    )
+
+
+def _photos_with_bad(source_dir: Path, count: int, bad_index: int) -> list[dict]:
+    """Create test photos, one of which is named bad."""
+    source_dir.mkdir()
+    photos = []
+    for i in range(count):
+        name = "bad" if i == bad_index else f"IMG_{i:03d}"
+        img_path = source_dir / f"{name}.jpg"
+        Image.new("RGB", (300, 200), color=(i * 20, 50, 50)).save(img_path, "JPEG")
+        photos.append(
+            {"source_path": str(img_path), "dest_path": f"test/{name}.jpg", "metadata": {}}
+        )
+    return photos
 
 
 class TestParallelThumbnailProcessing:
@@ -200,3 +282,400 @@ class TestParallelThumbnailProcessing:
         assert result.success is True
         photo = result.output_data["photos"][0]
         assert photo["cached"] is True
+
+    def test_shared_worker_pool_is_reused_across_calls(self, tmp_path):
+        """Plugin given a WorkerPool reuses it across calls and leaves it running."""
+        # Arrange
+        source_dir = tmp_path / "source"
+        source_dir.mkdir()
+        photos = []
+        for i in range(1, 3):
+            img_path = source_dir / f"IMG_{i:03d}.jpg"
+            Image.new("RGB", (400, 300), color=(i * 60, 90, 120)).save(img_path, "JPEG")
+            photos.append(
+                {"source_path": str(img_path), "dest_path": f"test/IMG_{i:03d}.jpg", "metadata": {}}
+            )
+
+        def make_context(output_name: str) -> PluginContext:
+            return PluginContext(
+                input_data={"photos": photos, "collection_name": "pool_test"},
+                config={"thumbnail_size": 100, "parallel": True, "max_workers": 2},
+                output_dir=tmp_path / output_name,
+            )
+
+        with WorkerPool() as pool:
+            plugin = ThumbnailProcessorPlugin(worker_pool=pool)
+
+            # Act
+            first = plugin.process_thumbnails(make_context("first"))
+            executor = pool.get_executor(2)
+            second = plugin.process_thumbnails(make_context("second"))
+
+            # Assert
+            assert first.output_data["thumbnail_count"] == 2
+            assert second.output_data["thumbnail_count"] == 2
+            assert pool.is_running is True
+            assert pool.get_executor(2) is executor
+
+    def test_batched_dispatch_matches_per_photo_dispatch(self, tmp_path):
+        """Batched and per-photo dispatch → Same photo records and files."""
+        # Arrange
+        source_dir = tmp_path / "source"
+        source_dir.mkdir()
+        photos = []
+        for i in range(1, 8):
+            img_path = source_dir / f"IMG_{i:03d}.jpg"
+            Image.new("RGB", (640, 480), color=(i * 30, 200 - i * 20, 60)).save(img_path, "JPEG")
+            photos.append(
+                {"source_path": str(img_path), "dest_path": f"test/IMG_{i:03d}.jpg", "metadata": {"index": i}}
+            )
+        photos.append(
+            {"source_path": str(source_dir / "missing.jpg"), "dest_path": "test/missing.jpg", "metadata": {}}
+        )
+
+        def run(dispatch: str):
+            context = PluginContext(
+                input_data={"photos": photos, "collection_name": "dispatch_test"},
+                config={
+                    "thumbnail_size": 100,
+                    "thumbnail_sizes": [50, 100],
+                    "web_size": 400,
+                    "parallel": True,
+                    "max_workers": 2,
+                    "dispatch": dispatch,
+                    "batch_size": 3,
+                },
+                output_dir=tmp_path / dispatch,
+            )
+            result = ThumbnailProcessorPlugin().process_thumbnails(context)
+            by_dest = {p["dest_path"]: p for p in result.output_data["photos"]}
+            return result, by_dest
+
+        # Act
+        per_photo, per_photo_records = run("photo")
+        batched, batched_records = run("batched")
+
+        # Assert: same counts, errors and fields (paths differ only by output dir)
+        assert batched.output_data["thumbnail_count"] == 7
+        assert len(batched.errors) == len(per_photo.errors) == 1
+        for dest, record in per_photo_records.items():
+            expected = {
+                k: str(v).replace(str(tmp_path / "photo"), str(tmp_path / "batched"))
+                for k, v in record.items()
+            }
+            actual = {k: str(v) for k, v in batched_records[dest].items()}
+            assert actual == expected
+
+    def test_parallel_processing_preserves_manifest_order(self, tmp_path):
+        """Parallel results come back in input order and report progress."""
+        # Arrange: mix large and tiny images so completion order differs
+        source_dir = tmp_path / "source"
+        source_dir.mkdir()
+        photos = []
+        for i in range(12):
+            img_path = source_dir / f"IMG_{i:03d}.png"
+            side = 1600 if i % 3 == 0 else 64
+            Image.new("RGB", (side, side), color=(i * 20, 100, 150)).save(img_path)
+            photos.append(
+                {"source_path": str(img_path), "dest_path": f"test/IMG_{i:03d}.png", "metadata": {}}
+            )
+        progress = []
+
+        context = PluginContext(
+            input_data={"photos": photos, "collection_name": "order_test"},
+            config={"thumbnail_size": 64, "parallel": True, "max_workers": 3, "batch_size": 1},
+            output_dir=tmp_path / "output",
+            metadata={"progress_callback": lambda done, total, path: progress.append((done, total))},
+        )
+
+        # Act
+        result = ThumbnailProcessorPlugin().process_thumbnails(context)
+
+        # Assert
+        assert [p["dest_path"] for p in result.output_data["photos"]] == [
+            p["dest_path"] for p in photos
+        ]
+        assert progress == [(n, 12) for n in range(1, 13)]
+
+    def test_thread_executor_matches_serial_output(self, tmp_path):
+        """executor=thread → Same photos, order and thumbnails as serial."""
+        # Arrange
+        source_dir = tmp_path / "source"
+        source_dir.mkdir()
+        photos = []
+        for i in range(6):
+            img_path = source_dir / f"IMG_{i:03d}.jpg"
+            Image.new("RGB", (500, 300), color=(i * 40, 80, 160)).save(img_path, "JPEG")
+            photos.append(
+                {"source_path": str(img_path), "dest_path": f"test/IMG_{i:03d}.jpg", "metadata": {}}
+            )
+
+        def run(executor: str):
+            context = PluginContext(
+                input_data={"photos": photos, "collection_name": "thread_test"},
+                config={"thumbnail_size": 120, "executor": executor, "max_workers": 3},
+                output_dir=tmp_path / executor,
+            )
+            return ThumbnailProcessorPlugin().process_thumbnails(context)
+
+        # Act
+        serial = run("serial")
+        threaded = run("thread")
+
+        # Assert
+        assert threaded.success is True
+        assert threaded.output_data["thumbnail_count"] == 6
+        for expected, actual in zip(
+            serial.output_data["photos"], threaded.output_data["photos"], strict=True
+        ):
+            assert actual["dest_path"] == expected["dest_path"]
+            assert (
+                Path(actual["thumbnail_path"]).read_bytes()
+                == Path(expected["thumbnail_path"]).read_bytes()
+            )
+
+    def test_distributed_executor_matches_serial_output(self, tmp_path):
+        """executor=distributed → Same photos, order and thumbnails as serial."""
+        # Arrange
+        source_dir = tmp_path / "source"
+        source_dir.mkdir()
+        photos = []
+        for i in range(6):
+            img_path = source_dir / f"IMG_{i:03d}.jpg"
+            Image.new("RGB", (500, 300), color=(i * 40, 80, 160)).save(img_path, "JPEG")
+            photos.append(
+                {"source_path": str(img_path), "dest_path": f"test/IMG_{i:03d}.jpg", "metadata": {}}
+            )
+
+        def run(config: dict):
+            context = PluginContext(
+                input_data={"photos": photos, "collection_name": "distributed_test"},
+                config={"thumbnail_size": 120, **config},
+                output_dir=tmp_path / config["executor"],
+            )
+            return ThumbnailProcessorPlugin().process_thumbnails(context)
+
+        # Act
+        serial = run({"executor": "serial"})
+        distributed = run(
+            {
+                "executor": "distributed",
+                "queue_dir": str(tmp_path / "queue"),
+                "queue_local_workers": 2,
+                "max_workers": 2,
+            }
+        )
+
+        # Assert
+        assert distributed.success is True
+        assert distributed.output_data["thumbnail_count"] == 6
+        for expected, actual in zip(
+            serial.output_data["photos"],
+            distributed.output_data["photos"],
+            strict=True,
+        ):
+            assert actual["dest_path"] == expected["dest_path"]
+            assert (
+                Path(actual["thumbnail_path"]).read_bytes()
+                == Path(expected["thumbnail_path"]).read_bytes()
+            )
+        assert list((tmp_path / "queue" / "jobs").iterdir()) == []
+
+    def test_distributed_worker_in_other_directory(self, tmp_path):
+        """Relative config paths, node in another cwd → Outputs land in the build."""
+        build_dir = tmp_path / "build"
+        (build_dir / "source").mkdir(parents=True)
+        node_dir = tmp_path / "node"
+        node_dir.mkdir()
+        for i in range(3):
+            Image.new("RGB", (300, 200)).save(build_dir / "source" / f"IMG_{i}.jpg")
+        results = multiprocessing.Queue()
+
+        # Build and node each run from their own working directory
+        node = multiprocessing.Process(
+            target=_serve_from, args=(str(node_dir), str(build_dir / "queue"))
+        )
+        build = multiprocessing.Process(
+            target=_build_from, args=(str(build_dir), 3, results)
+        )
+        node.start()
+        build.start()
+        success, errors, thumbnail_paths = results.get(timeout=60)
+        build.join()
+        node.join()
+
+        assert success is True
+        assert errors == []
+        assert len(thumbnail_paths) == 3
+        for thumbnail_path in thumbnail_paths:
+            assert not Path(thumbnail_path).is_absolute()
+            assert (build_dir / thumbnail_path).exists()
+        assert not (node_dir / "output").exists()
+
+    def test_distributed_executor_requires_queue_dir(self, tmp_path):
+        """executor=distributed without queue_dir → Failed result."""
+        context = PluginContext(
+            input_data={"photos": [], "collection_name": "no_queue"},
+            config={"executor": "distributed"},
+            output_dir=tmp_path,
+        )
+
+        result = ThumbnailProcessorPlugin().process_thumbnails(context)
+
+        assert result.success is False
+        assert "queue_dir" in result.errors[0]
+
+    def test_crashed_worker_is_respawned_and_bad_photo_reported(self, tmp_path):
+        """Worker dies on one photo → Pool respawned, only that photo fails."""
+        photos = _photos_with_bad(tmp_path / "source", 6, bad_index=2)
+        context = PluginContext(
+            input_data={"photos": photos, "collection_name": "crash"},
+            config={
+                "thumbnail_size": 100,
+                "executor": "process",
+                "max_workers": 2,
+                "batch_size": 2,
+                "max_retries": 1,
+            },
+            output_dir=tmp_path / "output",
+        )
+
+        with patch(
+            "galleria.plugins.processors.thumbnail.process_batch", _crashing_batch
+        ):
+            result = ThumbnailProcessorPlugin().process_thumbnails(context)
+
+        assert result.success is True
+        assert result.output_data["thumbnail_count"] == 5
+        assert [p["dest_path"] for p in result.output_data["photos"]] == [
+            p["dest_path"] for p in photos
+        ]
+        assert result.errors == [
+            f"Failed to process {photos[2]['source_path']}: "
+            "worker process crashed; gave up after 2 attempts"
+        ]
+
+    def test_hung_photo_times_out(self, tmp_path):
+        """Photo that never finishes → Error after photo_timeout_s, rest done."""
+        photos = _photos_with_bad(tmp_path / "source", 4, bad_index=1)
+        context = PluginContext(
+            input_data={"photos": photos, "collection_name": "hang"},
+            config={
+                "thumbnail_size": 100,
+                "executor": "process",
+                "max_workers": 2,
+                "batch_size": 1,
+                "photo_timeout_s": 1,
+                "max_retries": 1,
+            },
+            output_dir=tmp_path / "output",
+        )
+
+        try:
+            with patch(
+                "galleria.plugins.processors.thumbnail.process_batch", _hanging_batch
+            ):
+                result = ThumbnailProcessorPlugin().process_thumbnails(context)
+        finally:
+            _release_hang.set()
+
+        assert result.success is True
+        assert result.output_data["thumbnail_count"] == 3
+        assert result.errors == [
+            f"Failed to process {photos[1]['source_path']}: "
+            "timed out after 1s; gave up after 2 attempts"
+        ]
+
+    def test_thread_executor_rejects_timeout(self, tmp_path):
+        """photo_timeout_s with threads, which cannot be killed → Fatal error."""
+        context = PluginContext(
+            input_data={"photos": [], "collection_name": "thread_timeout"},
+            config={"executor": "thread", "photo_timeout_s": 30},
+            output_dir=tmp_path,
+        )
+
+        result = ThumbnailProcessorPlugin().process_thumbnails(context)
+
+        assert result.success is False
+        assert "photo_timeout_s" in result.errors[0]
+
+    def test_failed_task_reports_its_photos(self, tmp_path):
+        """Task raises instead of returning results → Its photos are errors."""
+        photos = _photos_with_bad(tmp_path / "source", 4, bad_index=3)
+        context = PluginContext(
+            input_data={"photos": photos, "collection_name": "lost"},
+            config={
+                "thumbnail_size": 100,
+                "executor": "thread",
+                "max_workers": 2,
+                "batch_size": 2,
+            },
+            output_dir=tmp_path / "output",
+        )
+
+        with patch(
+            "galleria.plugins.processors.thumbnail.process_batch", _failing_batch
+        ):
+            result = ThumbnailProcessorPlugin().process_thumbnails(context)
+
+        assert result.success is True
+        assert result.output_data["thumbnail_count"] == 2
+        assert len(result.errors) == 2
+        assert all(error.endswith(": task lost") for error in result.errors)
+
+    def test_unknown_executor_is_fatal_error(self, tmp_path):
+        """Unsupported executor value → Failed result naming the mode."""
+        context = PluginContext(
+            input_data={"photos": [], "collection_name": "bad_executor"},
+            config={"executor": "gpu"},
+            output_dir=tmp_path,
+        )
+
+        result = ThumbnailProcessorPlugin().process_thumbnails(context)
+
+        assert result.success is False
+        assert "gpu" in result.errors[0]
+
+    def test_max_in_flight_bounds_outstanding_tasks(self, tmp_path):
+        """max_in_flight=2 → Never more than two submitted, unfinished tasks."""
+        # Arrange
+        source_dir = tmp_path / "source"
+        source_dir.mkdir()
+        photos = []
+        for i in range(10):
+            img_path = source_dir / f"IMG_{i:03d}.jpg"
+            Image.new("RGB", (300, 200), color=(i * 20, 50, 50)).save(img_path, "JPEG")
+            photos.append(
+                {"source_path": str(img_path), "dest_path": f"test/IMG_{i:03d}.jpg", "metadata": {}}
+            )
+        outstanding = []
+        peak = []
+
+        class CountingExecutor(ThreadPoolExecutor):
+            def submit(self, fn, *args, **kwargs):
+                outstanding.append(1)
+                peak.append(len(outstanding))
+                future = super().submit(fn, *args, **kwargs)
+                future.add_done_callback(lambda _: outstanding.pop())
+                return future
+
+        context = PluginContext(
+            input_data={"photos": photos, "collection_name": "window_test"},
+            config={
+                "thumbnail_size": 64,
+                "executor": "thread",
+                "max_workers": 4,
+                "batch_size": 1,
+                "max_in_flight": 2,
+            },
+            output_dir=tmp_path / "output",
+        )
+
+        # Act
+        with patch("galleria.processor.dispatch.ThreadPoolExecutor", CountingExecutor):
+            result = ThumbnailProcessorPlugin().process_thumbnails(context)
+
+        # Assert
+        assert result.output_data["thumbnail_count"] == 10
+        assert len(peak) == 10
+        assert max(peak) <= 2
@@ -0,0 +1,244 @@
+"""Unit tests for the content-hash ThumbnailCache."""
+
+import json
+import os
+import time
+
+import pytest
+
+from galleria.processor.cache import (
+    CACHE_INDEX_NAME,
+    CACHE_JOURNAL_NAME,
+    TEMP_PREFIX,
+    CacheStatus,
+    ThumbnailCache,
+    atomic_output,
+    encoding_fingerprint,
+)
+
+
+class TestEncodingFingerprint:
+    """Unit tests for encoding_fingerprint()."""
+
+    def test_fingerprint_is_stable_for_same_params(self):
+        """Same parameters in any order → Same fingerprint."""
+        a = encoding_fingerprint(size=400, quality=70, format="webp")
+        b = encoding_fingerprint(format="webp", quality=70, size=400)
+
+        assert a == b
+
+    def test_fingerprint_changes_with_any_param(self):
+        """Changing size, quality or format → Different fingerprint."""
+        base = encoding_fingerprint(size=400, quality=70, format="webp")
+
+        assert base != encoding_fingerprint(size=300, quality=70, format="webp")
+        assert base != encoding_fingerprint(size=400, quality=80, format="webp")
+        assert base != encoding_fingerprint(size=400, quality=70, format="avif")
+
+
+class TestThumbnailCache:
+    """Unit tests for ThumbnailCache index handling."""
+
+    def test_lookup_unknown_without_index(self, tmp_path):
+        """No index file → Every lookup is UNKNOWN."""
+        (tmp_path / "a.webp").write_bytes(b"x")
+        cache = ThumbnailCache(tmp_path)
+        cache.load()
+
+        assert cache.lookup("a.webp", "hash1", "fp") is CacheStatus.UNKNOWN
+
+    def test_lookup_unknown_without_content_hash(self, tmp_path):
+        """Photo without content hash → UNKNOWN even with an entry."""
+        cache = ThumbnailCache(tmp_path)
+        cache.load()
+        cache.record("a.webp", "hash1", "fp")
+
+        assert cache.lookup("a.webp", None, "fp") is CacheStatus.UNKNOWN
+
+    def test_record_save_and_reload_hits(self, tmp_path):
+        """Recorded entry survives save/load and matches as HIT."""
+        (tmp_path / "a.webp").write_bytes(b"x")
+        cache = ThumbnailCache(tmp_path)
+        cache.load()
+        cache.record("a.webp", "hash1", "fp", output_bytes=1)
+        cache.save()
+
+        reloaded = ThumbnailCache(tmp_path)
+        reloaded.load()
+
+        assert reloaded.lookup("a.webp", "hash1", "fp") is CacheStatus.HIT
+        assert reloaded.get("a.webp")["bytes"] == 1
+
+    def test_lookup_stale_on_hash_or_fingerprint_change(self, tmp_path):
+        """Content or encoding change → STALE."""
+        (tmp_path / "a.webp").write_bytes(b"x")
+        cache = ThumbnailCache(tmp_path)
+        cache.load()
+        cache.record("a.webp", "hash1", "fp")
+
+        assert cache.lookup("a.webp", "hash2", "fp") is CacheStatus.STALE
+        assert cache.lookup("a.webp", "hash1", "fp2") is CacheStatus.STALE
+
+    def test_lookup_stale_when_file_deleted(self, tmp_path):
+        """Index entry whose thumbnail was deleted → STALE."""
+        cache = ThumbnailCache(tmp_path)
+        cache.load()
+        cache.record("a.webp", "hash1", "fp")
+        cache.save()
+
+        reloaded = ThumbnailCache(tmp_path)
+        reloaded.load()
+
+        assert reloaded.lookup("a.webp", "hash1", "fp") is CacheStatus.STALE
+
+    def test_corrupt_index_is_treated_as_empty(self, tmp_path):
+        """Unreadable index → Empty cache, no exception."""
+        (tmp_path / CACHE_INDEX_NAME).write_text("{not json")
+        cache = ThumbnailCache(tmp_path)
+        cache.load()
+
+        assert cache.entries == {}
+
+    def test_save_skips_write_when_unchanged(self, tmp_path):
+        """Re-recording identical entries does not rewrite the index."""
+        (tmp_path / "a.webp").write_bytes(b"x")
+        cache = ThumbnailCache(tmp_path)
+        cache.load()
+        cache.record("a.webp", "hash1", "fp", output_bytes=1)
+        cache.save()
+        index_mtime = (tmp_path / CACHE_INDEX_NAME).stat().st_mtime_ns
+
+        reloaded = ThumbnailCache(tmp_path)
+        reloaded.load()
+        reloaded.record("a.webp", "hash1", "fp")
+        reloaded.save()
+
+        assert (tmp_path / CACHE_INDEX_NAME).stat().st_mtime_ns == index_mtime
+        data = json.loads((tmp_path / CACHE_INDEX_NAME).read_text())
+        assert data["entries"]["a.webp"]["bytes"] == 1
+
+    def test_concurrent_saves_keep_each_others_entries(self, tmp_path):
+        """Two caches loaded together, saved in turn → Both entries kept."""
+        (tmp_path / "a.webp").write_bytes(b"x")
+        (tmp_path / "b.webp").write_bytes(b"x")
+        first = ThumbnailCache(tmp_path)
+        second = ThumbnailCache(tmp_path)
+        first.load()
+        second.load()
+
+        first.record("a.webp", "hash1", "fp")
+        first.save()
+        second.record("b.webp", "hash2", "fp")
+        second.save()
+
+        reloaded = ThumbnailCache(tmp_path)
+        reloaded.load()
+        assert reloaded.lookup("a.webp", "hash1", "fp") is CacheStatus.HIT
+        assert reloaded.lookup("b.webp", "hash2", "fp") is CacheStatus.HIT
+
+    def test_recorded_quality_survives_reload(self, tmp_path):
+        """record_quality() → Same quality after save and load, per search key."""
+        cache = ThumbnailCache(tmp_path)
+        cache.load()
+        cache.record_quality("hash-a", "key-1", 62)
+        cache.save()
+
+        reloaded = ThumbnailCache(tmp_path)
+        reloaded.load()
+
+        assert reloaded.get_quality("hash-a", "key-1") == 62
+        assert reloaded.get_quality("hash-a", "key-2") is None
+        assert reloaded.get_quality(None, "key-1") is None
+
+    def test_recorded_dimensions_survive_reload(self, tmp_path):
+        """record_dimensions() → Same (width, height) after save and load."""
+        cache = ThumbnailCache(tmp_path)
+        cache.load()
+        cache.record_dimensions("hash-a", (4000, 3000))
+        cache.save()
+
+        reloaded = ThumbnailCache(tmp_path)
+        reloaded.load()
+
+        assert reloaded.get_dimensions("hash-a") == (4000, 3000)
+        assert reloaded.get_dimensions("hash-b") is None
+
+
+class TestCacheJournal:
+    """Unit tests for crash recovery through the cache journal."""
+
+    def test_unsaved_records_are_replayed(self, tmp_path):
+        """Run killed before save() → Journaled thumbnails hit and are resumed."""
+        (tmp_path / "a.webp").write_bytes(b"x")
+        cache = ThumbnailCache(tmp_path, journal=True)
+        cache.load()
+        cache.record("a.webp", "hash1", "fp", output_bytes=1)
+        cache.record_dimensions("hash1", (400, 300))
+        cache.close()  # Killed: no save()
+
+        resumed = ThumbnailCache(tmp_path, journal=True)
+        resumed.load()
+
+        assert resumed.lookup("a.webp", "hash1", "fp") is CacheStatus.HIT
+        assert resumed.get_dimensions("hash1") == (400, 300)
+        assert resumed.resumed == {"a.webp"}
+
+    def test_save_folds_journal_into_index(self, tmp_path):
+        """save() → Index holds the entries and the journal is gone."""
+        (tmp_path / "a.webp").write_bytes(b"x")
+        cache = ThumbnailCache(tmp_path, journal=True)
+        cache.load()
+        cache.record("a.webp", "hash1", "fp")
+        cache.save()
+
+        reloaded = ThumbnailCache(tmp_path)
+        reloaded.load()
+
+        assert not (tmp_path / CACHE_JOURNAL_NAME).exists()
+        assert reloaded.lookup("a.webp", "hash1", "fp") is CacheStatus.HIT
+        assert reloaded.resumed == set()
+
+    def test_torn_line_and_deleted_files_are_ignored(self, tmp_path):
+        """Partial last line, journaled file since deleted → Neither is a hit."""
+        (tmp_path / "a.webp").write_bytes(b"x")
+        cache = ThumbnailCache(tmp_path, journal=True)
+        cache.load()
+        cache.record("a.webp", "hash1", "fp")
+        cache.record("b.webp", "hash2", "fp")
+        cache.close()
+        with open(tmp_path / CACHE_JOURNAL_NAME, "a") as f:
+            f.write('["record", "c.webp", "ha')
+
+        resumed = ThumbnailCache(tmp_path)
+        resumed.load()
+
+        assert resumed.lookup("a.webp", "hash1", "fp") is CacheStatus.HIT
+        assert resumed.lookup("b.webp", "hash2", "fp") is CacheStatus.STALE
+        assert resumed.get("c.webp") is None
+
+    def test_atomic_output_keeps_old_file_on_failure(self, tmp_path):
+        """Write interrupted by an error → Previous file intact, no temp left."""
+        path = tmp_path / "a.webp"
+        path.write_bytes(b"old")
+
+        with pytest.raises(RuntimeError):
+            with atomic_output(path) as tmp:
+                tmp.write_bytes(b"partial")
+                raise RuntimeError("killed")
+
+        assert path.read_bytes() == b"old"
+        assert os.listdir(tmp_path) == ["a.webp"]
+
+    def test_stale_temp_files_are_swept(self, tmp_path):
+        """Temp files of a killed run → Removed; recent ones are left alone."""
+        stale = tmp_path / f"{TEMP_PREFIX}1-a.webp"
+        recent = tmp_path / f"{TEMP_PREFIX}2-b.webp"
+        stale.write_bytes(b"partial")
+        recent.write_bytes(b"partial")
+        old = time.time() - 7200
+        os.utime(stale, (old, old))
+        cache = ThumbnailCache(tmp_path)
+        cache.load()
+
+        assert not stale.exists()
+        assert recent.exists()
@@ -0,0 +1,60 @@
+"""Unit tests for square crop selection."""
+
+import pytest
+from PIL import Image, ImageDraw
+
+from galleria.processor.crop import center_crop_box, crop_to_box, smart_crop_box
+
+
+def _portrait_with_subject_at_top():
+    """Plain grey portrait with a detailed block near the top edge."""
+    img = Image.new("RGB", (400, 1200), color=(128, 128, 128))
+    draw = ImageDraw.Draw(img)
+    for x in range(0, 400, 20):
+        draw.rectangle((x, 40, x + 9, 360), fill=(255, 0, 0))
+        draw.rectangle((x + 10, 40, x + 19, 360), fill=(0, 0, 255))
+    return img
+
+
+class TestSmartCropBox:
+    """Unit tests for smart_crop_box()."""
+
+    @pytest.mark.parametrize("mode", ["entropy", "edges"])
+    def test_window_follows_subject(self, mode):
+        """Detail near the top of a portrait → Window at the top."""
+        box = smart_crop_box(_portrait_with_subject_at_top(), mode)
+
+        left, top, right, bottom = box
+        assert (left, right) == (0.0, 1.0)
+        assert top < 0.1
+        assert bottom - top == pytest.approx(1 / 3, abs=1e-3)
+
+    def test_flat_image_falls_back_to_centre(self):
+        """No detail anywhere → Same box as the centre crop."""
+        img = Image.new("RGB", (1200, 400), color="white")
+
+        assert smart_crop_box(img, "entropy") == center_crop_box(1200, 400)
+
+    def test_center_mode(self):
+        """center → Centred square."""
+        img = _portrait_with_subject_at_top()
+
+        assert smart_crop_box(img, "center") == (0.0, 0.3333, 1.0, 0.6667)
+
+    def test_unknown_mode_raises(self):
+        """Unsupported mode → ValueError."""
+        with pytest.raises(ValueError, match="Unknown crop mode"):
+            smart_crop_box(Image.new("RGB", (20, 10)), "faces")
+
+
+class TestCropToBox:
+    """Unit tests for crop_to_box()."""
+
+    def test_scales_box_to_reduced_decode(self):
+        """Box from the full image applied to a half-size decode → Square."""
+        box = smart_crop_box(_portrait_with_subject_at_top(), "entropy")
+        half = _portrait_with_subject_at_top().reduce(2)
+
+        cropped = crop_to_box(half, box)
+
+        assert cropped.size == (200, 200)
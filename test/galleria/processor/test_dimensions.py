@@ -0,0 +1,41 @@
+"""Unit tests for header-only dimension probing."""
+
+import pytest
+from PIL import Image
+
+from galleria.processor.dimensions import DimensionProbeError, probe_dimensions
+
+
+class TestProbeDimensions:
+    """Unit tests for probe_dimensions()."""
+
+    def test_reads_size_without_decoding(self, tmp_path, monkeypatch):
+        """JPEG header → (width, height) with pixel data never loaded."""
+        path = tmp_path / "photo.jpg"
+        Image.new("RGB", (640, 480)).save(path, "JPEG")
+
+        def fail_load(self):
+            raise AssertionError("pixel data decoded")
+
+        monkeypatch.setattr(Image.Image, "load", fail_load)
+
+        assert probe_dimensions(path) == (640, 480)
+
+    def test_rotated_exif_orientation_swaps_dimensions(self, tmp_path):
+        """EXIF orientation 6 (90° rotation) → Display size is portrait."""
+        path = tmp_path / "rotated.jpg"
+        exif = Image.Exif()
+        exif[0x0112] = 6
+        Image.new("RGB", (640, 480)).save(path, "JPEG", exif=exif)
+
+        assert probe_dimensions(path) == (480, 640)
+
+    def test_unreadable_file_raises(self, tmp_path):
+        """Missing or non-image file → DimensionProbeError."""
+        bogus = tmp_path / "bogus.jpg"
+        bogus.write_text("not an image")
+
+        with pytest.raises(DimensionProbeError):
+            probe_dimensions(tmp_path / "missing.jpg")
+        with pytest.raises(DimensionProbeError):
+            probe_dimensions(bogus)
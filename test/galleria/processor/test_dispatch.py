@@ -0,0 +1,176 @@
+"""Unit tests for the bounded, supervised task dispatcher."""
+
+import os
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from galleria.processor.dispatch import TaskDispatcher
+
+
+def _run(items: list) -> list:
+    """Return the indexes of a chunk of items."""
+    return [index for index, _, _ in items]
+
+
+def _crash_on_bad(items: list) -> list:
+    """Kill the worker process when the chunk holds the bad item."""
+    if any(photo.get("bad") for _, photo, _ in items):
+        os._exit(1)
+    return _run(items)
+
+
+def _hang_on_bad(items: list) -> list:
+    """Never return when the chunk holds the bad item."""
+    if any(photo.get("bad") for _, photo, _ in items):
+        time.sleep(60)
+    return _run(items)
+
+
+def _dispatch(mode, task, items, **options):
+    """Run items through a TaskDispatcher; return (done, failed)."""
+    done, failed = [], []
+
+    def submit_task(executor, batch):
+        return executor.submit(task, batch)
+
+    def complete_task(future, batch):
+        done.extend(future.result())
+
+    def fail_item(item, reason):
+        failed.append((item[0], reason))
+
+    with TaskDispatcher(
+        mode, submit_task, complete_task, fail_item, **options
+    ) as dispatcher:
+        for item in items:
+            dispatcher.add(item)
+        dispatcher.finish()
+    return sorted(done), failed
+
+
+class TestTaskDispatcher:
+    """Unit tests for TaskDispatcher."""
+
+    def test_every_item_completed(self):
+        """Thread mode, partial last chunk → Every item completed once."""
+        items = [(i, {}, False) for i in range(10)]
+
+        done, failed = _dispatch("thread", _run, items, chunk_size=3, max_workers=2)
+
+        assert done == list(range(10))
+        assert failed == []
+
+    def test_window_bounds_outstanding_tasks(self):
+        """max_in_flight=2 → Never more than two tasks submitted at once."""
+        peak = []
+
+        def submit_task(executor, batch):
+            peak.append(dispatcher.in_flight + 1)
+            return executor.submit(_run, batch)
+
+        with TaskDispatcher(
+            "thread",
+            submit_task,
+            lambda future, batch: future.result(),
+            lambda item, reason: None,
+            chunk_size=1,
+            max_workers=4,
+            max_in_flight=2,
+        ) as dispatcher:
+            for i in range(8):
+                dispatcher.add((i, {}, False))
+            dispatcher.finish()
+
+        assert max(peak) == 2
+
+    def test_crashing_item_isolated(self):
+        """Worker killed by one item → Batch mates done, bad item failed."""
+        items = [(i, {"bad": i == 2}, False) for i in range(4)]
+
+        done, failed = _dispatch(
+            "process", _crash_on_bad, items, chunk_size=4, max_workers=1
+        )
+
+        assert done == [0, 1, 3]
+        assert failed == [(2, "worker process crashed; gave up after 2 attempts")]
+
+    def test_crash_suspects_are_the_failed_tasks(self):
+        """Broken task late in the window → Only the bad item retried alone."""
+        submitted = Counter()
+
+        def submit_task(executor, batch):
+            submitted.update(index for index, _, _ in batch)
+            if batch[0][0] == 6:
+                # The pool reports the crash on the task that caused it
+                future = Future()
+                future.set_exception(BrokenProcessPool("worker died"))
+                return future
+            return executor.submit(_run, batch)
+
+        done, failed = [], []
+        with TaskDispatcher(
+            "thread",
+            submit_task,
+            lambda future, batch: done.extend(future.result()),
+            lambda item, reason: failed.append((item[0], reason)),
+            chunk_size=1,
+            max_workers=2,
+            max_in_flight=8,
+        ) as dispatcher:
+            for i in range(8):
+                dispatcher.add((i, {}, False))
+            dispatcher.finish()
+
+        assert sorted(done) == [0, 1, 2, 3, 4, 5, 7]
+        assert failed == [(6, "worker process crashed; gave up after 2 attempts")]
+        assert submitted[6] == 2
+
+    def test_hung_item_killed(self):
+        """Item over its budget → Executor killed, item failed after retry."""
+        items = [(i, {"bad": i == 1}, False) for i in range(3)]
+
+        start = time.monotonic()
+        done, failed = _dispatch(
+            "process",
+            _hang_on_bad,
+            items,
+            chunk_size=1,
+            max_workers=1,
+            photo_timeout_s=1,
+        )
+
+        assert done == [0, 2]
+        assert failed == [(1, "timed out after 1s; gave up after 2 attempts")]
+        assert time.monotonic() - start < 30
+
+    def test_abandoned_run_cancels_queued_tasks(self):
+        """Exception inside the with block → Tasks not yet started cancelled."""
+        never = threading.Event()
+        futures = []
+
+        def submit_task(executor, batch):
+            # The first task holds the only worker while the rest queue
+            futures.append(executor.submit(never.wait, 0.5))
+            return futures[-1]
+
+        with pytest.raises(RuntimeError):
+            with TaskDispatcher(
+                "thread",
+                submit_task,
+                lambda future, batch: None,
+                lambda item, reason: None,
+                chunk_size=1,
+                max_workers=1,
+                max_in_flight=4,
+            ) as dispatcher:
+                for i in range(4):
+                    dispatcher.add((i, {}, False))
+                raise RuntimeError("cancelled")
+
+        assert dispatcher.in_flight == 0
+        assert [f.cancelled() for f in futures[1:]] == [True, True, True]
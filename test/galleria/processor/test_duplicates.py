@@ -0,0 +1,130 @@
+"""Unit tests for perceptual hashing and near-duplicate clustering."""
+
+import random
+
+import pytest
+from PIL import Image, ImageDraw
+
+import galleria.processor.duplicates as duplicates_module
+from galleria.processor.duplicates import (
+    find_duplicate_groups,
+    hamming_distances,
+    perceptual_hash,
+)
+
+
+def _scene(seed):
+    """Random rectangles on a gradient, distinct per seed."""
+    rng = random.Random(seed)
+    img = Image.linear_gradient("L").resize((600, 400)).convert("RGB")
+    draw = ImageDraw.Draw(img)
+    for _ in range(12):
+        x, y = rng.randrange(550), rng.randrange(350)
+        colour = tuple(rng.randrange(256) for _ in range(3))
+        draw.rectangle((x, y, x + rng.randrange(20, 200), y + 80), fill=colour)
+    return img
+
+
+def _distance(a, b):
+    return bin(int(a, 16) ^ int(b, 16)).count("1")
+
+
+class TestPerceptualHash:
+    """Unit tests for perceptual_hash()."""
+
+    @pytest.mark.parametrize("algorithm", ["dhash", "phash"])
+    def test_resized_export_hashes_alike(self, algorithm):
+        """Same scene at another size and quality → Near-identical hash."""
+        original = _scene(1)
+        export = original.resize((1200, 800)).reduce(3)
+
+        distance = _distance(
+            perceptual_hash(original, algorithm), perceptual_hash(export, algorithm)
+        )
+
+        assert distance <= 2
+
+    @pytest.mark.parametrize("algorithm", ["dhash", "phash"])
+    def test_different_scenes_hash_apart(self, algorithm):
+        """Unrelated images → Hashes far apart."""
+        distance = _distance(
+            perceptual_hash(_scene(1), algorithm), perceptual_hash(_scene(2), algorithm)
+        )
+
+        assert distance > 10
+
+    def test_unknown_algorithm_raises(self):
+        """Unsupported algorithm → ValueError."""
+        with pytest.raises(ValueError, match="Unknown perceptual hash"):
+            perceptual_hash(_scene(1), "ahash")
+
+
+class TestFindDuplicateGroups:
+    """Unit tests for find_duplicate_groups()."""
+
+    def test_groups_transitively_and_skips_missing(self):
+        """Chained near matches join one group; None hashes are ignored."""
+        hashes = [
+            "0000000000000000",
+            "ffffffffffffffff",
+            "0000000000000007",  # 3 bits from the first
+            None,
+            "000000000000003f",  # 3 bits from the third, 6 from the first
+        ]
+
+        assert find_duplicate_groups(hashes, threshold=3) == [[0, 2, 4]]
+        assert find_duplicate_groups(hashes, threshold=2) == []
+
+    @pytest.mark.parametrize("chunks_per_key", [1, 2, 3])
+    def test_matches_brute_force(self, monkeypatch, chunks_per_key):
+        """Multi-index lookup finds exactly the pairs a full comparison does."""
+        monkeypatch.setattr(
+            duplicates_module, "_chunks_per_key", lambda count, t: chunks_per_key
+        )
+        rng = random.Random(7)
+        values = [rng.getrandbits(64) for _ in range(150)]
+        for _ in range(150):
+            value = rng.choice(values)
+            for _ in range(rng.randint(0, 8)):
+                value ^= 1 << rng.randrange(64)
+            values.append(value)
+        hashes = [f"{value:016x}" for value in values]
+
+        parent = list(range(len(values)))
+
+        def root(i):
+            while parent[i] != i:
+                i = parent[i]
+            return i
+
+        for i in range(len(values)):
+            for j in range(i + 1, len(values)):
+                if _distance(hashes[i], hashes[j]) <= 5:
+                    a, b = root(i), root(j)
+                    parent[max(a, b)] = min(a, b)
+        expected = {}
+        for i in range(len(values)):
+            expected.setdefault(root(i), []).append(i)
+
+        assert find_duplicate_groups(hashes, threshold=5) == sorted(
+            members for members in expected.values() if len(members) > 1
+        )
+
+    def test_invalid_threshold_raises(self):
+        """Threshold outside [0, 64) → ValueError."""
+        with pytest.raises(ValueError, match="threshold"):
+            find_duplicate_groups(["00", "01"], threshold=64)
+
+
+class TestHammingDistances:
+    """Unit tests for hamming_distances()."""
+
+    def test_fallback_popcount_matches(self, monkeypatch):
+        """SWAR popcount (numpy < 2) → Same distances as bitwise_count."""
+        import numpy as np
+
+        a = np.array([0, 0xFFFFFFFFFFFFFFFF, 0x0F0F], dtype=np.uint64)
+        b = np.array([0, 0, 0x00FF], dtype=np.uint64)
+        monkeypatch.delattr(np, "bitwise_count", raising=False)
+
+        assert hamming_distances(a, b).tolist() == [0, 64, 8]
@@ -0,0 +1,41 @@
+"""Unit tests for the pluggable thumbnail encoders."""
+
+import pytest
+from PIL import Image
+
+from galleria.processor.encoders import UnsupportedFormatError, get_encoder
+
+
+class TestGetEncoder:
+    """Unit tests for get_encoder()."""
+
+    @pytest.mark.parametrize(
+        ("name", "extension", "mime_type"),
+        [
+            ("webp", "webp", "image/webp"),
+            ("AVIF", "avif", "image/avif"),
+            ("jpeg", "jpg", "image/jpeg"),
+            ("jpg", "jpg", "image/jpeg"),
+        ],
+    )
+    def test_resolves_names_and_extensions(self, name, extension, mime_type):
+        """Config names and extensions → Same encoder, case-insensitive."""
+        encoder = get_encoder(name)
+
+        assert encoder.extension == extension
+        assert encoder.mime_type == mime_type
+
+    def test_unknown_format_raises(self):
+        """Unknown name → UnsupportedFormatError listing known formats."""
+        with pytest.raises(UnsupportedFormatError, match="webp"):
+            get_encoder("bmp")
+
+    def test_save_returns_written_bytes(self, tmp_path):
+        """save() writes the format and returns the file size."""
+        path = tmp_path / "out.jpg"
+
+        written = get_encoder("jpeg").save(Image.new("RGB", (64, 64)), path, 80)
+
+        assert written == path.stat().st_size
+        with Image.open(path) as img:
+            assert img.format == "JPEG"
@@ -237,6 +237,333 @@ class TestImageProcessorProcessImage:
         )
 
 
+def _make_detailed_image(size):
+    """Create an RGB image with gradients so resampling differences show."""
+    width, height = size
+    red = Image.linear_gradient("L").resize((width, height))
+    green = Image.radial_gradient("L").resize((width, height))
+    blue = red.transpose(Image.Transpose.ROTATE_90).resize((width, height))
+    return Image.merge("RGB", (red, green, blue))
+
+
+def _mean_abs_difference(path_a, path_b):
+    """Mean absolute per-channel difference between two images."""
+    from PIL import ImageChops, ImageStat
+
+    with Image.open(path_a) as img_a, Image.open(path_b) as img_b:
+        diff = ImageChops.difference(img_a.convert("RGB"), img_b.convert("RGB"))
+        return sum(ImageStat.Stat(diff).mean) / 3
+
+
+class TestImageProcessorReducedDecode:
+    """Unit tests for reduced-scale decoding in process_image."""
+
+    def test_reduced_decode_jpeg_matches_full_decode(self, tmp_path):
+        """JPEG DCT-scaled decode → Output equivalent to full decode."""
+        # Arrange: Large JPEG where draft() can decode at 1/4 scale
+        source_path = tmp_path / "large.jpg"
+        _make_detailed_image((3200, 2400)).save(source_path, "JPEG", quality=95)
+
+        from galleria.processor.image import ImageProcessor
+
+        processor = ImageProcessor()
+        full_dir = tmp_path / "full"
+        reduced_dir = tmp_path / "reduced"
+        full_dir.mkdir()
+        reduced_dir.mkdir()
+
+        # Act
+        full_path = processor.process_image(
+            source_path, full_dir, size=400, reduced_decode=False
+        )
+        reduced_path = processor.process_image(
+            source_path, reduced_dir, size=400, reduced_decode=True
+        )
+
+        # Assert: Same geometry, visually equivalent pixels
+        with Image.open(full_path) as full, Image.open(reduced_path) as reduced:
+            assert full.size == reduced.size == (400, 400)
+        assert _mean_abs_difference(full_path, reduced_path) < 2.0
+
+    def test_reduced_decode_png_matches_full_decode(self, tmp_path):
+        """Non-JPEG integer reduce → Output equivalent to full decode."""
+        source_path = tmp_path / "large.png"
+        _make_detailed_image((1800, 1200)).save(source_path, "PNG")
+
+        from galleria.processor.image import ImageProcessor
+
+        processor = ImageProcessor()
+        full_dir = tmp_path / "full"
+        reduced_dir = tmp_path / "reduced"
+        full_dir.mkdir()
+        reduced_dir.mkdir()
+
+        full_path = processor.process_image(
+            source_path, full_dir, size=400, reduced_decode=False
+        )
+        reduced_path = processor.process_image(
+            source_path, reduced_dir, size=400, reduced_decode=True
+        )
+
+        assert _mean_abs_difference(full_path, reduced_path) < 2.0
+
+    def test_open_image_never_decodes_below_target_size(self, tmp_path):
+        """Reduced decode keeps the short side at or above the target size."""
+        source_path = tmp_path / "portrait.jpg"
+        _make_detailed_image((2000, 3000)).save(source_path, "JPEG")
+
+        from galleria.processor.image import ImageProcessor
+
+        processor = ImageProcessor()
+        img = processor._open_image(source_path, 400, reduced_decode=True)
+
+        # 1/4 scale (500px short side) is the smallest that still covers 400px
+        assert min(img.size) >= 400
+        assert img.size == (500, 750)
+
+    def test_reduced_decode_handles_source_smaller_than_target(self, tmp_path):
+        """Source smaller than target → No reduction, upscaled as before."""
+        source_path = tmp_path / "small.jpg"
+        _make_detailed_image((300, 200)).save(source_path, "JPEG")
+
+        output_dir = tmp_path / "output"
+        output_dir.mkdir()
+
+        from galleria.processor.image import ImageProcessor
+
+        processor = ImageProcessor()
+        result_path = processor.process_image(source_path, output_dir, size=400)
+
+        with Image.open(result_path) as result_img:
+            assert result_img.size == (400, 400)
+
+
+class TestImageProcessorDerivatives:
+    """Unit tests for ImageProcessor.process_derivatives."""
+
+    def test_process_derivatives_emits_square_ladder_and_web(self, tmp_path):
+        """One call → Every square size plus aspect-preserving web size."""
+        source_path = tmp_path / "landscape.jpg"
+        _make_detailed_image((3000, 2000)).save(source_path, "JPEG")
+        output_dir = tmp_path / "output"
+        output_dir.mkdir()
+
+        from galleria.processor.image import ImageProcessor
+
+        result = ImageProcessor().process_derivatives(
+            source_path,
+            output_dir,
+            {200: "a-200.webp", 400: "a.webp", 800: "a-800.webp"},
+            web_name="a-web.webp",
+            web_size=1600,
+        )
+
+        for size, path in result["thumbnails"].items():
+            with Image.open(path) as img:
+                assert img.size == (size, size)
+        web_path, web_dims = result["web"]
+        assert web_dims == (1600, 1067)
+        with Image.open(web_path) as img:
+            assert img.size == web_dims
+
+    def test_process_derivatives_decodes_source_once(self, tmp_path, monkeypatch):
+        """The whole ladder comes from a single Image.open of the source."""
+        source_path = tmp_path / "photo.jpg"
+        _make_detailed_image((1600, 1200)).save(source_path, "JPEG")
+        output_dir = tmp_path / "output"
+        output_dir.mkdir()
+
+        import galleria.processor.image as image_module
+
+        opened = []
+        original_open = image_module.Image.open
+
+        def counting_open(path, *args, **kwargs):
+            opened.append(path)
+            return original_open(path, *args, **kwargs)
+
+        monkeypatch.setattr(image_module.Image, "open", counting_open)
+
+        image_module.ImageProcessor().process_derivatives(
+            source_path,
+            output_dir,
+            {200: "p-200.webp", 400: "p.webp"},
+            web_name="p-web.webp",
+            web_size=1000,
+        )
+
+        assert opened == [source_path]
+
+    def test_process_derivatives_never_upscales_web_size(self, tmp_path):
+        """Source smaller than web_size → Web derivative keeps source size."""
+        source_path = tmp_path / "small.png"
+        _make_detailed_image((900, 600)).save(source_path, "PNG")
+        output_dir = tmp_path / "output"
+        output_dir.mkdir()
+
+        from galleria.processor.image import ImageProcessor
+
+        result = ImageProcessor().process_derivatives(
+            source_path, output_dir, {400: "s.webp"}, web_name="s-web.webp", web_size=1600
+        )
+
+        assert result["web"][1] == (900, 600)
+
+    def test_process_derivatives_applies_exif_orientation_first(self, tmp_path):
+        """Orientation 6 → Smart crop and every derivative on upright pixels."""
+        from PIL import ImageDraw
+
+        # Upright portrait with vertical red/blue stripes near the top,
+        # stored rotated a quarter turn with the tag that undoes it
+        upright = Image.new("RGB", (400, 1200), color=(128, 128, 128))
+        draw = ImageDraw.Draw(upright)
+        for x in range(0, 400, 20):
+            draw.rectangle((x, 40, x + 9, 360), fill=(255, 0, 0))
+            draw.rectangle((x + 10, 40, x + 19, 360), fill=(0, 0, 255))
+        exif = Image.Exif()
+        exif[0x0112] = 6
+        source_path = tmp_path / "rotated.jpg"
+        upright.transpose(Image.Transpose.ROTATE_90).save(
+            source_path, "JPEG", quality=95, exif=exif
+        )
+        output_dir = tmp_path / "output"
+        output_dir.mkdir()
+
+        from galleria.processor.image import ImageProcessor
+
+        result = ImageProcessor().process_derivatives(
+            source_path,
+            output_dir,
+            {400: "r.webp"},
+            web_name="r-web.webp",
+            web_size=1200,
+            crop="entropy",
+        )
+
+        left, top, right, bottom = result["crop_box"]
+        assert (left, right) == (0.0, 1.0)
+        assert top < 0.1
+        assert result["web"][1] == (400, 1200)
+        with Image.open(result["thumbnails"][400]) as img:
+            red, _, blue = img.convert("RGB").getpixel((5, 200))
+            assert red > blue
+            red, _, blue = img.convert("RGB").getpixel((15, 200))
+            assert blue > red
+
+
+class TestImageProcessorFormats:
+    """Unit tests for output_format and alternate format encoding."""
+
+    @pytest.mark.parametrize(
+        ("output_format", "suffix", "pil_format"),
+        [("jpeg", ".jpg", "JPEG"), ("avif", ".avif", "AVIF")],
+    )
+    def test_process_image_writes_requested_format(
+        self, tmp_path, output_format, suffix, pil_format
+    ):
+        """Non-WebP output → Matching suffix, no forced .webp."""
+        source_path = tmp_path / "source.jpg"
+        _make_detailed_image((600, 400)).save(source_path, "JPEG")
+
+        from galleria.processor.image import ImageProcessor
+
+        result_path = ImageProcessor().process_image(
+            source_path, tmp_path, size=100, output_format=output_format
+        )
+
+        assert result_path == tmp_path / f"source{suffix}"
+        with Image.open(result_path) as img:
+            assert img.format == pil_format
+
+    def test_unknown_format_raises_processing_error(self, tmp_path):
+        """Unsupported format → ImageProcessingError."""
+        source_path = tmp_path / "source.jpg"
+        Image.new("RGB", (100, 100)).save(source_path, "JPEG")
+
+        from galleria.processor.image import ImageProcessingError, ImageProcessor
+
+        with pytest.raises(ImageProcessingError, match="Unsupported"):
+            ImageProcessor().process_image(source_path, tmp_path, output_format="bmp")
+
+    def test_oversized_image_raises_before_decoding(self, tmp_path):
+        """Pixels over max_image_pixels → ImageProcessingError, no output."""
+        source_path = tmp_path / "source.jpg"
+        Image.new("RGB", (200, 100)).save(source_path, "JPEG")
+
+        from galleria.processor.image import ImageProcessingError, ImageProcessor
+
+        with pytest.raises(ImageProcessingError, match="exceeds max_image_pixels"):
+            ImageProcessor(max_image_pixels=10_000).process_image(
+                source_path, tmp_path / "out"
+            )
+        assert not (tmp_path / "out").exists()
+
+    def test_preview_writes_same_outputs(self, tmp_path):
+        """preview=True → Same files and sizes, cheaper resize and encode."""
+        source_path = tmp_path / "photo.jpg"
+        _make_detailed_image((1200, 800)).save(source_path, "JPEG")
+
+        from galleria.processor.image import ImageProcessor
+
+        result = ImageProcessor().process_derivatives(
+            source_path,
+            tmp_path,
+            {100: "p-100.webp", 200: "p.webp"},
+            web_name="p-web.webp",
+            web_size=600,
+            preview=True,
+        )
+
+        assert sorted(result["thumbnails"]) == [100, 200]
+        with Image.open(tmp_path / "p.webp") as img:
+            assert img.size == (200, 200)
+        assert result["web"] == (tmp_path / "p-web.webp", (600, 400))
+
+    def test_process_derivatives_encodes_alternates(self, tmp_path):
+        """Alternate formats → Every square size written per format."""
+        source_path = tmp_path / "photo.jpg"
+        _make_detailed_image((1200, 800)).save(source_path, "JPEG")
+
+        from galleria.processor.image import ImageProcessor
+
+        result = ImageProcessor().process_derivatives(
+            source_path,
+            tmp_path,
+            {100: "p-100.jpg", 200: "p.jpg"},
+            output_format="jpeg",
+            alternate_formats=("avif", "webp"),
+        )
+
+        assert [s["format"] for s in result["sources"]] == ["avif", "webp"]
+        assert result["sources"][0]["mime_type"] == "image/avif"
+        for source in result["sources"]:
+            assert sorted(source["thumbnails"]) == [100, 200]
+            for path in source["thumbnails"].values():
+                assert path.suffix == "." + source["format"]
+                assert path.exists()
+
+    def test_smallest_wins_drops_larger_alternates(self, tmp_path):
+        """smallest_wins → Alternates not smaller than the primary are deleted."""
+        source_path = tmp_path / "photo.jpg"
+        _make_detailed_image((800, 800)).save(source_path, "JPEG")
+
+        from galleria.processor.image import ImageProcessor
+
+        result = ImageProcessor().process_derivatives(
+            source_path,
+            tmp_path,
+            {200: "p.webp"},
+            quality=50,
+            output_format="webp",
+            alternate_formats=("jpeg",),
+            smallest_wins=True,
+            format_quality={"jpeg": 100},
+        )
+
+        assert result["sources"] == []
+        assert not (tmp_path / "p.jpg").exists()
+
+
 class TestImageProcessorCaching:
     """Unit tests for thumbnail caching logic."""
 
@@ -308,3 +635,30 @@ class TestImageProcessorCaching:
 
         # Assert: Should reprocess
         assert should_process is True
+
+
+class TestImageProcessorDecodeEstimate:
+    """Unit tests for header-only decode size estimates."""
+
+    def test_jpeg_estimate_accounts_for_dct_scaling(self, tmp_path):
+        """3200x2400 JPEG at size 400 → Estimated at 1/4 scale RGB."""
+        from galleria.processor.image import ImageProcessor
+
+        source_path = tmp_path / "large.jpg"
+        Image.new("RGB", (3200, 2400)).save(source_path, "JPEG")
+        processor = ImageProcessor()
+
+        assert processor.estimate_decode_bytes(source_path, 400) == 800 * 600 * 3
+        assert (
+            processor.estimate_decode_bytes(source_path, 400, reduced_decode=False)
+            == 3200 * 2400 * 3
+        )
+
+    def test_png_estimate_is_full_size(self, tmp_path):
+        """Non-JPEG formats → Full-size decode estimate with mode's pixel size."""
+        from galleria.processor.image import ImageProcessor
+
+        source_path = tmp_path / "pano.png"
+        Image.new("RGBA", (1600, 400)).save(source_path, "PNG")
+
+        assert ImageProcessor().estimate_decode_bytes(source_path, 400) == 1600 * 400 * 4
@@ -0,0 +1,51 @@
+"""Unit tests for LQIP and dominant colour placeholders."""
+
+import base64
+import io
+
+from PIL import Image, ImageDraw
+
+from galleria.processor.placeholder import (
+    LQIP_SIZE,
+    dominant_color,
+    lqip_data_uri,
+    make_placeholder,
+)
+
+
+class TestDominantColor:
+    """Unit tests for dominant_color()."""
+
+    def test_returns_majority_colour(self):
+        """Mostly blue image with a red corner → Blue."""
+        img = Image.new("RGB", (100, 100), color=(20, 40, 200))
+        ImageDraw.Draw(img).rectangle((0, 0, 30, 30), fill=(220, 10, 10))
+
+        assert dominant_color(img) == "#1428c8"
+
+    def test_accepts_non_rgb_modes(self):
+        """Greyscale input → Grey hex colour."""
+        assert dominant_color(Image.new("L", (10, 10), color=128)) == "#808080"
+
+
+class TestLqip:
+    """Unit tests for lqip_data_uri() and make_placeholder()."""
+
+    def test_data_uri_is_tiny_webp(self):
+        """Data URI decodes to a WebP no larger than LQIP_SIZE."""
+        uri = lqip_data_uri(Image.new("RGB", (400, 300), color="green"))
+
+        header, data = uri.split(",", 1)
+        assert header == "data:image/webp;base64"
+        with Image.open(io.BytesIO(base64.b64decode(data))) as img:
+            assert img.format == "WEBP"
+            assert max(img.size) == LQIP_SIZE
+            assert img.size == (16, 12)
+
+    def test_make_placeholder_reports_elapsed_time(self):
+        """make_placeholder() → lqip, dominant_color and elapsed_s."""
+        placeholder = make_placeholder(Image.new("RGB", (64, 64), color="white"))
+
+        assert placeholder["dominant_color"] == "#ffffff"
+        assert placeholder["lqip"].startswith("data:image/webp")
+        assert placeholder["elapsed_s"] >= 0
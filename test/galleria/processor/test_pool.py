@@ -0,0 +1,88 @@
+"""Unit tests for the long-lived WorkerPool."""
+
+import os
+import time
+
+from galleria.processor.pool import WorkerPool
+
+
+def _worker_pid(_: int) -> int:
+    """Return the pid of the worker that ran the task."""
+    return os.getpid()
+
+
+class TestWorkerPool:
+    """Unit tests for WorkerPool lifecycle."""
+
+    def test_pool_is_created_lazily(self):
+        """New WorkerPool → No worker processes until first use."""
+        pool = WorkerPool()
+
+        assert pool.is_running is False
+        assert pool.max_workers is None
+
+    def test_executor_is_reused_for_same_worker_count(self):
+        """Repeated get_executor() with same size → Same executor and workers."""
+        with WorkerPool() as pool:
+            # Act
+            first = pool.get_executor(max_workers=1)
+            first_pid = first.submit(_worker_pid, 0).result()
+            second = pool.get_executor(max_workers=1)
+            second_pid = second.submit(_worker_pid, 0).result()
+
+            # Assert
+            assert first is second
+            assert first_pid == second_pid
+
+    def test_executor_is_replaced_when_worker_count_changes(self):
+        """Different max_workers → Old executor shut down, new one sized."""
+        with WorkerPool() as pool:
+            # Act
+            first = pool.get_executor(max_workers=1)
+            first.submit(_worker_pid, 0).result()
+            second = pool.get_executor(max_workers=2)
+
+            # Assert
+            assert first is not second
+            assert pool.max_workers == 2
+            assert second.submit(_worker_pid, 0).result() != os.getpid()
+
+    def test_none_worker_count_uses_cpu_count(self):
+        """max_workers=None → Pool sized to os.cpu_count()."""
+        with WorkerPool() as pool:
+            pool.get_executor(None)
+
+            assert pool.max_workers == (os.cpu_count() or 1)
+
+    def test_shutdown_is_idempotent_and_pool_restarts(self):
+        """shutdown() twice is safe and the pool can be started again."""
+        pool = WorkerPool()
+        pool.get_executor(max_workers=1)
+
+        # Act
+        pool.shutdown()
+        pool.shutdown()
+
+        # Assert
+        assert pool.is_running is False
+        executor = pool.get_executor(max_workers=1)
+        assert executor.submit(_worker_pid, 0).result() != os.getpid()
+        pool.shutdown()
+
+    def test_kill_stops_stuck_worker_and_pool_restarts(self):
+        """kill() with a task stuck in a worker → Worker gone, fresh pool next."""
+        pool = WorkerPool()
+        executor = pool.get_executor(max_workers=1)
+        stuck_pid = executor.submit(_worker_pid, 0).result()
+        executor.submit(time.sleep, 60)
+
+        # Act
+        start = time.monotonic()
+        pool.kill()
+
+        # Assert
+        assert time.monotonic() - start < 5
+        assert pool.is_running is False
+        fresh = pool.get_executor(max_workers=1)
+        assert fresh.submit(_worker_pid, 0).result() != stuck_pid
+        pool.shutdown()
@@ -0,0 +1,64 @@
+"""Unit tests for the SSIM metric and adaptive quality search."""
+
+import pytest
+from PIL import Image, ImageFilter
+
+from galleria.processor.encoders import get_encoder
+from galleria.processor.quality import search_quality, ssim
+
+
+def _detailed_image(size=(128, 128)):
+    """Gradient image with enough structure for SSIM to react to blur."""
+    red = Image.linear_gradient("L").resize(size)
+    green = Image.radial_gradient("L").resize(size)
+    return Image.merge("RGB", (red, green, red.transpose(Image.Transpose.ROTATE_90)))
+
+
+class TestSsim:
+    """Unit tests for ssim()."""
+
+    def test_identical_images_score_one(self):
+        """Image against itself → 1.0."""
+        img = _detailed_image()
+
+        assert ssim(img, img.copy()) == pytest.approx(1.0)
+
+    def test_degradation_lowers_score(self):
+        """Stronger blur → Lower SSIM."""
+        img = _detailed_image()
+        light = img.filter(ImageFilter.GaussianBlur(1))
+        heavy = img.filter(ImageFilter.GaussianBlur(4))
+
+        assert ssim(img, heavy) < ssim(img, light) < 1.0
+
+    def test_size_mismatch_raises(self):
+        """Different sizes → ValueError."""
+        with pytest.raises(ValueError, match="equal sizes"):
+            ssim(_detailed_image((64, 64)), _detailed_image((32, 32)))
+
+
+class TestSearchQuality:
+    """Unit tests for search_quality()."""
+
+    def test_higher_target_needs_higher_quality(self):
+        """Stricter SSIM target → Equal or higher chosen quality."""
+        img = _detailed_image()
+        encoder = get_encoder("webp")
+
+        low, _ = search_quality(img, encoder, target_ssim=0.85)
+        high, data = search_quality(img, encoder, target_ssim=0.99)
+
+        assert low <= high
+        assert data == encoder.encode(img, high)
+
+    def test_unreachable_target_returns_max_quality(self):
+        """Target above what the range can reach → max_quality."""
+        quality, _ = search_quality(
+            _detailed_image(),
+            get_encoder("jpeg"),
+            target_ssim=1.01,
+            min_quality=40,
+            max_quality=60,
+        )
+
+        assert quality == 60
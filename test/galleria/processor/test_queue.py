@@ -0,0 +1,125 @@
+"""Unit tests for the shared-directory work queue."""
+
+import multiprocessing
+import os
+import time
+
+import pytest
+
+from galleria.processor.queue import (
+    JOBS_DIR,
+    QueueWorker,
+    SharedDirectoryExecutor,
+    TaskAbandonedError,
+)
+
+
+def _square(value: int) -> int:
+    """Return the square of a value."""
+    return value * value
+
+
+def _pid(_: int) -> int:
+    """Return the pid of the process that ran the task."""
+    time.sleep(0.05)
+    return os.getpid()
+
+
+def _fail(message: str) -> None:
+    """Raise an error carrying the message."""
+    raise ValueError(message)
+
+
+def _serve(queue_dir: str) -> None:
+    """Run a worker node until the queue stays idle."""
+    QueueWorker(queue_dir, poll_seconds=0.02).run(idle_exit_s=1.0)
+
+
+class TestSharedDirectoryExecutor:
+    """Unit tests for SharedDirectoryExecutor and QueueWorker."""
+
+    def test_local_worker_resolves_futures(self, tmp_path):
+        """local_workers=1 → Results without any separate worker node."""
+        with SharedDirectoryExecutor(tmp_path, poll_seconds=0.01) as executor:
+            results = list(executor.map(_square, range(10)))
+
+        assert results == [n * n for n in range(10)]
+        assert list((tmp_path / JOBS_DIR).iterdir()) == []
+
+    def test_worker_processes_share_the_queue(self, tmp_path):
+        """Two worker processes, no local workers → Both claim tasks."""
+        nodes = [
+            multiprocessing.Process(target=_serve, args=(str(tmp_path),))
+            for _ in range(2)
+        ]
+        for node in nodes:
+            node.start()
+        try:
+            with SharedDirectoryExecutor(
+                tmp_path, local_workers=0, poll_seconds=0.01
+            ) as executor:
+                pids = list(executor.map(_pid, range(40)))
+        finally:
+            for node in nodes:
+                node.join()
+
+        assert set(pids) == {node.pid for node in nodes}
+
+    def test_task_errors_propagate_to_future(self, tmp_path):
+        """Exception in a task → Raised from Future.result()."""
+        with SharedDirectoryExecutor(tmp_path, poll_seconds=0.01) as executor:
+            future = executor.submit(_fail, "bad photo")
+
+            with pytest.raises(ValueError, match="bad photo"):
+                future.result(timeout=10)
+
+    def test_expired_lease_is_taken_over(self, tmp_path):
+        """Lease without heartbeat for lease_seconds → Next attempt claims it."""
+        executor = SharedDirectoryExecutor(
+            tmp_path, lease_seconds=5, local_workers=0, poll_seconds=0.01
+        )
+        future = executor.submit(_square, 7)
+        # A node claimed the task and died without finishing it
+        stale = executor.job_dir / "leases" / "00000000.1.lease"
+        stale.touch()
+        worker = QueueWorker(tmp_path, lease_seconds=5, poll_seconds=0.01)
+
+        assert worker.run_once() is False
+        os.utime(stale, (time.time() - 60, time.time() - 60))
+        assert worker.run_once() is True
+
+        assert future.result(timeout=10) == 49
+        assert (executor.job_dir / "leases" / "00000000.2.lease").exists()
+        executor.shutdown()
+
+    def test_task_abandoned_after_max_attempts(self, tmp_path):
+        """max_attempts expired leases → TaskAbandonedError, not another run."""
+        executor = SharedDirectoryExecutor(
+            tmp_path,
+            lease_seconds=5,
+            max_attempts=2,
+            local_workers=0,
+            poll_seconds=0.01,
+        )
+        future = executor.submit(_square, 7)
+        old = time.time() - 60
+        for attempt in (1, 2):
+            lease = executor.job_dir / "leases" / f"00000000.{attempt}.lease"
+            lease.touch()
+            os.utime(lease, (old, old))
+        worker = QueueWorker(tmp_path, lease_seconds=5, max_attempts=2)
+
+        worker.run_once()
+
+        with pytest.raises(TaskAbandonedError, match="2 expired leases"):
+            future.result(timeout=10)
+        assert worker.completed == 0
+        executor.shutdown()
+
+    def test_submit_after_shutdown_raises(self, tmp_path):
+        """Shut-down executor → submit() raises RuntimeError."""
+        executor = SharedDirectoryExecutor(tmp_path, poll_seconds=0.01)
+        executor.shutdown()
+
+        with pytest.raises(RuntimeError):
+            executor.submit(_square, 2)
@@ -0,0 +1,51 @@
+"""Unit tests for the background preview upgrader."""
+
+import threading
+
+from galleria.processor.upgrade import PreviewUpgrader
+
+
+class TestPreviewUpgrader:
+    """Unit tests for PreviewUpgrader."""
+
+    def test_task_runs_in_background(self):
+        """submit() → Task runs in another thread; wait() returns when done."""
+        seen = []
+        upgrader = PreviewUpgrader()
+
+        upgrader.submit(lambda check: seen.append(threading.current_thread().name))
+
+        assert upgrader.wait(timeout=10)
+        assert seen == ["galleria-preview-upgrade"]
+        assert upgrader.is_running is False
+
+    def test_new_submit_cancels_running_task(self):
+        """Second submit() → First task stopped at its next check."""
+        started = threading.Event()
+        events = []
+
+        def endless(check):
+            started.set()
+            try:
+                while True:
+                    check()
+                    threading.Event().wait(0.01)
+            finally:
+                events.append("first stopped")
+
+        upgrader = PreviewUpgrader()
+        upgrader.submit(endless)
+        started.wait(10)
+        upgrader.submit(lambda check: events.append("second ran"))
+
+        assert upgrader.wait(timeout=10)
+        assert events == ["first stopped", "second ran"]
+
+    def test_shutdown_without_task(self):
+        """shutdown() with nothing running → No error, safe to repeat."""
+        upgrader = PreviewUpgrader()
+
+        upgrader.shutdown()
+        upgrader.shutdown()
+
+        assert upgrader.is_running is False
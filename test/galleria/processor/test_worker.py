@@ -0,0 +1,179 @@
+"""Unit tests for batched worker-side thumbnail rendering."""
+
+from contextlib import nullcontext
+
+from PIL import Image
+
+from galleria.processor import worker
+from galleria.processor.worker import BatchParams, process_batch
+
+
+def _params(tmp_path, **overrides) -> BatchParams:
+    values = {
+        "thumbnails_dir": str(tmp_path / "thumbnails"),
+        "thumbnail_size": 100,
+        "quality": 80,
+        "output_format": "webp",
+        "reduced_decode": True,
+        "thumbnail_sizes": (),
+        "web_size": None,
+        "collect_timing": True,
+    }
+    values.update(overrides)
+    return BatchParams(**values)
+
+
+class TestProcessBatch:
+    """Unit tests for process_batch()."""
+
+    def test_batch_returns_compact_result_per_item(self, tmp_path):
+        """Each work item → One small result tuple in item order."""
+        # Arrange
+        (tmp_path / "thumbnails").mkdir()
+        items = []
+        for i in range(3):
+            source = tmp_path / f"IMG_{i}.jpg"
+            Image.new("RGB", (300, 200), color=(i * 80, 40, 90)).save(source, "JPEG")
+            items.append((i, str(source), f"IMG_{i}", False, None, None))
+
+        # Act
+        results = process_batch(_params(tmp_path), items)
+
+        # Assert
+        assert [r.index for r in results] == [0, 1, 2]
+        for result in results:
+            assert result.cached is False
+            assert result.thumbnails is None and result.web is None
+            assert result.sources is None and result.quality is None
+            assert result.placeholder is None and result.error is None
+            assert result.timing_s > 0 and result.output_bytes > 0
+            assert (tmp_path / "thumbnails" / f"IMG_{result.index}.webp").exists()
+
+    def test_batch_returns_derivative_names(self, tmp_path):
+        """Ladder and web size → File names and web dimensions in the tuple."""
+        (tmp_path / "thumbnails").mkdir()
+        source = tmp_path / "IMG_0.jpg"
+        Image.new("RGB", (1200, 800), color="teal").save(source, "JPEG")
+        params = _params(tmp_path, thumbnail_sizes=(50, 100), web_size=600)
+
+        [result] = process_batch(params, [(7, str(source), "IMG_0", False, None, None)])
+
+        assert result.index == 7
+        assert result.thumbnails == ((50, "IMG_0-50.webp"), (100, "IMG_0.webp"))
+        assert result.web == ("IMG_0-web.webp", 600, 400)
+
+    def test_failed_item_reports_error_without_failing_batch(self, tmp_path):
+        """Missing source → Error slot filled, other items still rendered."""
+        (tmp_path / "thumbnails").mkdir()
+        source = tmp_path / "ok.jpg"
+        Image.new("RGB", (200, 200), color="red").save(source, "JPEG")
+        items = [
+            (0, str(tmp_path / "missing.jpg"), "missing", False, None, None),
+            (1, str(source), "ok", False, None, None),
+        ]
+
+        missing, ok = process_batch(_params(tmp_path), items)
+
+        assert "missing.jpg" in missing.error
+        assert ok.error is None
+
+    def test_batch_returns_alternate_format_sources(self, tmp_path):
+        """Alternate formats → Per-format file names next to the primary."""
+        (tmp_path / "thumbnails").mkdir()
+        source = tmp_path / "IMG_0.jpg"
+        Image.new("RGB", (400, 300), color="navy").save(source, "JPEG")
+        params = _params(tmp_path, output_format="jpg", alternate_formats=("webp",))
+
+        [result] = process_batch(params, [(0, str(source), "IMG_0", False, None, None)])
+
+        assert result.error is None
+        assert result.sources == (("webp", "image/webp", ((100, "IMG_0.webp"),)),)
+        assert (tmp_path / "thumbnails" / "IMG_0.jpg").exists()
+        assert (tmp_path / "thumbnails" / "IMG_0.webp").exists()
+
+    def test_adaptive_quality_searches_unless_known(self, tmp_path):
+        """target_ssim → Chosen quality returned; a known quality skips search."""
+        (tmp_path / "thumbnails").mkdir()
+        source = tmp_path / "IMG_0.jpg"
+        Image.new("RGB", (400, 300), color="olive").save(source, "JPEG")
+        params = _params(tmp_path, target_ssim=0.9, quality_range=(40, 90))
+
+        searched, known = process_batch(
+            params,
+            [
+                (0, str(source), "IMG_0", False, None, None),
+                (1, str(source), "IMG_1", False, 77, None),
+            ],
+        )
+
+        assert 40 <= searched.quality <= 90
+        assert known.quality == 77
+
+    def test_placeholder_returns_lqip_and_colour(self, tmp_path):
+        """placeholder=True → Data URI, hex colour and its cost in the result."""
+        (tmp_path / "thumbnails").mkdir()
+        source = tmp_path / "IMG_0.jpg"
+        Image.new("RGB", (400, 300), color=(200, 40, 40)).save(source, "JPEG")
+
+        [result] = process_batch(
+            _params(tmp_path, placeholder=True),
+            [(0, str(source), "IMG_0", False, None, None)],
+        )
+
+        lqip, color, placeholder_s = result.placeholder
+        assert lqip.startswith("data:image/webp;base64,")
+        assert color.startswith("#") and len(color) == 7
+        assert placeholder_s >= 0
+
+
+class TestBatchParams:
+    """Unit tests for BatchParams."""
+
+    def test_plain_thumbnail_has_no_derivatives(self, tmp_path):
+        """Defaults → Primary thumbnail only."""
+        assert not _params(tmp_path).has_derivatives
+
+    def test_each_option_needs_derivatives(self, tmp_path):
+        """Any option adding files or fields → has_derivatives."""
+        for option in (
+            {"thumbnail_sizes": (100, 200)},
+            {"web_size": 1200},
+            {"alternate_formats": ("avif",)},
+            {"target_ssim": 0.98},
+            {"placeholder": True},
+            {"crop": "entropy"},
+            {"perceptual_hash": "dhash"},
+        ):
+            assert _params(tmp_path, **option).has_derivatives, option
+
+
+class TestMemoryGuard:
+    """Unit tests for the per-worker large-image memory guard."""
+
+    def test_small_image_runs_without_lock(self, tmp_path):
+        """Decode estimate under the limit → No-op guard."""
+        source = tmp_path / "small.png"
+        Image.new("RGB", (100, 100)).save(source)
+        worker.init_worker()
+
+        guard = worker._memory_guard(_params(tmp_path, memory_limit_bytes=10**6), source)
+
+        assert isinstance(guard, nullcontext)
+
+    def test_large_image_takes_shared_lock(self, tmp_path):
+        """Decode estimate over the limit → Shared large-image lock."""
+        source = tmp_path / "panorama.png"
+        Image.new("RGB", (2000, 500)).save(source)
+        worker.init_worker()
+
+        guard = worker._memory_guard(_params(tmp_path, memory_limit_bytes=10**6), source)
+
+        assert guard is worker._large_image_lock
+
+    def test_guard_disabled_without_limit(self, tmp_path):
+        """No memory limit → Guard never engages."""
+        source = tmp_path / "panorama.png"
+        Image.new("RGB", (2000, 500)).save(source)
+        worker.init_worker()
+
+        assert isinstance(worker._memory_guard(_params(tmp_path), source), nullcontext)
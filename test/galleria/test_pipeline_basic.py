@@ -140,6 +140,55 @@ class TestPipelineManagerBasic:
         assert "thumbnails" in final_result.output_data
         assert len(final_result.output_data["thumbnails"]) == 2
 
+    def test_execute_stages_runs_stage_hooks(self):
+        """Test that execute_stages() runs before/after hooks around each stage."""
+        from pathlib import Path
+
+        from galleria.manager.hooks import PluginHookManager
+        from galleria.manager.pipeline import PipelineManager
+        from galleria.plugins.base import BasePlugin, PluginContext, PluginResult
+        from galleria.plugins.registry import PluginRegistry
+
+        calls = []
+
+        class ProcessorPlugin(BasePlugin):
+            @property
+            def name(self):
+                return "processor"
+
+            @property
+            def version(self):
+                return "1.0.0"
+
+            def execute(self, context):
+                calls.append(("execute", context.hooks))
+                return PluginResult(success=True, output_data={"thumbnails": 2})
+
+        def record(name):
+            def callback(context):
+                calls.append((name, context.input_data))
+                return PluginResult(success=True, output_data=None)
+
+            return callback
+
+        registry = PluginRegistry()
+        registry.register(ProcessorPlugin(), stage="processor")
+        hooks = PluginHookManager()
+        hooks.register_hook("before_processor", record("before"))
+        hooks.register_hook("after_processor", record("after"))
+        manager = PipelineManager(registry=registry, hooks=hooks)
+
+        initial_context = PluginContext(
+            input_data={"photos": 2}, config={}, output_dir=Path("/tmp/test")
+        )
+        manager.execute_stages([("processor", "processor")], initial_context)
+
+        assert calls == [
+            ("before", {"photos": 2}),
+            ("execute", hooks),
+            ("after", {"thumbnails": 2}),
+        ]
+
     def test_execute_stages_handles_stage_failure(self):
         """Test that execute_stages() handles stage failures."""
         from pathlib import Path
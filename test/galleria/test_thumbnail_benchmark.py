@@ -3,6 +3,8 @@
 This module is kept separate for future galleria extraction.
 """
 
+import pytest
+
 from galleria.benchmark import ThumbnailBenchmark
 
 
@@ -85,3 +87,49 @@ class TestThumbnailBenchmark:
         # Verify calculations
         assert metrics["total_output_bytes"] == 75000
         assert metrics["average_output_bytes"] == 25000
+
+    def test_placeholder_cost_is_reported(self):
+        """Test that placeholder time is totalled and reported as a share."""
+        benchmark = ThumbnailBenchmark()
+        benchmark.record_photo(duration_s=0.2, output_bytes=20000, placeholder_s=0.01)
+        benchmark.record_photo(duration_s=0.2, output_bytes=20000, placeholder_s=0.03)
+
+        metrics = benchmark.get_metrics()
+
+        assert metrics["placeholder_total_s"] == pytest.approx(0.04)
+        assert metrics["placeholder_share"] == pytest.approx(0.1)
+
+    def test_placeholder_metrics_absent_without_placeholders(self):
+        """Test that placeholder metrics are omitted when none were computed."""
+        benchmark = ThumbnailBenchmark()
+        benchmark.record_photo(duration_s=0.2, output_bytes=20000)
+
+        assert "placeholder_total_s" not in benchmark.get_metrics()
+
+    def test_outcomes_are_counted(self):
+        """Test that fresh, cached and resumed photos are reported separately."""
+        benchmark = ThumbnailBenchmark()
+        benchmark.record_photo(duration_s=0.2, output_bytes=20000)
+        benchmark.record_photo(duration_s=0.0, output_bytes=20000, outcome="cached")
+        benchmark.record_photo(duration_s=0.0, output_bytes=20000, outcome="resumed")
+        benchmark.record_photo(duration_s=0.0, output_bytes=20000, outcome="resumed")
+
+        metrics = benchmark.get_metrics()
+
+        assert metrics["fresh_photos"] == 1
+        assert metrics["cached_photos"] == 1
+        assert metrics["resumed_photos"] == 2
+
+    def test_cached_photos_excluded_from_timing(self):
+        """Test that cache hits do not inflate throughput or timing stats."""
+        benchmark = ThumbnailBenchmark()
+        benchmark.record_photo(duration_s=0.5, output_bytes=30000)
+        benchmark.record_photo(duration_s=0.0, output_bytes=10000, outcome="cached")
+        benchmark.record_photo(duration_s=0.0, output_bytes=20000, outcome="resumed")
+
+        metrics = benchmark.get_metrics()
+
+        assert metrics["per_photo_times"] == [0.5]
+        assert metrics["photos_per_second"] == pytest.approx(2.0)
+        assert metrics["total_output_bytes"] == 60000
+        assert metrics["average_output_bytes"] == 20000
@@ -133,6 +133,18 @@ class TestPluginHookManager:
         assert len(results) == 3
         assert [r.output_data for r in results] == ["1", "2", "3"]
 
+    def test_has_hook_reports_registered_callbacks(self):
+        """has_hook is True only for hooks with at least one callback."""
+        manager = PluginHookManager()
+
+        def dummy_callback(context: PluginContext) -> PluginResult:
+            return PluginResult(success=True, output_data="test")
+
+        manager.register_hook("processor_item", dummy_callback)
+
+        assert manager.has_hook("processor_item") is True
+        assert manager.has_hook("template_item") is False
+
     def test_list_hooks_returns_registered_hook_names(self):
         """list_hooks returns all hook names with registered callbacks."""
         manager = PluginHookManager()
@@ -210,3 +222,17 @@ class TestPluginHookManager:
             assert len(results) == 1
             assert results[0].success is True
             assert results[0].output_data == "executed"
+
+    def test_copy_keeps_callbacks_without_sharing_registrations(self):
+        """Hooks added to a copy do not reach the original manager."""
+        calls = []
+        manager = PluginHookManager()
+        manager.register_hook("test_hook", lambda ctx: calls.append("shared"))
+
+        copy = manager.copy()
+        copy.register_hook("test_hook", lambda ctx: calls.append("run"))
+        context = PluginContext(input_data={}, config={}, output_dir=Path("/tmp"))
+        manager.execute_hook("test_hook", context)
+        copy.execute_hook("test_hook", context)
+
+        assert calls == ["shared", "shared", "run"]
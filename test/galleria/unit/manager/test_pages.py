@@ -0,0 +1,122 @@
+"""Unit tests for PageWriter."""
+
+from PIL import Image
+
+from galleria.manager.hooks import PluginHookManager
+from galleria.manager.pages import PageWriter
+from galleria.plugins import PluginContext
+from galleria.plugins.processors.thumbnail import ThumbnailProcessorPlugin
+
+
+class TestPageWriter:
+    """Tests for writing gallery pages while thumbnails are built."""
+
+    def _context(self, tmp_path, input_data) -> PluginContext:
+        return PluginContext(
+            input_data=input_data,
+            config={"transform": {"page_size": 2}, "template": {}, "css": {}},
+            output_dir=tmp_path,
+        )
+
+    def _start(self, hooks, tmp_path, total):
+        """Run the before_processor hook for a collection of total photos."""
+        hooks.execute_hook(
+            "before_processor",
+            self._context(
+                tmp_path, {"collection_name": "wedding", "photos": [{}] * total}
+            ),
+        )
+
+    def _release(self, hooks, tmp_path, released, total):
+        """Release the photo at 1-based position ``released``."""
+        photo = {"thumbnail_path": f"thumbnails/IMG_{released:03d}.webp"}
+        return hooks.execute_hook(
+            "processor_release",
+            self._context(
+                tmp_path, {"photo": photo, "released": released, "total": total}
+            ),
+        )
+
+    def test_page_written_once_full(self, tmp_path):
+        """page_1.html, index.html and CSS appear after page_size photos."""
+        hooks = PluginHookManager()
+        writer = PageWriter().attach(hooks)
+        self._start(hooks, tmp_path, total=5)
+
+        self._release(hooks, tmp_path, 1, 5)
+        assert not (tmp_path / "page_1.html").exists()
+        self._release(hooks, tmp_path, 2, 5)
+
+        page = (tmp_path / "page_1.html").read_text(encoding="utf-8")
+        assert "IMG_002.webp" in page
+        assert "Page 1 of 3" in page
+        assert (tmp_path / "index.html").exists()
+        assert (tmp_path / "gallery.css").exists()
+        assert not (tmp_path / "page_2.html").exists()
+        assert writer.written[0] == "page_1.html"
+
+    def test_last_partial_page_written_on_final_photo(self, tmp_path):
+        """The last page is written when the last photo is released."""
+        hooks = PluginHookManager()
+        writer = PageWriter().attach(hooks)
+        self._start(hooks, tmp_path, total=3)
+
+        for released in range(1, 4):
+            self._release(hooks, tmp_path, released, 3)
+
+        assert "IMG_003.webp" in (tmp_path / "page_2.html").read_text()
+        assert [name for name in writer.written if name.startswith("page_")] == [
+            "page_1.html",
+            "page_2.html",
+        ]
+
+    def test_write_failure_is_reported_not_raised(self, tmp_path):
+        """An unwritable output directory fails the hook, not the processor."""
+        hooks = PluginHookManager()
+        PageWriter().attach(hooks)
+        missing = tmp_path / "missing"
+        self._start(hooks, missing, total=1)
+
+        results = self._release(hooks, missing, 1, 1)
+
+        assert results[0].success is False
+        assert "PAGE_WRITE_ERROR" in results[0].errors[0]
+
+    def test_first_page_exists_before_processor_finishes(self, tmp_path):
+        """With the thumbnail plugin, page 1 is on disk while page 2 renders."""
+        source_dir = tmp_path / "source"
+        source_dir.mkdir()
+        photos = []
+        for i in range(4):
+            img_path = source_dir / f"IMG_{i:03d}.jpg"
+            Image.new("RGB", (200, 150), color="teal").save(img_path, "JPEG")
+            photos.append(
+                {"source_path": str(img_path), "dest_path": f"wedding/IMG_{i:03d}.jpg"}
+            )
+        output_dir = tmp_path / "output"
+        output_dir.mkdir()
+        seen = []
+        hooks = PluginHookManager()
+        PageWriter().attach(hooks)
+        hooks.register_hook(
+            "processor_item",
+            lambda ctx: seen.append((output_dir / "page_1.html").exists()),
+        )
+        context = PluginContext(
+            input_data={"photos": photos, "collection_name": "wedding"},
+            config={
+                "processor": {"thumbnail_size": 100, "schedule": "page"},
+                "transform": {"page_size": 2},
+                "template": {},
+                "css": {},
+            },
+            output_dir=output_dir,
+            hooks=hooks,
+        )
+        hooks.execute_hook("before_processor", context)
+
+        result = ThumbnailProcessorPlugin().process_thumbnails(context)
+
+        assert result.success is True
+        assert seen == [False, False, True, True]
+        assert (output_dir / "page_2.html").exists()
@@ -0,0 +1,122 @@
+"""Unit tests for ProgressReporter."""
+
+import io
+from pathlib import Path
+
+from galleria.manager.hooks import PluginHookManager
+from galleria.manager.progress import ProgressReporter, format_duration
+from galleria.plugins import PluginContext
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestProgressReporter:
+    """Tests for the live thumbnail progress display."""
+
+    def _context(self, input_data) -> PluginContext:
+        return PluginContext(input_data=input_data, config={}, output_dir=Path("/tmp"))
+
+    def _run(self, hooks, clock, photos, step_s=0.5):
+        """Drive the processor hooks for photos given as cached flags."""
+        hooks.execute_hook(
+            "before_processor",
+            self._context({"collection_name": "wedding", "photos": [{}] * len(photos)}),
+        )
+        for completed, cached in enumerate(photos, 1):
+            clock.now += step_s
+            hooks.execute_hook(
+                "processor_item",
+                self._context(
+                    {
+                        "photo": {"cached": cached},
+                        "completed": completed,
+                        "total": len(photos),
+                    }
+                ),
+            )
+
+    def _run_more(self, hooks, clock, start, count, total, step_s):
+        """Complete more photos of the current collection."""
+        for completed in range(start, start + count):
+            clock.now += step_s
+            hooks.execute_hook(
+                "processor_item",
+                self._context({"photo": {}, "completed": completed, "total": total}),
+            )
+
+    def test_log_output_reports_rate_eta_and_cache_hits(self):
+        """Non-terminal streams get periodic lines and a summary."""
+        stream = io.StringIO()
+        clock = FakeClock()
+        hooks = PluginHookManager()
+        reporter = ProgressReporter(stream=stream, clock=clock, interval_s=2.0)
+        reporter.attach(hooks)
+
+        self._run(hooks, clock, [True, False, False, False, True, False])
+        hooks.execute_hook("after_processor", self._context({}))
+
+        lines = stream.getvalue().splitlines()
+        assert lines == [
+            "  wedding: 4/6 photos (67%) | 2.0 photos/s | ETA 1s | cache hits 25%",
+            "  wedding: 6 photos in 3s | 2.0 photos/s | cache hits 33%",
+        ]
+
+    def test_rate_uses_recent_window(self):
+        """A slowdown shows up in the rate instead of the run average."""
+        clock = FakeClock()
+        hooks = PluginHookManager()
+        reporter = ProgressReporter(stream=io.StringIO(), clock=clock).attach(hooks)
+
+        self._run(hooks, clock, [False] * 40, step_s=0.1)
+        self._run_more(hooks, clock, start=41, count=20, total=60, step_s=1.0)
+
+        assert reporter.rate(clock.now) == 1.0
+
+    def test_terminal_output_redraws_in_place(self):
+        """Terminal streams overwrite the status line and end it on finish."""
+
+        class TTY(io.StringIO):
+            def isatty(self):
+                return True
+
+        stream = TTY()
+        clock = FakeClock()
+        hooks = PluginHookManager()
+        ProgressReporter(stream=stream, clock=clock).attach(hooks)
+
+        self._run(hooks, clock, [False, False])
+        hooks.execute_hook("after_processor", self._context({}))
+
+        output = stream.getvalue()
+        assert output.startswith("\r  wedding: 1/2 photos (50%)")
+        assert output.count("\r") == 3
+        assert output.rstrip().endswith("cache hits 0%")
+        assert output.endswith("\n")
+        assert output.count("\n") == 1
+
+    def test_empty_collection_prints_nothing(self):
+        """No photos, no progress output."""
+        stream = io.StringIO()
+        hooks = PluginHookManager()
+        ProgressReporter(stream=stream).attach(hooks)
+
+        hooks.execute_hook(
+            "before_processor", self._context({"collection_name": "x", "photos": []})
+        )
+        hooks.execute_hook("after_processor", self._context({}))
+
+        assert stream.getvalue() == ""
+
+    def test_format_duration(self):
+        """Durations are compact at every scale."""
+        assert format_duration(42) == "42s"
+        assert format_duration(185) == "3m05s"
+        assert format_duration(3720) == "1h02m"
@@ -0,0 +1,253 @@
+"""Unit tests for streaming pipeline execution."""
+
+import json
+import threading
+
+from PIL import Image
+
+from galleria.manager.pipeline import PipelineManager
+from galleria.plugins import PluginContext, PluginResult
+from galleria.plugins.interfaces import ProviderPlugin, TransformPlugin
+from galleria.plugins.pagination import BasicPaginationPlugin
+from galleria.plugins.processors.thumbnail import ThumbnailProcessorPlugin
+from galleria.plugins.providers.normpic import NormPicProviderPlugin
+from galleria.plugins.streaming import StreamingPlugin
+from galleria.plugins.template import BasicTemplatePlugin
+
+STAGES = [
+    ("provider", "normpic-provider"),
+    ("processor", "thumbnail-processor"),
+    ("transform", "basic-pagination"),
+    ("template", "basic-template"),
+]
+
+
+class CountingProvider(ProviderPlugin, StreamingPlugin):
+    """Streams one image many times, recording when page 1 appears."""
+
+    def __init__(self, image_path, count, output_dir):
+        self.image_path = image_path
+        self.count = count
+        self.output_dir = output_dir
+        self.yielded = 0
+        self.yielded_before_first_page = None
+
+    @property
+    def name(self):
+        return "counting-provider"
+
+    @property
+    def version(self):
+        return "1.0.0"
+
+    def load_collection(self, context):
+        return self.stream(context)
+
+    def stream(self, context):
+        def photos():
+            for i in range(self.count):
+                if (
+                    self.yielded_before_first_page is None
+                    and (self.output_dir / "page_1.html").exists()
+                ):
+                    self.yielded_before_first_page = self.yielded
+                self.yielded += 1
+                yield {
+                    "source_path": str(self.image_path),
+                    "dest_path": f"stream/IMG_{i:04d}.jpg",
+                    "metadata": {"hash": f"hash-{i}"},
+                }
+
+        return PluginResult(
+            success=True,
+            output_data={
+                "photos": photos(),
+                "photo_count": self.count,
+                "collection_name": "stream",
+            },
+        )
+
+
+class DropOddPlugin(TransformPlugin):
+    """Dict-based transform that keeps every other photo."""
+
+    @property
+    def name(self):
+        return "drop-odd"
+
+    @property
+    def version(self):
+        return "1.0.0"
+
+    def transform_data(self, context):
+        photos = context.input_data["photos"]
+        assert isinstance(photos, list)
+        return PluginResult(
+            success=True,
+            output_data={**context.input_data, "photos": photos[::2]},
+        )
+
+
+class TestExecuteStreaming:
+    """Tests for PipelineManager.execute_streaming()."""
+
+    def _gallery(self, tmp_path, count):
+        """Write count small photos and a NormPic manifest for them."""
+        source_dir = tmp_path / "source"
+        source_dir.mkdir()
+        pics = []
+        for i in range(count):
+            img_path = source_dir / f"IMG_{i:03d}.jpg"
+            Image.new("RGB", (120, 90), color=(i * 20 % 255, 80, 80)).save(img_path)
+            pics.append(
+                {
+                    "source_path": str(img_path),
+                    "dest_path": f"stream/IMG_{i:03d}.jpg",
+                    "hash": f"hash-{i}",
+                }
+            )
+        manifest_path = tmp_path / "manifest.json"
+        manifest_path.write_text(
+            json.dumps({"collection_name": "stream", "pics": pics})
+        )
+        return manifest_path
+
+    def _pipeline(self, *extra):
+        pipeline = PipelineManager()
+        pipeline.registry.register(NormPicProviderPlugin(), "provider")
+        pipeline.registry.register(ThumbnailProcessorPlugin(), "processor")
+        pipeline.registry.register(BasicPaginationPlugin(), "transform")
+        pipeline.registry.register(BasicTemplatePlugin(), "template")
+        for plugin, stage in extra:
+            pipeline.registry.register(plugin, stage)
+        return pipeline
+
+    def _context(self, tmp_path, manifest_path, output_dir, **processor):
+        output_dir.mkdir(parents=True, exist_ok=True)
+        return PluginContext(
+            input_data={"manifest_path": str(manifest_path)},
+            config={
+                "processor": {"thumbnail_size": 100, **processor},
+                "transform": {"page_size": 2},
+                "template": {},
+            },
+            output_dir=output_dir,
+        )
+
+    def test_streamed_pages_match_staged_pages(self, tmp_path):
+        """Streaming writes the same pages execute_stages() returns."""
+        manifest_path = self._gallery(tmp_path, 5)
+        staged = self._pipeline().execute_stages(
+            STAGES, self._context(tmp_path, manifest_path, tmp_path / "staged")
+        )
+        output_dir = tmp_path / "streamed"
+
+        result = self._pipeline().execute_streaming(
+            STAGES, self._context(tmp_path, manifest_path, output_dir)
+        )
+
+        assert result.success is True
+        assert result.output_data["html_files"] == []
+        assert result.output_data["written_files"] == [
+            "page_1.html",
+            "page_2.html",
+            "page_3.html",
+            "index.html",
+        ]
+        for html_file in staged.output_data["html_files"]:
+            content = (output_dir / html_file["filename"]).read_text()
+            assert content == html_file["content"].replace("staged", "streamed")
+
+    def test_first_page_written_after_about_one_page(self, tmp_path):
+        """Photos are pulled through the pipeline a page at a time."""
+        image_path = tmp_path / "photo.jpg"
+        Image.new("RGB", (64, 48), color="teal").save(image_path)
+        output_dir = tmp_path / "output"
+        provider = CountingProvider(image_path, 100, output_dir)
+        pipeline = self._pipeline((provider, "provider"))
+        stages = [("provider", "counting-provider"), *STAGES[1:]]
+
+        result = pipeline.execute_streaming(
+            stages, self._context(tmp_path, None, output_dir)
+        )
+
+        assert result.success is True
+        assert provider.yielded == 100
+        # One page being filled, one queued and one in the processor's hands
+        assert provider.yielded_before_first_page <= 3 * 2 + 2
+        assert (output_dir / "page_50.html").exists()
+
+    def test_dict_plugins_run_on_materialized_input(self, tmp_path):
+        """Plugins without stream() get lists and keep photo_count correct."""
+        manifest_path = self._gallery(tmp_path, 5)
+        pipeline = self._pipeline((DropOddPlugin(), "transform"))
+        stages = [*STAGES[:2], ("transform", "drop-odd"), *STAGES[2:]]
+
+        result = pipeline.execute_streaming(
+            stages, self._context(tmp_path, manifest_path, tmp_path / "output")
+        )
+
+        assert result.success is True
+        assert result.output_data["written_files"] == [
+            "page_1.html",
+            "page_2.html",
+            "index.html",
+        ]
+        assert "Page 1 of 2" in (tmp_path / "output" / "page_1.html").read_text()
+
+    def test_after_hook_runs_once_stream_is_exhausted(self, tmp_path):
+        """after_processor follows the last photo, not the stage setup."""
+        manifest_path = self._gallery(tmp_path, 3)
+        pipeline = self._pipeline()
+        events = []
+        pipeline.hooks.register_hook(
+            "processor_item", lambda ctx: events.append("item")
+        )
+        pipeline.hooks.register_hook(
+            "after_processor", lambda ctx: events.append("after")
+        )
+
+        pipeline.execute_streaming(
+            STAGES, self._context(tmp_path, manifest_path, tmp_path / "output")
+        )
+
+        assert events == ["item", "item", "item", "after"]
+
+    def test_fatal_processor_error_fails_pipeline(self, tmp_path):
+        """An error raised while photos are pulled fails the result."""
+        manifest_path = self._gallery(tmp_path, 3)
+
+        result = self._pipeline().execute_streaming(
+            STAGES,
+            self._context(
+                tmp_path, manifest_path, tmp_path / "output", executor="bogus"
+            ),
+        )
+
+        assert result.success is False
+        assert "Unknown executor mode" in result.errors[0]
+
+    def test_closing_processor_stream_stops_its_thread(self, tmp_path):
+        """A consumer that stops early does not leave the thread running."""
+        manifest_path = self._gallery(tmp_path, 6)
+        provided = NormPicProviderPlugin().stream(
+            PluginContext(
+                input_data={"manifest_path": str(manifest_path)},
+                config={},
+                output_dir=tmp_path,
+            )
+        )
+        processed = ThumbnailProcessorPlugin().stream(
+            PluginContext(
+                input_data=provided.output_data,
+                config={"thumbnail_size": 100, "page_size": 1},
+                output_dir=tmp_path / "output",
+            )
+        )
+        photos = processed.output_data["photos"]
+
+        assert next(photos)["dest_path"] == "stream/IMG_000.jpg"
+        photos.close()
+
+        names = [thread.name for thread in threading.enumerate()]
+        assert "galleria-stream-processor" not in names
@@ -172,3 +172,33 @@ class TestBasicPaginationPlugin:
             assert actual_pages == expected_pages, (
                 f"Photos: {total_photos}, Page size: {page_size}, Expected: {expected_pages}, Got: {actual_pages}"
             )
+
+    def test_stream_pages_match_transform_data(self):
+        """Streamed pages and metadata equal the list-based result."""
+        plugin = BasicPaginationPlugin()
+        photos = [{"id": i} for i in range(7)]
+
+        listed = plugin.transform_data(
+            PluginContext(
+                input_data={"photos": photos, "collection_name": "test"},
+                config={"page_size": 3},
+                output_dir=Path("/tmp"),
+            )
+        )
+        streamed = plugin.stream(
+            PluginContext(
+                input_data={
+                    "photos": iter(photos),
+                    "photo_count": 7,
+                    "collection_name": "test",
+                },
+                config={"page_size": 3},
+                output_dir=Path("/tmp"),
+            )
+        )
+
+        assert list(streamed.output_data["pages"]) == listed.output_data["pages"]
+        assert (
+            streamed.output_data["transform_metadata"]
+            == listed.output_data["transform_metadata"]
+        )
@@ -0,0 +1,89 @@
+"""Unit tests for DuplicateDetectionPlugin."""
+
+from pathlib import Path
+
+from galleria.plugins.base import PluginContext
+from galleria.plugins.duplicates import DuplicateDetectionPlugin
+
+
+def _context(**config):
+    """Burst of three near-identical shots plus one unrelated photo."""
+    photos = [
+        {"dest_path": "a.jpg", "perceptual_hash": "0000000000000000"},
+        {"dest_path": "b.jpg", "perceptual_hash": "ffffffffffffffff"},
+        {"dest_path": "c.jpg", "perceptual_hash": "0000000000000001"},
+        {"dest_path": "d.jpg", "perceptual_hash": "0000000000000003"},
+        {"dest_path": "e.jpg"},
+    ]
+    return PluginContext(
+        input_data={"photos": photos, "collection_name": "test", "extra": 1},
+        config={"transform": config},
+        output_dir=Path("/tmp"),
+    )
+
+
+class TestDuplicateDetectionPlugin:
+    """Test marking and collapsing of near-duplicate groups."""
+
+    def test_mark_keeps_every_photo(self):
+        """mark → All photos kept, repeats point at the first of the group."""
+        result = DuplicateDetectionPlugin().transform_data(_context(duplicates="mark"))
+
+        assert result.success
+        photos = result.output_data["photos"]
+        assert [p["dest_path"] for p in photos] == [
+            "a.jpg",
+            "b.jpg",
+            "c.jpg",
+            "d.jpg",
+            "e.jpg",
+        ]
+        assert photos[0]["duplicates"] == ["c.jpg", "d.jpg"]
+        assert photos[2]["duplicate_of"] == "a.jpg"
+        assert photos[3]["duplicate_group"] == photos[0]["duplicate_group"] == 0
+        assert "duplicate_group" not in photos[1]
+        assert result.output_data["extra"] == 1
+        metadata = result.output_data["duplicate_metadata"]
+        assert (metadata["groups"], metadata["duplicates"]) == (1, 2)
+        assert metadata["hashed_photos"] == 4
+
+    def test_collapse_drops_repeats(self):
+        """collapse → Only the representative of each group remains."""
+        result = DuplicateDetectionPlugin().transform_data(
+            _context(duplicates="collapse")
+        )
+
+        photos = result.output_data["photos"]
+        assert [p["dest_path"] for p in photos] == ["a.jpg", "b.jpg", "e.jpg"]
+        assert result.output_data["duplicate_metadata"]["collapsed"] == 2
+
+    def test_threshold_limits_groups(self):
+        """Threshold 0 → Only identical hashes group; there are none here."""
+        result = DuplicateDetectionPlugin().transform_data(
+            _context(duplicates="mark", duplicate_threshold=0)
+        )
+
+        assert result.output_data["duplicate_metadata"]["groups"] == 0
+
+    def test_input_photos_not_mutated(self):
+        """Annotations go on copies, not the previous stage's dicts."""
+        context = _context(duplicates="mark")
+
+        DuplicateDetectionPlugin().transform_data(context)
+
+        assert "duplicates" not in context.input_data["photos"][0]
+
+    def test_ungrouped_photos_passed_through(self):
+        """Photo outside any group → Same object handed to the next stage."""
+        context = _context(duplicates="mark")
+
+        result = DuplicateDetectionPlugin().transform_data(context)
+
+        assert result.output_data["photos"][1] is context.input_data["photos"][1]
+
+    def test_invalid_mode_fails(self):
+        """Unknown mode → Error result."""
+        result = DuplicateDetectionPlugin().transform_data(_context(duplicates="drop"))
+
+        assert not result.success
+        assert "INVALID_DUPLICATES_MODE" in result.errors[0]
@@ -2,6 +2,8 @@
 
 import json
 
+import pytest
+
 from galleria.plugins import PluginContext
 
 
@@ -326,3 +328,33 @@ class TestNormPicProviderPlugin:
         assert metadata["camera"] == "Sony A7R IV"
         assert metadata["gps"] == {"lat": 34.0522, "lon": -118.2437}
         assert metadata["custom_field"] == "custom_value"
+
+    def test_stream_yields_photos_lazily_with_count(self, tmp_path):
+        """stream() reports photo_count up front and converts pics on demand."""
+        from galleria.plugins.exceptions import PluginExecutionError
+        from galleria.plugins.providers.normpic import NormPicProviderPlugin
+
+        manifest_data = {
+            "collection_name": "test_collection",
+            "pics": [
+                {"source_path": "/test/IMG_001.CR3", "dest_path": "test/IMG_001.jpg"},
+                {"source_path": "/test/IMG_002.CR3"},
+            ],
+        }
+        manifest_path = tmp_path / "manifest.json"
+        manifest_path.write_text(json.dumps(manifest_data))
+        context = PluginContext(
+            input_data={"manifest_path": str(manifest_path)},
+            config={},
+            output_dir=tmp_path / "output",
+        )
+
+        result = NormPicProviderPlugin().stream(context)
+        photos = result.output_data["photos"]
+
+        assert result.success is True
+        assert result.output_data["photo_count"] == 2
+        assert next(photos)["dest_path"] == "test/IMG_001.jpg"
+        # Bad entries fail when reached, not when the stream is opened
+        with pytest.raises(PluginExecutionError, match="dest_path"):
+            next(photos)
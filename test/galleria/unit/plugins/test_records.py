@@ -0,0 +1,89 @@
+"""Unit tests for copy-on-write photo records."""
+
+import pickle
+
+import pytest
+
+from galleria.plugins.records import PhotoRecord
+
+
+def _photo():
+    """Provider-style photo with nested metadata."""
+    return {
+        "source_path": "/photos/IMG_0001.jpg",
+        "dest_path": "IMG_0001.jpg",
+        "metadata": {"hash": "abc123", "camera": "Canon EOS R5"},
+    }
+
+
+class TestPhotoRecord:
+    """Test overlay reads, writes and deletions over a shared photo."""
+
+    def test_writes_leave_base_untouched(self):
+        """Set on record → Visible on the record, base photo unchanged."""
+        photo = _photo()
+        record = PhotoRecord(photo, cached=True)
+
+        record["thumbnail_path"] = "thumbnails/IMG_0001.webp"
+
+        assert record["thumbnail_path"] == "thumbnails/IMG_0001.webp"
+        assert record["cached"] is True
+        assert record["dest_path"] == "IMG_0001.jpg"
+        assert photo == _photo()
+
+    def test_nested_values_are_shared(self):
+        """Record over a photo → Nested metadata is the same object."""
+        photo = _photo()
+
+        assert PhotoRecord(photo)["metadata"] is photo["metadata"]
+
+    def test_delete_hides_base_field(self):
+        """del of a base field → Missing from the record, still on the base."""
+        photo = _photo()
+        record = PhotoRecord(photo)
+
+        del record["source_path"]
+
+        assert "source_path" not in record
+        assert record.get("source_path") is None
+        assert len(record) == 2
+        assert "source_path" in photo
+        with pytest.raises(KeyError):
+            record["source_path"]
+        with pytest.raises(KeyError):
+            del record["source_path"]
+
+        record["source_path"] = "/elsewhere.jpg"
+        assert record["source_path"] == "/elsewhere.jpg"
+
+    def test_iterates_in_dict_order(self):
+        """Overridden and added fields → Same order as an updated dict."""
+        record = PhotoRecord(_photo(), dest_path="other.jpg", cached=False)
+
+        expected = {**_photo(), "dest_path": "other.jpg", "cached": False}
+        assert list(record) == list(expected)
+        assert record == expected
+        assert dict(record) == expected
+
+    def test_wrapping_a_record_shares_its_base(self):
+        """Record of a record → One level deep, overlays independent."""
+        first = PhotoRecord(_photo(), cached=True)
+
+        second = PhotoRecord(first)
+        second["duplicate_group"] = 0
+        del second["cached"]
+
+        assert second._base is first._base
+        assert first["cached"] is True
+        assert "duplicate_group" not in first
+        assert dict(second) == {**_photo(), "duplicate_group": 0}
+
+    def test_pickles_as_record(self):
+        """Pickle round trip (process workers) → Equal record back."""
+        record = PhotoRecord(_photo(), cached=True)
+        del record["source_path"]
+
+        restored = pickle.loads(pickle.dumps(record))
+
+        assert isinstance(restored, PhotoRecord)
+        assert restored == record
@@ -1,5 +1,7 @@
 """Unit tests for TemplatePlugin interface and contract validation."""
 
+from pathlib import Path
+
 import pytest
 
 from galleria.plugins.base import PluginContext, PluginResult
@@ -375,3 +377,165 @@ class TestBasicTemplatePlugin:
         html_content = result.output_data["html_files"][0]["content"]
         assert "/galleries/wedding/thumbnails/img1.webp" in html_content
         assert "/pics/full/img1.jpg" in html_content
+
+    def test_basic_template_plugin_emits_srcset_and_links_web_size(self, tmp_path):
+        """Photos with a derivative ladder get srcset/sizes and link to the web size."""
+        from galleria.plugins.template import BasicTemplatePlugin
+
+        thumbs = "/abs/output/galleries/wedding/thumbnails"
+        photo = {
+            "source_path": "/home/user/photos/img1.jpg",
+            "dest_path": "/abs/output/pics/img1.jpg",
+            "thumbnail_path": f"{thumbs}/img1.webp",
+            "thumbnails": [
+                {"size": 200, "path": f"{thumbs}/img1-200.webp"},
+                {"size": 400, "path": f"{thumbs}/img1.webp"},
+                {"size": 800, "path": f"{thumbs}/img1-800.webp"},
+            ],
+            "web_path": f"{thumbs}/img1-web.webp",
+        }
+        theme_path = str(
+            Path(__file__).parents[4] / "galleria" / "themes" / "minimal"
+        )
+
+        for config in ({}, {"theme_path": theme_path}):
+            context = PluginContext(
+                input_data={"pages": [[photo]], "collection_name": "wedding"},
+                config=config,
+                output_dir=tmp_path,
+            )
+
+            result = BasicTemplatePlugin().generate_html(context)
+
+            assert result.success
+            html_content = result.output_data["html_files"][0]["content"]
+            assert (
+                'srcset="/galleries/wedding/thumbnails/img1-200.webp 200w, '
+                "/galleries/wedding/thumbnails/img1.webp 400w, "
+                '/galleries/wedding/thumbnails/img1-800.webp 800w"'
+            ) in html_content
+            assert 'sizes="(min-width: 1024px) 220px' in html_content
+            assert 'href="/galleries/wedding/thumbnails/img1-web.webp"' in html_content
+            assert "/pics/full/img1.jpg" not in html_content
+
+    def test_basic_template_plugin_links_pics_web(self, tmp_path):
+        """Photos with a pics/web derivative link to it, not the original."""
+        from galleria.plugins.template import BasicTemplatePlugin
+
+        photo = {
+            "source_path": "/home/user/photos/img1.jpg",
+            "dest_path": "img1.jpg",
+            "thumbnail_path": "/abs/output/galleries/wedding/thumbnails/img1.webp",
+            "web_path": "/abs/output/pics/web/img1.jpg",
+            "web_size": (2048, 1365),
+        }
+        context = PluginContext(
+            input_data={"pages": [[photo]], "collection_name": "wedding"},
+            config={},
+            output_dir=tmp_path,
+        )
+
+        result = BasicTemplatePlugin().generate_html(context)
+
+        html_content = result.output_data["html_files"][0]["content"]
+        assert 'href="/pics/web/img1.jpg"' in html_content
+        assert "/pics/full/img1.jpg" not in html_content
+
+    def test_basic_template_plugin_wraps_alternate_formats_in_picture(self, tmp_path):
+        """Photos with alternate formats get a <picture> with typed <source>s."""
+        from galleria.plugins.template import BasicTemplatePlugin
+
+        thumbs = "/abs/output/galleries/wedding/thumbnails"
+        photo = {
+            "source_path": "/home/user/photos/img1.jpg",
+            "dest_path": "/abs/output/pics/img1.jpg",
+            "thumbnail_path": f"{thumbs}/img1.webp",
+            "sources": [
+                {
+                    "format": "avif",
+                    "type": "image/avif",
+                    "path": f"{thumbs}/img1.avif",
+                    "thumbnails": [{"size": 400, "path": f"{thumbs}/img1.avif"}],
+                }
+            ],
+        }
+        theme_path = str(
+            Path(__file__).parents[4] / "galleria" / "themes" / "minimal"
+        )
+
+        for config in ({}, {"theme_path": theme_path}):
+            context = PluginContext(
+                input_data={"pages": [[photo]], "collection_name": "wedding"},
+                config=config,
+                output_dir=tmp_path,
+            )
+
+            result = BasicTemplatePlugin().generate_html(context)
+
+            html_content = result.output_data["html_files"][0]["content"]
+            assert (
+                '<picture><source type="image/avif" '
+                'srcset="/galleries/wedding/thumbnails/img1.avif">'
+                '<img src="/galleries/wedding/thumbnails/img1.webp"'
+            ) in html_content
+            assert "</picture>" in html_content
+
+    def test_basic_template_plugin_inlines_placeholder(self, tmp_path):
+        """Photos with an LQIP get it inlined as the img background."""
+        from galleria.plugins.template import BasicTemplatePlugin
+
+        photo = {
+            "source_path": "/home/user/photos/img1.jpg",
+            "dest_path": "/abs/output/pics/img1.jpg",
+            "thumbnail_path": "/abs/output/galleries/wedding/thumbnails/img1.webp",
+            "lqip": "data:image/webp;base64,AAAA",
+            "dominant_color": "#123456",
+        }
+        theme_path = str(
+            Path(__file__).parents[4] / "galleria" / "themes" / "minimal"
+        )
+
+        for config in ({}, {"theme_path": theme_path}):
+            context = PluginContext(
+                input_data={"pages": [[photo]], "collection_name": "wedding"},
+                config=config,
+                output_dir=tmp_path,
+            )
+
+            result = BasicTemplatePlugin().generate_html(context)
+
+            html_content = result.output_data["html_files"][0]["content"]
+            assert (
+                'loading="lazy" style="background: #123456 '
+                'url(data:image/webp;base64,AAAA) center/cover no-repeat">'
+            ) in html_content
+
+    def test_basic_template_plugin_emits_intrinsic_dimensions(self, tmp_path):
+        """Thumbnails get width/height; links carry the linked image size."""
+        from galleria.plugins.template import BasicTemplatePlugin
+
+        thumbs = "/abs/output/galleries/wedding/thumbnails"
+        photo = {
+            "source_path": "/home/user/photos/img1.jpg",
+            "dest_path": "/abs/output/pics/img1.jpg",
+            "thumbnail_path": f"{thumbs}/img1.webp",
+            "thumbnail_size": (400, 400),
+            "width": 4000,
+            "height": 3000,
+        }
+        theme_path = str(
+            Path(__file__).parents[4] / "galleria" / "themes" / "minimal"
+        )
+
+        for config in ({}, {"theme_path": theme_path}):
+            context = PluginContext(
+                input_data={"pages": [[photo]], "collection_name": "wedding"},
+                config=config,
+                output_dir=tmp_path,
+            )
+
+            result = BasicTemplatePlugin().generate_html(context)
+
+            html_content = result.output_data["html_files"][0]["content"]
+            assert 'data-width="4000" data-height="3000"' in html_content
+            assert 'width="400" height="400" alt=' in html_content
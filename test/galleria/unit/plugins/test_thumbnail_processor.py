@@ -1,11 +1,14 @@
 """Unit tests for ThumbnailProcessorPlugin implementation."""
 
 from pathlib import Path
+from unittest.mock import patch
 
+import pytest
 from PIL import Image
 
 from galleria.plugins import PluginContext
 from galleria.plugins.processors.thumbnail import _process_single_photo
+from galleria.processor.worker import BatchParams
 
 
 class TestThumbnailProcessorPlugin:
@@ -453,6 +456,11 @@ class TestThumbnailProcessorPlugin:
         assert "thumbnail_path" in photo
         assert photo["thumbnail_size"] == (250, 250)
 
+        # Added as an overlay: the provider's photo is shared, not modified
+        provider_photo = provider_data["photos"][0]
+        assert "thumbnail_path" not in provider_photo
+        assert metadata is provider_photo["metadata"]
+
 
 class TestProcessSinglePhoto:
     """Unit tests for _process_single_photo standalone function."""
@@ -478,10 +486,12 @@ class TestProcessSinglePhoto:
         # Act
         result = _process_single_photo(
             photo=photo,
-            thumbnails_dir=thumbnails_dir,
-            thumbnail_size=200,
-            quality=80,
-            output_format="webp",
+            params=BatchParams(
+                thumbnails_dir=str(thumbnails_dir),
+                thumbnail_size=200,
+                quality=80,
+                output_format="webp",
+            ),
             use_cache=True,
         )
 
@@ -523,10 +533,12 @@ class TestProcessSinglePhoto:
         # Act
         result = _process_single_photo(
             photo=photo,
-            thumbnails_dir=thumbnails_dir,
-            thumbnail_size=200,
-            quality=80,
-            output_format="webp",
+            params=BatchParams(
+                thumbnails_dir=str(thumbnails_dir),
+                thumbnail_size=200,
+                quality=80,
+                output_format="webp",
+            ),
             use_cache=True,
         )
 
@@ -549,10 +561,12 @@ class TestProcessSinglePhoto:
         # Act
         result = _process_single_photo(
             photo=photo,
-            thumbnails_dir=thumbnails_dir,
-            thumbnail_size=200,
-            quality=80,
-            output_format="webp",
+            params=BatchParams(
+                thumbnails_dir=str(thumbnails_dir),
+                thumbnail_size=200,
+                quality=80,
+                output_format="webp",
+            ),
             use_cache=True,
         )
 
@@ -580,10 +594,12 @@ class TestProcessSinglePhoto:
         # Act
         result = _process_single_photo(
             photo=photo,
-            thumbnails_dir=thumbnails_dir,
-            thumbnail_size=200,
-            quality=80,
-            output_format="webp",
+            params=BatchParams(
+                thumbnails_dir=str(thumbnails_dir),
+                thumbnail_size=200,
+                quality=80,
+                output_format="webp",
+            ),
             use_cache=True,
         )
 
@@ -616,10 +632,12 @@ class TestProcessSinglePhoto:
         # Act
         result = _process_single_photo(
             photo=photo,
-            thumbnails_dir=thumbnails_dir,
-            thumbnail_size=200,
-            quality=80,
-            output_format="webp",
+            params=BatchParams(
+                thumbnails_dir=str(thumbnails_dir),
+                thumbnail_size=200,
+                quality=80,
+                output_format="webp",
+            ),
             use_cache=True,
         )
 
@@ -840,6 +858,51 @@ class TestBenchmarkIntegration:
         assert all(t > 0 for t in benchmark["per_photo_times"])
         assert all(s > 0 for s in benchmark["output_sizes"])
 
+    def test_interrupted_run_resumes_from_journal(self, tmp_path):
+        """Run killed after 2 of 4 photos → Next run renders only the other 2."""
+        from galleria.plugins.processors.thumbnail import ThumbnailProcessorPlugin
+
+        # Arrange
+        source_dir = tmp_path / "source"
+        source_dir.mkdir()
+        photos = []
+        for i in range(4):
+            img_path = source_dir / f"IMG_{i:03d}.jpg"
+            Image.new("RGB", (400, 300), color=(i * 60, 90, 90)).save(img_path, "JPEG")
+            photos.append(
+                {
+                    "source_path": str(img_path),
+                    "dest_path": f"test/IMG_{i:03d}.jpg",
+                    "metadata": {"hash": f"hash-{i}"},
+                }
+            )
+
+        def interrupt(completed, total, source_path):
+            if completed == 2:
+                raise KeyboardInterrupt
+
+        def run(metadata=None):
+            context = PluginContext(
+                input_data={"photos": photos, "collection_name": "resume"},
+                config={"thumbnail_size": 100, "benchmark": True},
+                output_dir=tmp_path / "output",
+                metadata=metadata,
+            )
+            return ThumbnailProcessorPlugin().process_thumbnails(context)
+
+        # Act
+        with pytest.raises(KeyboardInterrupt):
+            run({"progress_callback": interrupt})
+        resumed = run()
+        warm = run()
+
+        # Assert
+        assert resumed.success is True
+        assert resumed.output_data["benchmark"]["resumed_photos"] == 2
+        assert resumed.output_data["benchmark"]["fresh_photos"] == 2
+        assert warm.output_data["benchmark"]["cached_photos"] == 4
+        assert warm.output_data["benchmark"]["resumed_photos"] == 0
+
     def test_benchmark_with_parallel_processing(self, tmp_path):
         """Test that benchmark works with parallel processing."""
         from galleria.plugins.processors.thumbnail import ThumbnailProcessorPlugin
@@ -920,3 +983,795 @@ class TestBenchmarkIntegration:
         photo = result.output_data["photos"][0]
         assert "_timing_s" not in photo
         assert "_output_bytes" not in photo
+
+
+class TestContentHashCache:
+    """Tests for the content-hash sidecar cache index."""
+
+    def _run(self, tmp_path, photos, **config):
+        """Run the plugin over photos with the given processor config."""
+        from galleria.plugins.processors.thumbnail import ThumbnailProcessorPlugin
+
+        context = PluginContext(
+            input_data={"photos": photos, "collection_name": "cache"},
+            config={"thumbnail_size": 200, **config},
+            output_dir=tmp_path / "output",
+        )
+        return ThumbnailProcessorPlugin().process_thumbnails(context)
+
+    def _photo(self, tmp_path, content_hash="hash-a"):
+        """Create a source image and its provider photo dict."""
+        source_dir = tmp_path / "source"
+        source_dir.mkdir(exist_ok=True)
+        img_path = source_dir / "IMG_001.jpg"
+        if not img_path.exists():
+            Image.new("RGB", (800, 600), color="teal").save(img_path, "JPEG")
+        return {
+            "source_path": str(img_path),
+            "dest_path": "test/IMG_001.jpg",
+            "metadata": {"hash": content_hash},
+        }
+
+    def test_second_build_hits_index(self, tmp_path):
+        """Unchanged hash and settings → Cached from index."""
+        photo = self._photo(tmp_path)
+
+        first = self._run(tmp_path, [photo])
+        second = self._run(tmp_path, [photo])
+
+        assert first.output_data["photos"][0]["cached"] is False
+        assert second.output_data["photos"][0]["cached"] is True
+        assert (tmp_path / "output" / "thumbnails" / ".galleria-cache.json").exists()
+
+    def test_item_hook_reports_each_photo_and_cache_hits(self, tmp_path):
+        """processor_item hooks see every completed photo with its cached flag."""
+        from galleria.manager.hooks import PluginHookManager
+        from galleria.plugins.processors.thumbnail import ThumbnailProcessorPlugin
+
+        photo = self._photo(tmp_path)
+        self._run(tmp_path, [photo])
+
+        seen = []
+        hooks = PluginHookManager()
+        hooks.register_hook(
+            "processor_item",
+            lambda ctx: seen.append(
+                (
+                    ctx.input_data["completed"],
+                    ctx.input_data["total"],
+                    ctx.input_data["photo"].get("cached"),
+                )
+            ),
+        )
+        missing = {
+            "source_path": str(tmp_path / "missing.jpg"),
+            "dest_path": "test/IMG_002.jpg",
+            "metadata": {"hash": "hash-b"},
+        }
+        context = PluginContext(
+            input_data={"photos": [photo, missing], "collection_name": "cache"},
+            config={"thumbnail_size": 200},
+            output_dir=tmp_path / "output",
+            hooks=hooks,
+        )
+        ThumbnailProcessorPlugin().process_thumbnails(context)
+
+        assert seen == [(1, 2, True), (2, 2, None)]
+
+    def test_touched_source_with_same_hash_stays_cached(self, tmp_path):
+        """Touching or restoring the original does not invalidate by hash."""
+        import os
+
+        photo = self._photo(tmp_path)
+        self._run(tmp_path, [photo])
+
+        # Make source look much newer than the thumbnail
+        future = Path(photo["source_path"]).stat().st_mtime + 3600
+        os.utime(photo["source_path"], (future, future))
+
+        result = self._run(tmp_path, [photo])
+
+        assert result.output_data["photos"][0]["cached"] is True
+
+    def test_changed_hash_invalidates(self, tmp_path):
+        """New content hash → Thumbnail regenerated."""
+        self._run(tmp_path, [self._photo(tmp_path, "hash-a")])
+
+        result = self._run(tmp_path, [self._photo(tmp_path, "hash-b")])
+
+        assert result.output_data["photos"][0]["cached"] is False
+
+    def test_changed_encoding_params_invalidate(self, tmp_path):
+        """Different quality or size → Thumbnail regenerated."""
+        photo = self._photo(tmp_path)
+        self._run(tmp_path, [photo], quality=80)
+
+        by_quality = self._run(tmp_path, [photo], quality=60)
+        by_size = self._run(tmp_path, [photo], quality=60, thumbnail_size=150)
+
+        assert by_quality.output_data["photos"][0]["cached"] is False
+        assert by_size.output_data["photos"][0]["cached"] is False
+        thumb = Path(by_size.output_data["photos"][0]["thumbnail_path"])
+        with Image.open(thumb) as img:
+            assert img.size == (150, 150)
+
+    def test_index_hits_do_not_stat_thumbnails(self, tmp_path, monkeypatch):
+        """Index hits resolve without per-photo exists()/stat() calls."""
+        photo = self._photo(tmp_path)
+        self._run(tmp_path, [photo])
+
+        calls = []
+        original_stat = Path.stat
+
+        def counting_stat(self, *args, **kwargs):
+            if self.suffix == ".webp":
+                calls.append(self)
+            return original_stat(self, *args, **kwargs)
+
+        monkeypatch.setattr(Path, "stat", counting_stat)
+        result = self._run(tmp_path, [photo], benchmark=True)
+
+        assert result.output_data["photos"][0]["cached"] is True
+        assert calls == []
+
+
+def _context(tmp_path, **config):
+    """Build a single-photo context with the given processor config."""
+    source_dir = tmp_path / "source"
+    source_dir.mkdir(exist_ok=True)
+    img_path = source_dir / "IMG_001.jpg"
+    if not img_path.exists():
+        Image.new("RGB", (2400, 1600), color="navy").save(img_path, "JPEG")
+    return PluginContext(
+        input_data={
+            "photos": [
+                {
+                    "source_path": str(img_path),
+                    "dest_path": "test/IMG_001.jpg",
+                    "metadata": {"hash": "ladder"},
+                }
+            ],
+            "collection_name": "ladder",
+        },
+        config={"thumbnail_size": 400, **config},
+        output_dir=tmp_path / "output",
+    )
+
+
+class TestResponsiveDerivatives:
+    """Tests for the thumbnail_sizes / web_size derivative ladder."""
+
+    def test_ladder_is_recorded_on_photo(self, tmp_path):
+        """Each derivative is recorded with its size and path."""
+        from galleria.plugins.processors.thumbnail import ThumbnailProcessorPlugin
+
+        context = _context(tmp_path, thumbnail_sizes=[200, 400, 800], web_size=1600)
+        result = ThumbnailProcessorPlugin().process_thumbnails(context)
+
+        photo = result.output_data["photos"][0]
+        thumbs_dir = tmp_path / "output" / "thumbnails"
+        assert photo["thumbnail_path"] == str(thumbs_dir / "IMG_001.webp")
+        assert [t["size"] for t in photo["thumbnails"]] == [200, 400, 800]
+        assert photo["thumbnails"][0]["path"] == str(thumbs_dir / "IMG_001-200.webp")
+        assert photo["web_path"] == str(thumbs_dir / "IMG_001-web.webp")
+        assert photo["web_size"] == (1600, 1067)
+        for t in photo["thumbnails"]:
+            assert Path(t["path"]).exists()
+
+    def test_cache_hit_restores_ladder(self, tmp_path):
+        """A cache hit returns the same derivative fields without reprocessing."""
+        from galleria.plugins.processors.thumbnail import ThumbnailProcessorPlugin
+
+        config = {"thumbnail_sizes": [200, 400], "web_size": 1200}
+        plugin = ThumbnailProcessorPlugin()
+        first = plugin.process_thumbnails(_context(tmp_path, **config))
+        second = plugin.process_thumbnails(_context(tmp_path, **config))
+
+        first_photo = first.output_data["photos"][0]
+        second_photo = second.output_data["photos"][0]
+        assert second_photo["cached"] is True
+        for key in ("thumbnail_path", "thumbnails", "web_path", "web_size"):
+            assert second_photo[key] == first_photo[key]
+
+    def test_missing_derivative_invalidates_cache(self, tmp_path):
+        """Deleting one rung of the ladder forces regeneration."""
+        from galleria.plugins.processors.thumbnail import ThumbnailProcessorPlugin
+
+        config = {"thumbnail_sizes": [200, 400]}
+        plugin = ThumbnailProcessorPlugin()
+        plugin.process_thumbnails(_context(tmp_path, **config))
+        (tmp_path / "output" / "thumbnails" / "IMG_001-200.webp").unlink()
+
+        result = plugin.process_thumbnails(_context(tmp_path, **config))
+
+        assert result.output_data["photos"][0]["cached"] is False
+        assert (tmp_path / "output" / "thumbnails" / "IMG_001-200.webp").exists()
+
+
+class TestOutputFormats:
+    """Tests for output_format / alternate_formats encoder selection."""
+
+    def test_jpeg_output_keeps_jpg_suffix(self, tmp_path):
+        """output_format jpeg → .jpg thumbnail, not a forced .webp name."""
+        from galleria.plugins.processors.thumbnail import ThumbnailProcessorPlugin
+
+        result = ThumbnailProcessorPlugin().process_thumbnails(
+            _context(tmp_path, output_format="jpeg")
+        )
+
+        photo = result.output_data["photos"][0]
+        assert photo["thumbnail_path"].endswith("IMG_001.jpg")
+        assert Path(photo["thumbnail_path"]).exists()
+
+    def test_alternate_formats_recorded_as_sources(self, tmp_path):
+        """Alternate formats → One sources entry per format, restored on cache hit."""
+        from galleria.plugins.processors.thumbnail import ThumbnailProcessorPlugin
+
+        config = {"alternate_formats": ["avif"], "thumbnail_sizes": [200, 400]}
+        plugin = ThumbnailProcessorPlugin()
+        first = plugin.process_thumbnails(_context(tmp_path, **config))
+        second = plugin.process_thumbnails(_context(tmp_path, **config))
+
+        thumbs_dir = tmp_path / "output" / "thumbnails"
+        [source] = first.output_data["photos"][0]["sources"]
+        assert source["format"] == "avif"
+        assert source["type"] == "image/avif"
+        assert source["path"] == str(thumbs_dir / "IMG_001.avif")
+        assert [t["size"] for t in source["thumbnails"]] == [200, 400]
+        assert second.output_data["photos"][0]["cached"] is True
+        assert second.output_data["photos"][0]["sources"] == [source]
+
+    def test_unsupported_format_fails_stage(self, tmp_path):
+        """Unknown output format → Stage fails before processing."""
+        from galleria.plugins.processors.thumbnail import ThumbnailProcessorPlugin
+
+        result = ThumbnailProcessorPlugin().process_thumbnails(
+            _context(tmp_path, output_format="bmp")
+        )
+
+        assert not result.success
+        assert "Unsupported output format" in result.errors[0]
+
+
+class TestAdaptiveQuality:
+    """Tests for per-image SSIM-targeted quality selection."""
+
+    def test_chosen_quality_is_recorded_and_reused(self, tmp_path, monkeypatch):
+        """Searched quality lands on the photo and is reused after invalidation."""
+        import galleria.processor.image as image_module
+        from galleria.plugins.processors.thumbnail import ThumbnailProcessorPlugin
+
+        searches = []
+        original_search = image_module.search_quality
+
+        def counting_search(*args, **kwargs):
+            searches.append(args)
+            return original_search(*args, **kwargs)
+
+        monkeypatch.setattr(image_module, "search_quality", counting_search)
+        config = {"adaptive_quality": True, "target_ssim": 0.9, "min_quality": 40}
+        plugin = ThumbnailProcessorPlugin()
+
+        first = plugin.process_thumbnails(_context(tmp_path, **config))
+        (tmp_path / "output" / "thumbnails" / "IMG_001.webp").unlink()
+        second = plugin.process_thumbnails(_context(tmp_path, **config))
+
+        first_photo = first.output_data["photos"][0]
+        second_photo = second.output_data["photos"][0]
+        assert 40 <= first_photo["thumbnail_quality"] <= 95
+        assert second_photo["cached"] is False
+        assert second_photo["thumbnail_quality"] == first_photo["thumbnail_quality"]
+        assert len(searches) == 1
+
+
+class TestPlaceholders:
+    """Tests for LQIP and dominant colour placeholders."""
+
+    def test_placeholder_recorded_restored_and_benchmarked(self, tmp_path):
+        """placeholders → Photo fields, restored on cache hit, cost in benchmark."""
+        from galleria.plugins.processors.thumbnail import ThumbnailProcessorPlugin
+
+        config = {"placeholders": True, "benchmark": True}
+        plugin = ThumbnailProcessorPlugin()
+        first = plugin.process_thumbnails(_context(tmp_path, **config))
+        second = plugin.process_thumbnails(_context(tmp_path, **config))
+
+        photo = first.output_data["photos"][0]
+        assert photo["lqip"].startswith("data:image/webp;base64,")
+        assert photo["dominant_color"].startswith("#0")
+        assert "_placeholder_s" not in photo
+        assert first.output_data["benchmark"]["placeholder_total_s"] > 0
+        cached = second.output_data["photos"][0]
+        assert cached["cached"] is True
+        assert cached["lqip"] == photo["lqip"]
+        assert cached["dominant_color"] == photo["dominant_color"]
+
+
+class TestDimensions:
+    """Tests for header-probed original and thumbnail dimensions."""
+
+    def test_dimensions_recorded_and_cached_by_hash(self, tmp_path, monkeypatch):
+        """Original size and aspect ratio set; warm builds never probe."""
+        import galleria.plugins.processors.thumbnail as thumbnail_module
+
+        probes = []
+        original_probe = thumbnail_module.probe_dimensions
+
+        def counting_probe(path):
+            probes.append(path)
+            return original_probe(path)
+
+        monkeypatch.setattr(thumbnail_module, "probe_dimensions", counting_probe)
+        plugin = thumbnail_module.ThumbnailProcessorPlugin()
+
+        first = plugin.process_thumbnails(_context(tmp_path))
+        second = plugin.process_thumbnails(_context(tmp_path))
+
+        for result in (first, second):
+            photo = result.output_data["photos"][0]
+            assert (photo["width"], photo["height"]) == (2400, 1600)
+            assert photo["aspect_ratio"] == 1.5
+        assert len(probes) == 1
+
+    def test_legacy_cached_thumbnail_reports_actual_size(self, tmp_path):
+        """Reused thumbnail from an older size → Its real size, not the config."""
+        from galleria.plugins.processors.thumbnail import ThumbnailProcessorPlugin
+
+        context = _context(tmp_path)
+        thumbs_dir = tmp_path / "output" / "thumbnails"
+        thumbs_dir.mkdir(parents=True)
+        Image.new("RGB", (300, 300)).save(thumbs_dir / "IMG_001.webp", "WEBP")
+
+        result = ThumbnailProcessorPlugin().process_thumbnails(context)
+
+        photo = result.output_data["photos"][0]
+        assert photo["cached"] is True
+        assert photo["thumbnail_size"] == (300, 300)
+
+
+class TestSmartCrop:
+    """Tests for the content-aware crop mode."""
+
+    def test_crop_box_recorded_and_reused(self, tmp_path, monkeypatch):
+        """Box chosen once; incremental builds reuse it without scoring."""
+        import galleria.processor.image as image_module
+        from galleria.plugins.processors.thumbnail import ThumbnailProcessorPlugin
+
+        scored = []
+        original_smart_crop = image_module.smart_crop_box
+
+        def counting_smart_crop(img, mode):
+            scored.append(mode)
+            return original_smart_crop(img, mode)
+
+        monkeypatch.setattr(image_module, "smart_crop_box", counting_smart_crop)
+        plugin = ThumbnailProcessorPlugin()
+
+        first = plugin.process_thumbnails(_context(tmp_path, crop="entropy"))
+        (tmp_path / "output" / "thumbnails" / "IMG_001.webp").unlink()
+        second = plugin.process_thumbnails(_context(tmp_path, crop="entropy"))
+        third = plugin.process_thumbnails(_context(tmp_path, crop="entropy"))
+
+        boxes = [r.output_data["photos"][0]["crop_box"] for r in (first, second, third)]
+        assert boxes[0] == boxes[1] == boxes[2]
+        assert third.output_data["photos"][0]["cached"] is True
+        assert scored == ["entropy"]
+
+    def test_center_crop_records_no_box(self, tmp_path):
+        """Default crop → No crop_box on the photo."""
+        from galleria.plugins.processors.thumbnail import ThumbnailProcessorPlugin
+
+        result = ThumbnailProcessorPlugin().process_thumbnails(_context(tmp_path))
+
+        assert "crop_box" not in result.output_data["photos"][0]
+
+    def test_unknown_crop_mode_fails(self, tmp_path):
+        """Unsupported crop mode → Plugin error."""
+        from galleria.plugins.processors.thumbnail import ThumbnailProcessorPlugin
+
+        result = ThumbnailProcessorPlugin().process_thumbnails(
+            _context(tmp_path, crop="faces")
+        )
+
+        assert result.success is False
+        assert "Unknown crop mode" in result.errors[0]
+
+
+class TestPerceptualHash:
+    """Tests for perceptual hashes computed during thumbnailing."""
+
+    def test_hash_recorded_and_restored_from_cache(self, tmp_path):
+        """perceptual_hash set → Hex hash on fresh and cached photos."""
+        from galleria.plugins.processors.thumbnail import ThumbnailProcessorPlugin
+
+        plugin = ThumbnailProcessorPlugin()
+        first = plugin.process_thumbnails(_context(tmp_path, perceptual_hash="phash"))
+        second = plugin.process_thumbnails(_context(tmp_path, perceptual_hash="phash"))
+
+        fresh = first.output_data["photos"][0]
+        cached = second.output_data["photos"][0]
+        assert len(fresh["perceptual_hash"]) == 16
+        assert cached["cached"] is True
+        assert cached["perceptual_hash"] == fresh["perceptual_hash"]
+
+    def test_unknown_algorithm_fails(self, tmp_path):
+        """Unsupported algorithm → Plugin error."""
+        from galleria.plugins.processors.thumbnail import ThumbnailProcessorPlugin
+
+        result = ThumbnailProcessorPlugin().process_thumbnails(
+            _context(tmp_path, perceptual_hash="ahash")
+        )
+
+        assert result.success is False
+        assert "Unknown perceptual hash" in result.errors[0]
+
+
+class TestWebPhotos:
+    """Tests for web-optimized photos written to pics/web."""
+
+    def test_progressive_jpeg_in_pics_web(self, tmp_path):
+        """web_photos → Long-edge-limited progressive JPEG under output/pics/web."""
+        from galleria.plugins.processors.thumbnail import ThumbnailProcessorPlugin
+
+        result = ThumbnailProcessorPlugin().process_thumbnails(
+            _context(tmp_path, web_photos=True)
+        )
+
+        photo = result.output_data["photos"][0]
+        web_path = tmp_path / "output" / "pics" / "web" / "IMG_001.jpg"
+        assert photo["web_path"] == str(web_path)
+        assert tuple(photo["web_size"]) == (2048, 1365)
+        with Image.open(web_path) as img:
+            assert img.format == "JPEG"
+            assert img.info.get("progressive") or img.info.get("progression")
+            assert not img.getexif()
+
+    def test_orientation_applied_before_exif_is_stripped(self, tmp_path):
+        """EXIF orientation 6 → Portrait web photo without an orientation tag."""
+        from galleria.plugins.processors.thumbnail import ThumbnailProcessorPlugin
+
+        source_dir = tmp_path / "source"
+        source_dir.mkdir()
+        exif = Image.Exif()
+        exif[0x0112] = 6
+        Image.new("RGB", (2400, 1600), color="navy").save(
+            source_dir / "IMG_001.jpg", "JPEG", exif=exif
+        )
+
+        result = ThumbnailProcessorPlugin().process_thumbnails(
+            _context(tmp_path, web_photos=True, web_dir=str(tmp_path / "web"))
+        )
+
+        photo = result.output_data["photos"][0]
+        assert tuple(photo["web_size"]) == (1365, 2048)
+        with Image.open(tmp_path / "web" / "IMG_001.jpg") as img:
+            assert img.size == (1365, 2048)
+            assert 0x0112 not in img.getexif()
+
+    def test_cached_and_regenerated_when_missing(self, tmp_path):
+        """Warm build restores web_path; a deleted web photo is rebuilt."""
+        from galleria.plugins.processors.thumbnail import ThumbnailProcessorPlugin
+
+        plugin = ThumbnailProcessorPlugin()
+        first = plugin.process_thumbnails(_context(tmp_path, web_photos=True))
+        second = plugin.process_thumbnails(_context(tmp_path, web_photos=True))
+        web_path = tmp_path / "output" / "pics" / "web" / "IMG_001.jpg"
+        web_path.unlink()
+        third = plugin.process_thumbnails(_context(tmp_path, web_photos=True))
+
+        cached = second.output_data["photos"][0]
+        assert cached["cached"] is True
+        assert cached["web_path"] == first.output_data["photos"][0]["web_path"]
+        assert third.output_data["photos"][0]["cached"] is False
+        assert web_path.exists()
+
+    def test_parallel_batched_matches_serial(self, tmp_path):
+        """Batched workers report the same pics/web path as the serial path."""
+        from galleria.plugins.processors.thumbnail import ThumbnailProcessorPlugin
+
+        result = ThumbnailProcessorPlugin().process_thumbnails(
+            _context(tmp_path, web_photos=True, parallel=True, executor="thread")
+        )
+
+        photo = result.output_data["photos"][0]
+        assert photo["web_path"] == str(
+            tmp_path / "output" / "pics" / "web" / "IMG_001.jpg"
+        )
+
+
+class TestLargestFirstSchedule:
+    """Tests for largest-first submission of parallel work."""
+
+    def _photos(self, tmp_path, sizes):
+        """Create photos of the given (width, height) with matching size_bytes."""
+        source_dir = tmp_path / "source"
+        source_dir.mkdir(exist_ok=True)
+        photos = []
+        for i, (width, height) in enumerate(sizes):
+            img_path = source_dir / f"IMG_{i:03d}.jpg"
+            Image.new("RGB", (width, height), color="olive").save(img_path, "JPEG")
+            photos.append(
+                {
+                    "source_path": str(img_path),
+                    "dest_path": f"test/IMG_{i:03d}.jpg",
+                    "metadata": {"hash": f"hash-{i}", "size_bytes": width * height},
+                }
+            )
+        return photos
+
+    def _run(self, tmp_path, photos, **config):
+        """Run one thread worker, recording the order photos complete in."""
+        from galleria.manager.hooks import PluginHookManager
+        from galleria.plugins.processors.thumbnail import ThumbnailProcessorPlugin
+
+        completed = []
+        hooks = PluginHookManager()
+        hooks.register_hook(
+            "processor_item",
+            lambda ctx: completed.append(ctx.input_data["photo"]["dest_path"]),
+        )
+        context = PluginContext(
+            input_data={"photos": photos, "collection_name": "schedule"},
+            config={
+                "thumbnail_size": 100,
+                "executor": "thread",
+                "max_workers": 1,
+                "max_in_flight": 1,
+                "dispatch": "photo",
+                **config,
+            },
+            output_dir=tmp_path / "output",
+            hooks=hooks,
+        )
+        return ThumbnailProcessorPlugin().process_thumbnails(context), completed
+
+    def test_largest_first_submits_by_size_keeps_manifest_order(self, tmp_path):
+        """Work starts with the largest photo; output stays in manifest order."""
+        photos = self._photos(tmp_path, [(200, 150), (1200, 900), (400, 300)])
+
+        result, completed = self._run(tmp_path, photos, schedule="largest-first")
+
+        assert completed == ["test/IMG_001.jpg", "test/IMG_002.jpg", "test/IMG_000.jpg"]
+        assert [p["dest_path"] for p in result.output_data["photos"]] == [
+            p["dest_path"] for p in photos
+        ]
+
+    def test_pixel_weight_uses_header_probe(self, tmp_path):
+        """Pixel weighting ignores size_bytes and orders by probed dimensions."""
+        photos = self._photos(tmp_path, [(200, 150), (1200, 900)])
+        # Misleading byte counts: the small image claims to be the largest
+        photos[0]["metadata"]["size_bytes"] = 10**9
+
+        _, by_bytes = self._run(tmp_path / "a", photos, schedule="largest-first")
+        result, by_pixels = self._run(
+            tmp_path / "b",
+            photos,
+            schedule="largest-first",
+            schedule_weight="pixels",
+        )
+
+        assert by_bytes[0] == "test/IMG_000.jpg"
+        assert by_pixels[0] == "test/IMG_001.jpg"
+        assert result.output_data["photos"][1]["width"] == 1200
+
+    def test_largest_first_bounds_reorder_buffer(self, tmp_path):
+        """Misses are sorted a window at a time; parked results stay bounded."""
+        from galleria.util.reorder import ReorderBuffer
+
+        peak = []
+
+        class PeakBuffer(ReorderBuffer):
+            def push(self, index, item):
+                peak.append(self.pending_count + 1)
+                return super().push(index, item)
+
+        # Growing sizes: each window's first manifest photo finishes last
+        photos = self._photos(tmp_path, [(100 + 20 * i, 100) for i in range(20)])
+
+        with (
+            patch("galleria.plugins.processors.thumbnail.LARGEST_FIRST_WINDOW", 4),
+            patch("galleria.plugins.processors.thumbnail.ReorderBuffer", PeakBuffer),
+        ):
+            result, completed = self._run(tmp_path, photos, schedule="largest-first")
+
+        assert result.output_data["thumbnail_count"] == 20
+        assert completed[:4] == [f"test/IMG_{i:03d}.jpg" for i in (3, 2, 1, 0)]
+        assert max(peak) <= 4 + 1
+
+    def test_unknown_schedule_fails_stage(self, tmp_path):
+        """An unsupported schedule is reported instead of silently ignored."""
+        photos = self._photos(tmp_path, [(200, 150)])
+
+        result, _ = self._run(tmp_path, photos, schedule="smallest-first")
+
+        assert result.success is False
+        assert "Unknown schedule" in result.errors[0]
+
+
+class TestPageSchedule:
+    """Tests for page-by-page submission of parallel work."""
+
+    _photos = TestLargestFirstSchedule._photos
+    _run = TestLargestFirstSchedule._run
+
+    def test_page_schedule_finishes_pages_in_order(self, tmp_path):
+        """Pages complete in order; largest photo of each page starts first."""
+        photos = self._photos(
+            tmp_path, [(200, 150), (1200, 900), (400, 300), (800, 600)]
+        )
+
+        result, completed = self._run(tmp_path, photos, schedule="page", page_size=2)
+
+        assert completed == [
+            "test/IMG_001.jpg",
+            "test/IMG_000.jpg",
+            "test/IMG_003.jpg",
+            "test/IMG_002.jpg",
+        ]
+        assert [p["dest_path"] for p in result.output_data["photos"]] == [
+            p["dest_path"] for p in photos
+        ]
+
+    def test_release_hook_reports_photos_in_manifest_order(self, tmp_path):
+        """processor_release runs per photo in manifest order with counts."""
+        from galleria.manager.hooks import PluginHookManager
+        from galleria.plugins.processors.thumbnail import ThumbnailProcessorPlugin
+
+        photos = self._photos(tmp_path, [(200, 150), (1200, 900), (400, 300)])
+        released = []
+        hooks = PluginHookManager()
+        hooks.register_hook(
+            "processor_release",
+            lambda ctx: released.append(
+                (ctx.input_data["photo"]["dest_path"], ctx.input_data["released"])
+            ),
+        )
+        context = PluginContext(
+            input_data={"photos": photos, "collection_name": "schedule"},
+            config={
+                "thumbnail_size": 100,
+                "executor": "thread",
+                "max_workers": 2,
+                "schedule": "largest-first",
+            },
+            output_dir=tmp_path / "output",
+            hooks=hooks,
+        )
+
+        ThumbnailProcessorPlugin().process_thumbnails(context)
+
+        assert released == [(p["dest_path"], i) for i, p in enumerate(photos, 1)]
+
+
+class TestDevPreviews:
+    """Tests for quick dev-build previews upgraded in the background."""
+
+    class RecordingUpgrader:
+        """Upgrader stand-in that keeps submitted tasks instead of running them."""
+
+        def __init__(self):
+            self.tasks = []
+
+        def submit(self, task):
+            self.tasks.append(task)
+
+        def cancel(self):
+            pass
+
+    def _run(self, tmp_path, photo, upgrader, production=False):
+        """Run a build of one photo with a dev or production BuildContext."""
+        from build.context import BuildContext
+        from galleria.plugins.processors.thumbnail import ThumbnailProcessorPlugin
+
+        context = PluginContext(
+            input_data={"photos": [photo], "collection_name": "dev"},
+            config={"thumbnail_size": 200},
+            output_dir=tmp_path / "output",
+            metadata={"build_context": BuildContext(production=production)},
+        )
+        return ThumbnailProcessorPlugin(upgrader=upgrader).process_thumbnails(context)
+
+    def test_dev_build_previews_then_upgrades_in_background(self, tmp_path):
+        """Dev build → Preview now; after the upgrade a production build hits."""
+        from galleria.processor.upgrade import PreviewUpgrader
+
+        photo = TestContentHashCache()._photo(tmp_path)
+        upgrader = PreviewUpgrader()
+
+        preview = self._run(tmp_path, photo, upgrader)
+        thumbnail = Path(preview.output_data["photos"][0]["thumbnail_path"])
+        assert thumbnail.exists()
+        assert upgrader.wait(timeout=30)
+        production = self._run(tmp_path, photo, upgrader, production=True)
+
+        assert preview.output_data["photos"][0]["cached"] is False
+        assert production.output_data["photos"][0]["cached"] is True
+        with Image.open(thumbnail) as img:
+            assert img.size == (200, 200)
+
+    def test_previews_reused_by_dev_builds_only(self, tmp_path):
+        """A preview is a hit for the next dev build, stale for production."""
+        photo = TestContentHashCache()._photo(tmp_path)
+        upgrader = self.RecordingUpgrader()
+
+        self._run(tmp_path, photo, upgrader)
+        again = self._run(tmp_path, photo, upgrader)
+        production = self._run(tmp_path, photo, None, production=True)
+
+        assert again.output_data["photos"][0]["cached"] is True
+        assert len(upgrader.tasks) == 2
+        assert production.output_data["photos"][0]["cached"] is False
+
+    def test_cancelled_upgrade_is_not_a_failure(self, tmp_path):
+        """Upgrade cancelled mid-pass → UpgradeCancelled, not a fatal result."""
+        from galleria.processor.upgrade import UpgradeCancelled
+
+        photo = TestContentHashCache()._photo(tmp_path)
+        upgrader = self.RecordingUpgrader()
+        self._run(tmp_path, photo, upgrader)
+
+        def check_cancelled():
+            raise UpgradeCancelled()
+
+        with pytest.raises(UpgradeCancelled):
+            upgrader.tasks[0](check_cancelled)
+
+    def test_production_build_renders_full_quality(self, tmp_path):
+        """Production BuildContext → No previews and nothing to upgrade."""
+        photo = TestContentHashCache()._photo(tmp_path)
+        upgrader = self.RecordingUpgrader()
+
+        self._run(tmp_path, photo, upgrader, production=True)
+        again = self._run(tmp_path, photo, upgrader)
+
+        assert upgrader.tasks == []
+        assert again.output_data["photos"][0]["cached"] is True
+
+
+class TestLazyThumbnails:
+    """Tests for lazy dev builds that leave thumbnails to the dev server."""
+
+    def _run(self, tmp_path, photo, production=False, **config):
+        """Run a lazy_thumbnails build of one photo."""
+        from build.context import BuildContext
+        from galleria.plugins.processors.thumbnail import ThumbnailProcessorPlugin
+
+        context = PluginContext(
+            input_data={"photos": [photo], "collection_name": "lazy"},
+            config={"thumbnail_size": 200, "lazy_thumbnails": True, **config},
+            output_dir=tmp_path / "output",
+            metadata={"build_context": BuildContext(production=production)},
+        )
+        return ThumbnailProcessorPlugin().process_thumbnails(context)
+
+    def test_dev_build_plans_thumbnails_without_rendering(self, tmp_path):
+        """Lazy dev build → Paths listed, nothing rendered, manifest written."""
+        import json
+
+        photo = TestContentHashCache()._photo(tmp_path)
+
+        result = self._run(tmp_path, photo, thumbnail_sizes=[100, 200])
+
+        thumbnails_dir = tmp_path / "output" / "thumbnails"
+        planned = result.output_data["photos"][0]
+        assert planned["thumbnail_path"] == str(thumbnails_dir / "IMG_001.webp")
+        assert [item["size"] for item in planned["thumbnails"]] == [100, 200]
+        assert planned["width"] == 800
+        assert not (thumbnails_dir / "IMG_001.webp").exists()
+        manifest = json.loads((thumbnails_dir / ".galleria-lazy.json").read_text())
+        assert manifest["files"] == {
+            "IMG_001-100.webp": "IMG_001",
+            "IMG_001.webp": "IMG_001",
+        }
+        assert manifest["config"]["lazy_thumbnails"] is False
+
+    def test_production_build_ignores_lazy_flag(self, tmp_path):
+        """Production BuildContext → Rendered as usual, no manifest."""
+        photo = TestContentHashCache()._photo(tmp_path)
+
+        result = self._run(tmp_path, photo, production=True)
+
+        thumbnails_dir = tmp_path / "output" / "thumbnails"
+        assert result.output_data["photos"][0]["cached"] is False
+        assert (thumbnails_dir / "IMG_001.webp").exists()
+        assert not (thumbnails_dir / ".galleria-lazy.json").exists()
@@ -7,6 +7,7 @@ from click.testing import CliRunner
 
 from galleria.__main__ import cli
 from galleria.plugins.base import PluginResult
+from galleria.processor.queue import SharedDirectoryExecutor
 
 
 class TestGalleriaCLI:
@@ -281,3 +282,21 @@ class TestGalleriaCLI:
             assert (
                 "Pipeline execution error: Unexpected pipeline error" in result.output
             )
+
+    def test_worker_command_serves_queue_until_idle(self, tmp_path):
+        """worker --idle-exit → Runs queued tasks, then exits reporting the count."""
+        # Arrange
+        executor = SharedDirectoryExecutor(tmp_path, local_workers=0, poll_seconds=0.01)
+        futures = [executor.submit(abs, n) for n in (-1, -2, -3)]
+        runner = CliRunner()
+
+        # Act
+        result = runner.invoke(
+            cli, ["worker", "--queue-dir", str(tmp_path), "--idle-exit", "0.3"]
+        )
+
+        # Assert
+        assert result.exit_code == 0
+        assert "Worker stopped after 3 tasks" in result.output
+        assert [future.result(timeout=10) for future in futures] == [1, 2, 3]
+        executor.shutdown()
@@ -206,6 +206,51 @@ class TestGalleriaConfig:
         assert config.pipeline.processor.config["parallel"] is True
         assert config.pipeline.processor.config["max_workers"] == 4
 
+    def test_load_config_extracts_derivative_options(self, tmp_path):
+        """Test that thumbnail_sizes and web_size reach the processor config."""
+        manifest_path = tmp_path / "manifest.json"
+        manifest_path.write_text(
+            '{"version": "0.1.0", "collection_name": "test", "pics": []}'
+        )
+
+        config_data = {
+            "manifest_path": str(manifest_path),
+            "output_dir": str(tmp_path / "output"),
+            "thumbnail_sizes": [200, 400, 800],
+            "web_size": 1600,
+        }
+
+        config_path = tmp_path / "config.json"
+        config_path.write_text(json.dumps(config_data))
+
+        config = GalleriaConfig.from_file(config_path)
+
+        assert config.pipeline.processor.config["thumbnail_sizes"] == [200, 400, 800]
+        assert config.pipeline.processor.config["web_size"] == 1600
+
+    def test_load_config_duplicates_enable_hashing(self, tmp_path):
+        """Test that duplicates reaches the transform stage and turns on hashing."""
+        manifest_path = tmp_path / "manifest.json"
+        manifest_path.write_text(
+            '{"version": "0.1.0", "collection_name": "test", "pics": []}'
+        )
+
+        config_data = {
+            "manifest_path": str(manifest_path),
+            "output_dir": str(tmp_path / "output"),
+            "duplicates": "collapse",
+            "duplicate_threshold": 6,
+        }
+
+        config_path = tmp_path / "config.json"
+        config_path.write_text(json.dumps(config_data))
+
+        config = GalleriaConfig.from_file(config_path)
+
+        assert config.pipeline.processor.config["perceptual_hash"] == "dhash"
+        assert config.pipeline.transform.config["duplicates"] == "collapse"
+        assert config.pipeline.transform.config["duplicate_threshold"] == 6
+
     def test_load_config_parallel_defaults_to_absent(self, tmp_path):
         """Test that parallel options are absent when not specified in config."""
         # Arrange
@@ -0,0 +1,50 @@
+"""Unit tests for ReorderBuffer."""
+
+import pytest
+
+from galleria.util.reorder import ReorderBuffer
+
+
+class TestReorderBuffer:
+    """Unit tests for streaming reordering of out-of-order results."""
+
+    def test_in_order_results_are_released_immediately(self):
+        """Results arriving in order → Each released on push."""
+        buffer = ReorderBuffer()
+
+        assert buffer.push(0, "a") == ["a"]
+        assert buffer.push(1, "b") == ["b"]
+        assert buffer.pending_count == 0
+
+    def test_out_of_order_results_wait_for_gap(self):
+        """Later results are held until the missing earlier index arrives."""
+        # Arrange
+        buffer = ReorderBuffer()
+
+        # Act & Assert
+        assert buffer.push(2, "c") == []
+        assert buffer.push(1, "b") == []
+        assert buffer.pending_count == 2
+        assert buffer.push(0, "a") == ["a", "b", "c"]
+        assert buffer.next_index == 3
+        assert buffer.pending_count == 0
+
+    def test_prefix_is_released_without_waiting_for_slowest(self):
+        """Completed prefix is released while a later index is still missing."""
+        buffer = ReorderBuffer()
+        buffer.push(1, "b")
+
+        assert buffer.push(0, "a") == ["a", "b"]
+        assert buffer.push(3, "d") == []
+        assert buffer.next_index == 2
+
+    def test_duplicate_index_raises(self):
+        """Pushing an index twice → ValueError."""
+        buffer = ReorderBuffer()
+        buffer.push(0, "a")
+        buffer.push(2, "c")
+
+        with pytest.raises(ValueError, match="Duplicate"):
+            buffer.push(0, "again")
+        with pytest.raises(ValueError, match="Duplicate"):
+            buffer.push(2, "again")
@@ -71,10 +71,14 @@ class TestServeOrchestrator:
             "manifest_path": "/test/manifest.json",
             "output_dir": "/test/output",
         }
-        # base_dir is project root (config's parent's parent)
+        # base_dir is project root (config's parent's parent); the
+        # development BuildContext switches thumbnails to quick previews
         mock_galleria_builder.build.assert_called_once_with(
-            expected_builder_config, config_path.parent.parent
+            expected_builder_config,
+            config_path.parent.parent,
+            build_context=orchestrator.build_context,
         )
+        assert orchestrator.build_context.production is False
 
     @patch("galleria.orchestrator.serve.ConfigManager")
     @patch("galleria.orchestrator.serve.GalleriaBuilder")
@@ -127,7 +131,9 @@ class TestServeOrchestrator:
         orchestrator.execute(config_path, host="localhost", port=8080)
 
         # Assert
-        mock_server.assert_called_once_with(output_dir, "localhost", 8080)
+        mock_server.assert_called_once_with(
+            output_dir, "localhost", 8080, lazy=False
+        )
         mock_http_server.start.assert_called_once_with(verbose=False)
 
     @patch("galleria.orchestrator.serve.ConfigManager")
@@ -256,8 +262,16 @@ class TestServeOrchestrator:
         }
         # base_dir is project root (config's parent's parent)
         expected_calls = [
-            call(expected_builder_config, config_path.parent.parent),
-            call(expected_builder_config, config_path.parent.parent),
+            call(
+                expected_builder_config,
+                config_path.parent.parent,
+                build_context=orchestrator.build_context,
+            ),
+            call(
+                expected_builder_config,
+                config_path.parent.parent,
+                build_context=orchestrator.build_context,
+            ),
         ]
         mock_galleria_builder.build.assert_has_calls(expected_calls)
 
@@ -305,7 +319,9 @@ class TestServeOrchestrator:
         orchestrator.execute(config_path)
 
         # Assert
-        mock_server.assert_called_once_with(expected_output_dir, "127.0.0.1", 8000)
+        mock_server.assert_called_once_with(
+            expected_output_dir, "127.0.0.1", 8000, lazy=False
+        )
 
     @patch("galleria.orchestrator.serve.ConfigManager")
     @patch("galleria.orchestrator.serve.GalleriaBuilder")
@@ -396,9 +412,56 @@ class TestServeOrchestrator:
         expected_manifest_path = Path("/project/output/pics/manifest.json")
 
         # HTTP server should receive resolved output path
-        mock_server.assert_called_once_with(expected_output_dir, "127.0.0.1", 8000)
+        mock_server.assert_called_once_with(
+            expected_output_dir, "127.0.0.1", 8000, lazy=False
+        )
 
         # File watcher should receive resolved manifest path
         call_args = mock_watcher.call_args
         watched_paths = call_args[0][0]
         assert expected_manifest_path in watched_paths
+
+    @patch("galleria.orchestrator.serve.ConfigManager")
+    @patch("galleria.orchestrator.serve.GalleriaBuilder")
+    @patch("galleria.orchestrator.serve.GalleriaHTTPServer")
+    @patch("galleria.orchestrator.serve.FileWatcher")
+    def test_builder_shares_worker_pool_and_cleanup_shuts_it_down(
+        self, mock_watcher, mock_server, mock_builder, mock_config
+    ):
+        """Builder receives the orchestrator's pool and upgrader; cleanup stops both."""
+        # Arrange
+        orchestrator = ServeOrchestrator()
+
+        with (
+            patch.object(orchestrator.worker_pool, "shutdown") as mock_shutdown,
+            patch.object(orchestrator.upgrader, "shutdown") as mock_upgrader_shutdown,
+        ):
+            # Act
+            orchestrator._cleanup()
+
+            # Assert
+            mock_builder.assert_called_once_with(
+                worker_pool=orchestrator.worker_pool, upgrader=orchestrator.upgrader
+            )
+            mock_shutdown.assert_called_once()
+            mock_upgrader_shutdown.assert_called_once()
+
+    @patch("galleria.orchestrator.serve.ConfigManager")
+    @patch("galleria.orchestrator.serve.GalleriaBuilder")
+    @patch("galleria.orchestrator.serve.GalleriaHTTPServer")
+    def test_lazy_leaves_thumbnails_to_the_server(
+        self, mock_server, mock_builder, mock_config
+    ):
+        """lazy=True → Build plans thumbnails, server renders them on request."""
+        config_path = Path("/test/config/galleria.json")
+        mock_config.return_value.load_galleria_config.return_value = {
+            "output_dir": "output",
+            "manifest_path": "manifest.json",
+        }
+
+        orchestrator = ServeOrchestrator()
+        orchestrator.execute(config_path, no_watch=True, lazy=True)
+
+        builder_config = mock_builder.return_value.build.call_args[0][0]
+        assert builder_config["lazy_thumbnails"] is True
+        assert mock_server.call_args.kwargs["lazy"] is True
@@ -263,3 +263,156 @@ class TestGalleriaRequestHandler:
             mock_log.assert_called_once()
             format_str = mock_log.call_args[0][0]
             assert "Galleria server: 200 /test.html" == format_str
+
+
+class TestLazyThumbnails:
+    """Tests for thumbnails rendered by the dev server on first request."""
+
+    def _lazy_build(self, root, count=1):
+        """Run a lazy dev build over ``count`` photos and return the output dir."""
+        from PIL import Image
+
+        from build.context import BuildContext
+        from galleria.plugins import PluginContext
+        from galleria.plugins.processors.thumbnail import ThumbnailProcessorPlugin
+
+        photos = []
+        for n in range(count):
+            source = root / f"IMG_{n:03d}.jpg"
+            Image.new("RGB", (640, 480), color="olive").save(source, "JPEG")
+            photos.append(
+                {
+                    "source_path": str(source),
+                    "dest_path": f"wedding/IMG_{n:03d}.jpg",
+                    "metadata": {"hash": f"hash-{n}"},
+                }
+            )
+        output_dir = root / "output"
+        ThumbnailProcessorPlugin().process_thumbnails(
+            PluginContext(
+                input_data={"photos": photos, "collection_name": "wedding"},
+                config={"thumbnail_size": 120, "lazy_thumbnails": True},
+                output_dir=output_dir,
+                metadata={"build_context": BuildContext(production=False)},
+            )
+        )
+        return output_dir
+
+    def test_concurrent_requests_render_once_into_cache(self, temp_filesystem):
+        """Same photo requested by many threads → One render, cached after."""
+        import threading
+
+        from galleria.server.lazy import LazyThumbnails
+
+        output_dir = self._lazy_build(temp_filesystem)
+        lazy = LazyThumbnails(output_dir)
+        errors = []
+        threads = [
+            threading.Thread(
+                target=lambda: errors.append(lazy.ensure("IMG_000.webp"))
+            )
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == [None] * 8
+        assert lazy.rendered == 1
+        assert (output_dir / "thumbnails" / "IMG_000.webp").exists()
+        assert "IMG_000.webp" in (
+            output_dir / "thumbnails" / ".galleria-cache.json"
+        ).read_text()
+        assert lazy.ensure("IMG_000.webp") is None
+        assert lazy.rendered == 1
+
+    def test_render_during_rebuild_keeps_both_index_entries(self, temp_filesystem):
+        """Lazy render between a rebuild's load and save → Both entries kept."""
+        import json
+
+        from PIL import Image
+
+        from galleria.plugins import PluginContext
+        from galleria.plugins.processors.thumbnail import ThumbnailProcessorPlugin
+        from galleria.server.lazy import LazyThumbnails
+
+        output_dir = self._lazy_build(temp_filesystem)
+        lazy = LazyThumbnails(output_dir)
+        source = temp_filesystem / "IMG_100.jpg"
+        Image.new("RGB", (640, 480), color="teal").save(source, "JPEG")
+        errors = []
+
+        # The rebuild has loaded the index when its photo completes
+        ThumbnailProcessorPlugin().process_thumbnails(
+            PluginContext(
+                input_data={
+                    "photos": [
+                        {
+                            "source_path": str(source),
+                            "dest_path": "wedding/IMG_100.jpg",
+                            "metadata": {"hash": "hash-100"},
+                        }
+                    ],
+                    "collection_name": "wedding",
+                },
+                config={"thumbnail_size": 120},
+                output_dir=output_dir,
+                metadata={
+                    "progress_callback": lambda *_: errors.append(
+                        lazy.ensure("IMG_000.webp")
+                    )
+                },
+            )
+        )
+
+        index = json.loads(
+            (output_dir / "thumbnails" / ".galleria-cache.json").read_text()
+        )
+        assert errors == [None]
+        assert {"IMG_000.webp", "IMG_100.webp"} <= set(index["entries"])
+
+    def test_unplanned_and_failed_files(self, temp_filesystem):
+        """Unknown names pass through; a missing source reports its error."""
+        from galleria.server.lazy import LazyThumbnails
+
+        output_dir = self._lazy_build(temp_filesystem)
+        (temp_filesystem / "IMG_000.jpg").unlink()
+        lazy = LazyThumbnails(output_dir)
+
+        assert lazy.ensure("other.webp") is None
+        assert "IMG_000.jpg" in lazy.ensure("IMG_000.webp")
+
+    def test_http_request_generates_thumbnail(self, temp_filesystem):
+        """GET /thumbnails/<name> for a planned file → 200 with the image."""
+        import functools
+        import io
+        import threading
+        import urllib.request
+        from http.server import ThreadingHTTPServer
+
+        from PIL import Image
+
+        from galleria.server import GalleriaRequestHandler
+        from galleria.server.lazy import LazyThumbnails
+
+        output_dir = self._lazy_build(temp_filesystem)
+        handler = type(
+            "Handler",
+            (GalleriaRequestHandler,),
+            {"lazy": LazyThumbnails(output_dir), "log_message": lambda *a: None},
+        )
+        server = ThreadingHTTPServer(
+            ("127.0.0.1", 0), functools.partial(handler, directory=str(output_dir))
+        )
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            url = f"http://127.0.0.1:{server.server_port}/thumbnails/IMG_000.webp"
+            with urllib.request.urlopen(url, timeout=30) as response:
+                body = response.read()
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        with Image.open(io.BytesIO(body)) as img:
+            assert img.size == (120, 120)
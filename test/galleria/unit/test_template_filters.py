@@ -96,3 +96,23 @@ class TestTemplateURLFilters:
         # Relative path starting with output/ - this is the bug case
         result = full_url("output/galleries/wedding/thumbnails/photo.webp", context, site_url)
         assert result == "/galleries/wedding/thumbnails/photo.webp"
+
+    def test_full_url_filter_keeps_web_photos_in_pics_web(self):
+        """Web-optimized photos route to /pics/web/, not the originals."""
+        from galleria.template.filters import full_url
+
+        context = BuildContext(production=True)
+        site_url = "https://marco-chrissy.com"
+
+        result = full_url("/srv/site/output/pics/web/photo.jpg", context, site_url)
+        assert result == "/pics/web/photo.jpg"
+
+    def test_full_url_filter_routes_pics_tree_without_output_root(self):
+        """A pics/web tree outside an output/ root still maps to /pics/web/."""
+        from galleria.template.filters import full_url
+
+        context = BuildContext(production=True)
+        site_url = "https://marco-chrissy.com"
+
+        result = full_url("/tmp/build/site/pics/web/photo.jpg", context, site_url)
+        assert result == "/pics/web/photo.jpg"
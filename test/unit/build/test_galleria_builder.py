@@ -338,3 +338,88 @@ class TestGalleriaBuilder:
         assert "parallel" not in captured_context.config["processor"]
         assert "max_workers" not in captured_context.config["processor"]
         assert result is True
+
+    def test_build_resolves_web_dir_against_base_dir(self, temp_filesystem, file_factory):
+        """Test that a relative web_dir is resolved like output_dir."""
+        from unittest.mock import MagicMock, patch
+
+        galleria_config = {
+            "manifest_path": "manifest.json",
+            "output_dir": "output/galleries/test",
+            "web_photos": True,
+            "web_dir": "output/pics/web",
+        }
+        file_factory("manifest.json", json_content={"collection_name": "test", "pics": []})
+
+        captured_context = None
+
+        def capture_context(stages, context):
+            nonlocal captured_context
+            captured_context = context
+            mock_result = MagicMock()
+            mock_result.success = True
+            mock_result.output_data = {"html_files": [], "css_files": []}
+            return mock_result
+
+        with patch('galleria.manager.pipeline.PipelineManager.execute_stages', side_effect=capture_context):
+            GalleriaBuilder().build(galleria_config, temp_filesystem)
+
+        processor_config = captured_context.config["processor"]
+        assert processor_config["web_photos"] is True
+        assert processor_config["web_dir"] == str(temp_filesystem / "output/pics/web")
+
+    def test_page_schedule_attaches_page_writer_per_build(self, temp_filesystem, file_factory):
+        """Test that schedule "page" adds early page writes without touching shared hooks."""
+        from unittest.mock import MagicMock, patch
+
+        from galleria.manager.hooks import PluginHookManager
+        from galleria.manager.pipeline import PipelineManager
+
+        galleria_config = {
+            "manifest_path": "manifest.json",
+            "output_dir": "output/galleries/test",
+            "schedule": "page",
+        }
+        file_factory("manifest.json", json_content={"collection_name": "test", "pics": []})
+        shared_hooks = PluginHookManager()
+        pipeline_hooks = []
+
+        def capture_hooks(pipeline, stages, context):
+            pipeline_hooks.append(pipeline.hooks)
+            mock_result = MagicMock()
+            mock_result.success = True
+            mock_result.output_data = {"html_files": [], "css_files": []}
+            return mock_result
+
+        with patch.object(PipelineManager, "execute_stages", autospec=True, side_effect=capture_hooks):
+            GalleriaBuilder(hooks=shared_hooks).build(galleria_config, temp_filesystem)
+            GalleriaBuilder(hooks=shared_hooks).build(
+                {**galleria_config, "schedule": "manifest"}, temp_filesystem
+            )
+
+        assert pipeline_hooks[0].has_hook("processor_release")
+        assert not pipeline_hooks[1].has_hook("processor_release")
+        assert not shared_hooks.has_hook("processor_release")
+
+    def test_streaming_config_uses_streaming_pipeline(self, temp_filesystem, file_factory):
+        """Test that streaming: true runs execute_streaming instead of execute_stages."""
+        from unittest.mock import MagicMock, patch
+
+        from galleria.manager.pipeline import PipelineManager
+
+        galleria_config = {
+            "manifest_path": "manifest.json",
+            "output_dir": "output/galleries/test",
+            "streaming": True,
+        }
+        file_factory("manifest.json", json_content={"collection_name": "test", "pics": []})
+        mock_result = MagicMock()
+        mock_result.success = True
+        mock_result.output_data = {"html_files": [], "written_files": ["page_1.html"]}
+
+        with patch.object(PipelineManager, "execute_streaming", return_value=mock_result) as streaming, \
+                patch.object(PipelineManager, "execute_stages") as staged:
+            GalleriaBuilder().build(galleria_config, temp_filesystem)
+
+        streaming.assert_called_once()
+        staged.assert_not_called()
@@ -3,6 +3,7 @@
 from pathlib import Path
 from unittest.mock import Mock
 
+from deploy.manifest_comparator import ManifestComparator
 from deploy.orchestrator import DeployOrchestrator
 
 
@@ -77,6 +78,24 @@ class TestDeployOrchestrator:
         }
         assert site_paths == expected_site_paths
 
+    def test_web_photos_deploy_to_photo_zone(self, temp_filesystem, file_factory):
+        """Test pics/web derivatives are routed and uploaded like originals."""
+        output_dir = temp_filesystem / "output"
+        file_factory(output_dir / "pics" / "full" / "photo1.jpg", content="original")
+        file_factory(output_dir / "pics" / "web" / "photo1.jpg", content="web")
+
+        photo_files, site_files = self.orchestrator.route_files_to_zones(output_dir)
+        self.mock_photo_client.download_file.return_value = None
+        self.mock_photo_client.upload_file.return_value = True
+        orchestrator = DeployOrchestrator(
+            self.mock_photo_client, self.mock_site_client, ManifestComparator()
+        )
+
+        assert orchestrator.deploy_photos(photo_files, output_dir)
+        assert site_files == []
+        uploaded = {c.args[1] for c in self.mock_photo_client.upload_file.call_args_list}
+        assert {"full/photo1.jpg", "web/photo1.jpg"} <= uploaded
+
     def test_deploy_photos_uses_manifest_comparison(self, temp_filesystem, file_factory):
         """Test photo deployment uses manifest comparison for incremental uploads."""
         # Create output directory with photo files